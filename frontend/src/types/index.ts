@@ -86,7 +86,8 @@ export enum ConnectorRuntimeType {
   EXTERNAL_PYTHON = 'external_python',
   EXTERNAL_NODEJS = 'external_nodejs',
   EXTERNAL_GO = 'external_go',
-  EXTERNAL_CUSTOM = 'external_custom'
+  EXTERNAL_CUSTOM = 'external_custom',
+  EXTERNAL_HTTP = 'external_http'
 }
 
 export enum ProcessStatus {
@@ -189,9 +190,25 @@ export interface PlatformStats {
   pool_hits: number
   pool_misses: number
   tool_calls_today: number
+  circuit_breakers: CircuitBreakerStats | null
   timestamp: string
 }
 
+export interface CircuitBreakerStats {
+  tracked: number
+  closed: number
+  open: number
+  half_open: number
+  tripped: {
+    host: string
+    credential: string | null
+    state: 'open' | 'half_open'
+    requests: number
+    failure_rate: number
+    retry_in: number
+  }[]
+}
+
 export interface PoolEntry {
   key: string
   tenant_slug: string
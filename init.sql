@@ -4,6 +4,9 @@
 -- Create UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Trigram indexes for registry search (migration 12 also tries to create it)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create any additional extensions as needed
 -- CREATE EXTENSION IF NOT EXISTS "pgcrypto";
 
@@ -1,16 +1,22 @@
 """Admin API routes for tenant and connector management."""
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
-import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel, field_serializer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database.connection import get_db_session
+from ..database.tool_states import (
+    delete_tool_states_except,
+    insert_missing_tool_states,
+    set_all_tool_states,
+    upsert_tool_states,
+)
 from ..models.api_key import APIKeyScope
 from ..models.connector import Connector, ConnectorType, ConnectorRuntimeType
 from ..models.connector_tool_state import ConnectorToolState
@@ -19,11 +25,18 @@ from ..models.tenant import Tenant
 from ..connectors.registry import connector_registry
 from ..runtime import process_manager
 from ..security.auth import require_scope, require_tenant_access
+from ..security.tenant_directory import TenantInfo, get_tenant_info, invalidate_tenant
+from .pagination import finish_page, keyset_page
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Keyset sort keys of the list endpoints (slug is unique; name is not)
+_TENANT_ORDER = (Tenant.slug,)
+_CONNECTOR_ORDER = (Connector.name, Connector.id)
+_MAX_PAGE_SIZE = 500
+
 
 def _invalidate_pool(request: Request, tenant_slug: str, connector_id: str):
     """Invalidate server pool entry if pool is active."""
@@ -130,6 +143,11 @@ class ProcessStatusResponse(BaseModel):
     last_health_check: Optional[datetime]
     error_message: Optional[str]
     restart_count: int
+    cpu_limit_millicores: Optional[int] = None
+    memory_limit_mb: Optional[int] = None
+    limit_enforcement: Optional[str] = None  # "cgroup", "rlimit" or None
+    rss_bytes: Optional[int] = None
+    cpu_millicores: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -157,16 +175,8 @@ async def populate_tools_for_connector(connector: Connector, session: AsyncSessi
         # Note: OAuth credential may not be configured yet, so we pass None
         tools = await connector_plugin.get_tools(connector, oauth_cred=None)
 
-        # Create ConnectorToolState records for each tool (all enabled by default)
-        for tool in tools:
-            tool_state = ConnectorToolState(
-                id=uuid.uuid4(),
-                connector_id=connector.id,
-                tool_name=tool.name,
-                is_enabled=True  # Default: all tools enabled
-            )
-            session.add(tool_state)
-
+        # Create ConnectorToolState records for all tools in one statement (all enabled by default)
+        await insert_missing_tool_states(session, connector.id, (tool.name for tool in tools))
         await session.commit()
 
     except Exception as e:
@@ -217,15 +227,16 @@ async def create_tenant(
     dependencies=[Depends(require_scope(APIKeyScope.PLATFORM_ADMIN))],
 )
 async def list_tenants(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_PAGE_SIZE, description="Page size; all tenants if omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     session: AsyncSession = Depends(get_db_session)
 ):
-    """List all tenants."""
+    """List tenants by slug, a page at a time when a limit is given."""
     from sqlalchemy import select
 
-    result = await session.execute(select(Tenant))
-    tenants = result.scalars().all()
-
-    return list(tenants)
+    result = await session.execute(keyset_page(select(Tenant), _TENANT_ORDER, cursor, limit))
+    return finish_page(result.scalars().all(), _TENANT_ORDER, limit, response)
 
 
 @router.get(
@@ -263,21 +274,13 @@ async def get_tenant(
 async def create_connector(
     tenant_slug: str,
     connector_data: ConnectorCreate,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Create a new connector for a tenant."""
     from sqlalchemy import select
     from sqlalchemy.exc import IntegrityError
 
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Check if connector of this type already exists for this tenant
     # Only enforce uniqueness for built-in connectors, not CUSTOM connectors
     if connector_data.connector_type != ConnectorType.CUSTOM:
@@ -331,27 +334,20 @@ async def create_connector(
 )
 async def list_connectors(
     tenant_slug: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_PAGE_SIZE, description="Page size; all connectors if omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
-    """List connectors for a tenant."""
+    """List connectors for a tenant by name, a page at a time when a limit is given."""
     from sqlalchemy import select
 
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get connectors
     connector_result = await session.execute(
-        select(Connector).where(Connector.tenant_id == tenant.id)
+        keyset_page(select(Connector).where(Connector.tenant_id == tenant.id), _CONNECTOR_ORDER, cursor, limit)
     )
-    connectors = connector_result.scalars().all()
-
-    return list(connectors)
+    return finish_page(connector_result.scalars().all(), _CONNECTOR_ORDER, limit, response)
 
 
 @router.delete(
@@ -385,6 +381,7 @@ async def delete_tenant(
     )
 
     await session.commit()
+    invalidate_tenant(tenant_slug)
 
     return {
         "message": (
@@ -428,6 +425,7 @@ async def update_tenant(
     )
 
     await session.commit()
+    invalidate_tenant(tenant_slug)
     await session.refresh(tenant)
 
     return tenant
@@ -441,20 +439,12 @@ async def update_tenant(
 async def get_connector(
     tenant_slug: str,
     connector_id: str,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Get a specific connector."""
     from sqlalchemy import select
 
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get connector
     connector_result = await session.execute(
         select(Connector).where(
@@ -483,20 +473,12 @@ async def update_connector(
     connector_id: str,
     connector_data: ConnectorCreate,
     request: Request,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Update a connector."""
     from sqlalchemy import select, update
 
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get connector
     connector_result = await session.execute(
         select(Connector).where(
@@ -540,20 +522,12 @@ async def delete_connector(
     tenant_slug: str,
     connector_id: str,
     request: Request,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Delete a connector."""
     from sqlalchemy import select, delete
 
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get connector
     connector_result = await session.execute(
         select(Connector).where(
@@ -591,20 +565,12 @@ async def delete_connector(
 async def toggle_connector(
     tenant_slug: str,
     connector_id: str,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Toggle connector enabled/disabled status."""
     from sqlalchemy import select, update
 
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get connector
     connector_result = await session.execute(
         select(Connector).where(
@@ -646,20 +612,12 @@ async def toggle_connector(
 async def list_connector_tools(
     tenant_slug: str,
     connector_id: str,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """List all tools for a connector with their enabled/disabled state."""
     from sqlalchemy import select
 
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get connector
     try:
         connector_uuid = UUID(connector_id)
@@ -762,7 +720,12 @@ async def list_connector_tools_legacy(
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
-    return await list_connector_tools(tenant.slug, connector_id, session)
+    return await list_connector_tools(
+        tenant.slug,
+        connector_id,
+        tenant=TenantInfo(id=tenant.id, slug=tenant.slug, is_active=tenant.is_active),
+        session=session,
+    )
 
 
 @router.patch(
@@ -779,20 +742,12 @@ async def toggle_tool(
     tool_name: str,
     request: ToolToggleRequest,
     http_request: Request,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Toggle a specific tool's enabled/disabled state."""
     from sqlalchemy import select
 
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get connector
     connector_result = await session.execute(
         select(Connector).where(
@@ -805,36 +760,15 @@ async def toggle_tool(
     if not connector:
         raise HTTPException(status_code=404, detail="Connector not found")
 
-    # Get or create tool state
-    tool_state_result = await session.execute(
-        select(ConnectorToolState).where(
-            ConnectorToolState.connector_id == connector.id,
-            ConnectorToolState.tool_name == tool_name
-        )
-    )
-    tool_state = tool_state_result.scalar_one_or_none()
-
-    if tool_state:
-        # Update existing state
-        tool_state.is_enabled = request.is_enabled
-    else:
-        # Create new state
-        tool_state = ConnectorToolState(
-            id=uuid.uuid4(),
-            connector_id=connector.id,
-            tool_name=tool_name,
-            is_enabled=request.is_enabled
-        )
-        session.add(tool_state)
-
+    # Create or update the tool state
+    await upsert_tool_states(session, connector.id, {tool_name: request.is_enabled})
     await session.commit()
-    await session.refresh(tool_state)
 
     _invalidate_pool(http_request, tenant_slug, connector_id)
 
     return ToolStateResponse(
-        tool_name=tool_state.tool_name,
-        is_enabled=tool_state.is_enabled
+        tool_name=tool_name,
+        is_enabled=request.is_enabled
     )
 
 
@@ -851,20 +785,12 @@ async def bulk_update_tools(
     connector_id: str,
     request: BulkToolUpdatesRequest,
     http_request: Request,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Bulk update multiple tools' enabled/disabled state."""
     from sqlalchemy import select
 
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get connector
     connector_result = await session.execute(
         select(Connector).where(
@@ -877,30 +803,9 @@ async def bulk_update_tools(
     if not connector:
         raise HTTPException(status_code=404, detail="Connector not found")
 
-    # Process each update
-    updated_count = 0
-    for update in request.updates:
-        # Get or create tool state
-        tool_state_result = await session.execute(
-            select(ConnectorToolState).where(
-                ConnectorToolState.connector_id == connector.id,
-                ConnectorToolState.tool_name == update.tool_name
-            )
-        )
-        tool_state = tool_state_result.scalar_one_or_none()
-
-        if tool_state:
-            tool_state.is_enabled = update.is_enabled
-        else:
-            tool_state = ConnectorToolState(
-                id=uuid.uuid4(),
-                connector_id=connector.id,
-                tool_name=update.tool_name,
-                is_enabled=update.is_enabled
-            )
-            session.add(tool_state)
-
-        updated_count += 1
+    # Create or update all tool states in one statement (the last update per tool wins)
+    states = {update.tool_name: update.is_enabled for update in request.updates}
+    updated_count = len(await upsert_tool_states(session, connector.id, states))
 
     await session.commit()
 
@@ -925,19 +830,11 @@ async def enable_all_tools(
     tenant_slug: str,
     connector_id: str,
     request: Request,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Enable all tools for a connector."""
-    from sqlalchemy import select, update
-
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
+    from sqlalchemy import select
 
     # Get connector
     connector_result = await session.execute(
@@ -952,11 +849,7 @@ async def enable_all_tools(
         raise HTTPException(status_code=404, detail="Connector not found")
 
     # Update all tool states to enabled
-    result = await session.execute(
-        update(ConnectorToolState)
-        .where(ConnectorToolState.connector_id == connector.id)
-        .values(is_enabled=True)
-    )
+    updated_count = await set_all_tool_states(session, connector.id, is_enabled=True)
 
     await session.commit()
 
@@ -964,8 +857,8 @@ async def enable_all_tools(
 
     return {
         "success": True,
-        "updated_count": result.rowcount,
-        "message": f"Enabled {result.rowcount} tools"
+        "updated_count": updated_count,
+        "message": f"Enabled {updated_count} tools"
     }
 
 
@@ -981,19 +874,11 @@ async def disable_all_tools(
     tenant_slug: str,
     connector_id: str,
     request: Request,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Disable all tools for a connector."""
-    from sqlalchemy import select, update
-
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
+    from sqlalchemy import select
 
     # Get connector
     connector_result = await session.execute(
@@ -1008,11 +893,7 @@ async def disable_all_tools(
         raise HTTPException(status_code=404, detail="Connector not found")
 
     # Update all tool states to disabled
-    result = await session.execute(
-        update(ConnectorToolState)
-        .where(ConnectorToolState.connector_id == connector.id)
-        .values(is_enabled=False)
-    )
+    updated_count = await set_all_tool_states(session, connector.id, is_enabled=False)
 
     await session.commit()
 
@@ -1020,8 +901,8 @@ async def disable_all_tools(
 
     return {
         "success": True,
-        "updated_count": result.rowcount,
-        "message": f"Disabled {result.rowcount} tools"
+        "updated_count": updated_count,
+        "message": f"Disabled {updated_count} tools"
     }
 
 
@@ -1037,6 +918,7 @@ async def sync_connector_tools(
     tenant_slug: str,
     connector_id: str,
     request: Request,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Sync tools for a connector - detect new tools from code and remove orphaned tools.
@@ -1048,16 +930,7 @@ async def sync_connector_tools(
     4. Removes orphaned tools (tools deleted from code)
     5. Returns a summary of changes
     """
-    from sqlalchemy import select, delete
-
-    # Get tenant
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
+    from sqlalchemy import select
 
     # Get connector
     connector_result = await session.execute(
@@ -1086,49 +959,15 @@ async def sync_connector_tools(
 
     code_tool_names = {tool.name for tool in all_tools}
 
-    # Get existing tool states from database
-    db_tools_result = await session.execute(
-        select(ConnectorToolState).where(ConnectorToolState.connector_id == connector.id)
-    )
-    db_tools = {tool.tool_name: tool for tool in db_tools_result.scalars().all()}
-    db_tool_names = set(db_tools.keys())
-
-    # Find new tools (in code but not in DB)
-    new_tool_names = code_tool_names - db_tool_names
-
-    # Find orphaned tools (in DB but not in code)
-    orphaned_tool_names = db_tool_names - code_tool_names
-
-    # Add new tools to database (enabled by default)
-    added_tools = []
-    for tool_name in new_tool_names:
-        tool_state = ConnectorToolState(
-            id=uuid.uuid4(),
-            connector_id=connector.id,
-            tool_name=tool_name,
-            is_enabled=True
-        )
-        session.add(tool_state)
-        added_tools.append(tool_name)
-
-    # Remove orphaned tools from database
-    removed_tools = []
-    if orphaned_tool_names:
-        for tool_name in orphaned_tool_names:
-            await session.execute(
-                delete(ConnectorToolState).where(
-                    ConnectorToolState.connector_id == connector.id,
-                    ConnectorToolState.tool_name == tool_name
-                )
-            )
-            removed_tools.append(tool_name)
+    # Add new tools (enabled by default) and remove orphaned ones (deleted from code)
+    added_tools = await insert_missing_tool_states(session, connector.id, code_tool_names)
+    removed_tools = await delete_tool_states_except(session, connector.id, code_tool_names)
 
     await session.commit()
 
     _invalidate_pool(request, tenant_slug, connector_id)
 
-    # Calculate unchanged count
-    unchanged_count = len(code_tool_names & db_tool_names)
+    unchanged_count = len(code_tool_names) - len(added_tools)
 
     return {
         "success": True,
@@ -1186,11 +1025,7 @@ async def get_process_status(
     has_db_changes = False
     key = f"{process.tenant_id}:{process.connector_id}"
     managed_process = process_manager.processes.get(key)
-    is_live = (
-        managed_process is not None
-        and managed_process.process is not None
-        and managed_process.process.returncode is None
-    )
+    is_live = managed_process is not None and managed_process.is_running
 
     # Reconcile stale DB state after app/container restart.
     # If process manager has no live process for this connector, it cannot be running.
@@ -1227,6 +1062,21 @@ async def get_process_status(
     if process.status == ProcessStatus.STOPPED:
         return None
 
+    cpu_limit_millicores = process.cpu_limit_millicores
+    memory_limit_mb = process.memory_limit_mb
+    limit_enforcement = None
+    usage = None
+    if is_live:
+        guard = managed_process.resource_guard
+        cpu_limit_millicores = guard.limits.cpu_millicores
+        memory_limit_mb = guard.limits.memory_mb
+        limit_enforcement = guard.enforcement
+        # The health pass samples every process; reuse its result.
+        usage = guard.last_usage
+        if usage is None:
+            # Not sampled yet. Read /proc off the loop, leaving the guard's CPU baseline alone.
+            usage = await asyncio.to_thread(managed_process.sample_resource_usage, False)
+
     return ProcessStatusResponse(
         connector_id=process.connector_id,
         tenant_id=process.tenant_id,
@@ -1236,7 +1086,12 @@ async def get_process_status(
         started_at=process.started_at,
         last_health_check=process.last_health_check,
         error_message=process.error_message,
-        restart_count=process.restart_count
+        restart_count=process.restart_count,
+        cpu_limit_millicores=cpu_limit_millicores,
+        memory_limit_mb=memory_limit_mb,
+        limit_enforcement=limit_enforcement,
+        rss_bytes=usage.rss_bytes if usage else None,
+        cpu_millicores=usage.cpu_millicores if usage else None,
     )
 
 
@@ -1,24 +1,31 @@
 """Admin stats endpoint for dashboard metrics."""
 
 import logging
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..connectors.circuit_breaker import get_circuit_breakers
 from ..database.connection import get_db_session
 from ..models.api_key import APIKeyScope
 from ..models.tenant import Tenant
 from ..models.connector import Connector
 from ..observability.metrics import get_tool_calls_today
-from ..security.auth import require_scope
+from ..observability.usage import USAGE_GROUPS, query_usage
+from ..security.auth import require_scope, require_tenant_access
+from ..security.tenant_directory import TenantInfo, get_tenant_info
 from .mcp import get_recent_active_session_count
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Longest date range a usage query may span.
+_MAX_USAGE_DAYS = 366
+
 
 @router.get("/stats", dependencies=[Depends(require_scope(APIKeyScope.PLATFORM_ADMIN))])
 async def get_platform_stats(request: Request):
@@ -55,6 +62,8 @@ async def get_platform_stats(request: Request):
         else get_recent_active_session_count(request.app, ttl_seconds=60.0)
     )
 
+    breakers = get_circuit_breakers()
+
     return {
         "tenants": tenant_count,
         "connectors": connector_count,
@@ -63,5 +72,60 @@ async def get_platform_stats(request: Request):
         "pool_hits": pool_hits,
         "pool_misses": pool_misses,
         "tool_calls_today": get_tool_calls_today(),
+        "circuit_breakers": breakers.get_stats() if breakers else None,
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
+
+
+def _usage_window(start: Optional[date], end: Optional[date], group_by: str) -> Tuple[date, date, List[str]]:
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days >= _MAX_USAGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Usage range is limited to {_MAX_USAGE_DAYS} days")
+    groups = [group.strip() for group in group_by.split(",") if group.strip()]
+    unknown = set(groups) - set(USAGE_GROUPS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown group_by value(s): {', '.join(sorted(unknown))}; use {', '.join(USAGE_GROUPS)}",
+        )
+    return start, end, groups
+
+
+@router.get("/usage", dependencies=[Depends(require_scope(APIKeyScope.PLATFORM_ADMIN))])
+async def get_platform_usage(
+    start: Optional[date] = Query(default=None, description="First day (UTC), default 29 days before end"),
+    end: Optional[date] = Query(default=None, description="Last day (UTC), default today"),
+    group_by: str = Query(default="day", description="Comma-separated: day, tenant, connector, tool"),
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Tool usage across all tenants, from the persisted aggregates.
+
+    Counts reach the database on each replica's next usage flush.
+    """
+    start, end, groups = _usage_window(start, end, group_by)
+    rows = await query_usage(session, start, end, group_by=groups)
+    return {"start": start, "end": end, "group_by": groups, "rows": rows}
+
+
+@router.get(
+    "/tenants/{tenant_slug}/usage",
+    dependencies=[
+        Depends(require_scope(APIKeyScope.PLATFORM_ADMIN, APIKeyScope.TENANT_ADMIN)),
+        Depends(require_tenant_access()),
+    ],
+)
+async def get_tenant_usage(
+    tenant_slug: str,
+    start: Optional[date] = Query(default=None, description="First day (UTC), default 29 days before end"),
+    end: Optional[date] = Query(default=None, description="Last day (UTC), default today"),
+    group_by: str = Query(default="day", description="Comma-separated: day, connector, tool"),
+    tenant: TenantInfo = Depends(get_tenant_info),
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Tool usage of one tenant, from the persisted aggregates."""
+    start, end, groups = _usage_window(start, end, group_by)
+    rows = await query_usage(session, start, end, tenant_id=tenant.id, group_by=groups)
+    return {"tenant": tenant_slug, "start": start, "end": end, "group_by": groups, "rows": rows}
@@ -1,5 +1,6 @@
 """API key management endpoints."""
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import List, Optional
@@ -14,6 +15,7 @@ from ..database.connection import get_db_session
 from ..models.api_key import APIKey, APIKeyScope
 from ..security.auth import (
     AuthContext,
+    compute_key_verifier,
     generate_api_key,
     get_auth_context,
     hash_api_key,
@@ -81,12 +83,14 @@ async def create_api_key(
 ):
     """Create a new API key. Only platform admins can create keys."""
     raw_key = generate_api_key(request.scope)
-    key_hash = hash_api_key(raw_key)
+    # bcrypt takes ~250ms at 12 rounds; keep it off the event loop
+    key_hash = await asyncio.to_thread(hash_api_key, raw_key)
 
     api_key = APIKey(
         name=request.name,
         key_prefix=raw_key[:8],
         key_hash=key_hash,
+        key_verifier=compute_key_verifier(raw_key),
         scope=request.scope,
         tenant_id=request.tenant_id,
         is_active=True,
@@ -121,6 +121,11 @@ def _get_event_buffer_manager(request: Request):
     return getattr(request.app.state, "event_buffer_manager", None)
 
 
+def _resolved_tenant_id(request: Request) -> Optional[str]:
+    """Tenant id resolved by ``require_tenant_access`` for this request, if any."""
+    return getattr(request.state, "tenant_id", None)
+
+
 async def _get_transport(
     request: Request,
     tenant_slug: str,
@@ -128,9 +133,10 @@ async def _get_transport(
     user_token: Optional[str] = None,
 ) -> MCPTransport:
     """Get an MCPTransport, using server pool if available."""
+    tenant_id = _resolved_tenant_id(request)
     pool = _get_server_pool(request)
     if pool:
-        server = await pool.get_or_create(tenant_slug, connector_id, user_token)
+        server = await pool.get_or_create(tenant_slug, connector_id, user_token, tenant_id=tenant_id)
         if server:
             transport = MCPTransport(tenant_slug, connector_id, user_token)
             transport.mcp_server = server
@@ -138,7 +144,7 @@ async def _get_transport(
             return transport
 
     # Fallback: create new transport directly
-    return MCPTransport(tenant_slug, connector_id, user_token=user_token)
+    return MCPTransport(tenant_slug, connector_id, user_token=user_token, tenant_id=tenant_id)
 
 
 @router.websocket("/{tenant_slug}/connectors/{connector_id}/mcp")
@@ -379,8 +385,10 @@ async def mcp_http_get(tenant_slug: str, connector_id: str, request: Request):
     session_id = request.headers.get("mcp-session-id")
     last_event_id_str = request.headers.get("last-event-id")
 
+    tenant_id = _resolved_tenant_id(request)
+
     async def event_stream():
-        transport = MCPTransport(tenant_slug, connector_id)
+        transport = MCPTransport(tenant_slug, connector_id, tenant_id=tenant_id)
 
         if not await transport.initialize():
             error_msg = {
@@ -411,6 +419,12 @@ async def mcp_http_get(tenant_slug: str, connector_id: str, request: Request):
 
         message_queue = _message_queues[queue_key]
 
+        # External MCP servers push list_changed notifications; give each
+        # stream its own subscription so every client receives them.
+        subscription = transport.subscribe_notifications()
+        if subscription is not None:
+            message_queue = subscription
+
         try:
             while True:
                 try:
@@ -441,6 +455,9 @@ async def mcp_http_get(tenant_slug: str, connector_id: str, request: Request):
                 }
             }
             yield f"event: message\ndata: {json.dumps(error_msg)}\n\n"
+        finally:
+            if subscription is not None:
+                transport.unsubscribe_notifications(subscription)
 
     return StreamingResponse(
         event_stream(),
@@ -460,13 +477,14 @@ async def mcp_http_get(tenant_slug: str, connector_id: str, request: Request):
     "/{tenant_slug}/connectors/{connector_id}/mcp/sse",
     dependencies=[Depends(require_tenant_access())],
 )
-async def mcp_sse(tenant_slug: str, connector_id: str):
+async def mcp_sse(tenant_slug: str, connector_id: str, request: Request):
     """DEPRECATED: Old HTTP+SSE endpoint (protocol version 2024-11-05)."""
+    tenant_id = _resolved_tenant_id(request)
 
     async def event_stream():
         yield f"event: endpoint\ndata: {json.dumps({'type': 'endpoint'})}\n\n"
 
-        transport = MCPTransport(tenant_slug, connector_id)
+        transport = MCPTransport(tenant_slug, connector_id, tenant_id=tenant_id)
 
         if not await transport.initialize():
             yield f"event: error\ndata: {json.dumps({'error': 'Tenant not found or inactive', 'code': 4004})}\n\n"
@@ -499,9 +517,9 @@ async def mcp_sse(tenant_slug: str, connector_id: str):
     "/{tenant_slug}/connectors/{connector_id}/mcp/info",
     dependencies=[Depends(require_tenant_access())],
 )
-async def mcp_info(tenant_slug: str, connector_id: str):
+async def mcp_info(tenant_slug: str, connector_id: str, request: Request):
     """Get MCP server information for a specific connector."""
-    transport = MCPTransport(tenant_slug, connector_id)
+    transport = MCPTransport(tenant_slug, connector_id, tenant_id=_resolved_tenant_id(request))
 
     if not await transport.initialize():
         raise HTTPException(status_code=404, detail="Connector not found or inactive")
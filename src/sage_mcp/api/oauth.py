@@ -19,8 +19,8 @@ from ..database.connection import get_db_session
 from ..models.api_key import APIKeyScope
 from ..models.oauth_credential import OAuthCredential
 from ..models.oauth_config import OAuthConfig
-from ..models.tenant import Tenant
 from ..security.auth import require_scope, require_tenant_access
+from ..security.tenant_directory import TenantInfo, get_tenant_info
 
 logger = logging.getLogger(__name__)
 
@@ -588,6 +588,7 @@ async def initiate_oauth(
     request: Request,
     custom_redirect_uri: Optional[str] = None,
     custom_state: Optional[str] = None,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Initiate OAuth flow for a provider.
@@ -606,14 +607,6 @@ async def initiate_oauth(
             detail=f"Unsupported provider: {provider}"
         )
 
-    # Verify tenant exists
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     provider_config = OAUTH_PROVIDERS[provider]
 
     # Check for tenant-specific OAuth configuration first
@@ -725,6 +718,7 @@ async def oauth_callback(
     tenant_slug: str,
     provider: str,
     request: Request,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Handle OAuth callback from provider."""
@@ -734,14 +728,6 @@ async def oauth_callback(
             detail=f"Unsupported provider: {provider}"
         )
 
-    # Verify tenant exists
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get query parameters
     params = dict(request.query_params)
 
@@ -1104,17 +1090,10 @@ async def oauth_callback(
 async def revoke_oauth(
     tenant_slug: str,
     provider: str,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Revoke OAuth credentials for a provider."""
-    # Verify tenant exists
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Delete OAuth credentials for this tenant and provider
     result = await session.execute(
         delete(OAuthCredential).where(
@@ -1149,17 +1128,10 @@ async def revoke_oauth(
 )
 async def list_oauth_credentials(
     tenant_slug: str,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """List OAuth credentials for a tenant."""
-    # Verify tenant exists
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get OAuth credentials for this tenant
     credentials_result = await session.execute(
         select(OAuthCredential).where(
@@ -1196,17 +1168,10 @@ async def list_oauth_providers():
 )
 async def list_oauth_configs(
     tenant_slug: str,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """List OAuth configurations for a tenant."""
-    # Verify tenant exists
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Get OAuth configurations
     configs_result = await session.execute(
         select(OAuthConfig).where(OAuthConfig.tenant_id == tenant.id)
@@ -1226,17 +1191,10 @@ async def list_oauth_configs(
 async def create_oauth_config(
     tenant_slug: str,
     config_data: OAuthConfigCreate,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Create or update OAuth configuration for a tenant."""
-    # Verify tenant exists
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Validate provider
     if config_data.provider not in OAUTH_PROVIDERS:
         raise HTTPException(
@@ -1285,17 +1243,10 @@ async def create_oauth_config(
 async def delete_oauth_config(
     tenant_slug: str,
     provider: str,
+    tenant: TenantInfo = Depends(get_tenant_info),
     session: AsyncSession = Depends(get_db_session)
 ):
     """Delete OAuth configuration for a tenant and provider."""
-    # Verify tenant exists
-    tenant_result = await session.execute(
-        select(Tenant).where(Tenant.slug == tenant_slug)
-    )
-    tenant = tenant_result.scalar_one_or_none()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Find and delete configuration
     config_result = await session.execute(
         select(OAuthConfig).where(
@@ -0,0 +1,86 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+A page is the first ``limit`` rows after the cursor in a fixed sort order
+whose last key is unique (the primary key), so pages never skip or repeat
+rows and each page is an index range scan no matter how deep it is.
+
+The cursor is the sort key of the last row returned, encoded as URL-safe
+base64 JSON. It is opaque to clients. List bodies stay plain JSON arrays,
+and the cursor for the next page is sent in the ``X-Next-Cursor`` response
+header. The header is absent on the last page.
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, bindparam, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a row's sort key as an opaque cursor."""
+    plain = [str(v) if isinstance(v, uuid.UUID) else v.isoformat() if isinstance(v, datetime) else v
+             for v in values]
+    return base64.urlsafe_b64encode(json.dumps(plain, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """Decode a cursor into values typed for *columns*; raises 400 if it is malformed."""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(columns):
+            raise ValueError("wrong number of keys")
+        values = []
+        for value, column in zip(raw, columns):
+            python_type = column.type.python_type
+            if python_type is uuid.UUID:
+                value = uuid.UUID(value)
+            elif python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif type(value) is not python_type:
+                raise ValueError(f"expected {python_type.__name__}")
+            values.append(value)
+        return values
+    except (ValueError, TypeError, AttributeError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(
+    query: Select,
+    columns: Sequence[Any],
+    cursor: Optional[str],
+    limit: Optional[int],
+    descending: bool = False,
+) -> Select:
+    """Order *query* by *columns* and restrict it to the page after *cursor*.
+
+    One extra row is fetched so ``finish_page`` can tell whether another
+    page follows. Without a limit the whole remainder is returned.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        row = tuple_(*columns)
+        after = tuple_(*(bindparam(None, v, type_=c.type) for v, c in zip(values, columns)))
+        query = query.where(row < after if descending else row > after)
+    query = query.order_by(*(c.desc() if descending else c.asc() for c in columns))
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+def finish_page(
+    rows: Sequence[Any], columns: Sequence[Any], limit: Optional[int], response: Response
+) -> List[Any]:
+    """Drop the look-ahead row and, if there was one, set the next-page header."""
+    rows = list(rows)
+    if limit is None or len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(rows[-1], c.key) for c in columns])
+    return rows
@@ -4,7 +4,7 @@ import logging
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Depends
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Depends, Response
 from pydantic import BaseModel, Field
 from sqlalchemy import select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,6 +14,7 @@ from ..models.api_key import APIKeyScope
 from ..models.mcp_server_registry import MCPServerRegistry, DiscoveryJob, SourceType, RuntimeType
 from ..discovery.manager import discovery_manager
 from ..security.auth import require_scope
+from .pagination import finish_page, keyset_page
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +94,14 @@ class RegistryStatsResponse(BaseModel):
     verified_count: int
 
 
+# Sort key of the server list, backed by ix_mcp_server_registry_popularity
+_POPULARITY_ORDER = (
+    MCPServerRegistry.star_count,
+    MCPServerRegistry.download_count,
+    MCPServerRegistry.id,
+)
+
+
 # API Endpoints
 @router.get(
     "/servers",
@@ -100,25 +109,32 @@ class RegistryStatsResponse(BaseModel):
     dependencies=[Depends(require_scope(APIKeyScope.TENANT_USER))],
 )
 async def list_registry_servers(
+    response: Response,
     search: Optional[str] = Query(None, description="Search in name/description"),
     runtime_type: Optional[str] = Query(None, description="Filter by runtime"),
     source_type: Optional[str] = Query(None, description="Filter by source"),
     requires_oauth: Optional[bool] = Query(None, description="Filter by OAuth requirement"),
     verified_only: bool = Query(False, description="Show only verified servers"),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Use cursor instead"),
     db: AsyncSession = Depends(get_db_session)
 ):
     """List MCP servers in the registry with filtering and pagination.
 
+    Servers come in popularity order (stars, then downloads, then id). The
+    cursor for the next page is returned in the X-Next-Cursor header.
+
     Args:
+        response: Response, for the next-page header
         search: Search query for name/description
         runtime_type: Filter by runtime (nodejs, python, go, rust, binary)
         source_type: Filter by source (npm, github, custom, manual)
         requires_oauth: Filter by OAuth requirement
         verified_only: Show only verified servers
         limit: Maximum results
-        offset: Pagination offset
+        cursor: Opaque cursor from the previous page's X-Next-Cursor header
+        offset: Deprecated offset pagination, ignored when a cursor is given
         db: Database session
 
     Returns:
@@ -159,17 +175,13 @@ async def list_registry_servers(
         # Filter out deprecated servers by default
         query = query.where(MCPServerRegistry.is_deprecated.is_(False))
 
-        # Order by popularity (star count, then download count)
-        query = query.order_by(
-            MCPServerRegistry.star_count.desc(),
-            MCPServerRegistry.download_count.desc()
-        )
-
-        # Apply pagination
-        query = query.limit(limit).offset(offset)
+        # Order by popularity; the id tiebreak keeps pages stable
+        query = keyset_page(query, _POPULARITY_ORDER, cursor, limit, descending=True)
+        if offset and not cursor:
+            query = query.offset(offset)
 
         result = await db.execute(query)
-        servers = result.scalars().all()
+        servers = finish_page(result.scalars().all(), _POPULARITY_ORDER, limit, response)
 
         return [
             ServerRegistryResponse(
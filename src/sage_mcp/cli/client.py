@@ -23,6 +23,9 @@ class APIError(Exception):
 class SageMCPClient:
     """HTTP client for SageMCP API."""
 
+    # Items per request to paginated list endpoints (the server maximum)
+    PAGE_SIZE = 500
+
     def __init__(self, config: ProfileConfig):
         """Initialize API client.
 
@@ -72,14 +75,35 @@ class SageMCPClient:
         except Exception as e:
             raise APIError(f"Request failed: {e}")
 
-    # Tenant operations
-    def list_tenants(self) -> List[Dict[str, Any]]:
-        """List all tenants."""
+    def _get_pages(self, url: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """GET a list endpoint page by page, following X-Next-Cursor.
+
+        Args:
+            url: List endpoint URL
+            limit: Stop after this many items (all items if None)
+
+        Returns:
+            Items from all pages fetched
+        """
+        items: List[Dict[str, Any]] = []
+        cursor: Optional[str] = None
         with httpx.Client(timeout=self.timeout) as client:
-            response = client.get(
-                f"{self.base_url}/api/v1/admin/tenants", headers=self._get_headers()
-            )
-            return self._handle_response(response)
+            while True:
+                params: Dict[str, Any] = {
+                    "limit": min(self.PAGE_SIZE, limit - len(items)) if limit else self.PAGE_SIZE
+                }
+                if cursor:
+                    params["cursor"] = cursor
+                response = client.get(url, headers=self._get_headers(), params=params)
+                items.extend(self._handle_response(response))
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor or (limit and len(items) >= limit):
+                    return items
+
+    # Tenant operations
+    def list_tenants(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List tenants by slug (all tenants if limit is None)."""
+        return self._get_pages(f"{self.base_url}/api/v1/admin/tenants", limit)
 
     def get_tenant(self, tenant_slug: str) -> Dict[str, Any]:
         """Get tenant details."""
@@ -150,14 +174,9 @@ class SageMCPClient:
             return self._handle_response(response)
 
     # Connector operations
-    def list_connectors(self, tenant_slug: str) -> List[Dict[str, Any]]:
-        """List connectors for a tenant."""
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.get(
-                f"{self.base_url}/api/v1/admin/tenants/{tenant_slug}/connectors",
-                headers=self._get_headers(),
-            )
-            return self._handle_response(response)
+    def list_connectors(self, tenant_slug: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List connectors for a tenant by name (all connectors if limit is None)."""
+        return self._get_pages(f"{self.base_url}/api/v1/admin/tenants/{tenant_slug}/connectors", limit)
 
     def get_connector(self, tenant_slug: str, connector_id: str) -> Dict[str, Any]:
         """Get connector details."""
@@ -35,11 +35,12 @@ def list_connectors(
     tenant_slug: str = typer.Argument(..., help="Tenant slug"),
     profile: Optional[str] = typer.Option(None, help="Profile to use"),
     format: str = typer.Option("table", help="Output format (table, json, yaml)"),
+    limit: Optional[int] = typer.Option(None, min=1, help="Show at most this many"),
 ) -> None:
     """List connectors for a tenant."""
     try:
         client = get_client(profile)
-        connectors = client.list_connectors(tenant_slug)
+        connectors = client.list_connectors(tenant_slug, limit=limit)
 
         if format == "table":
             output_table_connectors(connectors, tenant_slug)
@@ -0,0 +1,73 @@
+"""Database schema commands.
+
+Unlike the other command groups these talk to the database directly, using
+the server's settings (DATABASE_URL, SECRET_KEY, ...), so they run from a
+deploy job or a server container rather than through the API.
+"""
+
+import asyncio
+import sys
+
+import typer
+from rich.console import Console
+
+from sage_mcp.cli.utils.output import print_error, print_info, print_success
+
+app = typer.Typer(help="Database schema commands (run against DATABASE_URL)")
+
+console = Console()
+
+
+async def _migrate():
+    from sage_mcp.database.connection import db_manager
+    from sage_mcp.database.migrations import run_migrations
+
+    try:
+        return await run_migrations()
+    finally:
+        await db_manager.close()
+
+
+async def _status():
+    from sage_mcp.database.connection import db_manager
+    from sage_mcp.database.migrations import applied_versions
+
+    try:
+        return await applied_versions()
+    finally:
+        await db_manager.close()
+
+
+@app.command("migrate")
+def migrate() -> None:
+    """Apply pending schema migrations."""
+    try:
+        applied = asyncio.run(_migrate())
+    except Exception as e:
+        print_error(f"Migration failed: {e}")
+        sys.exit(1)
+
+    if applied:
+        print_success(f"Applied migrations {', '.join(str(v) for v in applied)}")
+    else:
+        print_info("Database schema is up to date")
+
+
+@app.command("status")
+def status() -> None:
+    """Show applied and pending schema migrations."""
+    from sage_mcp.database.migrations import pending_migrations
+
+    try:
+        applied = asyncio.run(_status())
+    except Exception as e:
+        print_error(f"Failed to read schema version: {e}")
+        sys.exit(1)
+
+    pending = pending_migrations(applied)
+    console.print(f"Applied: {len(applied or ())}")
+    if not pending:
+        print_info("Database schema is up to date")
+        return
+    for version, step in pending:
+        console.print(f"  pending  {version:>3}  {step.__name__}")
@@ -33,11 +33,12 @@ def get_client(profile: Optional[str] = None) -> SageMCPClient:
 def list_tenants(
     profile: Optional[str] = typer.Option(None, help="Profile to use"),
     format: str = typer.Option("table", help="Output format (table, json, yaml)"),
+    limit: Optional[int] = typer.Option(None, min=1, help="Show at most this many"),
 ) -> None:
     """List all tenants."""
     try:
         client = get_client(profile)
-        tenants = client.list_tenants()
+        tenants = client.list_tenants(limit=limit)
 
         if format == "table":
             output_table_tenants(tenants)
@@ -7,7 +7,7 @@ from rich.console import Console
 
 from sage_mcp.cli import __version__
 from sage_mcp.cli.client import SageMCPClient
-from sage_mcp.cli.commands import config_cmd, connector, mcp, oauth, tenant
+from sage_mcp.cli.commands import config_cmd, connector, db, mcp, oauth, tenant
 from sage_mcp.cli.config import config_manager
 from sage_mcp.cli.utils.output import print_error, print_info
 
@@ -26,6 +26,7 @@ app.add_typer(tenant.app, name="tenant")
 app.add_typer(connector.app, name="connector")
 app.add_typer(oauth.app, name="oauth")
 app.add_typer(mcp.app, name="mcp")
+app.add_typer(db.app, name="db")
 
 
 @app.command()
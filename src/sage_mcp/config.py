@@ -2,7 +2,7 @@
 
 import os
 from functools import lru_cache
-from typing import List, Optional, Union, Literal
+from typing import Dict, List, Optional, Union, Literal
 
 from pydantic import Field, field_validator, ConfigDict
 from pydantic_settings import BaseSettings
@@ -38,6 +38,45 @@ class Settings(BaseSettings):
         env="DATABASE_URL"
     )
 
+    database_read_url: Optional[str] = Field(
+        default=None,
+        env="DATABASE_READ_URL",
+        description="Optional read replica for hot-path reads (MCP server loads, credential lookups)",
+    )
+
+    # Database connection pools (database/connection.py)
+    db_pool_size: int = Field(default=10, env="DB_POOL_SIZE", description="Persistent connections per engine")
+    db_max_overflow: int = Field(
+        default=20, env="DB_MAX_OVERFLOW", description="Extra connections allowed above DB_POOL_SIZE under load"
+    )
+    db_pool_timeout: float = Field(
+        default=10.0, env="DB_POOL_TIMEOUT", description="Seconds to wait for a free connection before failing"
+    )
+    db_pool_recycle: int = Field(
+        default=1800, env="DB_POOL_RECYCLE", description="Replace connections older than this many seconds; -1 disables"
+    )
+    db_pool_pre_ping: bool = Field(
+        default=True, env="DB_POOL_PRE_PING", description="Check connections for liveness on checkout"
+    )
+    db_background_pool_size: int = Field(
+        default=5,
+        env="DB_BACKGROUND_POOL_SIZE",
+        description="Connections of the separate engine used by background jobs; 0 shares the primary pool",
+    )
+    db_background_max_overflow: int = Field(
+        default=5, env="DB_BACKGROUND_MAX_OVERFLOW", description="Overflow of the background engine"
+    )
+    db_prepared_statement_cache_size: int = Field(
+        default=100,
+        env="DB_PREPARED_STATEMENT_CACHE_SIZE",
+        description="Prepared statements cached per asyncpg connection (0 disables)",
+    )
+    migrate_on_startup: bool = Field(
+        default=True,
+        env="MIGRATE_ON_STARTUP",
+        description="Apply pending schema migrations at startup; disable when `sagemcp db migrate` runs before deploys",
+    )
+
     # Supabase specific configuration
     supabase_url: Optional[str] = Field(default=None, env="SUPABASE_URL")
     supabase_anon_key: Optional[str] = Field(default=None, env="SUPABASE_ANON_KEY")
@@ -46,6 +85,16 @@ class Settings(BaseSettings):
 
     # Security
     secret_key: str = Field(env="SECRET_KEY")
+    secret_key_previous: Optional[str] = Field(
+        default=None,
+        env="SECRET_KEY_PREVIOUS",
+        description="Comma-separated retired SECRET_KEY values still accepted for decryption",
+    )
+    encryption_cache_size: int = Field(
+        default=4096,
+        env="ENCRYPTION_CACHE_SIZE",
+        description="Decrypted column values kept in memory, keyed by ciphertext digest (0 disables)",
+    )
     access_token_expire_minutes: int = Field(
         default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES"
     )
@@ -151,6 +200,216 @@ class Settings(BaseSettings):
         description="Comma-separated list of allowed origins for MCP requests",
     )
 
+    # External MCP server bridge (stdio and Streamable HTTP) configuration
+    external_mcp_request_timeouts: Optional[str] = Field(
+        default=None,
+        env="EXTERNAL_MCP_REQUEST_TIMEOUTS",
+        description=(
+            "Comma-separated per-method timeout overrides in seconds, e.g. "
+            "'tools/call=120,tools/list=10'. Unlisted methods use MCP_SERVER_TIMEOUT."
+        ),
+    )
+    external_mcp_max_in_flight: int = Field(
+        default=32,
+        env="EXTERNAL_MCP_MAX_IN_FLIGHT",
+        description="Maximum concurrent requests in flight to one external MCP process",
+    )
+    external_mcp_http_notifications: bool = Field(
+        default=False,
+        env="EXTERNAL_MCP_HTTP_NOTIFICATIONS",
+        description=(
+            "Keep a GET event stream open to each external_http MCP server for "
+            "list_changed notifications (holds one pooled HTTP connection each)"
+        ),
+    )
+    external_mcp_cpu_limit_millicores: Optional[int] = Field(
+        default=None,
+        env="EXTERNAL_MCP_CPU_LIMIT_MILLICORES",
+        description="Default CPU limit for external MCP processes (1000 = one core)",
+    )
+    external_mcp_memory_limit_mb: Optional[int] = Field(
+        default=None,
+        env="EXTERNAL_MCP_MEMORY_LIMIT_MB",
+        description="Default memory limit for external MCP processes in MB",
+    )
+    external_mcp_cgroup_root: Optional[str] = Field(
+        default=None,
+        env="EXTERNAL_MCP_CGROUP_ROOT",
+        description=(
+            "Writable cgroup v2 directory delegated to SageMCP. Each external process "
+            "gets a child cgroup here; without it limits fall back to setrlimit/nice."
+        ),
+    )
+
+    # Upstream HTTP connection pools (connectors/http_client.py)
+    http_pool_max_connections_per_host: int = Field(
+        default=50,
+        env="HTTP_POOL_MAX_CONNECTIONS_PER_HOST",
+        description="Maximum concurrent connections to one upstream host",
+    )
+    http_pool_max_keepalive_per_host: int = Field(
+        default=20,
+        env="HTTP_POOL_MAX_KEEPALIVE_PER_HOST",
+        description="Idle keep-alive connections retained per upstream host",
+    )
+    http_pool_keepalive_expiry: float = Field(
+        default=60.0,
+        env="HTTP_POOL_KEEPALIVE_EXPIRY",
+        description="Seconds an idle upstream connection is kept open",
+    )
+    http_pool_host_limits: Optional[str] = Field(
+        default=None,
+        env="HTTP_POOL_HOST_LIMITS",
+        description=(
+            "Comma-separated per-host connection limits, e.g. "
+            "'slack.com=20,api.github.com=100'. Matches the host or any subdomain."
+        ),
+    )
+    http_pool_max_hosts: int = Field(
+        default=100,
+        env="HTTP_POOL_MAX_HOSTS",
+        description="Upstream host pools kept open; beyond it the least recently used idle pool is closed",
+    )
+    http2_hosts: str = Field(
+        default="googleapis.com,graph.microsoft.com,api.github.com",
+        env="HTTP2_HOSTS",
+        description="Comma-separated hosts (and their subdomains) to reach over HTTP/2",
+    )
+
+    # Client-side pacing from provider quota headers (connectors/quota.py)
+    upstream_rate_limit_enabled: bool = Field(
+        default=True,
+        env="UPSTREAM_RATE_LIMIT_ENABLED",
+        description="Pace upstream requests from X-RateLimit-*/Retry-After headers",
+    )
+    upstream_rate_limit_burst: int = Field(
+        default=10,
+        env="UPSTREAM_RATE_LIMIT_BURST",
+        description="Requests per credential released at once while quota is being paced",
+    )
+    upstream_rate_limit_low_water: float = Field(
+        default=0.1,
+        env="UPSTREAM_RATE_LIMIT_LOW_WATER",
+        description="Start pacing once remaining quota drops below this fraction of the window's limit",
+    )
+    upstream_rate_limit_max_wait: float = Field(
+        default=30.0,
+        env="UPSTREAM_RATE_LIMIT_MAX_WAIT",
+        description="Fail with a rate-limit error instead of waiting longer than this (seconds)",
+    )
+
+    # Single-flight coalescing of identical upstream GETs (connectors/coalesce.py)
+    upstream_coalesce_gets: bool = Field(
+        default=False,
+        env="UPSTREAM_COALESCE_GETS",
+        description="Share one upstream call among identical concurrent GET requests",
+    )
+
+    # ETag / Last-Modified cache for upstream GETs (connectors/response_cache.py)
+    upstream_response_cache_enabled: bool = Field(
+        default=True,
+        env="UPSTREAM_RESPONSE_CACHE_ENABLED",
+        description="Revalidate repeated upstream GETs with If-None-Match and reuse bodies on 304",
+    )
+    upstream_response_cache_max_bytes: int = Field(
+        default=32 * 1024 * 1024,
+        env="UPSTREAM_RESPONSE_CACHE_MAX_BYTES",
+        description="Total response body bytes kept in the conditional-request cache",
+    )
+    upstream_response_cache_ttls: Optional[str] = Field(
+        default=None,
+        env="UPSTREAM_RESPONSE_CACHE_TTLS",
+        description=(
+            "Comma-separated host/path globs served from cache without revalidation, "
+            "e.g. 'api.github.com/user=30,api.github.com/user/orgs=300'"
+        ),
+    )
+
+    # Implicit Graph/Google batching of concurrent single GETs (connectors/batch.py)
+    upstream_batch_window_ms: int = Field(
+        default=0,
+        env="UPSTREAM_BATCH_WINDOW_MS",
+        description="Merge single message GETs issued within this window into one batch call; 0 disables",
+    )
+
+    # GraphQL query merging (connectors/graphql.py)
+    graphql_batch_window_ms: int = Field(
+        default=0,
+        env="GRAPHQL_BATCH_WINDOW_MS",
+        description="Merge GraphQL queries issued concurrently within this window into one aliased document; 0 disables",
+    )
+    graphql_batch_max_queries: int = Field(
+        default=10,
+        env="GRAPHQL_BATCH_MAX_QUERIES",
+        description="Most queries merged into one GraphQL document",
+    )
+
+    # Proactive OAuth token refresh (security/oauth_refresh.py)
+    oauth_refresh_enabled: bool = Field(
+        default=True,
+        env="OAUTH_REFRESH_ENABLED",
+        description="Refresh OAuth access tokens with their refresh token before they expire",
+    )
+    oauth_refresh_lead_seconds: int = Field(
+        default=300,
+        env="OAUTH_REFRESH_LEAD_SECONDS",
+        description="Refresh tokens that expire within this many seconds",
+    )
+    oauth_refresh_interval_seconds: int = Field(
+        default=60,
+        env="OAUTH_REFRESH_INTERVAL_SECONDS",
+        description="How often the background loop looks for tokens to refresh",
+    )
+    oauth_refresh_batch_size: int = Field(
+        default=50,
+        env="OAUTH_REFRESH_BATCH_SIZE",
+        description="Most credentials refreshed per background pass",
+    )
+
+    # Provider metadata cache (connectors/provider_metadata.py)
+    provider_metadata_ttl_seconds: int = Field(
+        default=3600,
+        env="PROVIDER_METADATA_TTL_SECONDS",
+        description="How long per-account provider lookups (Atlassian cloud id) are cached; 0 disables",
+    )
+    provider_metadata_max_entries: int = Field(
+        default=1024,
+        env="PROVIDER_METADATA_MAX_ENTRIES",
+        description="Most accounts kept in the provider metadata cache",
+    )
+
+    # Upstream circuit breakers (connectors/circuit_breaker.py)
+    circuit_breaker_enabled: bool = Field(
+        default=True,
+        env="CIRCUIT_BREAKER_ENABLED",
+        description="Fail fast while an upstream host keeps returning 5xx or timing out",
+    )
+    circuit_breaker_per_credential: bool = Field(
+        default=False,
+        env="CIRCUIT_BREAKER_PER_CREDENTIAL",
+        description="Keep a breaker per host and credential instead of per host",
+    )
+    circuit_breaker_failure_rate: float = Field(
+        default=0.5,
+        env="CIRCUIT_BREAKER_FAILURE_RATE",
+        description="Failure ratio within the window that opens the breaker",
+    )
+    circuit_breaker_min_requests: int = Field(
+        default=10,
+        env="CIRCUIT_BREAKER_MIN_REQUESTS",
+        description="Requests needed in the window before the failure rate is judged",
+    )
+    circuit_breaker_window_seconds: float = Field(
+        default=30.0,
+        env="CIRCUIT_BREAKER_WINDOW_SECONDS",
+        description="Sliding window over which the failure rate is measured",
+    )
+    circuit_breaker_open_seconds: float = Field(
+        default=30.0,
+        env="CIRCUIT_BREAKER_OPEN_SECONDS",
+        description="How long an open breaker fails fast before probing the host",
+    )
+
     # Image Registry Configuration
     image_registry: Optional[str] = Field(
         default="localhost:5000", env="IMAGE_REGISTRY"
@@ -174,12 +433,42 @@ class Settings(BaseSettings):
         env="RATE_LIMIT_RPM",
         description="Default requests per minute per tenant",
     )
+    # Tool usage aggregation
+    usage_flush_interval_seconds: float = Field(
+        default=60.0,
+        env="USAGE_FLUSH_INTERVAL_SECONDS",
+        description="How often per-tenant tool usage counts are written to the database",
+    )
+    usage_max_pending_keys: int = Field(
+        default=50000,
+        env="USAGE_MAX_PENDING_KEYS",
+        description="Distinct (day, tenant, connector, tool) counts held in memory before flushing early",
+    )
+    usage_max_pending_keys_per_tenant: int = Field(
+        default=2000,
+        env="USAGE_MAX_PENDING_KEYS_PER_TENANT",
+        description="Distinct usage counts one tenant may hold between flushes; further tools count as _other",
+    )
+    # Tenant lookup cache
+    tenant_cache_ttl_seconds: float = Field(
+        default=60.0,
+        env="TENANT_CACHE_TTL_SECONDS",
+        description="How long tenant slug lookups are cached (0 disables)",
+    )
+    tenant_cache_max_entries: int = Field(
+        default=10000, env="TENANT_CACHE_MAX_ENTRIES", description="Tenant slugs kept in the lookup cache"
+    )
 
     # Feature Flags
     enable_server_pool: bool = Field(default=False, env="SAGEMCP_ENABLE_SERVER_POOL")
     enable_session_management: bool = Field(default=False, env="SAGEMCP_ENABLE_SESSION_MANAGEMENT")
     enable_metrics: bool = Field(default=False, env="SAGEMCP_ENABLE_METRICS")
     enable_auth: bool = Field(default=False, env="SAGEMCP_ENABLE_AUTH")
+    auth_bcrypt_workers: int = Field(
+        default=4,
+        env="AUTH_BCRYPT_WORKERS",
+        description="Threads checking API keys without a verifier against their bcrypt hash",
+    )
 
     # Auth bootstrap
     bootstrap_admin_key: Optional[str] = Field(default=None, env="SAGEMCP_BOOTSTRAP_ADMIN_KEY")
@@ -243,6 +532,57 @@ class Settings(BaseSettings):
             return [o.strip() for o in self.mcp_allowed_origins.split(",") if o.strip()]
         return None
 
+    def get_http_pool_host_limits(self) -> Dict[str, int]:
+        """Parse per-host upstream connection limits from config."""
+        limits: Dict[str, int] = {}
+        if not self.http_pool_host_limits:
+            return limits
+        for entry in self.http_pool_host_limits.split(","):
+            host, sep, value = entry.partition("=")
+            if not sep or not host.strip():
+                continue
+            try:
+                limits[host.strip().lower()] = int(value)
+            except ValueError:
+                continue
+        return limits
+
+    def get_upstream_response_cache_ttls(self) -> Dict[str, float]:
+        """Parse freshness lifetimes for cached upstream GETs from config."""
+        ttls: Dict[str, float] = {}
+        if not self.upstream_response_cache_ttls:
+            return ttls
+        for entry in self.upstream_response_cache_ttls.split(","):
+            pattern, sep, seconds = entry.partition("=")
+            if not sep or not pattern.strip():
+                continue
+            try:
+                ttl = float(seconds)
+            except ValueError:
+                continue
+            if ttl > 0:
+                ttls[pattern.strip().lower()] = ttl
+        return ttls
+
+    def get_http2_hosts(self) -> List[str]:
+        """Get hosts that should be reached over HTTP/2."""
+        return [host.strip().lower() for host in self.http2_hosts.split(",") if host.strip()]
+
+    def get_external_mcp_request_timeouts(self) -> Dict[str, float]:
+        """Parse per-method external MCP request timeouts from config."""
+        timeouts: Dict[str, float] = {}
+        if not self.external_mcp_request_timeouts:
+            return timeouts
+        for entry in self.external_mcp_request_timeouts.split(","):
+            method, sep, value = entry.partition("=")
+            if not sep or not method.strip():
+                continue
+            try:
+                timeouts[method.strip()] = float(value)
+            except ValueError:
+                continue
+        return timeouts
+
 
 @lru_cache()
 def get_settings() -> Settings:
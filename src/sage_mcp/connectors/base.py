@@ -4,6 +4,7 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Protocol
 
+import httpx
 from mcp import types
 
 from ..models.connector import Connector
@@ -155,9 +156,18 @@ class BaseConnector(ABC):
         """Make an authenticated HTTP request using OAuth credentials.
 
         Uses a shared HTTP client with connection pooling for better performance.
-        Automatically retries on transient failures (429, 5xx, connection errors).
+        Requests are paced per (provider, credential) from the provider's
+        quota headers, fail fast while the host's circuit breaker is open,
+        and are automatically retried on transient failures (429, 5xx,
+        connection errors). GETs are revalidated against cached ETags, and
+        with UPSTREAM_COALESCE_GETS identical concurrent GETs share one
+        upstream call.
         """
+        from .circuit_breaker import send_guarded
+        from .coalesce import send_coalesced
         from .http_client import get_http_client
+        from .quota import send_paced
+        from .response_cache import is_not_modified, send_conditional
         from .retry import retry_with_backoff
 
         if not self.validate_oauth_credential(oauth_cred):
@@ -169,11 +179,32 @@ class BaseConnector(ABC):
 
         async def _do_request():
             client = get_http_client()
-            response = await client.request(method, url, **kwargs)
-            response.raise_for_status()
+            response = await send_guarded(
+                httpx.URL(url).host,
+                oauth_cred.access_token,
+                lambda: send_paced(
+                    oauth_cred.provider,
+                    oauth_cred.access_token,
+                    lambda: client.request(method, url, **kwargs),
+                ),
+            )
+            if not is_not_modified(response):
+                response.raise_for_status()
             return response
 
-        return await retry_with_backoff(_do_request)
+        return await send_coalesced(
+            oauth_cred.access_token,
+            method,
+            url,
+            kwargs,
+            lambda: send_conditional(
+                oauth_cred.access_token,
+                method,
+                url,
+                kwargs,
+                lambda: retry_with_backoff(_do_request),
+            ),
+        )
 
 
 class ApiKeyBaseConnector(BaseConnector):
@@ -214,7 +245,11 @@ class ApiKeyBaseConnector(BaseConnector):
         Returns:
             httpx.Response with status already checked.
         """
+        from .circuit_breaker import send_guarded
+        from .coalesce import send_coalesced
         from .http_client import get_http_client
+        from .quota import send_paced
+        from .response_cache import is_not_modified, send_conditional
         from .retry import retry_with_backoff
 
         api_key = self._get_api_key(connector)
@@ -230,8 +265,22 @@ class ApiKeyBaseConnector(BaseConnector):
 
         async def _do_request():
             client = get_http_client()
-            response = await client.request(method, url, **kwargs)
-            response.raise_for_status()
+            host = httpx.URL(url).host
+            response = await send_guarded(
+                host,
+                api_key,
+                lambda: send_paced(host, api_key, lambda: client.request(method, url, **kwargs)),
+            )
+            if not is_not_modified(response):
+                response.raise_for_status()
             return response
 
-        return await retry_with_backoff(_do_request)
+        return await send_coalesced(
+            api_key,
+            method,
+            url,
+            kwargs,
+            lambda: send_conditional(
+                api_key, method, url, kwargs, lambda: retry_with_backoff(_do_request)
+            ),
+        )
@@ -0,0 +1,341 @@
+"""Upstream batch APIs: Microsoft Graph JSON $batch and Google multipart batch.
+
+Fetching N objects one request at a time costs N round-trips. Both
+providers accept many sub-requests in one HTTP call: Graph up to 20 per
+`$batch`, Google up to 100 per multipart/mixed batch. The helpers here
+chunk a list of sub-requests, send the chunks concurrently through the
+connector's normal authenticated request path (pacing, circuit breaker,
+retries) and return one `httpx.Response` per sub-request, in order.
+
+Sub-responses are not raised automatically; bulk tools usually want to
+report per-item errors. Use `raise_for_sub_response` to get the same
+exceptions a single request would raise.
+
+With UPSTREAM_BATCH_WINDOW_MS > 0, `request_batched` also merges single
+GETs issued by concurrent tool calls within that window into one batch.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from .exceptions import (
+    ConnectorAPIError,
+    ConnectorAuthError,
+    ConnectorNotFoundError,
+    ConnectorRateLimitError,
+)
+
+logger = logging.getLogger(__name__)
+
+GRAPH_BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+GRAPH_BATCH_LIMIT = 20
+GOOGLE_BATCH_LIMIT = 100
+
+# Google batch endpoints per API (https://developers.google.com/gmail/api/guides/batch)
+GMAIL_BATCH_URL = "https://gmail.googleapis.com/batch/gmail/v1"
+
+
+@dataclass
+class SubRequest:
+    """One request inside a batch; `url` is absolute."""
+
+    method: str
+    url: str
+    params: Optional[Dict[str, Any]] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    json_body: Optional[Any] = None
+
+    def full_url(self) -> httpx.URL:
+        return httpx.URL(self.url, params=self.params) if self.params else httpx.URL(self.url)
+
+    def relative_url(self) -> str:
+        parts = urlsplit(str(self.full_url()))
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+# Transport headers of a sub-response that do not describe the decoded body.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _body_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS}
+
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def raise_for_sub_response(response: httpx.Response):
+    """Raise the connector exception a standalone request would have raised."""
+    status = response.status_code
+    if status < 400:
+        return
+    if status in (401, 403):
+        raise ConnectorAuthError(f"Authentication failed: HTTP {status}")
+    if status == 404:
+        raise ConnectorNotFoundError("Not found: HTTP 404")
+    if status == 429:
+        raise ConnectorRateLimitError("Rate limited: HTTP 429")
+    raise ConnectorAPIError(
+        f"API error: HTTP {status}", status_code=status, response_body=response.text[:500]
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Microsoft Graph $batch
+# --------------------------------------------------------------------------- #
+
+async def graph_batch(connector: Any, oauth_cred: Any, requests: List[SubRequest]) -> List[httpx.Response]:
+    """Send sub-requests to Microsoft Graph in $batch calls of up to 20."""
+    async def send_chunk(chunk: List[SubRequest]) -> List[httpx.Response]:
+        payload = {"requests": []}
+        for index, sub in enumerate(chunk):
+            entry: Dict[str, Any] = {
+                "id": str(index),
+                "method": sub.method,
+                # Graph expects URLs relative to the version root.
+                "url": sub.relative_url().split("/v1.0", 1)[-1],
+            }
+            headers = dict(sub.headers)
+            if sub.json_body is not None:
+                entry["body"] = sub.json_body
+                headers.setdefault("Content-Type", "application/json")
+            if headers:
+                entry["headers"] = headers
+            payload["requests"].append(entry)
+
+        response = await connector._make_authenticated_request(
+            "POST", GRAPH_BATCH_URL, oauth_cred, json=payload
+        )
+        by_id = {item["id"]: item for item in response.json().get("responses", [])}
+        results = []
+        for index, sub in enumerate(chunk):
+            item = by_id.get(str(index), {"status": 500, "body": {"error": "missing batch response"}})
+            body = item.get("body")
+            content = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+            results.append(httpx.Response(
+                item.get("status", 500),
+                headers=_body_headers(item.get("headers") or {"Content-Type": "application/json"}),
+                content=content,
+                request=httpx.Request(sub.method, sub.full_url()),
+            ))
+        return results
+
+    return await _send_chunks(requests, GRAPH_BATCH_LIMIT, send_chunk)
+
+
+# --------------------------------------------------------------------------- #
+# Google multipart batch
+# --------------------------------------------------------------------------- #
+
+def _encode_google_batch(chunk: List[SubRequest], boundary: str) -> bytes:
+    parts = []
+    for index, sub in enumerate(chunk):
+        lines = [f"{sub.method} {sub.relative_url()} HTTP/1.1"]
+        body = b""
+        headers = dict(sub.headers)
+        if sub.json_body is not None:
+            body = json.dumps(sub.json_body).encode()
+            headers.setdefault("Content-Type", "application/json")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        parts.append(
+            (
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item-{index}>\r\n\r\n"
+                + "\r\n".join(lines)
+                + "\r\n\r\n"
+            ).encode()
+            + body
+            + b"\r\n"
+        )
+    return b"".join(parts) + f"--{boundary}--\r\n".encode()
+
+
+def _parse_http_message(raw: bytes) -> Tuple[int, Dict[str, str], bytes]:
+    raw = raw.lstrip(b"\r\n")
+    separator = b"\r\n\r\n" if b"\r\n\r\n" in raw else b"\n\n"
+    head, _, body = raw.partition(separator)
+    status_line, *header_lines = head.decode("latin-1").splitlines()
+    status = int(status_line.split(" ", 2)[1])
+    headers = {}
+    for line in header_lines:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip()] = value.strip()
+    return status, headers, body.rstrip(b"\r\n")
+
+
+def _decode_google_batch(response: httpx.Response) -> Dict[int, Tuple[int, Dict[str, str], bytes]]:
+    content_type = response.headers.get("content-type", "")
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + response.content
+    )
+    results = {}
+    for part in message.iter_parts():
+        content_id = (part.get("Content-ID") or "").strip("<>")
+        index = content_id.rsplit("-", 1)[-1]
+        if not index.isdigit():
+            continue
+        results[int(index)] = _parse_http_message(part.get_payload(decode=True) or b"")
+    return results
+
+
+async def google_batch(
+    connector: Any, oauth_cred: Any, batch_url: str, requests: List[SubRequest]
+) -> List[httpx.Response]:
+    """Send sub-requests to a Google batch endpoint in calls of up to 100."""
+    async def send_chunk(chunk: List[SubRequest]) -> List[httpx.Response]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+        response = await connector._make_authenticated_request(
+            "POST",
+            batch_url,
+            oauth_cred,
+            content=_encode_google_batch(chunk, boundary),
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        parsed = _decode_google_batch(response)
+        results = []
+        for index, sub in enumerate(chunk):
+            status, headers, body = parsed.get(index, (500, {}, b'{"error": "missing batch response"}'))
+            results.append(httpx.Response(
+                status, headers=_body_headers(headers), content=body,
+                request=httpx.Request(sub.method, sub.full_url()),
+            ))
+        return results
+
+    return await _send_chunks(requests, GOOGLE_BATCH_LIMIT, send_chunk)
+
+
+async def _send_chunks(
+    requests: List[SubRequest],
+    limit: int,
+    send_chunk: Callable[[List[SubRequest]], Awaitable[List[httpx.Response]]],
+) -> List[httpx.Response]:
+    if not requests:
+        return []
+    chunk_results = await asyncio.gather(*(send_chunk(c) for c in _chunks(requests, limit)))
+    return [response for chunk in chunk_results for response in chunk]
+
+
+# --------------------------------------------------------------------------- #
+# Implicit batching of concurrent single requests
+# --------------------------------------------------------------------------- #
+
+class MicroBatcher:
+    """Collects items for a short window and sends them as one batch.
+
+    `send_batch` returns one result per item, in order. Also used by the
+    GraphQL client to merge concurrent queries.
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        limit: int,
+        window: float,
+        on_idle: Optional[Callable[[], None]] = None,
+    ):
+        self.send_batch = send_batch
+        self.limit = limit
+        self.window = window
+        self.on_idle = on_idle
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    def submit(self, request: Any) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+        if len(self._pending) >= self.limit:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._forget)
+
+    def _forget(self, task: asyncio.Task):
+        self._in_flight.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Batch send failed: %s", task.exception())
+        # Stay registered while any batch is in flight so its task stays referenced.
+        if not self._in_flight and not self._pending and self._timer is None and self.on_idle:
+            self.on_idle()
+
+    async def _send(self, batch: List[Tuple[Any, asyncio.Future]]):
+        try:
+            responses = await self.send_batch([request for request, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+
+
+_batchers: Dict[Tuple[str, str], MicroBatcher] = {}
+
+
+def _batch_window() -> float:
+    from ..config import get_settings
+
+    return get_settings().upstream_batch_window_ms / 1000.0
+
+
+async def request_batched(
+    connector: Any,
+    oauth_cred: Any,
+    batch_url: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> httpx.Response:
+    """GET one object, merged with concurrent GETs into a batch when enabled.
+
+    `batch_url` is GRAPH_BATCH_URL or a Google batch endpoint. Errors are
+    raised like `_make_authenticated_request`.
+    """
+    window = _batch_window()
+    if window <= 0:
+        return await connector._make_authenticated_request("GET", url, oauth_cred, params=params)
+
+    credential = hashlib.sha256(oauth_cred.access_token.encode("utf-8")).hexdigest()[:16]
+    key = (batch_url, credential)
+    batcher = _batchers.get(key)
+    if batcher is None:
+        if batch_url == GRAPH_BATCH_URL:
+            async def send(requests):
+                return await graph_batch(connector, oauth_cred, requests)
+            limit = GRAPH_BATCH_LIMIT
+        else:
+            async def send(requests):
+                return await google_batch(connector, oauth_cred, batch_url, requests)
+            limit = GOOGLE_BATCH_LIMIT
+        batcher = MicroBatcher(send, limit, window)
+        batcher.on_idle = lambda: _batchers.pop(key) if _batchers.get(key) is batcher else None
+        _batchers[key] = batcher
+
+    response = await batcher.submit(SubRequest("GET", url, params=params))
+    raise_for_sub_response(response)
+    return response
@@ -0,0 +1,263 @@
+"""Circuit breakers for upstream provider APIs.
+
+When a provider is degraded, every tool call would otherwise spend a minute
+or more in `retry_with_backoff` holding a worker and a pooled connection.
+A breaker per upstream host (optionally per host and credential) tracks the
+recent failure rate and, once it crosses the threshold, fails calls
+immediately with ConnectorAPIError until the open period has passed. Then a
+single probe request is let through (half-open): success closes the
+breaker, failure opens it again.
+
+Only signs of an unhealthy upstream count as failures: 5xx responses,
+connection errors and timeouts. 4xx responses, including 429, mean the
+provider is answering and are handled by retry/pacing instead.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from .exceptions import ConnectorAPIError
+from ..observability.metrics import (
+    adjust_circuit_breakers_open,
+    record_circuit_breaker_rejected,
+    record_circuit_breaker_transition,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+BreakerKey = Tuple[str, Optional[str]]
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker over a sliding time window."""
+
+    def __init__(
+        self,
+        host: str,
+        failure_rate: float = 0.5,
+        min_requests: int = 10,
+        window_seconds: float = 30.0,
+        open_seconds: float = 30.0,
+    ):
+        self.host = host
+        self.failure_rate = failure_rate
+        self.min_requests = max(1, min_requests)
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (time, failed)
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def _trim(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            _, failed = self._outcomes.popleft()
+            self._failures -= failed
+
+    def _transition(self, state: str, now: float):
+        was_tripped = self.state != CLOSED
+        self.state = state
+        if state == OPEN:
+            self.opened_at = now
+        elif state == CLOSED:
+            self.opened_at = None
+            self._outcomes.clear()
+            self._failures = 0
+        if was_tripped != (state != CLOSED):
+            adjust_circuit_breakers_open(self.host, 1 if state != CLOSED else -1)
+        record_circuit_breaker_transition(self.host, state)
+        logger.info("Circuit breaker for %s is now %s", self.host, state)
+
+    def retry_in(self, now: Optional[float] = None) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        if self.state != OPEN or self.opened_at is None:
+            return 0.0
+        if now is None:
+            now = time.monotonic()
+        return max(0.0, self.opened_at + self.open_seconds - now)
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """Whether a request may be sent now; claims the probe when half-open."""
+        if now is None:
+            now = time.monotonic()
+        if self.state == OPEN and self.retry_in(now) <= 0:
+            self._transition(HALF_OPEN, now)
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+        return self.state == CLOSED
+
+    def record(self, failed: bool, now: Optional[float] = None):
+        """Record the outcome of an allowed request."""
+        if now is None:
+            now = time.monotonic()
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+            self._transition(OPEN if failed else CLOSED, now)
+            return
+        if self.state != CLOSED:
+            return
+
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        self._trim(now)
+        total = len(self._outcomes)
+        if total >= self.min_requests and self._failures / total >= self.failure_rate:
+            self._transition(OPEN, now)
+
+    def release(self):
+        """Give back the half-open probe when the request never completed."""
+        self._probe_in_flight = False
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        if now is None:
+            now = time.monotonic()
+        self._trim(now)
+        total = len(self._outcomes)
+        return {
+            "host": self.host,
+            "state": self.state,
+            "requests": total,
+            "failure_rate": round(self._failures / total, 3) if total else 0.0,
+            "retry_in": round(self.retry_in(now), 1),
+        }
+
+
+class CircuitBreakerRegistry:
+    """Breakers keyed by upstream host, or by host and credential."""
+
+    def __init__(
+        self,
+        per_credential: bool = False,
+        failure_rate: float = 0.5,
+        min_requests: int = 10,
+        window_seconds: float = 30.0,
+        open_seconds: float = 30.0,
+        max_breakers: int = 10000,
+    ):
+        self.per_credential = per_credential
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.max_breakers = max_breakers
+        self._breakers: "OrderedDict[BreakerKey, CircuitBreaker]" = OrderedDict()
+
+    def make_key(self, host: str, credential: str = "") -> BreakerKey:
+        """Build a breaker key; the credential is hashed, never stored."""
+        if not self.per_credential:
+            return host, None
+        return host, hashlib.sha256(str(credential).encode("utf-8")).hexdigest()[:16]
+
+    def get(self, key: BreakerKey) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                key[0],
+                failure_rate=self.failure_rate,
+                min_requests=self.min_requests,
+                window_seconds=self.window_seconds,
+                open_seconds=self.open_seconds,
+            )
+            self._breakers[key] = breaker
+            while len(self._breakers) > self.max_breakers:
+                _, evicted = self._breakers.popitem(last=False)
+                if evicted.state != CLOSED:
+                    adjust_circuit_breakers_open(evicted.host, -1)
+        else:
+            self._breakers.move_to_end(key)
+        return breaker
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Summarize breaker states; only tripped breakers are listed."""
+        now = time.monotonic()
+        tripped: List[Dict[str, Any]] = []
+        counts = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+        for (_, credential), breaker in self._breakers.items():
+            if breaker.state == OPEN and breaker.retry_in(now) <= 0:
+                # Due for a probe; reported as half-open without claiming it.
+                state = HALF_OPEN
+            else:
+                state = breaker.state
+            counts[state] += 1
+            if state != CLOSED:
+                entry = breaker.snapshot(now)
+                entry["state"] = state
+                entry["credential"] = credential
+                tripped.append(entry)
+        return {"tracked": len(self._breakers), **counts, "tripped": tripped}
+
+
+_registry: Optional[CircuitBreakerRegistry] = None
+
+
+def get_circuit_breakers() -> Optional[CircuitBreakerRegistry]:
+    """Get the process-wide breaker registry, or None when disabled in Settings."""
+    global _registry
+    if _registry is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        if not settings.circuit_breaker_enabled:
+            return None
+        _registry = CircuitBreakerRegistry(
+            per_credential=settings.circuit_breaker_per_credential,
+            failure_rate=settings.circuit_breaker_failure_rate,
+            min_requests=settings.circuit_breaker_min_requests,
+            window_seconds=settings.circuit_breaker_window_seconds,
+            open_seconds=settings.circuit_breaker_open_seconds,
+        )
+    return _registry
+
+
+def _is_failure(response: Any) -> bool:
+    status = getattr(response, "status_code", None)
+    return isinstance(status, int) and status >= 500
+
+
+async def send_guarded(
+    host: str,
+    credential: str,
+    send: Callable[[], Awaitable[httpx.Response]],
+) -> httpx.Response:
+    """Send one upstream request through the host's circuit breaker.
+
+    Raises:
+        ConnectorAPIError: With status 503 when the breaker is open.
+    """
+    registry = get_circuit_breakers()
+    if registry is None:
+        return await send()
+
+    breaker = registry.get(registry.make_key(host, credential))
+    if not breaker.allow():
+        record_circuit_breaker_rejected(host)
+        retry_in = breaker.retry_in()
+        raise ConnectorAPIError(
+            f"{host} is failing; requests suspended for {retry_in:.0f}s (circuit open)",
+            status_code=503,
+        )
+
+    try:
+        response = await send()
+    except (httpx.TransportError, httpx.TimeoutException):
+        breaker.record(failed=True)
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record(failed=_is_failure(response))
+    return response
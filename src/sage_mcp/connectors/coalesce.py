@@ -0,0 +1,122 @@
+"""Single-flight coalescing of identical concurrent upstream GETs.
+
+Agents in one tenant often issue the same read at the same moment (the same
+repository, the same Jira issue). With UPSTREAM_COALESCE_GETS enabled, the
+first caller performs the request (including retries) and every identical
+GET that arrives while it is in flight waits for that result instead of
+making its own round-trip.
+
+Requests are identical when credential, method, URL, query parameters and
+extra headers all match, so responses are never shared across credentials
+or representations. Callers share the already-read response; each
+`response.json()` call parses its own copy, so one caller mutating the
+result cannot affect another.
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+import httpx
+
+from ..observability.metrics import record_upstream_coalesced
+
+logger = logging.getLogger(__name__)
+
+# Request bodies make a call non-idempotent for coalescing purposes.
+_BODY_KWARGS = ("content", "data", "files", "json")
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return str(value)
+
+
+def coalesce_key(
+    credential: str, method: str, url: str, kwargs: Mapping[str, Any]
+) -> Optional[Tuple[Hashable, ...]]:
+    """Build the single-flight key for a request, or None if it must not be shared."""
+    if method.upper() != "GET" or any(kwargs.get(name) is not None for name in _BODY_KWARGS):
+        return None
+    # Anything besides params/headers (timeouts, auth overrides) opts out.
+    if set(kwargs) - {"params", "headers"}:
+        return None
+    credential_id = hashlib.sha256(str(credential).encode("utf-8")).hexdigest()[:16]
+    headers = {
+        k.lower(): v
+        for k, v in (kwargs.get("headers") or {}).items()
+        if k.lower() != "authorization"
+    }
+    return (
+        credential_id,
+        str(httpx.URL(url)),
+        _freeze(kwargs.get("params") or {}),
+        _freeze(headers),
+    )
+
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers with the same key."""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], label: str = "") -> Any:
+        """Run `fn` unless an identical call is in flight, then share its result.
+
+        The call runs in its own task, so a caller that gives up does not
+        cancel it for the others.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            record_upstream_coalesced(label)
+        else:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Consume the exception so an abandoned flight is not logged as unretrieved.
+            task.exception()
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """Get the process-wide single-flight group, or None when disabled in Settings."""
+    global _single_flight
+    if _single_flight is None:
+        from ..config import get_settings
+
+        if not get_settings().upstream_coalesce_gets:
+            return None
+        _single_flight = SingleFlight()
+    return _single_flight
+
+
+async def send_coalesced(
+    credential: str,
+    method: str,
+    url: str,
+    kwargs: Mapping[str, Any],
+    send: Callable[[], Awaitable[httpx.Response]],
+) -> httpx.Response:
+    """Send a request, sharing the result with identical in-flight GETs."""
+    group = get_single_flight()
+    key = coalesce_key(credential, method, url, kwargs) if group is not None else None
+    if key is None:
+        return await send()
+    return await group.do(key, send, label=httpx.URL(url).host)
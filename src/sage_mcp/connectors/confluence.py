@@ -21,6 +21,7 @@ from mcp import types
 from ..models.connector import Connector, ConnectorType
 from ..models.oauth_credential import OAuthCredential
 from .base import BaseConnector
+from .provider_metadata import get_atlassian_cloud_id
 from .registry import register_connector
 
 
@@ -28,10 +29,6 @@ from .registry import register_connector
 class ConfluenceConnector(BaseConnector):
     """Confluence connector for accessing Confluence Cloud API."""
 
-    def __init__(self):
-        super().__init__()
-        self._cloud_id_cache: Dict[str, str] = {}  # Cache cloudId per OAuth token
-
     @property
     def display_name(self) -> str:
         return "Confluence"
@@ -45,41 +42,13 @@ class ConfluenceConnector(BaseConnector):
         return True
 
     async def _get_cloud_id(self, oauth_cred: OAuthCredential) -> str:
-        """Get Confluence Cloud ID for the authenticated user.
+        """Get the Confluence Cloud ID for the authenticated user.
 
-        The cloudId is required to construct Confluence API endpoints.
-        This uses the same Atlassian accessible-resources endpoint as Jira.
-        Cached per OAuth token to minimize API calls.
+        The cloudId is required to construct Confluence API endpoints. It is
+        cached per connected Atlassian account by the shared provider
+        metadata resolver, so token refreshes do not trigger a new lookup.
         """
-        cache_key = oauth_cred.access_token[:20]
-
-        if cache_key in self._cloud_id_cache:
-            return self._cloud_id_cache[cache_key]
-
-        try:
-            print("DEBUG: Fetching Confluence accessible resources to get cloudId")
-            response = await self._make_authenticated_request(
-                "GET",
-                "https://api.atlassian.com/oauth/token/accessible-resources",
-                oauth_cred
-            )
-
-            resources = response.json()
-            print(f"DEBUG: Found {len(resources)} accessible Atlassian resources")
-
-            if not resources:
-                raise ValueError("No accessible Confluence resources found for this account")
-
-            # Use the first accessible resource
-            cloud_id = resources[0]["id"]
-            self._cloud_id_cache[cache_key] = cloud_id
-
-            print(f"DEBUG: Using cloudId: {cloud_id} ({resources[0].get('name', 'Unknown')})")
-            return cloud_id
-
-        except Exception as e:
-            print(f"DEBUG: Error fetching Confluence cloudId: {str(e)}")
-            raise
+        return await get_atlassian_cloud_id(self, oauth_cred, "Confluence")
 
     def _get_api_base_url(self, cloud_id: str) -> str:
         """Construct Confluence REST API v2 base URL."""
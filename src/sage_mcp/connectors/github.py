@@ -1,6 +1,7 @@
 """GitHub connector implementation."""
 
 import json
+import math
 from typing import Any, Dict, List, Optional
 
 from mcp import types
@@ -8,8 +9,12 @@ from mcp import types
 from ..models.connector import Connector, ConnectorType
 from ..models.oauth_credential import OAuthCredential
 from .base import BaseConnector
+from .pagination import collect_all_pages, paginate_offset
 from .registry import register_connector
 
+# Repositories considered by github_get_user_stats (100 per page).
+USER_STATS_MAX_REPO_PAGES = 10
+
 
 @register_connector(ConnectorType.GITHUB)
 class GitHubConnector(BaseConnector):
@@ -1635,14 +1640,26 @@ class GitHubConnector(BaseConnector):
         )
         user_data = user_response.json()
 
-        # Get user's repositories
-        repos_response = await self._make_authenticated_request(
-            "GET",
-            f"https://api.github.com/users/{username}/repos",
-            oauth_cred,
-            params={"per_page": 100, "sort": "updated"}
+        # Get all of the user's repositories; the page count is known from
+        # public_repos, so pages are fetched concurrently.
+        async def fetch_repos_page(params):
+            return await self._make_authenticated_request(
+                "GET",
+                f"https://api.github.com/users/{username}/repos",
+                oauth_cred,
+                params={**params, "sort": "updated"}
+            )
+
+        repos = await collect_all_pages(
+            paginate_offset(
+                fetch_repos_page,
+                per_page=100,
+                total_pages=max(1, math.ceil(user_data.get("public_repos", 0) / 100)),
+                max_pages=USER_STATS_MAX_REPO_PAGES,
+                source="github",
+            ),
+            max_items=USER_STATS_MAX_REPO_PAGES * 100,
         )
-        repos = repos_response.json()
 
         # Calculate statistics
         total_stars = sum(repo.get("stargazers_count", 0) for repo in repos)
@@ -10,6 +10,7 @@ from mcp import types
 from ..models.connector import Connector, ConnectorType
 from ..models.oauth_credential import OAuthCredential
 from .base import BaseConnector
+from .batch import GMAIL_BATCH_URL, SubRequest, google_batch, raise_for_sub_response, request_batched
 from .registry import register_connector
 
 GMAIL_API_BASE = "https://gmail.googleapis.com/gmail/v1/users/me"
@@ -77,6 +78,29 @@ class GmailConnector(BaseConnector):
                     "required": ["id"]
                 }
             ),
+            types.Tool(
+                name="gmail_get_messages",
+                description="Get several messages by ID in one batched request, e.g. the ids returned by gmail_list_messages. Prefer this over repeated gmail_get_message calls.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "minItems": 1,
+                            "maxItems": 500,
+                            "description": "IDs of the messages to retrieve"
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": ["full", "metadata", "minimal"],
+                            "default": "full",
+                            "description": "Amount of each message to return"
+                        }
+                    },
+                    "required": ["ids"]
+                }
+            ),
             types.Tool(
                 name="gmail_search_messages",
                 description="Search messages using Gmail search syntax (e.g., 'from:user@example.com after:2024/01/01 has:attachment')",
@@ -384,6 +408,8 @@ class GmailConnector(BaseConnector):
                 return await self._list_messages(arguments, oauth_cred)
             elif tool_name == "get_message":
                 return await self._get_message(arguments, oauth_cred)
+            elif tool_name == "get_messages":
+                return await self._get_messages(arguments, oauth_cred)
             elif tool_name == "search_messages":
                 return await self._search_messages(arguments, oauth_cred)
             elif tool_name == "send_message":
@@ -616,16 +642,44 @@ class GmailConnector(BaseConnector):
         """Get a specific message with full content."""
         message_id = arguments["id"]
 
-        response = await self._make_authenticated_request(
-            "GET",
-            f"{GMAIL_API_BASE}/messages/{message_id}",
+        response = await request_batched(
+            self,
             oauth_cred,
+            GMAIL_BATCH_URL,
+            f"{GMAIL_API_BASE}/messages/{message_id}",
             params={"format": "full"},
         )
         data = response.json()
         parsed = self._parse_message(data)
         return json.dumps(parsed, indent=2)
 
+    async def _get_messages(self, arguments: Dict[str, Any], oauth_cred: OAuthCredential) -> str:
+        """Get several messages via the Gmail batch endpoint."""
+        ids = arguments["ids"]
+        message_format = arguments.get("format", "full")
+
+        responses = await google_batch(
+            self,
+            oauth_cred,
+            GMAIL_BATCH_URL,
+            [
+                SubRequest("GET", f"{GMAIL_API_BASE}/messages/{message_id}", params={"format": message_format})
+                for message_id in ids
+            ],
+        )
+
+        messages = []
+        errors = []
+        for message_id, response in zip(ids, responses):
+            try:
+                raise_for_sub_response(response)
+            except Exception as e:
+                errors.append({"id": message_id, "error": str(e)})
+                continue
+            messages.append(self._parse_message(response.json()))
+
+        return json.dumps({"messages": messages, "errors": errors}, indent=2)
+
     async def _search_messages(self, arguments: Dict[str, Any], oauth_cred: OAuthCredential) -> str:
         """Search messages using Gmail query syntax."""
         params: Dict[str, Any] = {"q": arguments["query"]}
@@ -109,6 +109,38 @@ class GoogleSheetsConnector(BaseConnector):
                     "required": ["spreadsheet_id", "range"]
                 }
             ),
+            types.Tool(
+                name="google_sheets_read_ranges",
+                description="Read several ranges of a spreadsheet in one request (values.batchGet). Prefer this over repeated read_range calls.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "spreadsheet_id": {
+                            "type": "string",
+                            "description": "The ID of the Google Sheets spreadsheet"
+                        },
+                        "ranges": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "minItems": 1,
+                            "description": "A1 notation ranges to read (e.g., ['Sheet1!A1:D10', 'Summary!B2'])"
+                        },
+                        "major_dimension": {
+                            "type": "string",
+                            "enum": ["ROWS", "COLUMNS"],
+                            "default": "ROWS",
+                            "description": "Whether to return data organized by rows or columns"
+                        },
+                        "value_render_option": {
+                            "type": "string",
+                            "enum": ["FORMATTED_VALUE", "UNFORMATTED_VALUE", "FORMULA"],
+                            "default": "FORMATTED_VALUE",
+                            "description": "How values should be rendered (FORMATTED_VALUE shows display values, FORMULA shows formulas)"
+                        }
+                    },
+                    "required": ["spreadsheet_id", "ranges"]
+                }
+            ),
             types.Tool(
                 name="google_sheets_write_range",
                 description="Write values to a range of cells in a Google Sheets spreadsheet. Values are provided as a 2D array (list of rows).",
@@ -463,6 +495,8 @@ class GoogleSheetsConnector(BaseConnector):
                 return await self._get_spreadsheet(arguments, oauth_cred)
             elif tool_name == "read_range":
                 return await self._read_range(arguments, oauth_cred)
+            elif tool_name == "read_ranges":
+                return await self._read_ranges(arguments, oauth_cred)
             elif tool_name == "write_range":
                 return await self._write_range(arguments, oauth_cred)
             elif tool_name == "append_rows":
@@ -647,6 +681,43 @@ class GoogleSheetsConnector(BaseConnector):
         except Exception as e:
             return f"Error reading range: {str(e)}"
 
+    async def _read_ranges(self, arguments: Dict[str, Any], oauth_cred: OAuthCredential) -> str:
+        """Read several ranges in one call using the values.batchGet endpoint."""
+        spreadsheet_id = arguments["spreadsheet_id"]
+        ranges = arguments["ranges"]
+        major_dimension = arguments.get("major_dimension", "ROWS")
+        value_render_option = arguments.get("value_render_option", "FORMATTED_VALUE")
+
+        try:
+            response = await self._make_authenticated_request(
+                "GET",
+                f"{SHEETS_API_BASE}/{spreadsheet_id}/values:batchGet",
+                oauth_cred,
+                params={
+                    "ranges": ranges,
+                    "majorDimension": major_dimension,
+                    "valueRenderOption": value_render_option
+                }
+            )
+            data = response.json()
+
+            result = {
+                "spreadsheet_id": data.get("spreadsheetId", spreadsheet_id),
+                "value_ranges": [
+                    {
+                        "range": value_range.get("range"),
+                        "major_dimension": value_range.get("majorDimension"),
+                        "values": value_range.get("values", [])
+                    }
+                    for value_range in data.get("valueRanges", [])
+                ]
+            }
+
+            return json.dumps(result, indent=2)
+
+        except Exception as e:
+            return f"Error reading ranges: {str(e)}"
+
     async def _write_range(self, arguments: Dict[str, Any], oauth_cred: OAuthCredential) -> str:
         """Write values to a cell range using the Sheets API values.update endpoint."""
         spreadsheet_id = arguments["spreadsheet_id"]
@@ -1,16 +1,227 @@
 """Lightweight async GraphQL client for connectors.
 
-Used by Linear (and future GraphQL APIs). Handles single queries and
-Relay-style cursor pagination.
+Used by Linear (and future GraphQL APIs). Handles single queries,
+Relay-style cursor pagination, and two ways of saving round-trips and bytes:
+
+- Aliased merging: independent queries are rewritten into one document
+  (top-level fields aliased ``q<i>_<field>``, variables renamed
+  ``$q<i>_<name>``) and the response is split back per query. Queries
+  whose outcome the merged response does not reveal (``data`` is null, or
+  an error names no alias) are re-run on their own, so one bad query
+  cannot fail its neighbours.
+  `execute_many` does this explicitly. With GRAPHQL_BATCH_WINDOW_MS > 0,
+  concurrent `execute` calls for the same endpoint and credential within
+  that window are merged too. Mutations, fragments and documents with
+  several operations are always sent on their own.
+- Automatic persisted queries (APQ): with ``persisted_queries=True`` only
+  the query's SHA-256 hash is sent; the full text follows once if the
+  server does not know the hash yet.
+
+Response body sizes are recorded per endpoint host.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Any, AsyncIterator, Dict, List, Optional
+import re
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
+import httpx
 
 from .exceptions import ConnectorAPIError
+from ..observability.metrics import record_graphql_queries, record_graphql_response
 
 logger = logging.getLogger(__name__)
 
+GraphQLQuery = Tuple[str, Optional[Dict[str, Any]]]
+# (data, errors, HTTP status) of one query, after splitting a merged response.
+GraphQLResult = Tuple[Dict[str, Any], List[Dict[str, Any]], int]
+
+_TOKEN_RE = re.compile(
+    r'"""(?:[^"\\]|\\.|"(?!""))*"""'
+    r'|"(?:[^"\\\n]|\\.)*"'
+    r"|#[^\n]*"
+    r"|\.\.\."
+    r"|[A-Za-z_]\w*"
+    r"|[^\s,]"
+)
+_MERGED_KEY_RE = re.compile(r"^q(\d+)_(.+)$")
+
+_APQ_NOT_FOUND = "PERSISTED_QUERY_NOT_FOUND"
+_APQ_NOT_SUPPORTED = "PERSISTED_QUERY_NOT_SUPPORTED"
+# Endpoints that answered PersistedQueryNotSupported; APQ is skipped for them.
+_apq_unsupported: Set[str] = set()
+
+
+def _is_name(token: str) -> bool:
+    return token[0].isalpha() or token[0] == "_"
+
+
+def _apply_edits(text: str, start: int, end: int, edits: List[Tuple[int, int, str]]) -> str:
+    """Return text[start:end] with (position, length, replacement) edits applied."""
+    out = []
+    cursor = start
+    for position, length, replacement in sorted(edits):
+        out.append(text[cursor:position])
+        out.append(replacement)
+        cursor = position + length
+    out.append(text[cursor:end])
+    return "".join(out)
+
+
+def alias_query(query: str, prefix: str) -> Optional[Tuple[str, str]]:
+    """Rewrite a single query operation for merging into a larger document.
+
+    Returns ``(variable_definitions, selections)`` with every top-level
+    field aliased and every variable renamed with `prefix`, or None when
+    the document cannot be merged safely.
+    """
+    tokens = [(m.group(), m.start()) for m in _TOKEN_RE.finditer(query) if m.group()[0] != "#"]
+    if not tokens:
+        return None
+    i = 0
+    if tokens[0][0] == "query":
+        i = 1
+        if i < len(tokens) and _is_name(tokens[i][0]):
+            i += 1
+    elif tokens[0][0] != "{":
+        return None
+
+    definitions = ""
+    if i < len(tokens) and tokens[i][0] == "(":
+        close = next((j for j in range(i, len(tokens)) if tokens[j][0] == ")"), None)
+        if close is None:
+            return None
+        edits = [
+            (tokens[j + 1][1], len(tokens[j + 1][0]), prefix + tokens[j + 1][0])
+            for j in range(i, close)
+            if tokens[j][0] == "$"
+        ]
+        definitions = _apply_edits(query, tokens[i][1] + 1, tokens[close][1], edits)
+        i = close + 1
+    if i >= len(tokens) or tokens[i][0] != "{":
+        return None
+
+    depth = 0
+    edits = []
+    end = None
+    for j in range(i, len(tokens)):
+        token, position = tokens[j]
+        if token in ("{", "("):
+            depth += 1
+        elif token in ("}", ")"):
+            depth -= 1
+            if depth == 0:
+                end = j
+                break
+        elif token == "$" and j + 1 < len(tokens):
+            edits.append((tokens[j + 1][1], len(tokens[j + 1][0]), prefix + tokens[j + 1][0]))
+        elif depth == 1 and token == "...":
+            return None
+        elif depth == 1 and _is_name(token) and tokens[j - 1][0] not in ("@", ":", "$"):
+            if j + 1 < len(tokens) and tokens[j + 1][0] == ":":
+                edits.append((position, len(token), prefix + token))
+            else:
+                edits.append((position, 0, f"{prefix}{token}: "))
+    # Anything after the operation (fragments, more operations) is not supported.
+    if end is None or end != len(tokens) - 1:
+        return None
+    return definitions.strip(), _apply_edits(query, tokens[i][1] + 1, tokens[end][1], edits)
+
+
+def merge_queries(queries: Sequence[GraphQLQuery]) -> Optional[GraphQLQuery]:
+    """Merge queries into one aliased document; None if any cannot be merged."""
+    definitions = []
+    selections = []
+    variables: Dict[str, Any] = {}
+    for index, (query, query_variables) in enumerate(queries):
+        prefix = f"q{index}_"
+        rewritten = alias_query(query, prefix)
+        if rewritten is None:
+            return None
+        query_definitions, query_selections = rewritten
+        if query_definitions:
+            definitions.append(query_definitions)
+        selections.append(query_selections.strip())
+        for name, value in (query_variables or {}).items():
+            variables[prefix + name] = value
+    header = f"query Merged({', '.join(definitions)})" if definitions else "query Merged"
+    return header + " {\n" + "\n".join(selections) + "\n}", variables
+
+
+def split_merged_response(
+    body: Dict[str, Any], count: int
+) -> List[Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]]:
+    """Split a merged response into (data, errors) per original query.
+
+    Errors carrying a path go to the query that owns the aliased field.
+    A query without errors of its own gets None, meaning its outcome is
+    unknown and it must be re-run alone, when ``data`` is null (a non-null
+    field failed and nulled the whole document) or when some error names
+    no alias and the query's own fields are missing or null.
+    """
+    data = body.get("data")
+    results: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = [({}, []) for _ in range(count)]
+    for key, value in (data or {}).items():
+        match = _MERGED_KEY_RE.match(key)
+        if match and int(match.group(1)) < count:
+            results[int(match.group(1))][0][match.group(2)] = value
+    unattributed = False
+    for error in body.get("errors") or []:
+        path = error.get("path") or []
+        match = _MERGED_KEY_RE.match(str(path[0])) if path else None
+        if match and int(match.group(1)) < count:
+            results[int(match.group(1))][1].append({**error, "path": [match.group(2), *path[1:]]})
+        else:
+            unattributed = True
+
+    def unknown(query_data: Dict[str, Any], errors: List[Dict[str, Any]]) -> bool:
+        if errors:
+            return False
+        if data is None:
+            return True
+        return unattributed and (not query_data or any(v is None for v in query_data.values()))
+
+    return [None if unknown(*result) else result for result in results]
+
+
+@lru_cache(maxsize=256)
+def _query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def _apq_error(body: Dict[str, Any]) -> Optional[str]:
+    for error in body.get("errors") or []:
+        code = (error.get("extensions") or {}).get("code")
+        message = error.get("message")
+        if code == _APQ_NOT_FOUND or message == "PersistedQueryNotFound":
+            return _APQ_NOT_FOUND
+        if code == _APQ_NOT_SUPPORTED or message == "PersistedQueryNotSupported":
+            return _APQ_NOT_SUPPORTED
+    return None
+
+
+def _raise_for_errors(errors: List[Dict[str, Any]], status_code: int):
+    if errors:
+        error_messages = "; ".join(e.get("message", "Unknown error") for e in errors)
+        raise ConnectorAPIError(
+            f"GraphQL error: {error_messages}",
+            status_code=status_code,
+            response_body=str(errors)[:500],
+        )
+
+
+def _batch_settings() -> Tuple[float, int]:
+    from ..config import get_settings
+
+    settings = get_settings()
+    return settings.graphql_batch_window_ms / 1000.0, max(1, settings.graphql_batch_max_queries)
+
+
+# Implicit merging of concurrent `execute` calls, per (endpoint, credential).
+_batchers: Dict[Tuple[str, str], Any] = {}
+
 
 class GraphQLClient:
     """Async GraphQL client that uses the shared HTTP client with retry."""
@@ -20,10 +231,16 @@ class GraphQLClient:
         endpoint: str,
         auth_header: str = "Authorization",
         auth_value: str = "",
+        persisted_queries: bool = False,
     ):
         self.endpoint = endpoint
         self.auth_header = auth_header
         self.auth_value = auth_value
+        self.persisted_queries = persisted_queries
+
+    @property
+    def host(self) -> str:
+        return httpx.URL(self.endpoint).host
 
     async def execute(
         self,
@@ -32,6 +249,9 @@ class GraphQLClient:
     ) -> Dict[str, Any]:
         """Execute a single GraphQL query.
 
+        With GRAPHQL_BATCH_WINDOW_MS > 0, queries issued concurrently with the
+        same credential may travel in one merged document.
+
         Args:
             query: GraphQL query string.
             variables: Optional query variables.
@@ -42,40 +262,151 @@ class GraphQLClient:
         Raises:
             ConnectorAPIError: If the response contains GraphQL errors.
         """
-        from .http_client import get_http_client
-        from .retry import retry_with_backoff
+        window, limit = _batch_settings()
+        if window > 0 and not query.lstrip().startswith(("mutation", "subscription")):
+            data, errors, status_code = await self._get_batcher(window, limit).submit((query, variables))
+            _raise_for_errors(errors, status_code)
+            return data
+
+        body, status_code = await self._send(query, variables)
+        _raise_for_errors(body.get("errors"), status_code)
+        return body.get("data", {})
+
+    async def execute_many(
+        self,
+        queries: Sequence[GraphQLQuery],
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Execute independent queries with as few requests as possible.
+
+        Queries are merged into aliased documents of up to
+        GRAPHQL_BATCH_MAX_QUERIES; ones that cannot be merged are sent on
+        their own, concurrently.
+
+        Args:
+            queries: (query, variables) pairs.
+            return_exceptions: Return a ConnectorAPIError in place of a
+                failed query's data instead of raising it.
+
+        Returns:
+            The "data" portion of each query's result, in order.
+        """
+        _, limit = _batch_settings()
+        results = await self._execute_merged(list(queries), limit)
+        out: List[Any] = []
+        for data, errors, status_code in results:
+            try:
+                _raise_for_errors(errors, status_code)
+            except ConnectorAPIError as e:
+                if not return_exceptions:
+                    raise
+                out.append(e)
+                continue
+            out.append(data)
+        return out
+
+    def _get_batcher(self, window: float, limit: int):
+        from .batch import MicroBatcher
+
+        credential = hashlib.sha256(self.auth_value.encode("utf-8")).hexdigest()[:16]
+        key = (self.endpoint, credential)
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = MicroBatcher(lambda queries: self._execute_merged(queries, limit), limit, window)
+            batcher.on_idle = lambda: _batchers.pop(key) if _batchers.get(key) is batcher else None
+            _batchers[key] = batcher
+        return batcher
+
+    async def _execute_merged(self, queries: List[GraphQLQuery], limit: int) -> List[GraphQLResult]:
+        results: List[Optional[GraphQLResult]] = [None] * len(queries)
 
+        async def send_single(index: int):
+            body, status_code = await self._send(*queries[index])
+            results[index] = (body.get("data") or {}, body.get("errors") or [], status_code)
+
+        async def send_merged(indexes: List[int]):
+            query, variables = merge_queries([queries[i] for i in indexes])
+            body, status_code = await self._send(query, variables, mode="merged", count=len(indexes))
+            rerun = []
+            for index, result in zip(indexes, split_merged_response(body, len(indexes))):
+                if result is None:
+                    rerun.append(index)
+                else:
+                    results[index] = (*result, status_code)
+            if rerun:
+                logger.debug("Re-running %d of %d merged GraphQL queries alone", len(rerun), len(indexes))
+                await asyncio.gather(*(send_single(index) for index in rerun))
+
+        mergeable = [i for i, (query, _) in enumerate(queries) if alias_query(query, "q0_") is not None]
+        sends = [send_single(i) for i in sorted(set(range(len(queries))) - set(mergeable))]
+        for start in range(0, len(mergeable), limit):
+            chunk = mergeable[start:start + limit]
+            sends.append(send_merged(chunk) if len(chunk) > 1 else send_single(chunk[0]))
+        await asyncio.gather(*sends)
+        return results
+
+    async def _send(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        mode: str = "single",
+        count: int = 1,
+    ) -> Tuple[Dict[str, Any], int]:
+        """POST one document, by persisted-query hash first when enabled."""
         payload: Dict[str, Any] = {"query": query}
         if variables:
             payload["variables"] = variables
 
+        if self.persisted_queries and self.endpoint not in _apq_unsupported:
+            extensions = {"persistedQuery": {"version": 1, "sha256Hash": _query_hash(query)}}
+            body, status_code = await self._post(
+                {**{k: v for k, v in payload.items() if k != "query"}, "extensions": extensions}
+            )
+            apq_error = _apq_error(body)
+            if apq_error is None:
+                record_graphql_queries(self.host, "persisted", count)
+                return body, status_code
+            if apq_error == _APQ_NOT_SUPPORTED:
+                _apq_unsupported.add(self.endpoint)
+            else:
+                # Register the hash along with the full text.
+                payload["extensions"] = extensions
+
+        record_graphql_queries(self.host, mode, count)
+        return await self._post(payload)
+
+    async def _post(self, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        from .circuit_breaker import send_guarded
+        from .http_client import get_http_client
+        from .quota import send_paced
+        from .retry import retry_with_backoff
+
         async def _do_request():
             client = get_http_client()
-            response = await client.post(
-                self.endpoint,
-                json=payload,
-                headers={
-                    self.auth_header: self.auth_value,
-                    "Content-Type": "application/json",
-                },
+            host = self.host
+            response = await send_guarded(
+                host,
+                self.auth_value,
+                lambda: send_paced(
+                    host,
+                    self.auth_value,
+                    lambda: client.post(
+                        self.endpoint,
+                        json=payload,
+                        headers={
+                            self.auth_header: self.auth_value,
+                            "Content-Type": "application/json",
+                        },
+                    ),
+                ),
             )
             response.raise_for_status()
             return response
 
         response = await retry_with_backoff(_do_request)
-        body = response.json()
-
-        if "errors" in body and body["errors"]:
-            error_messages = "; ".join(
-                e.get("message", "Unknown error") for e in body["errors"]
-            )
-            raise ConnectorAPIError(
-                f"GraphQL error: {error_messages}",
-                status_code=response.status_code,
-                response_body=str(body["errors"])[:500],
-            )
-
-        return body.get("data", {})
+        if isinstance(response, httpx.Response):
+            record_graphql_response(self.host, len(response.content))
+        return response.json(), response.status_code
 
     async def paginate_connection(
         self,
@@ -19,6 +19,7 @@ from mcp import types
 from ..models.connector import Connector, ConnectorType
 from ..models.oauth_credential import OAuthCredential
 from .base import BaseConnector
+from .provider_metadata import get_atlassian_cloud_id
 from .registry import register_connector
 
 
@@ -26,10 +27,6 @@ from .registry import register_connector
 class JiraConnector(BaseConnector):
     """Jira connector for accessing Jira Cloud API."""
 
-    def __init__(self):
-        super().__init__()
-        self._cloud_id_cache: Dict[str, str] = {}  # Cache cloudId per OAuth token
-
     @property
     def display_name(self) -> str:
         return "Jira"
@@ -43,41 +40,13 @@ class JiraConnector(BaseConnector):
         return True
 
     async def _get_cloud_id(self, oauth_cred: OAuthCredential) -> str:
-        """Get Jira Cloud ID for the authenticated user.
+        """Get the Jira Cloud ID for the authenticated user.
 
-        The cloudId is required to construct Jira API endpoints.
-        This is cached per OAuth token to minimize API calls.
+        The cloudId is required to construct Jira API endpoints. It is
+        cached per connected Atlassian account by the shared provider
+        metadata resolver, so token refreshes do not trigger a new lookup.
         """
-        # Use access token as cache key
-        cache_key = oauth_cred.access_token[:20]  # Use token prefix as key
-
-        if cache_key in self._cloud_id_cache:
-            return self._cloud_id_cache[cache_key]
-
-        try:
-            print("DEBUG: Fetching Jira accessible resources to get cloudId")
-            response = await self._make_authenticated_request(
-                "GET",
-                "https://api.atlassian.com/oauth/token/accessible-resources",
-                oauth_cred
-            )
-
-            resources = response.json()
-            print(f"DEBUG: Found {len(resources)} accessible Jira resources")
-
-            if not resources:
-                raise ValueError("No accessible Jira resources found for this account")
-
-            # Use the first accessible resource
-            cloud_id = resources[0]["id"]
-            self._cloud_id_cache[cache_key] = cloud_id
-
-            print(f"DEBUG: Using cloudId: {cloud_id} ({resources[0].get('name', 'Unknown')})")
-            return cloud_id
-
-        except Exception as e:
-            print(f"DEBUG: Error fetching Jira cloudId: {str(e)}")
-            raise
+        return await get_atlassian_cloud_id(self, oauth_cred, "Jira")
 
     def _get_api_base_url(self, cloud_id: str) -> str:
         """Construct Jira API v3 base URL."""
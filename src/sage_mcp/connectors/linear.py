@@ -512,7 +512,7 @@ class LinearConnector(BaseConnector):
         connector: Connector,
         oauth_cred: Optional[OAuthCredential] = None,
     ) -> List[types.Tool]:
-        """Return the 18 Linear tools with their JSON Schema input definitions."""
+        """Return the 20 Linear tools with their JSON Schema input definitions."""
         return [
             # 1. list_issues
             types.Tool(
@@ -867,6 +867,24 @@ class LinearConnector(BaseConnector):
                     "required": ["email"],
                 },
             ),
+            # 20. get_issues
+            types.Tool(
+                name="linear_get_issues",
+                description="Get several Linear issues by ID in one request. Prefer this over repeated linear_get_issue calls.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "minItems": 1,
+                            "maxItems": 50,
+                            "description": "Issue IDs or identifiers (e.g. ENG-123)",
+                        },
+                    },
+                    "required": ["ids"],
+                },
+            ),
         ]
 
     async def get_resources(
@@ -897,6 +915,8 @@ class LinearConnector(BaseConnector):
                 return await self._list_issues(arguments, oauth_cred)
             elif tool_name == "get_issue":
                 return await self._get_issue(arguments, oauth_cred)
+            elif tool_name == "get_issues":
+                return await self._get_issues(arguments, oauth_cred)
             elif tool_name == "create_issue":
                 return await self._create_issue(arguments, oauth_cred)
             elif tool_name == "update_issue":
@@ -985,6 +1005,28 @@ class LinearConnector(BaseConnector):
         data = await client.execute(_GET_ISSUE_QUERY, {"id": arguments["id"]})
         return json.dumps(data.get("issue", {}), indent=2)
 
+    async def _get_issues(
+        self, arguments: Dict[str, Any], oauth_cred: OAuthCredential
+    ) -> str:
+        """Get several issues, merged into as few GraphQL requests as possible."""
+        client = self._get_client(oauth_cred)
+        ids = arguments["ids"]
+        results = await client.execute_many(
+            [(_GET_ISSUE_QUERY, {"id": issue_id}) for issue_id in ids],
+            return_exceptions=True,
+        )
+
+        issues = []
+        errors = []
+        for issue_id, result in zip(ids, results):
+            if isinstance(result, Exception):
+                errors.append({"id": issue_id, "error": str(result)})
+            elif not result.get("issue"):
+                errors.append({"id": issue_id, "error": "Issue not found"})
+            else:
+                issues.append(result["issue"])
+        return json.dumps({"issues": issues, "errors": errors}, indent=2)
+
     async def _create_issue(
         self, arguments: Dict[str, Any], oauth_cred: OAuthCredential
     ) -> str:
@@ -8,6 +8,7 @@ from mcp import types
 from ..models.connector import Connector, ConnectorType
 from ..models.oauth_credential import OAuthCredential
 from .base import BaseConnector
+from .batch import GRAPH_BATCH_URL, SubRequest, graph_batch, raise_for_sub_response, request_batched
 from .registry import register_connector
 
 GRAPH_API_BASE = "https://graph.microsoft.com/v1.0/me"
@@ -84,6 +85,27 @@ class OutlookConnector(BaseConnector):
                     "required": ["message_id"]
                 }
             ),
+            types.Tool(
+                name="outlook_get_messages",
+                description="Get several email messages by ID in batched requests (20 per Graph $batch call). Prefer this over repeated outlook_get_message calls.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "message_ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "minItems": 1,
+                            "maxItems": 200,
+                            "description": "The unique IDs of the messages"
+                        },
+                        "select": {
+                            "type": "string",
+                            "description": "Comma-separated list of fields to return (e.g., \"subject,body,from,toRecipients\")"
+                        }
+                    },
+                    "required": ["message_ids"]
+                }
+            ),
             types.Tool(
                 name="outlook_send_message",
                 description="Send a new email message. Supports HTML and text body content, with CC and BCC recipients.",
@@ -387,6 +409,8 @@ class OutlookConnector(BaseConnector):
                 return await self._list_messages(arguments, oauth_cred)
             elif tool_name == "get_message":
                 return await self._get_message(arguments, oauth_cred)
+            elif tool_name == "get_messages":
+                return await self._get_messages(arguments, oauth_cred)
             elif tool_name == "send_message":
                 return await self._send_message(arguments, oauth_cred)
             elif tool_name == "reply_to_message":
@@ -506,6 +530,41 @@ class OutlookConnector(BaseConnector):
             "inference_classification": message.get("inferenceClassification"),
         }
 
+    @staticmethod
+    def _format_message_detail(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract full message details, including the body, from a Graph API message object."""
+        from_email = data.get("from", {}).get("emailAddress", {})
+        to_recipients = [
+            {"address": r.get("emailAddress", {}).get("address"),
+             "name": r.get("emailAddress", {}).get("name")}
+            for r in data.get("toRecipients", [])
+        ]
+        cc_recipients = [
+            {"address": r.get("emailAddress", {}).get("address"),
+             "name": r.get("emailAddress", {}).get("name")}
+            for r in data.get("ccRecipients", [])
+        ]
+
+        return {
+            "id": data.get("id"),
+            "subject": data.get("subject"),
+            "from": {"address": from_email.get("address"), "name": from_email.get("name")},
+            "to_recipients": to_recipients,
+            "cc_recipients": cc_recipients,
+            "received_date_time": data.get("receivedDateTime"),
+            "sent_date_time": data.get("sentDateTime"),
+            "is_read": data.get("isRead"),
+            "has_attachments": data.get("hasAttachments"),
+            "importance": data.get("importance"),
+            "body_content_type": data.get("body", {}).get("contentType"),
+            "body": data.get("body", {}).get("content"),
+            "body_preview": data.get("bodyPreview"),
+            "flag": data.get("flag", {}).get("flagStatus"),
+            "categories": data.get("categories", []),
+            "inference_classification": data.get("inferenceClassification"),
+            "web_link": data.get("webLink"),
+        }
+
     # ------------------------------------------------------------------ #
     # Tool implementation methods
     # ------------------------------------------------------------------ #
@@ -556,50 +615,48 @@ class OutlookConnector(BaseConnector):
             if select:
                 params["$select"] = select
 
-            response = await self._make_authenticated_request(
-                "GET",
-                f"{GRAPH_API_BASE}/messages/{message_id}",
+            response = await request_batched(
+                self,
                 oauth_cred,
+                GRAPH_BATCH_URL,
+                f"{GRAPH_API_BASE}/messages/{message_id}",
                 params=params if params else None
             )
-            data = response.json()
+            return json.dumps(self._format_message_detail(response.json()), indent=2)
 
-            from_email = data.get("from", {}).get("emailAddress", {})
-            to_recipients = [
-                {"address": r.get("emailAddress", {}).get("address"),
-                 "name": r.get("emailAddress", {}).get("name")}
-                for r in data.get("toRecipients", [])
-            ]
-            cc_recipients = [
-                {"address": r.get("emailAddress", {}).get("address"),
-                 "name": r.get("emailAddress", {}).get("name")}
-                for r in data.get("ccRecipients", [])
-            ]
+        except Exception as e:
+            return f"Error getting message: {str(e)}"
 
-            result = {
-                "id": data.get("id"),
-                "subject": data.get("subject"),
-                "from": {"address": from_email.get("address"), "name": from_email.get("name")},
-                "to_recipients": to_recipients,
-                "cc_recipients": cc_recipients,
-                "received_date_time": data.get("receivedDateTime"),
-                "sent_date_time": data.get("sentDateTime"),
-                "is_read": data.get("isRead"),
-                "has_attachments": data.get("hasAttachments"),
-                "importance": data.get("importance"),
-                "body_content_type": data.get("body", {}).get("contentType"),
-                "body": data.get("body", {}).get("content"),
-                "body_preview": data.get("bodyPreview"),
-                "flag": data.get("flag", {}).get("flagStatus"),
-                "categories": data.get("categories", []),
-                "inference_classification": data.get("inferenceClassification"),
-                "web_link": data.get("webLink"),
-            }
+    async def _get_messages(self, arguments: Dict[str, Any], oauth_cred: OAuthCredential) -> str:
+        """Get several messages by ID via Graph $batch."""
+        message_ids = arguments["message_ids"]
+        select = arguments.get("select")
+        params = {"$select": select} if select else None
 
-            return json.dumps(result, indent=2)
+        try:
+            responses = await graph_batch(
+                self,
+                oauth_cred,
+                [
+                    SubRequest("GET", f"{GRAPH_API_BASE}/messages/{message_id}", params=params)
+                    for message_id in message_ids
+                ]
+            )
+
+            messages = []
+            errors = []
+            for message_id, response in zip(message_ids, responses):
+                try:
+                    raise_for_sub_response(response)
+                except Exception as e:
+                    errors.append({"message_id": message_id, "error": str(e)})
+                    continue
+                messages.append(self._format_message_detail(response.json()))
+
+            return json.dumps({"messages": messages, "errors": errors}, indent=2)
 
         except Exception as e:
-            return f"Error getting message: {str(e)}"
+            return f"Error getting messages: {str(e)}"
 
     async def _send_message(self, arguments: Dict[str, Any], oauth_cred: OAuthCredential) -> str:
         """Send a new email message via the sendMail endpoint."""
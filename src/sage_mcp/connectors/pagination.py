@@ -2,16 +2,56 @@
 
 Async generators for common pagination patterns. Opt-in utility — existing
 connectors don't need to change.
+
+All paginators overlap fetching with the consumer: the next page is
+requested as soon as the current one says it exists, before its items are
+yielded. Offset pagination additionally keeps up to `prefetch` pages in
+flight once the total page count is known (from `total_pages` or an
+X-Total-Pages header). Pages are always yielded in order, `max_items` stops
+early, and closing the generator cancels any page still in flight.
+Per-page latency is recorded under the `source` label.
 """
 
+import asyncio
 import logging
-from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 
 import httpx
 
+from ..observability.metrics import record_pagination_page
+
 logger = logging.getLogger(__name__)
 
 
+async def _timed_fetch(fetch_page: Callable[..., Awaitable[Any]], arg: Any, source: str) -> Any:
+    start = time.perf_counter()
+    try:
+        return await fetch_page(arg)
+    finally:
+        record_pagination_page(source, time.perf_counter() - start)
+
+
+def _start_fetch(fetch_page: Callable[..., Awaitable[Any]], arg: Any, source: str) -> asyncio.Task:
+    return asyncio.ensure_future(_timed_fetch(fetch_page, arg, source))
+
+
+def _discard(task: asyncio.Task):
+    """Cancel a page fetch nobody will consume."""
+    task.cancel()
+    # Retrieve the outcome so a fetch that already failed is not logged as unhandled.
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+def _total_pages_header(response: Any) -> Optional[int]:
+    value = response.headers.get("X-Total-Pages")
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
 async def paginate_offset(
     fetch_page: Callable[..., Any],
     *,
@@ -21,6 +61,10 @@ async def paginate_offset(
     start_page: int = 1,
     results_key: Optional[str] = None,
     max_pages: int = 50,
+    total_pages: Optional[int] = None,
+    prefetch: int = 4,
+    max_items: Optional[int] = None,
+    source: str = "other",
 ) -> AsyncIterator[Dict[str, Any]]:
     """Paginate APIs that use page/per_page offset pagination (GitLab, Bitbucket).
 
@@ -33,24 +77,97 @@ async def paginate_offset(
         results_key: If set, extract items from response_json[results_key].
                      If None, the response JSON is expected to be a list.
         max_pages: Safety limit on total pages fetched.
+        total_pages: Known page count; read from X-Total-Pages if not given.
+        prefetch: Pages fetched concurrently once the page count is known.
+        max_items: Stop after yielding this many items.
+        source: Metrics label for per-page latency (e.g. "gitlab").
     """
-    page = start_page
-    for _ in range(max_pages):
-        params = {page_param: page, per_page_param: per_page}
-        response = await fetch_page(params)
-        data = response.json()
-
-        items = data[results_key] if results_key else data
-        if not items:
-            break
-
-        for item in items:
-            yield item
-
-        if len(items) < per_page:
-            break
+    def fetch(page: int) -> asyncio.Task:
+        return _start_fetch(fetch_page, {page_param: page, per_page_param: per_page}, source)
+
+    last_page = start_page + max_pages - 1
+    window: Deque[Tuple[int, asyncio.Task]] = deque([(start_page, fetch(start_page))])
+    next_page = start_page + 1
+    yielded = 0
+    try:
+        while window:
+            _, task = window.popleft()
+            response = await task
+            data = response.json()
+
+            items = data[results_key] if results_key else data
+            if not items:
+                break
+
+            full_page = len(items) >= per_page
+            if total_pages is None:
+                total_pages = _total_pages_header(response)
+            if full_page:
+                limit = last_page
+                depth = 1
+                if total_pages is not None:
+                    limit = min(last_page, start_page + total_pages - 1)
+                    depth = max(1, prefetch)
+                if max_items is not None and yielded + len(items) >= max_items:
+                    limit = 0
+                while next_page <= limit and len(window) < depth:
+                    window.append((next_page, fetch(next_page)))
+                    next_page += 1
+
+            for item in items:
+                yield item
+                yielded += 1
+                if max_items is not None and yielded >= max_items:
+                    return
+
+            if not full_page:
+                break
+    finally:
+        for _, task in window:
+            _discard(task)
+
+
+async def _paginate_chain(
+    fetch_page: Callable[..., Any],
+    first_arg: Any,
+    extract: Callable[[Any], Tuple[List[Dict[str, Any]], Any]],
+    *,
+    max_pages: int,
+    prefetch: bool,
+    max_items: Optional[int],
+    source: str,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Follow next-page pointers, fetching page k+1 while page k is consumed.
 
-        page += 1
+    `extract` returns (items, next_arg); next_arg None ends pagination.
+    """
+    pending: Optional[asyncio.Task] = _start_fetch(fetch_page, first_arg, source)
+    yielded = 0
+    try:
+        for page_index in range(max_pages):
+            response = await pending
+            pending = None
+            items, next_arg = extract(response)
+            if page_index + 1 >= max_pages:
+                next_arg = None
+            if max_items is not None and yielded + len(items) >= max_items:
+                next_arg = None
+            if prefetch and next_arg is not None:
+                pending = _start_fetch(fetch_page, next_arg, source)
+
+            for item in items:
+                yield item
+                yielded += 1
+                if max_items is not None and yielded >= max_items:
+                    return
+
+            if next_arg is None:
+                break
+            if pending is None:
+                pending = _start_fetch(fetch_page, next_arg, source)
+    finally:
+        if pending is not None:
+            _discard(pending)
 
 
 async def paginate_cursor(
@@ -60,6 +177,9 @@ async def paginate_cursor(
     results_key: str = "items",
     cursor_key: str = "next_cursor",
     max_pages: int = 50,
+    prefetch: bool = True,
+    max_items: Optional[int] = None,
+    source: str = "other",
 ) -> AsyncIterator[Dict[str, Any]]:
     """Paginate APIs that use cursor/token pagination (Slack, Discord, Gmail).
 
@@ -69,23 +189,23 @@ async def paginate_cursor(
         results_key: Key in response JSON containing the items list.
         cursor_key: Key in response JSON containing the next cursor.
         max_pages: Safety limit.
+        prefetch: Fetch the next page while the current one is consumed.
+        max_items: Stop after yielding this many items.
+        source: Metrics label for per-page latency.
     """
-    cursor: Optional[str] = None
-    for _ in range(max_pages):
-        params = {}
-        if cursor:
-            params[cursor_param] = cursor
-
-        response = await fetch_page(params)
+    def extract(response: Any) -> Tuple[List[Dict[str, Any]], Any]:
         data = response.json()
-
         items = data.get(results_key, [])
-        for item in items:
-            yield item
-
         cursor = data.get(cursor_key)
         if not cursor or not items:
-            break
+            return items, None
+        return items, {cursor_param: cursor}
+
+    async for item in _paginate_chain(
+        fetch_page, {}, extract,
+        max_pages=max_pages, prefetch=prefetch, max_items=max_items, source=source,
+    ):
+        yield item
 
 
 async def paginate_link_header(
@@ -94,6 +214,9 @@ async def paginate_link_header(
     initial_url: Optional[str] = None,
     results_key: Optional[str] = None,
     max_pages: int = 50,
+    prefetch: bool = True,
+    max_items: Optional[int] = None,
+    source: str = "other",
 ) -> AsyncIterator[Dict[str, Any]]:
     """Paginate APIs that use Link rel="next" header (GitHub, GitLab).
 
@@ -102,24 +225,22 @@ async def paginate_link_header(
                     When url is None, fetch the first page.
         results_key: If set, extract items from response_json[results_key].
         max_pages: Safety limit.
+        prefetch: Fetch the next page while the current one is consumed.
+        max_items: Stop after yielding this many items.
+        source: Metrics label for per-page latency.
     """
-    url = initial_url
-    for _ in range(max_pages):
-        response = await fetch_page(url)
+    def extract(response: Any) -> Tuple[List[Dict[str, Any]], Any]:
         data = response.json()
-
         items = data[results_key] if results_key else data
         if not items:
-            break
+            return [], None
+        return items, _parse_link_next(response.headers.get("Link", ""))
 
-        for item in items:
-            yield item
-
-        # Parse Link header for next URL
-        next_url = _parse_link_next(response.headers.get("Link", ""))
-        if not next_url:
-            break
-        url = next_url
+    async for item in _paginate_chain(
+        fetch_page, initial_url, extract,
+        max_pages=max_pages, prefetch=prefetch, max_items=max_items, source=source,
+    ):
+        yield item
 
 
 async def paginate_odata(
@@ -127,6 +248,9 @@ async def paginate_odata(
     *,
     results_key: str = "value",
     max_pages: int = 50,
+    prefetch: bool = True,
+    max_items: Optional[int] = None,
+    source: str = "other",
 ) -> AsyncIterator[Dict[str, Any]]:
     """Paginate Microsoft Graph APIs using @odata.nextLink.
 
@@ -135,20 +259,23 @@ async def paginate_odata(
                     When url is None, fetch the first page.
         results_key: Key containing items (default "value").
         max_pages: Safety limit.
+        prefetch: Fetch the next page while the current one is consumed.
+        max_items: Stop after yielding this many items.
+        source: Metrics label for per-page latency.
     """
-    url: Optional[str] = None
-    for _ in range(max_pages):
-        response = await fetch_page(url)
+    def extract(response: Any) -> Tuple[List[Dict[str, Any]], Any]:
         data = response.json()
-
         items = data.get(results_key, [])
-        for item in items:
-            yield item
-
         next_link = data.get("@odata.nextLink")
         if not next_link or not items:
-            break
-        url = next_link
+            return items, None
+        return items, next_link
+
+    async for item in _paginate_chain(
+        fetch_page, None, extract,
+        max_pages=max_pages, prefetch=prefetch, max_items=max_items, source=source,
+    ):
+        yield item
 
 
 async def collect_all_pages(
@@ -170,6 +297,10 @@ async def collect_all_pages(
         if len(items) >= max_items:
             logger.warning("collect_all_pages hit max_items=%d", max_items)
             break
+    # Cancel any page the paginator is still prefetching.
+    aclose = getattr(paginator, "aclose", None)
+    if aclose is not None:
+        await aclose()
     return items
 
 
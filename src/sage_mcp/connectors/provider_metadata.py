@@ -0,0 +1,138 @@
+"""Cached "who am I / which site" lookups for connectors.
+
+Some providers need a metadata call before the real request can be built:
+Atlassian APIs are addressed by the cloud id of the site the token can
+reach, which comes from `accessible-resources`. The answer depends on the
+connected account, not on the access token, so entries are keyed by
+(kind, tenant, provider, provider account id) and survive token refreshes.
+
+Entries expire after PROVIDER_METADATA_TTL_SECONDS and the cache holds at
+most PROVIDER_METADATA_MAX_ENTRIES, evicting the least recently used.
+Concurrent misses for the same key share one upstream call.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+from .coalesce import SingleFlight
+from ..observability.metrics import record_provider_metadata_lookup
+
+logger = logging.getLogger(__name__)
+
+ATLASSIAN_ACCESSIBLE_RESOURCES_URL = "https://api.atlassian.com/oauth/token/accessible-resources"
+
+
+def credential_key(oauth_cred: Any) -> Tuple[str, str, str]:
+    """Identify the connected provider account behind a credential."""
+    account = getattr(oauth_cred, "provider_user_id", None)
+    if not account:
+        # No account id recorded: fall back to the token itself.
+        account = "token:" + hashlib.sha256(oauth_cred.access_token.encode("utf-8")).hexdigest()[:16]
+    return (
+        str(getattr(oauth_cred, "tenant_id", "")),
+        str(getattr(oauth_cred, "provider", "")),
+        str(account),
+    )
+
+
+class ProviderMetadataResolver:
+    """TTL- and size-bounded cache of per-account provider metadata."""
+
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._flights = SingleFlight()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def resolve(self, kind: str, oauth_cred: Any, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `kind` and this account, fetching it on a miss.
+
+        Failed fetches are not cached.
+        """
+        key = (kind, *credential_key(oauth_cred))
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if time.monotonic() - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                record_provider_metadata_lookup(kind, "hit")
+                return value
+            del self._entries[key]
+
+        record_provider_metadata_lookup(kind, "miss")
+
+        async def fetch_and_store():
+            value = await fetch()
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+
+        return await self._flights.do(key, fetch_and_store)
+
+    def invalidate(self, kind: Optional[str] = None, oauth_cred: Any = None):
+        """Drop entries for one kind and/or account; no arguments clears everything."""
+        account = credential_key(oauth_cred) if oauth_cred is not None else None
+        for key in list(self._entries):
+            if kind is not None and key[0] != kind:
+                continue
+            if account is not None and key[1:] != account:
+                continue
+            del self._entries[key]
+
+
+_resolver: Optional[ProviderMetadataResolver] = None
+
+
+def get_provider_metadata_resolver() -> Optional[ProviderMetadataResolver]:
+    """Get the process-wide resolver, or None when caching is disabled in Settings."""
+    global _resolver
+    if _resolver is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        if settings.provider_metadata_ttl_seconds <= 0:
+            return None
+        _resolver = ProviderMetadataResolver(
+            ttl=settings.provider_metadata_ttl_seconds,
+            max_entries=settings.provider_metadata_max_entries,
+        )
+    return _resolver
+
+
+async def resolve_provider_metadata(kind: str, oauth_cred: Any, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Resolve through the shared cache, or call `fetch` directly when it is disabled."""
+    resolver = get_provider_metadata_resolver()
+    if resolver is None:
+        return await fetch()
+    return await resolver.resolve(kind, oauth_cred, fetch)
+
+
+async def get_atlassian_cloud_id(connector: Any, oauth_cred: Any, product: str) -> str:
+    """Cloud id of the first Atlassian site the credential can access.
+
+    Shared by the Jira and Confluence connectors; `product` only shapes the
+    error message.
+    """
+    async def fetch() -> str:
+        response = await connector._make_authenticated_request(
+            "GET", ATLASSIAN_ACCESSIBLE_RESOURCES_URL, oauth_cred
+        )
+        resources = response.json()
+        if not resources:
+            raise ValueError(f"No accessible {product} resources found for this account")
+        site = resources[0]
+        logger.debug(
+            "Using Atlassian cloudId %s (%s) of %d accessible sites",
+            site["id"], site.get("name", "Unknown"), len(resources),
+        )
+        return site["id"]
+
+    return await resolve_provider_metadata("atlassian_cloud_id", oauth_cred, fetch)
@@ -0,0 +1,349 @@
+"""Client-side pacing of upstream API calls from advertised quota headers.
+
+Most providers report remaining quota on every response (GitHub and
+Atlassian `X-RateLimit-*`, GitLab `RateLimit-*`, Discord, Linear) or at
+least send `Retry-After` when throttling (Slack, Microsoft Graph, Notion).
+`UpstreamRateLimiter` keeps a token bucket per (provider, credential) whose
+refill rate is learned from those headers. Pacing only starts once the
+remaining quota drops below a low-water mark (UPSTREAM_RATE_LIMIT_LOW_WATER
+of the window's limit, a tenth by default); from then on requests are spread over the rest of the window
+before the provider starts returning 429s. A credential with most of its
+quota left is never slowed down.
+
+The number of credentials currently paced or blocked is exported per
+provider (never per credential) as sagemcp_upstream_quota_paced_credentials.
+
+Callers reserve a slot synchronously and then sleep until it comes up, so
+concurrent requests sharing a credential are released in arrival order
+instead of all retrying at the same moment.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Mapping, Optional, Set, Tuple
+
+import httpx
+
+from .exceptions import ConnectorRateLimitError
+from .retry import _parse_retry_after
+from ..observability.metrics import adjust_upstream_quota_paced, record_upstream_throttle
+
+logger = logging.getLogger(__name__)
+
+# (remaining, limit, reset) header names, first match wins
+QUOTA_HEADER_SETS = (
+    ("x-ratelimit-remaining", "x-ratelimit-limit", "x-ratelimit-reset"),
+    ("ratelimit-remaining", "ratelimit-limit", "ratelimit-reset"),
+    ("x-ratelimit-requests-remaining", "x-ratelimit-requests-limit", "x-ratelimit-requests-reset"),
+)
+
+# Numeric reset values above these are absolute epochs rather than deltas.
+_EPOCH_SECONDS_THRESHOLD = 1_000_000_000
+_EPOCH_MILLIS_THRESHOLD = 1_000_000_000_000
+
+RateLimitKey = Tuple[str, str]
+
+
+@dataclass
+class QuotaSnapshot:
+    """Quota advertised by one upstream response."""
+
+    remaining: Optional[int] = None
+    limit: Optional[int] = None
+    reset_in: Optional[float] = None  # seconds until the window resets
+    retry_after: Optional[float] = None
+
+
+def _parse_reset(value: str, now: float) -> Optional[float]:
+    """Parse a reset header into seconds from now.
+
+    Accepts delta seconds, epoch seconds, epoch milliseconds (Linear) and
+    ISO-8601 timestamps (Atlassian).
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        try:
+            reset_at = datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+        return max(0.0, reset_at - now)
+    if number >= _EPOCH_MILLIS_THRESHOLD:
+        return max(0.0, number / 1000 - now)
+    if number >= _EPOCH_SECONDS_THRESHOLD:
+        return max(0.0, number - now)
+    return max(0.0, number)
+
+
+def parse_quota_headers(
+    response: httpx.Response, now: Optional[float] = None
+) -> QuotaSnapshot:
+    """Extract remaining quota, window reset and Retry-After from a response."""
+    if now is None:
+        now = time.time()
+    headers: Mapping[str, str] = response.headers
+    snapshot = QuotaSnapshot()
+
+    for remaining_name, limit_name, reset_name in QUOTA_HEADER_SETS:
+        remaining = headers.get(remaining_name)
+        if remaining is None:
+            continue
+        try:
+            snapshot.remaining = int(float(remaining))
+        except ValueError:
+            continue
+        limit = headers.get(limit_name)
+        if limit is not None:
+            try:
+                snapshot.limit = int(float(limit))
+            except ValueError:
+                pass
+        reset = headers.get(reset_name) or headers.get("x-ratelimit-reset-after")
+        if reset is not None:
+            snapshot.reset_in = _parse_reset(reset, now)
+        break
+
+    if response.status_code in (429, 503):
+        snapshot.retry_after = _parse_retry_after(response)
+    return snapshot
+
+
+class AdaptiveTokenBucket:
+    """Token bucket whose refill rate follows the advertised quota.
+
+    Unlimited while the advertised remaining quota is at or above the
+    low-water mark: `low_water_fraction` of the window's limit, and never
+    less than `burst` (which is also the mark when no limit is advertised).
+    Below it, tokens refill at remaining / seconds-until-reset, and once the
+    window resets the bucket is unlimited again until the next response. A
+    Retry-After blocks the bucket until it expires and then releases queued
+    callers at `burst` per Retry-After interval unless the headers say
+    otherwise.
+    """
+
+    def __init__(self, burst: int = 10, low_water_fraction: float = 0.1):
+        self.burst = max(1, burst)
+        self.low_water_fraction = low_water_fraction
+        self.capacity = float(self.burst)
+        self.tokens = float(self.burst)
+        self.refill_rate: Optional[float] = None  # tokens/second; None = unlimited
+        self.last_refill = 0.0  # monotonic time tokens were last topped up
+        self.window_ends: Optional[float] = None  # monotonic reset time
+
+    def learn(self, snapshot: QuotaSnapshot, now: Optional[float] = None):
+        """Update pacing from a response's quota snapshot."""
+        if now is None:
+            now = time.monotonic()
+
+        if snapshot.remaining is not None and snapshot.reset_in is not None:
+            window = max(snapshot.reset_in, 1.0)
+            if snapshot.remaining <= 0:
+                self.window_ends = now + window
+                self._block(now, window, self.refill_rate or self.burst / window)
+            elif snapshot.remaining < self.low_water(snapshot.limit):
+                self.window_ends = now + window
+                self.refill_rate = snapshot.remaining / window
+                self.capacity = float(max(1, min(self.burst, snapshot.remaining)))
+                self.tokens = min(self.tokens, self.capacity)
+            elif now >= self.last_refill:
+                # Plenty of quota left and no block pending: don't pace.
+                self._unlimit()
+
+        if snapshot.retry_after is not None:
+            retry_after = max(snapshot.retry_after, 0.0)
+            self._block(now, retry_after, self.refill_rate or self.burst / max(retry_after, 1.0))
+
+    def is_paced(self, now: Optional[float] = None) -> bool:
+        """Whether requests are currently paced or blocked."""
+        if now is None:
+            now = time.monotonic()
+        if self.refill_rate is None:
+            return False
+        return self.window_ends is None or now < self.window_ends
+
+    def low_water(self, limit: Optional[int]) -> float:
+        """Remaining quota below which requests are paced."""
+        if not limit:
+            return float(self.burst)
+        return max(float(self.burst), limit * self.low_water_fraction)
+
+    def _unlimit(self):
+        self.refill_rate = None
+        self.window_ends = None
+        self.capacity = float(self.burst)
+        self.tokens = self.capacity
+
+    def _block(self, now: float, seconds: float, rate: float):
+        # Refill restarts when the block ends; one token is ready at that moment.
+        self.refill_rate = rate
+        self.last_refill = max(self.last_refill, now + seconds)
+        self.tokens = min(self.tokens, 1.0)
+        self.window_ends = max(self.window_ends or 0.0, self.last_refill)
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        if now is None:
+            now = time.monotonic()
+
+        if self.window_ends is not None and now >= self.window_ends:
+            # Window reset and nothing newer was learned: stop pacing.
+            self._unlimit()
+        if self.refill_rate is None:
+            return 0.0
+
+        if now > self.last_refill:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate
+            )
+            self.last_refill = now
+
+        self.tokens -= 1.0
+        wait = max(0.0, self.last_refill - now)
+        if self.tokens < 0:
+            wait += -self.tokens / self.refill_rate
+        return wait
+
+    def cancel_reservation(self):
+        """Give back a token taken by reserve()."""
+        if self.refill_rate is not None:
+            self.tokens += 1.0
+
+
+class UpstreamRateLimiter:
+    """Per (provider, credential) pacing for connector HTTP requests."""
+
+    def __init__(
+        self,
+        burst: int = 10,
+        max_wait: float = 30.0,
+        max_buckets: int = 10000,
+        low_water_fraction: float = 0.1,
+    ):
+        self.burst = burst
+        self.low_water_fraction = low_water_fraction
+        self.max_wait = max_wait
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[RateLimitKey, AdaptiveTokenBucket]" = OrderedDict()
+        self._paced: Set[RateLimitKey] = set()
+
+    @staticmethod
+    def make_key(provider: str, credential: str) -> RateLimitKey:
+        """Build a bucket key; the credential is hashed, never stored."""
+        digest = hashlib.sha256(str(credential).encode("utf-8")).hexdigest()[:16]
+        return str(provider), digest
+
+    def _bucket(self, key: RateLimitKey) -> AdaptiveTokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = AdaptiveTokenBucket(burst=self.burst, low_water_fraction=self.low_water_fraction)
+            self._buckets[key] = bucket
+            while len(self._buckets) > self.max_buckets:
+                evicted, _ = self._buckets.popitem(last=False)
+                if evicted in self._paced:
+                    self._paced.discard(evicted)
+                    adjust_upstream_quota_paced(evicted[0], -1)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def _track_paced(self, key: RateLimitKey, bucket: AdaptiveTokenBucket):
+        """Keep the per-provider paced gauge in step with the buckets.
+
+        Only buckets already counted as paced are rechecked, so a window
+        that ends without further traffic is still uncounted promptly.
+        """
+        now = time.monotonic()
+        for other in [k for k in self._paced if k != key]:
+            if not self._buckets[other].is_paced(now):
+                self._paced.discard(other)
+                adjust_upstream_quota_paced(other[0], -1)
+        paced = bucket.is_paced(now)
+        if paced and key not in self._paced:
+            self._paced.add(key)
+            adjust_upstream_quota_paced(key[0], 1)
+        elif not paced and key in self._paced:
+            self._paced.discard(key)
+            adjust_upstream_quota_paced(key[0], -1)
+
+    async def acquire(self, key: RateLimitKey):
+        """Wait for this key's next slot.
+
+        Raises:
+            ConnectorRateLimitError: If the slot is further away than max_wait.
+        """
+        bucket = self._bucket(key)
+        wait = bucket.reserve()
+        self._track_paced(key, bucket)
+        if wait <= 0:
+            return
+        provider = key[0]
+        if wait > self.max_wait:
+            bucket.cancel_reservation()
+            record_upstream_throttle(provider, "rejected", 0.0)
+            raise ConnectorRateLimitError(
+                f"Upstream quota for {provider} exhausted; retry in {wait:.0f}s",
+                retry_after=wait,
+            )
+        record_upstream_throttle(provider, "paced", wait)
+        logger.debug("Pacing %s request for %.2fs", provider, wait)
+        await asyncio.sleep(wait)
+
+    def observe(self, key: RateLimitKey, response: httpx.Response):
+        """Learn from the quota headers of a response."""
+        if not isinstance(response, httpx.Response):
+            return
+        try:
+            snapshot = parse_quota_headers(response)
+        except (TypeError, ValueError, AttributeError) as e:
+            logger.debug("Ignoring unparseable quota headers from %s: %s", key[0], e)
+            return
+        if snapshot.remaining is None and snapshot.retry_after is None:
+            return
+        bucket = self._bucket(key)
+        bucket.learn(snapshot)
+        self._track_paced(key, bucket)
+
+
+_limiter: Optional[UpstreamRateLimiter] = None
+
+
+def get_upstream_rate_limiter() -> Optional[UpstreamRateLimiter]:
+    """Get the process-wide limiter, or None when disabled in Settings."""
+    global _limiter
+    if _limiter is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        if not settings.upstream_rate_limit_enabled:
+            return None
+        _limiter = UpstreamRateLimiter(
+            burst=settings.upstream_rate_limit_burst,
+            max_wait=settings.upstream_rate_limit_max_wait,
+            low_water_fraction=settings.upstream_rate_limit_low_water,
+        )
+    return _limiter
+
+
+async def send_paced(
+    provider: str,
+    credential: str,
+    send: Callable[[], Awaitable[httpx.Response]],
+) -> httpx.Response:
+    """Send one upstream request through the (provider, credential) bucket.
+
+    Waits for a slot before calling `send` and learns from the response's
+    quota headers afterwards. Sends immediately when pacing is disabled.
+    """
+    limiter = get_upstream_rate_limiter()
+    if limiter is None:
+        return await send()
+    key = limiter.make_key(provider, credential)
+    await limiter.acquire(key)
+    response = await send()
+    limiter.observe(key, response)
+    return response
@@ -1,5 +1,12 @@
-"""Connector registry for managing available connectors."""
+"""Connector registry for managing available connectors.
 
+Built-in connectors are declared in ``BUILTIN_CONNECTORS`` by module name
+and imported on first use: ``get_connector(ConnectorType.SLACK)`` imports
+``connectors/slack.py``, whose ``@register_connector`` decorator registers
+the instance. A worker only loads the connector types its tenants use.
+"""
+
+import importlib
 import json
 import logging
 from typing import Dict, List, Optional, Type, TYPE_CHECKING
@@ -13,13 +20,43 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Module (relative to this package) implementing each built-in connector type.
+BUILTIN_CONNECTORS: Dict[ConnectorType, str] = {
+    ConnectorType.GITHUB: "github",
+    ConnectorType.GITLAB: "gitlab",
+    ConnectorType.BITBUCKET: "bitbucket",
+    ConnectorType.GOOGLE_DOCS: "google_docs",
+    ConnectorType.GOOGLE_SHEETS: "google_sheets",
+    ConnectorType.GMAIL: "gmail",
+    ConnectorType.GOOGLE_SLIDES: "google_slides",
+    ConnectorType.NOTION: "notion",
+    ConnectorType.CONFLUENCE: "confluence",
+    ConnectorType.JIRA: "jira",
+    ConnectorType.LINEAR: "linear",
+    ConnectorType.SLACK: "slack",
+    ConnectorType.TEAMS: "teams",
+    ConnectorType.DISCORD: "discord",
+    ConnectorType.ZOOM: "zoom",
+    ConnectorType.OUTLOOK: "outlook",
+    ConnectorType.EXCEL: "excel",
+    ConnectorType.POWERPOINT: "powerpoint",
+    # AI coding tool intelligence connectors
+    ConnectorType.COPILOT: "copilot",
+    ConnectorType.CLAUDE_CODE: "claude_code",
+    ConnectorType.CODEX: "codex",
+    ConnectorType.CURSOR: "cursor",
+    ConnectorType.WINDSURF: "windsurf",
+}
+
 
 class ConnectorRegistry:
     """Registry for managing connector plugins."""
 
-    def __init__(self):
+    def __init__(self, lazy_modules: Optional[Dict[ConnectorType, str]] = None):
         self._connectors: Dict[str, BaseConnector] = {}
         self._connector_types: Dict[ConnectorType, str] = {}
+        # Declared but not yet imported: connector type -> module name.
+        self._lazy_modules: Dict[ConnectorType, str] = dict(lazy_modules or {})
 
     def register(self, connector_type: ConnectorType, connector_class: Type[BaseConnector]):
         """Register a connector plugin."""
@@ -28,14 +65,38 @@ class ConnectorRegistry:
 
         self._connectors[connector_name] = connector_instance
         self._connector_types[connector_type] = connector_name
+        self._lazy_modules.pop(connector_type, None)
 
         logger.info("Registered connector: %s (%s)", connector_name, connector_type.value)
 
+    def declare(self, connector_type: ConnectorType, module: str):
+        """Declare the module implementing a connector type without importing it."""
+        if connector_type not in self._connector_types:
+            self._lazy_modules[connector_type] = module
+
+    def _load(self, connector_type: ConnectorType):
+        module = self._lazy_modules.get(connector_type)
+        if module is None:
+            return
+        importlib.import_module(f".{module}", __package__)
+        if self._lazy_modules.pop(connector_type, None) is not None:
+            logger.warning("Module %s did not register connector %s", module, connector_type.value)
+
+    def load_all(self):
+        """Import every declared connector."""
+        for connector_type in list(self._lazy_modules):
+            self._load(connector_type)
+
     def get_connector(self, connector_type: ConnectorType) -> Optional[BaseConnector]:
         """Get a connector instance by type (for native connectors only)."""
         connector_name = self._connector_types.get(connector_type)
         if not connector_name:
-            return None
+            if connector_type not in self._lazy_modules:
+                return None
+            self._load(connector_type)
+            connector_name = self._connector_types.get(connector_type)
+            if not connector_name:
+                return None
 
         return self._connectors.get(connector_name)
 
@@ -48,7 +109,8 @@ class ConnectorRegistry:
 
         This method checks the runtime_type and returns either:
         - A native Python connector (for runtime_type == NATIVE)
-        - A GenericMCPConnector via process_manager (for external runtime types)
+        - A GenericMCPConnector via process_manager (for external runtime types;
+          a StreamableHTTPMCPConnector for external_http)
 
         For external connectors, delegates to MCPProcessManager.get_or_create()
         to ensure process reuse across requests.
@@ -75,15 +137,18 @@ class ConnectorRegistry:
 
     def get_connector_by_name(self, name: str) -> Optional[BaseConnector]:
         """Get a connector instance by name."""
+        if name not in self._connectors and self._lazy_modules:
+            # Names come from the connector classes, so look in every module.
+            self.load_all()
         return self._connectors.get(name)
 
     def list_connectors(self) -> List[str]:
-        """List all registered connector names."""
+        """List the names of connectors loaded so far."""
         return list(self._connectors.keys())
 
     def list_connector_types(self) -> List[ConnectorType]:
-        """List all registered connector types."""
-        return list(self._connector_types.keys())
+        """List all registered or declared connector types."""
+        return list(dict.fromkeys([*self._connector_types, *self._lazy_modules]))
 
     def get_connector_info(self, connector_type: ConnectorType) -> Optional[Dict[str, str]]:
         """Get connector information."""
@@ -101,7 +166,7 @@ class ConnectorRegistry:
 
 
 # Global connector registry instance
-connector_registry = ConnectorRegistry()
+connector_registry = ConnectorRegistry(BUILTIN_CONNECTORS)
 
 
 def register_connector(connector_type: ConnectorType):
@@ -0,0 +1,194 @@
+"""Conditional-request (ETag / Last-Modified) cache for connector GETs.
+
+GitHub, GitLab, Microsoft Graph and Google APIs return validators on most
+reads, and a GitHub 304 does not count against the rate limit. Responses
+carrying an ETag or Last-Modified are kept per request identity (credential,
+URL, params, headers; see `coalesce_key`) and the next identical GET is sent
+with If-None-Match / If-Modified-Since. On 304 the cached body is served as
+a normal 200 response.
+
+Paths listed in UPSTREAM_RESPONSE_CACHE_TTLS are additionally served
+straight from the cache for a few seconds without any upstream call, for
+slow-changing endpoints such as `/user` or org lists.
+
+Memory is bounded by total body bytes with least-recently-used eviction.
+"""
+
+import fnmatch
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, MutableMapping, Optional
+
+import httpx
+
+from .coalesce import coalesce_key
+from ..observability.metrics import record_upstream_cache, set_upstream_cache_bytes
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the stored body and are replayed on a cache hit.
+_REPLAYED_HEADERS = ("content-type", "etag", "last-modified", "link", "cache-control")
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    stored_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def to_response(self, request: Optional[httpx.Request]) -> httpx.Response:
+        return httpx.Response(
+            self.status_code, headers=self.headers, content=self.content, request=request
+        )
+
+
+class ConditionalResponseCache:
+    """LRU (by body bytes) store of validated GET responses."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, ttls: Optional[Dict[str, float]] = None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max(1, max_bytes // 10)
+        self.ttls = dict(ttls or {})
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+
+    def ttl_for(self, url: str) -> float:
+        """Freshness lifetime for a URL; patterns are globs over host + path."""
+        parsed = httpx.URL(url)
+        target = f"{parsed.host}{parsed.path}"
+        for pattern, ttl in self.ttls.items():
+            if fnmatch.fnmatchcase(target, pattern):
+                return ttl
+        return 0.0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, response: httpx.Response, now: Optional[float] = None):
+        """Store a 200 response that carries a validator."""
+        cache_control = response.headers.get("cache-control", "").lower()
+        if "no-store" in cache_control:
+            return
+        content = response.content
+        if len(content) > self.max_entry_bytes:
+            return
+        entry = CachedResponse(
+            status_code=response.status_code,
+            headers={
+                k.lower(): v for k, v in response.headers.items() if k.lower() in _REPLAYED_HEADERS
+            },
+            content=content,
+            stored_at=time.monotonic() if now is None else now,
+        )
+        self.discard(key)
+        self._entries[key] = entry
+        self.total_bytes += entry.size
+        while self.total_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+        set_upstream_cache_bytes(self.total_bytes)
+
+    def discard(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: Optional[ConditionalResponseCache] = None
+
+
+def get_response_cache() -> Optional[ConditionalResponseCache]:
+    """Get the process-wide response cache, or None when disabled in Settings."""
+    global _cache
+    if _cache is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        if not settings.upstream_response_cache_enabled:
+            return None
+        _cache = ConditionalResponseCache(
+            max_bytes=settings.upstream_response_cache_max_bytes,
+            ttls=settings.get_upstream_response_cache_ttls(),
+        )
+    return _cache
+
+
+def _has_validator(response: httpx.Response) -> bool:
+    return "etag" in response.headers or "last-modified" in response.headers
+
+
+def is_not_modified(response: httpx.Response) -> bool:
+    """True for a 304 answering a conditional request, which is not an error.
+
+    httpx's raise_for_status() rejects 304, so senders check this first and
+    hand the response back to `send_conditional` to swap in the cached body.
+    """
+    if response.status_code != 304:
+        return False
+    request = response._request
+    return request is not None and (
+        "if-none-match" in request.headers or "if-modified-since" in request.headers
+    )
+
+
+async def send_conditional(
+    credential: str,
+    method: str,
+    url: str,
+    kwargs: MutableMapping[str, Any],
+    send: Callable[[], Awaitable[httpx.Response]],
+) -> httpx.Response:
+    """Send a GET with cached validators and serve the cached body on 304.
+
+    `send` issues the request from `kwargs`; the validator headers are
+    added to a copy of kwargs["headers"] before it is called.
+    """
+    cache = get_response_cache()
+    key = coalesce_key(credential, method, url, kwargs) if cache is not None else None
+    if key is None:
+        return await send()
+
+    host = httpx.URL(url).host
+    entry = cache.get(key)
+    if entry is not None:
+        ttl = cache.ttl_for(url)
+        if ttl and time.monotonic() - entry.stored_at < ttl:
+            record_upstream_cache(host, "fresh")
+            return entry.to_response(httpx.Request(method, url))
+        headers = dict(kwargs.get("headers") or {})
+        if "etag" in entry.headers:
+            headers["If-None-Match"] = entry.headers["etag"]
+        if "last-modified" in entry.headers:
+            headers["If-Modified-Since"] = entry.headers["last-modified"]
+        kwargs["headers"] = headers
+
+    response = await send()
+    if not isinstance(response, httpx.Response):
+        return response
+
+    if response.status_code == 304 and entry is not None:
+        record_upstream_cache(host, "revalidated")
+        # Restart the freshness lifetime: the upstream just confirmed the body.
+        entry.stored_at = time.monotonic()
+        return entry.to_response(response.request)
+
+    record_upstream_cache(host, "miss")
+    if response.status_code == 200 and _has_validator(response):
+        cache.put(key, response)
+    elif entry is not None:
+        cache.discard(key)
+        set_upstream_cache_bytes(cache.total_bytes)
+    return response
@@ -6,6 +6,8 @@ Transparent to callers — wrap any async callable and it retries on transient f
 import asyncio
 import logging
 import random
+import time
+from email.utils import parsedate_to_datetime
 from typing import Any, Callable, Awaitable, Set
 
 import httpx
@@ -159,11 +161,18 @@ def _compute_delay(
 
 
 def _parse_retry_after(response: httpx.Response) -> float | None:
-    """Parse Retry-After header (seconds only, not HTTP-date)."""
+    """Parse Retry-After header as delay seconds or an HTTP-date."""
     value = response.headers.get("Retry-After") or response.headers.get("retry-after")
     if value is None:
         return None
     try:
         return float(value)
     except (ValueError, TypeError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (ValueError, TypeError):
+        return None
+    if retry_at is None:
         return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -1,12 +1,72 @@
-"""Database connection and session management."""
+"""Database connection and session management.
 
+Sessions are routed by workload so slow jobs cannot starve the request path:
+
+- ``primary``: writes and request-scoped work (the default).
+- ``read``: hot-path reads (MCP server loads, credential lookups). Uses the
+  DATABASE_READ_URL replica when set, otherwise the primary engine.
+- ``background``: discovery sync, usage flushing, process health and token
+  refresh. Uses its own small engine unless DB_BACKGROUND_POOL_SIZE is 0.
+
+Pool sizing, timeouts and recycling come from Settings. Checkout wait time
+and pool occupancy are exported as Prometheus metrics.
+"""
+
+import time
+import uuid
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from ..config import get_settings
+from ..observability.metrics import record_db_pool_checkout, set_db_pool_connections
+
+PRIMARY = "primary"
+READ = "read"
+BACKGROUND = "background"
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports checkout wait time and occupancy.
+
+    The pool's logging name doubles as the ``pool`` metric label; it is
+    carried over when SQLAlchemy recreates the pool.
+    """
+
+    @property
+    def workload(self) -> str:
+        return self._orig_logging_name or PRIMARY
+
+    def _report(self):
+        capacity = self.size() + max(self._max_overflow, 0)
+        set_db_pool_connections(self.workload, self.checkedout(), self.checkedin(), capacity)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            record_db_pool_checkout(self.workload, time.perf_counter() - start, timed_out=True)
+            raise
+        record_db_pool_checkout(self.workload, time.perf_counter() - start)
+        self._report()
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._report()
+
+
+def _async_url(database_url: str) -> str:
+    # Convert postgres:// to postgresql+asyncpg://
+    if database_url.startswith("postgresql://"):
+        return database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if database_url.startswith("postgres://"):
+        return database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    return database_url
 
 
 class DatabaseManager:
@@ -16,22 +76,10 @@ class DatabaseManager:
         self.settings = get_settings()
         self.engine = None
         self.session_factory = None
+        self.engines: Dict[str, AsyncEngine] = {}
+        self.session_factories: Dict[str, async_sessionmaker] = {}
 
-    def initialize(self):
-        """Initialize database engine and session factory."""
-        # Get the appropriate database URL based on provider
-        # For Supabase, always use the generated URL regardless of DATABASE_URL env var
-        if self.settings.database_provider == "supabase":
-            database_url = self.settings.get_database_url()
-        else:
-            database_url = self.settings.database_url
-        
-        # Convert postgres:// to postgresql+asyncpg://
-        if database_url.startswith("postgresql://"):
-            database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-        elif database_url.startswith("postgres://"):
-            database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-
+    def _create_engine(self, database_url: str, workload: str, pool_size: int, max_overflow: int) -> AsyncEngine:
         # Add connection arguments for Supabase compatibility
         connect_args = {}
         if self.settings.database_provider == "supabase":
@@ -39,26 +87,86 @@ class DatabaseManager:
             connect_args.update({
                 "ssl": "require",
                 "server_settings": {
-                    "application_name": "sagemcp"
+                    "application_name": f"sagemcp-{workload}"
                 }
             })
 
-        self.engine = create_async_engine(
+        database_url = _async_url(database_url)
+        if database_url.startswith("postgresql+asyncpg"):
+            # asyncpg prepares every statement; keep the hot ones per connection.
+            connect_args["prepared_statement_cache_size"] = self.settings.db_prepared_statement_cache_size
+            if self.settings.database_provider == "supabase":
+                # The transaction pooler may hand each statement a different
+                # backend, so prepared statement names must never collide.
+                connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+        if self.settings.environment == "test" or database_url.startswith("sqlite"):
+            # SQLite and tests do not benefit from pooling; keep the old behaviour.
+            pool_kwargs = {"poolclass": NullPool} if self.settings.environment == "test" else {}
+        else:
+            pool_kwargs = {
+                "poolclass": InstrumentedQueuePool,
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": self.settings.db_pool_timeout,
+                "pool_recycle": self.settings.db_pool_recycle,
+                "pool_pre_ping": self.settings.db_pool_pre_ping,
+                "pool_logging_name": workload,
+            }
+
+        return create_async_engine(
             database_url,
-            poolclass=NullPool if self.settings.environment == "test" else None,
             echo=self.settings.debug,
             connect_args=connect_args,
+            **pool_kwargs,
         )
 
-        self.session_factory = async_sessionmaker(
-            bind=self.engine,
-            class_=AsyncSession,
-            expire_on_commit=False
+    def initialize(self):
+        """Initialize database engines and session factories."""
+        settings = self.settings
+        # Get the appropriate database URL based on provider
+        # For Supabase, always use the generated URL regardless of DATABASE_URL env var
+        if settings.database_provider == "supabase":
+            database_url = settings.get_database_url()
+        else:
+            database_url = settings.database_url
+
+        self.engine = self._create_engine(
+            database_url, PRIMARY, settings.db_pool_size, settings.db_max_overflow
         )
+        self.engines = {PRIMARY: self.engine}
+        if settings.database_read_url:
+            self.engines[READ] = self._create_engine(
+                settings.database_read_url, READ, settings.db_pool_size, settings.db_max_overflow
+            )
+        if settings.db_background_pool_size > 0:
+            self.engines[BACKGROUND] = self._create_engine(
+                database_url,
+                BACKGROUND,
+                settings.db_background_pool_size,
+                settings.db_background_max_overflow,
+            )
+
+        self.session_factories = {
+            workload: async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+            for workload, engine in self.engines.items()
+        }
+        self.session_factory = self.session_factories[PRIMARY]
+
+    def get_session_factory(self, workload: str = PRIMARY) -> async_sessionmaker:
+        """Session factory for a workload, falling back to the primary engine."""
+        if not self.session_factory:
+            self.initialize()
+        return self.session_factories.get(workload, self.session_factory)
+
+    def pool_status(self) -> Dict[str, Optional[str]]:
+        """Human-readable pool state per workload, for diagnostics."""
+        return {workload: engine.pool.status() for workload, engine in self.engines.items()}
 
     async def close(self):
         """Close database connections."""
-        if self.engine:
+        for engine in self.engines.values():
+            await engine.dispose()
+        if self.engine and not self.engines:
             await self.engine.dispose()
 
 
@@ -66,12 +174,8 @@ class DatabaseManager:
 db_manager = DatabaseManager()
 
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session."""
-    if not db_manager.session_factory:
-        db_manager.initialize()
-
-    async with db_manager.session_factory() as session:
+async def _session_for(workload: str) -> AsyncGenerator[AsyncSession, None]:
+    async with db_manager.get_session_factory(workload)() as session:
         try:
             yield session
         except Exception:
@@ -81,8 +185,19 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get database session."""
+    async for session in _session_for(PRIMARY):
+        yield session
+
+
 @asynccontextmanager
-async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
-    """Context manager to get database session."""
-    async for session in get_db_session():
+async def get_db_context(workload: str = PRIMARY) -> AsyncGenerator[AsyncSession, None]:
+    """Context manager to get database session.
+
+    Args:
+        workload: ``primary`` (default), ``read`` for hot-path reads that
+            tolerate replica lag, or ``background`` for periodic jobs.
+    """
+    async for session in _session_for(workload):
         yield session
@@ -1,9 +1,27 @@
-"""Database migration utilities."""
+"""Database migration utilities.
+
+Startup goes through ``run_migrations``, which applies the ``MIGRATIONS``
+list in order and records each version in ``schema_migrations``. When every
+version is recorded it returns after a single SELECT. Otherwise it takes a
+Postgres advisory lock, so only one replica migrates while the others wait
+and then find the schema current.
+
+``MIGRATIONS`` is append-only: a schema change (including a new table,
+since ``create_tables`` only runs while version 1 is pending) needs a new
+entry with the next version. Steps must stay idempotent; a step that fails
+is not recorded and runs again next time.
+
+``sagemcp db migrate`` runs the same code ahead of a deploy.
+"""
 
 import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
 
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncEngine
-from sqlalchemy import text
+from sqlalchemy import Column, DateTime, Integer, String, Table, func, insert, select, text
 
 from ..models.base import Base
 from ..models.connector_tool_state import ConnectorToolState
@@ -175,7 +193,8 @@ async def upgrade_add_custom_connector_type(engine: AsyncEngine = None):
 async def upgrade_add_runtime_type_values(engine: AsyncEngine = None):
     """Migration: Add all ConnectorRuntimeType values to enum.
 
-    Adds external_python, external_nodejs, external_go, external_custom values.
+    Adds external_python, external_nodejs, external_go, external_custom,
+    external_http values.
     Safe to run on existing databases - checks if each value exists first.
     """
     if engine is None:
@@ -185,7 +204,7 @@ async def upgrade_add_runtime_type_values(engine: AsyncEngine = None):
 
     runtime_values = [
         'native', 'external_python', 'external_nodejs',
-        'external_go', 'external_custom'
+        'external_go', 'external_custom', 'external_http'
     ]
 
     async with engine.begin() as conn:
@@ -502,3 +521,205 @@ async def upgrade_create_api_keys_table(engine: AsyncEngine = None):
             lambda sync_conn: APIKey.__table__.create(sync_conn, checkfirst=True)
         )
     logger.debug("api_keys table ready")
+
+
+async def upgrade_add_api_key_verifier(engine: AsyncEngine = None):
+    """Migration: Add the indexed HMAC verifier column to api_keys.
+
+    Existing keys keep a NULL verifier until they are next used, when it is
+    filled in after a successful bcrypt check.
+    """
+    if engine is None:
+        if not db_manager.engine:
+            db_manager.initialize()
+        engine = db_manager.engine
+
+    async with engine.begin() as conn:
+        result = await conn.execute(text(
+            "SELECT EXISTS (SELECT FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND table_name = 'api_keys' "
+            "AND column_name = 'key_verifier')"
+        ))
+        if not result.scalar():
+            await conn.execute(text("ALTER TABLE api_keys ADD COLUMN key_verifier VARCHAR(64)"))
+            await conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_api_keys_key_verifier ON api_keys (key_verifier)"
+            ))
+            print("✓ Added key_verifier column to api_keys table")
+        else:
+            print("✓ key_verifier column already exists in api_keys table")
+
+
+async def upgrade_create_tool_usage_table(engine: AsyncEngine = None):
+    """Migration: Create the tool_usage table for per-tenant, per-tool daily counts."""
+    if engine is None:
+        if not db_manager.engine:
+            db_manager.initialize()
+        engine = db_manager.engine
+
+    from ..models.tool_usage import ToolUsage
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: ToolUsage.__table__.create(sync_conn, checkfirst=True)
+        )
+    print("✓ tool_usage table ready")
+
+
+# Registry search matches ILIKE '%term%' on these columns; pg_trgm GIN
+# indexes serve such substring matches without a sequential scan.
+_REGISTRY_SEARCH_COLUMNS = ("name", "display_name", "description")
+
+
+async def upgrade_add_list_indexes(engine: AsyncEngine = None):
+    """Migration: Add indexes behind the paginated list endpoints.
+
+    Creates the registry popularity index and the per-tenant connector name
+    index on every database. On PostgreSQL it also enables pg_trgm and adds
+    trigram indexes for registry search. If the extension cannot be created,
+    for example because of missing privileges, search still works without
+    those indexes and a warning is logged.
+    """
+    from ..models.connector import Connector
+
+    if engine is None:
+        if not db_manager.engine:
+            db_manager.initialize()
+        engine = db_manager.engine
+
+    list_indexes = [
+        index
+        for table in (MCPServerRegistry.__table__, Connector.__table__)
+        for index in table.indexes
+        if index.name in ("ix_mcp_server_registry_popularity", "ix_connectors_tenant_name")
+    ]
+
+    async with engine.begin() as conn:
+        for index in list_indexes:
+            await conn.run_sync(lambda sync_conn, index=index: index.create(sync_conn, checkfirst=True))
+
+        if conn.dialect.name == "postgresql":
+            await _add_registry_trigram_indexes(conn)
+    print("✓ List and search indexes ready")
+
+
+async def _add_registry_trigram_indexes(conn):
+    try:
+        async with conn.begin_nested():
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError as e:
+        logger.warning("pg_trgm is unavailable, registry search stays unindexed: %s", e)
+        return
+
+    for column in _REGISTRY_SEARCH_COLUMNS:
+        await conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_mcp_server_registry_{column}_trgm "
+            f"ON mcp_server_registry USING gin ({column} gin_trgm_ops)"
+        ))
+
+
+# --------------------------------------------------------------------------- #
+# Versioned runner
+# --------------------------------------------------------------------------- #
+
+schema_migrations = Table(
+    "schema_migrations",
+    Base.metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+Migration = Callable[[AsyncEngine], Awaitable[None]]
+
+MIGRATIONS: List[Tuple[int, Migration]] = [
+    (1, create_tables),
+    (2, upgrade_add_external_mcp_runtime),
+    (3, upgrade_add_custom_connector_type),
+    (4, upgrade_add_runtime_type_values),
+    (5, upgrade_add_process_status_values),
+    (6, upgrade_remove_connector_unique_constraint),
+    (7, upgrade_add_mcp_server_registry),
+    (8, upgrade_encrypt_existing_secrets),
+    (9, upgrade_create_api_keys_table),
+    (10, upgrade_add_api_key_verifier),
+    (11, upgrade_create_tool_usage_table),
+    (12, upgrade_add_list_indexes),
+]
+
+# pg_advisory_lock key shared by every replica ("sagemcp" in ASCII).
+_MIGRATION_LOCK_KEY = 0x736167656D6370
+
+
+def _engine(engine: Optional[AsyncEngine]) -> AsyncEngine:
+    if engine is None:
+        if not db_manager.engine:
+            db_manager.initialize()
+        engine = db_manager.engine
+    return engine
+
+
+async def applied_versions(engine: AsyncEngine = None) -> Optional[Set[int]]:
+    """Versions recorded in schema_migrations, or None if the table does not exist yet."""
+    engine = _engine(engine)
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(select(schema_migrations.c.version))
+            return set(result.scalars())
+    except DBAPIError:
+        return None
+
+
+def pending_migrations(
+    applied: Optional[Set[int]], migrations: List[Tuple[int, Migration]] = None
+) -> List[Tuple[int, Migration]]:
+    """Migrations not yet recorded, in order."""
+    migrations = MIGRATIONS if migrations is None else migrations
+    return [(version, step) for version, step in migrations if not applied or version not in applied]
+
+
+@asynccontextmanager
+async def _migration_lock(engine: AsyncEngine):
+    """Hold the cluster-wide migration lock (Postgres only)."""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    async with engine.connect() as conn:
+        # Autocommit so the lock holder is not left idle in a transaction.
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+        try:
+            yield
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+
+
+async def run_migrations(
+    engine: AsyncEngine = None, migrations: List[Tuple[int, Migration]] = None
+) -> List[int]:
+    """Apply pending migrations in order and return the versions applied."""
+    engine = _engine(engine)
+    migrations = MIGRATIONS if migrations is None else migrations
+
+    if not pending_migrations(await applied_versions(engine), migrations):
+        logger.debug("Database schema is current")
+        return []
+
+    applied_now: List[int] = []
+    async with _migration_lock(engine):
+        # Another replica may have finished while this one waited for the lock.
+        pending = pending_migrations(await applied_versions(engine), migrations)
+        if pending:
+            async with engine.begin() as conn:
+                await conn.run_sync(lambda sync_conn: schema_migrations.create(sync_conn, checkfirst=True))
+
+        for version, step in pending:
+            started = time.monotonic()
+            await step(engine)
+            async with engine.begin() as conn:
+                await conn.execute(insert(schema_migrations).values(version=version, name=step.__name__))
+            applied_now.append(version)
+            logger.info(
+                "Applied migration %d (%s) in %.2fs", version, step.__name__, time.monotonic() - started
+            )
+    return applied_now
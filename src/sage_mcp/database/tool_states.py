@@ -0,0 +1,102 @@
+"""Set-based writes to connector_tool_states.
+
+Each helper issues a single statement for any number of tools (a VALUES
+list with ON CONFLICT, or an UPDATE/DELETE over a list of names) and
+returns the names it affected via RETURNING. Callers commit and invalidate
+the server pool once.
+
+Name lists are bound as one array parameter (``= ANY(:names)``) on
+PostgreSQL so the statement text, and its prepared statement, does not
+change with the list length; other dialects use an expanding IN.
+"""
+
+import uuid
+from typing import Iterable, List, Mapping
+
+from sqlalchemy import String, bindparam, delete, func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import any_
+
+from ..models.connector_tool_state import ConnectorToolState
+
+# Rows per INSERT; 4 parameters each stays under PostgreSQL's 32767 limit.
+_INSERT_CHUNK_ROWS = 5000
+
+
+def _is_postgres(session: AsyncSession) -> bool:
+    return session.bind.dialect.name == "postgresql"
+
+
+def _insert(session: AsyncSession):
+    return (postgresql if _is_postgres(session) else sqlite).insert(ConnectorToolState)
+
+
+def _name_in(session: AsyncSession, names: List[str]):
+    if _is_postgres(session):
+        return ConnectorToolState.tool_name == any_(
+            bindparam("tool_names", names, type_=postgresql.ARRAY(String))
+        )
+    return ConnectorToolState.tool_name.in_(names)
+
+
+def _rows(connector_id: uuid.UUID, states: Mapping[str, bool]) -> List[dict]:
+    return [
+        {"id": uuid.uuid4(), "connector_id": connector_id, "tool_name": name, "is_enabled": enabled}
+        for name, enabled in states.items()
+    ]
+
+
+async def upsert_tool_states(
+    session: AsyncSession, connector_id: uuid.UUID, states: Mapping[str, bool]
+) -> List[str]:
+    """Set the enabled flag of each named tool, creating missing rows; returns the names written."""
+    written: List[str] = []
+    rows = _rows(connector_id, states)
+    for start in range(0, len(rows), _INSERT_CHUNK_ROWS):
+        stmt = _insert(session).values(rows[start:start + _INSERT_CHUNK_ROWS])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["connector_id", "tool_name"],
+            set_={"is_enabled": stmt.excluded.is_enabled, "updated_at": func.now()},
+        ).returning(ConnectorToolState.tool_name)
+        written.extend((await session.execute(stmt)).scalars())
+    return written
+
+
+async def insert_missing_tool_states(
+    session: AsyncSession, connector_id: uuid.UUID, names: Iterable[str], is_enabled: bool = True
+) -> List[str]:
+    """Create rows for tools that have none, leaving existing rows alone; returns the names added."""
+    added: List[str] = []
+    rows = _rows(connector_id, dict.fromkeys(names, is_enabled))
+    for start in range(0, len(rows), _INSERT_CHUNK_ROWS):
+        stmt = (
+            _insert(session)
+            .values(rows[start:start + _INSERT_CHUNK_ROWS])
+            .on_conflict_do_nothing(index_elements=["connector_id", "tool_name"])
+            .returning(ConnectorToolState.tool_name)
+        )
+        added.extend((await session.execute(stmt)).scalars())
+    return added
+
+
+async def set_all_tool_states(session: AsyncSession, connector_id: uuid.UUID, is_enabled: bool) -> int:
+    """Enable or disable every existing row of a connector; returns the row count."""
+    result = await session.execute(
+        update(ConnectorToolState)
+        .where(ConnectorToolState.connector_id == connector_id)
+        .values(is_enabled=is_enabled, updated_at=func.now())
+    )
+    return result.rowcount
+
+
+async def delete_tool_states_except(
+    session: AsyncSession, connector_id: uuid.UUID, keep: Iterable[str]
+) -> List[str]:
+    """Delete rows for tools not in *keep*; returns the names removed."""
+    stmt = delete(ConnectorToolState).where(ConnectorToolState.connector_id == connector_id)
+    keep = list(keep)
+    if keep:
+        stmt = stmt.where(~_name_in(session, keep))
+    stmt = stmt.returning(ConnectorToolState.tool_name)
+    return list((await session.execute(stmt)).scalars())
@@ -12,7 +12,7 @@ from sqlalchemy.exc import IntegrityError
 from .base import MCPServerMetadata
 from .npm_provider import NPMDiscoveryProvider
 from .github_provider import GitHubDiscoveryProvider
-from ..database.connection import get_db_context
+from ..database.connection import BACKGROUND, get_db_context
 from ..models.mcp_server_registry import (
     MCPServerRegistry,
     DiscoveryJob,
@@ -111,7 +111,7 @@ class DiscoveryManager:
 
         logger.info(f"Syncing {len(servers)} servers to database")
 
-        async with get_db_context() as session:
+        async with get_db_context(BACKGROUND) as session:
             for server in servers:
                 try:
                     # Check if server exists (by source_type + source_url)
@@ -245,7 +245,7 @@ class DiscoveryManager:
         logger.info(f"Starting discovery job {job_id} (type={job_type}, query='{query}')")
 
         # Create job record
-        async with get_db_context() as session:
+        async with get_db_context(BACKGROUND) as session:
             job = DiscoveryJob(
                 id=job_id,
                 job_type=job_type,
@@ -271,7 +271,7 @@ class DiscoveryManager:
             stats = await self.sync_to_database(servers)
 
             # Update job status
-            async with get_db_context() as session:
+            async with get_db_context(BACKGROUND) as session:
                 await session.execute(
                     update(DiscoveryJob)
                     .where(DiscoveryJob.id == job_id)
@@ -291,7 +291,7 @@ class DiscoveryManager:
             logger.error(f"Discovery job {job_id} failed: {e}")
 
             # Update job with error
-            async with get_db_context() as session:
+            async with get_db_context(BACKGROUND) as session:
                 await session.execute(
                     update(DiscoveryJob)
                     .where(DiscoveryJob.id == job_id)
@@ -316,7 +316,7 @@ class DiscoveryManager:
         Returns:
             Job status dict or None if not found
         """
-        async with get_db_context() as session:
+        async with get_db_context(BACKGROUND) as session:
             result = await session.execute(
                 select(DiscoveryJob).where(DiscoveryJob.id == job_id)
             )
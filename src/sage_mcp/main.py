@@ -9,25 +9,13 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import PlainTextResponse
 
+from .api.pagination import NEXT_CURSOR_HEADER
 from .api.routes import router as api_router
 from .config import get_settings
 from .database.connection import db_manager
-from .database.migrations import (
-    create_tables,
-    upgrade_add_external_mcp_runtime,
-    upgrade_add_custom_connector_type,
-    upgrade_add_runtime_type_values,
-    upgrade_add_process_status_values,
-    upgrade_remove_connector_unique_constraint,
-    upgrade_add_mcp_server_registry,
-    upgrade_encrypt_existing_secrets,
-    upgrade_create_api_keys_table,
-)
+from .database.migrations import run_migrations
 from .observability.logging import configure_logging
 
-# Import connectors to register them
-from .connectors import github  # noqa
-
 logger = logging.getLogger(__name__)
 
 
@@ -46,22 +34,11 @@ async def lifespan(app: FastAPI):
     # Initialize database
     db_manager.initialize()
 
-    # Create tables if they don't exist
-    await create_tables()
-
-    # Run migrations
-    await upgrade_add_external_mcp_runtime()
-    await upgrade_add_custom_connector_type()
-    await upgrade_add_runtime_type_values()
-    await upgrade_add_process_status_values()
-    await upgrade_remove_connector_unique_constraint()
-    await upgrade_add_mcp_server_registry()
-
-    # Encrypt existing plaintext secrets in DB
-    await upgrade_encrypt_existing_secrets()
-
-    # Create api_keys table (Phase 2: API key auth)
-    await upgrade_create_api_keys_table()
+    # Bring the schema up to date (a single query when it already is)
+    if settings.migrate_on_startup:
+        await run_migrations()
+    else:
+        logger.info("Skipping migrations on startup (MIGRATE_ON_STARTUP=false)")
 
     # Bootstrap admin API key if auth is enabled and no keys exist
     if settings.enable_auth:
@@ -103,17 +80,29 @@ async def lifespan(app: FastAPI):
     # Set MCP allowed origins (Phase 2.4)
     app.state.mcp_allowed_origins = settings.get_mcp_allowed_origins()
 
-    # Initialize and periodically flush in-memory daily tool-call counter.
-    from .observability.metrics import (
-        bootstrap_tool_calls_today_from_db,
-        run_tool_usage_flush_loop,
-    )
-    await bootstrap_tool_calls_today_from_db()
+    # Aggregate tool usage in memory and write it behind in batches.
+    from .observability.usage import bootstrap_usage_from_db, run_usage_flush_loop
+    await bootstrap_usage_from_db()
     app.state.tool_usage_flush_stop = asyncio.Event()
     app.state.tool_usage_flush_task = asyncio.create_task(
-        run_tool_usage_flush_loop(app.state.tool_usage_flush_stop, interval_seconds=60.0)
+        run_usage_flush_loop(
+            app.state.tool_usage_flush_stop,
+            interval_seconds=settings.usage_flush_interval_seconds,
+        )
     )
 
+    # Refresh OAuth tokens ahead of expiry.
+    app.state.oauth_refresh_stop = asyncio.Event()
+    app.state.oauth_refresh_task = None
+    if settings.oauth_refresh_enabled:
+        from .security.oauth_refresh import run_token_refresh_loop
+        app.state.oauth_refresh_task = asyncio.create_task(
+            run_token_refresh_loop(
+                app.state.oauth_refresh_stop,
+                interval_seconds=settings.oauth_refresh_interval_seconds,
+            )
+        )
+
     logger.info("%s v%s started", settings.app_name, settings.app_version)
     logger.info("Environment: %s", settings.environment)
     logger.info("Database: Connected")
@@ -124,15 +113,25 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Sage MCP...")
 
-    # Stop periodic flush loop and persist remaining daily counter increments.
-    from .observability.metrics import flush_tool_calls_today_to_db
+    # Stop the usage flush loop and write out all pending usage.
+    from .observability.usage import get_usage_aggregator
     flush_stop = getattr(app.state, "tool_usage_flush_stop", None)
     flush_task = getattr(app.state, "tool_usage_flush_task", None)
     if flush_stop is not None:
         flush_stop.set()
     if flush_task is not None:
         await flush_task
-    await flush_tool_calls_today_to_db()
+    await get_usage_aggregator().drain()
+
+    # Stop the OAuth refresh loop and any refreshes it or requests started.
+    refresh_task = getattr(app.state, "oauth_refresh_task", None)
+    if refresh_task is not None:
+        app.state.oauth_refresh_stop.set()
+        await refresh_task
+        from .security.oauth_refresh import get_token_refresher
+        refresher = get_token_refresher()
+        if refresher is not None:
+            await refresher.shutdown()
 
     # Shut down server pool
     if app.state.server_pool:
@@ -182,12 +181,14 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=["Mcp-Session-Id"],
+        expose_headers=["Mcp-Session-Id", NEXT_CURSOR_HEADER],
     )
 
     # Rate limiting middleware (Phase 4)
     from .middleware.rate_limit import RateLimiter, RateLimitMiddleware
     rate_limiter = RateLimiter(default_rpm=settings.rate_limit_rpm)
+    # Tenant resolution applies per-tenant overrides through app.state
+    app.state.rate_limiter = rate_limiter
     app.add_middleware(RateLimitMiddleware, rate_limiter=rate_limiter)
 
     # Include API routes
@@ -272,7 +273,7 @@ def create_app() -> FastAPI:
         from .connectors.registry import connector_registry
         return {
             "status": "started",
-            "registered_connectors": connector_registry.list_connectors(),
+            "registered_connectors": [ct.value for ct in connector_registry.list_connector_types()],
         }
 
     # Prometheus metrics endpoint (Phase 3.1)
@@ -64,6 +64,7 @@ class ServerPool:
         tenant_slug: str,
         connector_id: str,
         user_token: Optional[str] = None,
+        tenant_id: Optional[str] = None,
     ) -> Optional[MCPServer]:
         """Get a cached MCPServer or create and cache a new one.
 
@@ -71,6 +72,7 @@ class ServerPool:
             tenant_slug: Tenant identifier
             connector_id: Connector identifier
             user_token: User-provided OAuth token (updated per-request, not cached)
+            tenant_id: Tenant id if already resolved, used on a miss to skip the slug lookup
 
         Returns:
             Initialized MCPServer, or None if initialization fails
@@ -112,7 +114,7 @@ class ServerPool:
                     del self._pool[key]
 
             # Create and initialize new server
-            server = MCPServer(tenant_slug, connector_id, user_token)
+            server = MCPServer(tenant_slug, connector_id, user_token, tenant_id=tenant_id)
             success = await server.initialize()
             if not success:
                 logger.debug("Pool miss: initialization failed for %s", key)
@@ -2,14 +2,16 @@
 
 import logging
 import time
+import uuid
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from mcp import types
 from mcp.server import Server
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database.connection import get_db_context
+from ..database.connection import READ, get_db_context
 from ..models.tenant import Tenant
 from ..models.connector import Connector
 from ..models.connector import ConnectorRuntimeType
@@ -17,17 +19,51 @@ from ..models.connector_tool_state import ConnectorToolState
 from ..models.oauth_credential import OAuthCredential
 from ..connectors.registry import connector_registry
 from ..observability.metrics import record_tool_call
+from ..observability.usage import UNKNOWN_TOOL
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_uuid(value: Any) -> Optional[uuid.UUID]:
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=2)
+def _connector_load_statement(by_tenant_id: bool):
+    """Tenant + connector + tool states, filtered by tenant id or slug.
+
+    Built once per shape with bound parameters, so SQLAlchemy's compiled
+    cache and asyncpg's prepared statement cache both reuse it.
+    """
+    tenant_filter = Tenant.id if by_tenant_id else Tenant.slug
+    return (
+        select(Tenant, Connector, ConnectorToolState.tool_name, ConnectorToolState.is_enabled)
+        .join(Connector, Connector.tenant_id == Tenant.id)
+        .outerjoin(ConnectorToolState, ConnectorToolState.connector_id == Connector.id)
+        .where(tenant_filter == bindparam("tenant_key"), Connector.id == bindparam("connector_id"))
+    )
+
+
 class MCPServer:
     """Multi-tenant MCP server implementation."""
 
-    def __init__(self, tenant_slug: str, connector_id: str = None, user_token: str = None):
+    def __init__(
+        self,
+        tenant_slug: str,
+        connector_id: str = None,
+        user_token: str = None,
+        tenant_id: Optional[str] = None,
+    ):
         self.tenant_slug = tenant_slug
         self.connector_id = connector_id
         self.user_token = user_token  # User-provided OAuth token (optional)
+        # Tenant id already resolved from the slug (e.g. during auth), if any
+        self.tenant_id = tenant_id
         logger.debug(
             "MCPServer created - tenant: %s, connector: %s, has_user_token: %s",
             tenant_slug, connector_id, user_token is not None,
@@ -37,47 +73,64 @@ class MCPServer:
         self.connectors: List[Connector] = []  # For backward compatibility, will contain single connector
         self.server = Server("sage-mcp")
         self._tool_states_cache: Optional[Dict[str, bool]] = None
+        # Tool names each connector advertises, by connector id
+        self._tool_names: Dict[uuid.UUID, frozenset] = {}
         self._setup_handlers()
 
     async def initialize(self) -> bool:
         """Initialize the MCP server for a specific connector."""
-        async with get_db_context() as session:
-            # Load tenant
+        async with get_db_context(READ) as session:
+            if self.connector_id:
+                return await self._load_connector(session)
+
+            # Fallback: Load all enabled connectors for this tenant (for backward compatibility)
             tenant = await self._get_tenant(session, self.tenant_slug)
             if not tenant or not tenant.is_active:
                 return False
 
             self.tenant = tenant
-
-            # Load specific connector by ID
-            if self.connector_id:
-                connector = await self._get_connector_by_id(session, self.connector_id, tenant.id)
-                if not connector or not connector.is_enabled:
-                    return False
-
-                self.connector = connector
-                self.connectors = [connector]  # For backward compatibility with existing handlers
-
-                # Pre-populate tool states cache
-                await self._load_tool_states_cache(session, connector.id)
-            else:
-                # Fallback: Load all enabled connectors for this tenant (for backward compatibility)
-                self.connectors = await self._get_tenant_connectors(session, tenant.id)
-
+            self.connectors = await self._get_tenant_connectors(session, tenant.id)
             return True
 
-    async def _load_tool_states_cache(self, session: AsyncSession, connector_id):
-        """Load tool states into cache during initialization."""
-        result = await session.execute(
-            select(ConnectorToolState.tool_name, ConnectorToolState.is_enabled)
-            .where(ConnectorToolState.connector_id == connector_id)
-        )
-        self._tool_states_cache = {name: enabled for name, enabled in result.all()}
+    async def _load_connector(self, session: AsyncSession) -> bool:
+        """Load tenant, connector and tool states in a single round-trip.
+
+        One row comes back per tool state (or one row with NULL tool columns
+        when the connector has none); no rows means the tenant or connector
+        does not exist.
+        """
+        connector_uuid = _parse_uuid(self.connector_id)
+        if connector_uuid is None:
+            return False
+
+        result = await session.execute(_connector_load_statement(self.tenant_id is not None), {
+            "tenant_key": _parse_uuid(self.tenant_id) if self.tenant_id is not None else self.tenant_slug,
+            "connector_id": connector_uuid,
+        })
+        rows = result.all()
+        if not rows:
+            return False
+
+        tenant, connector = rows[0][0], rows[0][1]
+        if not tenant.is_active or not connector.is_enabled:
+            return False
+
+        self.tenant = tenant
+        self.tenant_id = str(tenant.id)
+        self.connector = connector
+        self.connectors = [connector]  # For backward compatibility with existing handlers
+
+        # Pre-populate tool states cache
+        self._tool_states_cache = {
+            tool_name: is_enabled for _, _, tool_name, is_enabled in rows if tool_name is not None
+        }
         logger.debug("Cached %d tool states", len(self._tool_states_cache))
+        return True
 
     def refresh_tool_states(self):
         """Invalidate the tool states cache so it's reloaded on next access."""
         self._tool_states_cache = None
+        self._tool_names = {}
 
     def _setup_handlers(self):
         """Set up MCP protocol handlers."""
@@ -117,23 +170,27 @@ class MCPServer:
 
             logger.info("Tool call: %s (connector=%s, action=%s)", name, connector.connector_type.value, action)
 
+            usage_name = await self._usage_tool_name(connector, name, action)
+
             # Execute the tool call
             start = time.perf_counter()
             try:
                 result = await self._execute_tool(connector, action, arguments)
                 record_tool_call(
                     connector_type=connector.connector_type.value,
-                    tool_name=action,
+                    tool_name=usage_name,
                     status="success",
                     duration=time.perf_counter() - start,
+                    tenant_id=self.tenant.id if self.tenant else None,
                 )
                 return [types.TextContent(type="text", text=result)]
             except Exception as e:
                 record_tool_call(
                     connector_type=connector.connector_type.value,
-                    tool_name=action,
+                    tool_name=usage_name,
                     status="error",
                     duration=time.perf_counter() - start,
+                    tenant_id=self.tenant.id if self.tenant else None,
                 )
                 logger.error("Tool execution failed: %s - %s", name, str(e))
                 return [types.TextContent(
@@ -186,6 +243,29 @@ class MCPServer:
 
         return None, None
 
+    async def _usage_tool_name(self, connector: Connector, name: str, action: str) -> str:
+        """Name to record a call under: the action if *name* is a tool the connector has.
+
+        Tool names come from the client, so anything else is counted as
+        UNKNOWN_TOOL to keep usage rows and metric labels bounded. Names come
+        from the last tools/list, or from a native connector's static tool
+        list; the call path never loads credentials or starts a process.
+        """
+        names = self._tool_names.get(connector.id)
+        if names is None and connector.runtime_type == ConnectorRuntimeType.NATIVE:
+            connector_plugin = connector_registry.get_connector(connector.connector_type)
+            if connector_plugin:
+                try:
+                    tools = await connector_plugin.get_tools(connector, None)
+                except Exception as e:
+                    logger.debug("No static tool list for %s: %s", connector.connector_type.value, e)
+                else:
+                    names = frozenset(tool.name for tool in tools)
+                    self._tool_names[connector.id] = names
+        if names and name in names:
+            return action
+        return UNKNOWN_TOOL
+
     def _resolve_resource_target(self, uri: Any) -> Tuple[Optional[Connector], Optional[str]]:
         """Resolve a resource URI into (connector, resource argument)."""
         enabled_connectors = [c for c in self.connectors if c.is_enabled]
@@ -225,11 +305,8 @@ class MCPServer:
 
     async def _get_connector_by_id(self, session: AsyncSession, connector_id: str, tenant_id: str) -> Optional[Connector]:
         """Get a specific connector by ID."""
-        import uuid
-
-        try:
-            connector_uuid = uuid.UUID(connector_id)
-        except ValueError:
+        connector_uuid = _parse_uuid(connector_id)
+        if connector_uuid is None:
             return None
 
         result = await session.execute(
@@ -272,11 +349,12 @@ class MCPServer:
         try:
             all_tools = await connector_plugin.get_tools(connector, oauth_cred)
             logger.debug("Got %d tools from connector", len(all_tools))
+            self._tool_names[connector.id] = frozenset(tool.name for tool in all_tools)
 
             # Use cached tool states if available, otherwise fetch from DB
             tool_states = self._tool_states_cache
             if tool_states is None:
-                async with get_db_context() as session:
+                async with get_db_context(READ) as session:
                     result = await session.execute(
                         select(ConnectorToolState.tool_name, ConnectorToolState.is_enabled)
                         .where(ConnectorToolState.connector_id == connector.id)
@@ -378,7 +456,7 @@ class MCPServer:
         provider_lower = provider.lower()
         logger.info("No user token, querying DB for tenant-level credential: provider=%s", provider_lower)
 
-        async with get_db_context() as session:
+        async with get_db_context(READ) as session:
             from sqlalchemy import func
 
             result = await session.execute(
@@ -390,4 +468,9 @@ class MCPServer:
             )
             cred = result.scalar_one_or_none()
             logger.info("DB credential lookup: provider=%s result=%s", provider_lower, "found" if cred else "NOT_FOUND")
-            return cred
+
+        if cred is not None:
+            from ..security.oauth_refresh import ensure_fresh_credential
+
+            cred = await ensure_fresh_credential(cred)
+        return cred
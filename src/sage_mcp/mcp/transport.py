@@ -39,7 +39,13 @@ def _negotiate_protocol_version(client_version: str) -> Optional[str]:
 class MCPTransport:
     """Transport layer for MCP communication."""
 
-    def __init__(self, tenant_slug: str, connector_id: str = None, user_token: str = None):
+    def __init__(
+        self,
+        tenant_slug: str,
+        connector_id: str = None,
+        user_token: str = None,
+        tenant_id: Optional[str] = None,
+    ):
         self.tenant_slug = tenant_slug
         self.connector_id = connector_id
         self.user_token = user_token  # User-provided OAuth token (optional)
@@ -47,7 +53,7 @@ class MCPTransport:
             "MCPTransport created - tenant: %s, connector: %s, has_user_token: %s",
             tenant_slug, connector_id, user_token is not None,
         )
-        self.mcp_server = MCPServer(tenant_slug, connector_id, user_token)
+        self.mcp_server = MCPServer(tenant_slug, connector_id, user_token, tenant_id=tenant_id)
         self.initialized = False
 
     async def initialize(self) -> bool:
@@ -61,6 +67,33 @@ class MCPTransport:
 
         return success
 
+    def subscribe_notifications(self) -> Optional[asyncio.Queue]:
+        """Subscribe to notifications pushed by the connector's external MCP process.
+
+        Returns None for native connectors, which never push notifications.
+        """
+        from ..models.connector import ConnectorRuntimeType
+        from ..runtime import process_manager
+
+        connector = self.mcp_server.connector
+        if connector is None or connector.runtime_type == ConnectorRuntimeType.NATIVE:
+            return None
+        return process_manager.subscribe(str(connector.tenant_id), str(connector.id))
+
+    def unsubscribe_notifications(self, queue: asyncio.Queue):
+        """Release a queue returned by subscribe_notifications()."""
+        from ..runtime import process_manager
+
+        connector = self.mcp_server.connector
+        if connector is not None:
+            process_manager.unsubscribe(str(connector.tenant_id), str(connector.id), queue)
+
+    async def _forward_notifications(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Relay queued server notifications to a WebSocket client."""
+        while True:
+            message = await queue.get()
+            await websocket.send_text(json.dumps(message))
+
     async def handle_websocket(
         self,
         websocket: WebSocket,
@@ -71,9 +104,16 @@ class MCPTransport:
             await websocket.close(code=4004, reason="Tenant not found or inactive")
             return
 
+        subscription = self.subscribe_notifications()
+        forward_task: Optional[asyncio.Task] = None
         try:
             await websocket.accept()
 
+            if subscription is not None:
+                forward_task = asyncio.create_task(
+                    self._forward_notifications(websocket, subscription)
+                )
+
             # Basic WebSocket message handling
             while True:
                 try:
@@ -125,6 +165,11 @@ class MCPTransport:
                 await websocket.close(code=1011, reason="Internal server error")
             except Exception:
                 pass
+        finally:
+            if forward_task is not None:
+                forward_task.cancel()
+            if subscription is not None:
+                self.unsubscribe_notifications(subscription)
 
     async def handle_sse(self, messages: asyncio.Queue):
         """Handle Server-Sent Events for MCP protocol."""
@@ -69,6 +69,16 @@ class RateLimiter:
         # Reset bucket to apply new limit
         self._buckets.pop(tenant_slug, None)
 
+    def sync_tenant_limit(self, tenant_slug: str, rpm: Optional[int]):
+        """Apply a tenant's configured override (None = default), if it changed."""
+        if self._tenant_overrides.get(tenant_slug) == rpm:
+            return
+        if rpm is None:
+            self._tenant_overrides.pop(tenant_slug, None)
+            self._buckets.pop(tenant_slug, None)
+        else:
+            self.set_tenant_limit(tenant_slug, rpm)
+
     def _get_bucket(self, tenant_slug: str) -> TokenBucket:
         """Get or create a token bucket for a tenant."""
         bucket = self._buckets.get(tenant_slug)
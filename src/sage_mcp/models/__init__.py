@@ -8,6 +8,7 @@ from .connector import Connector, ConnectorType, ConnectorRuntimeType
 from .connector_tool_state import ConnectorToolState
 from .mcp_process import MCPProcess, ProcessStatus
 from .tool_usage_daily import ToolUsageDaily
+from .tool_usage import ToolUsage
 from .api_key import APIKey, APIKeyScope
 
 __all__ = [
@@ -22,6 +23,7 @@ __all__ = [
     "MCPProcess",
     "ProcessStatus",
     "ToolUsageDaily",
+    "ToolUsage",
     "APIKey",
     "APIKeyScope",
 ]
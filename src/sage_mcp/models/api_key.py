@@ -28,6 +28,11 @@ class APIKey(Base):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     key_prefix: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
     key_hash: Mapped[str] = mapped_column(Text, nullable=False)
+    # HMAC-SHA256 of the raw key under SECRET_KEY; also the indexed lookup id.
+    # NULL for keys created before verifiers existed (bcrypt only).
+    key_verifier: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, unique=True, index=True
+    )
 
     scope: Mapped[APIKeyScope] = mapped_column(
         Enum(
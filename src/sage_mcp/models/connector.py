@@ -5,7 +5,7 @@ import json
 import uuid
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from sqlalchemy import Boolean, Enum, ForeignKey, String, Text, TypeDecorator
+from sqlalchemy import Boolean, Enum, ForeignKey, Index, String, Text, TypeDecorator
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -94,11 +94,18 @@ class ConnectorRuntimeType(enum.Enum):
     EXTERNAL_GO = "external_go"            # Go MCP implementation
     EXTERNAL_CUSTOM = "external_custom"    # Any binary that speaks MCP over stdio
 
+    # External MCP servers reachable over Streamable HTTP (runtime_command is the URL)
+    EXTERNAL_HTTP = "external_http"
+
 
 class Connector(Base):
     """Connector configuration for tenants."""
 
     __tablename__ = "connectors"
+    __table_args__ = (
+        # A tenant's connectors in list order (by name), for keyset pages
+        Index("ix_connectors_tenant_name", "tenant_id", "name", "id"),
+    )
 
     # Foreign key to tenant
     tenant_id: Mapped[uuid.UUID] = mapped_column(
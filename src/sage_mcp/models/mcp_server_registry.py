@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Boolean, Enum, Integer, String, Text, TIMESTAMP, JSON
+from sqlalchemy import Boolean, Enum, Index, Integer, String, Text, TIMESTAMP, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -35,6 +35,11 @@ class MCPServerRegistry(Base):
     """Registry of discovered MCP servers from NPM, GitHub, and custom sources."""
 
     __tablename__ = "mcp_server_registry"
+    __table_args__ = (
+        # Popularity order of the marketplace list, scanned backwards for
+        # keyset pages. Search uses pg_trgm indexes created by migration 12.
+        Index("ix_mcp_server_registry_popularity", "star_count", "download_count", "id"),
+    )
 
     # Basic information
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
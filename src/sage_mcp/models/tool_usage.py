@@ -0,0 +1,34 @@
+"""Per-tenant, per-tool daily usage model."""
+
+import uuid
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, Index, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ToolUsage(Base):
+    """Tool calls per (UTC day, tenant, connector type, tool).
+
+    Rows are written by the usage aggregator's batched upserts. tenant_id
+    has no foreign key so that usage survives tenant deletion for billing.
+    """
+
+    __tablename__ = "tool_usage"
+    __table_args__ = (
+        UniqueConstraint("day", "tenant_id", "connector_type", "tool_name", name="uq_tool_usage_key"),
+        Index("ix_tool_usage_tenant_day", "tenant_id", "day"),
+    )
+
+    day: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    tenant_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    connector_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    tool_name: Mapped[str] = mapped_column(String(200), nullable=False)
+
+    call_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Summed call duration, for average latency per tool.
+    duration_ms: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -1,18 +1,46 @@
 """Prometheus metrics for SageMCP.
 
 Cardinality rule: tenant_slug is NOT a Prometheus label (unbounded).
-connector_type and tool_name are labels (bounded).
+connector_type and tool_name are labels (bounded). Per-process resource
+gauges use connector_id, bounded by live processes on the node; their
+series are removed when the process stops. Upstream metrics (HTTP pools,
+circuit breakers, coalescing, caching, GraphQL, throttling) are labelled by
+host, but only hosts under a known provider domain keep their name; every
+other host (self-hosted instances, custom domains, external MCP servers)
+is reported as ``other``.
 """
 
 import logging
 import os
 import time
-import asyncio
-from datetime import datetime, timezone
+import uuid
 from typing import Optional
 
+from .usage import get_usage_aggregator
+
 logger = logging.getLogger(__name__)
 
+# Domains of the providers built-in connectors talk to; their hosts are metric labels.
+_KNOWN_UPSTREAM_DOMAINS = (
+    "anthropic.com",
+    "atlassian.com",
+    "bitbucket.org",
+    "codeium.com",
+    "discord.com",
+    "github.com",
+    "gitlab.com",
+    "google.com",
+    "googleapis.com",
+    "linear.app",
+    "microsoft.com",
+    "microsoftonline.com",
+    "notion.com",
+    "openai.com",
+    "slack.com",
+    "zoom.us",
+)
+OTHER_HOST = "other"
+
 # Lazy-load prometheus_client to allow graceful degradation
 _prom = None
 
@@ -33,13 +61,10 @@ def _get_prom():
 # --- Metric singletons (created on first access) ---
 
 _metrics = {}
-_tool_calls_day = None
-_tool_calls_today_count = 0
-_tool_calls_flushed_count = 0
 
 
-def _metric(name, metric_type, description, labelnames=()):
-    """Get or create a Prometheus metric."""
+def _metric(name, metric_type, description, labelnames=(), **kwargs):
+    """Get or create a Prometheus metric; extra kwargs (e.g. buckets) go to the constructor."""
     if name in _metrics:
         return _metrics[name]
     prom = _get_prom()
@@ -47,7 +72,7 @@ def _metric(name, metric_type, description, labelnames=()):
         _metrics[name] = None
         return None
     cls = getattr(prom, metric_type)
-    m = cls(name, description, labelnames=labelnames)
+    m = cls(name, description, labelnames=labelnames, **kwargs)
     _metrics[name] = m
     return m
 
@@ -119,6 +144,241 @@ def external_processes():
     )
 
 
+def external_requests_in_flight():
+    return _metric(
+        "sagemcp_external_requests_in_flight",
+        "Gauge",
+        "Requests currently in flight to external MCP processes",
+        labelnames=["runtime_type"],
+    )
+
+
+def external_requests_queued():
+    return _metric(
+        "sagemcp_external_requests_queued",
+        "Gauge",
+        "Requests waiting for an in-flight slot on external MCP processes",
+        labelnames=["runtime_type"],
+    )
+
+
+def external_request_queue_wait():
+    return _metric(
+        "sagemcp_external_request_queue_wait_seconds",
+        "Histogram",
+        "Time spent waiting for an in-flight slot on external MCP processes",
+        labelnames=["runtime_type"],
+    )
+
+
+def external_requests_cancelled_total():
+    return _metric(
+        "sagemcp_external_requests_cancelled_total",
+        "Counter",
+        "Requests to external MCP processes abandoned by the caller",
+        labelnames=["runtime_type", "method", "reason"],
+    )
+
+
+def external_process_rss_bytes():
+    return _metric(
+        "sagemcp_external_process_rss_bytes",
+        "Gauge",
+        "Resident memory of an external MCP process tree in bytes",
+        labelnames=["connector_id", "runtime_type"],
+    )
+
+
+def external_process_cpu_millicores():
+    return _metric(
+        "sagemcp_external_process_cpu_millicores",
+        "Gauge",
+        "CPU used by an external MCP process tree (1000 = one core)",
+        labelnames=["connector_id", "runtime_type"],
+    )
+
+
+def http_pool_in_flight():
+    return _metric(
+        "sagemcp_http_pool_in_flight",
+        "Gauge",
+        "Requests in flight on an upstream host connection pool",
+        labelnames=["host"],
+    )
+
+
+def http_pool_max_connections():
+    return _metric(
+        "sagemcp_http_pool_max_connections",
+        "Gauge",
+        "Connection limit of an upstream host connection pool",
+        labelnames=["host"],
+    )
+
+
+def http_pool_saturated_total():
+    return _metric(
+        "sagemcp_http_pool_saturated_total",
+        "Counter",
+        "Requests that found their upstream host pool at its connection limit",
+        labelnames=["host"],
+    )
+
+
+def upstream_throttled_total():
+    return _metric(
+        "sagemcp_upstream_throttled_total",
+        "Counter",
+        "Upstream requests delayed or rejected by client-side pacing",
+        labelnames=["provider", "reason"],
+    )
+
+
+def upstream_throttle_wait():
+    return _metric(
+        "sagemcp_upstream_throttle_wait_seconds",
+        "Histogram",
+        "Time upstream requests were held back by client-side pacing",
+        labelnames=["provider"],
+    )
+
+
+def upstream_quota_paced():
+    return _metric(
+        "sagemcp_upstream_quota_paced_credentials",
+        "Gauge",
+        "Credentials per provider currently paced or blocked by advertised upstream quota",
+        labelnames=["provider"],
+    )
+
+
+def circuit_breakers_open():
+    return _metric(
+        "sagemcp_circuit_breakers_open",
+        "Gauge",
+        "Upstream circuit breakers currently open or half-open",
+        labelnames=["host"],
+    )
+
+
+def circuit_breaker_transitions_total():
+    return _metric(
+        "sagemcp_circuit_breaker_transitions_total",
+        "Counter",
+        "Upstream circuit breaker state changes by new state",
+        labelnames=["host", "state"],
+    )
+
+
+def circuit_breaker_rejected_total():
+    return _metric(
+        "sagemcp_circuit_breaker_rejected_total",
+        "Counter",
+        "Upstream requests failed fast by an open circuit breaker",
+        labelnames=["host"],
+    )
+
+
+def upstream_coalesced_total():
+    return _metric(
+        "sagemcp_upstream_coalesced_total",
+        "Counter",
+        "Upstream GETs served by joining an identical in-flight request",
+        labelnames=["host"],
+    )
+
+
+def upstream_cache_total():
+    return _metric(
+        "sagemcp_upstream_cache_total",
+        "Counter",
+        "Conditional-cache outcomes for upstream GETs (fresh, revalidated, miss)",
+        labelnames=["host", "result"],
+    )
+
+
+def upstream_cache_bytes():
+    return _metric(
+        "sagemcp_upstream_cache_bytes",
+        "Gauge",
+        "Body bytes held by the upstream conditional-request cache",
+    )
+
+
+def pagination_page_duration():
+    return _metric(
+        "sagemcp_pagination_page_seconds",
+        "Histogram",
+        "Latency of one upstream page fetched by the pagination helpers",
+        labelnames=["source"],
+    )
+
+
+def graphql_response_bytes():
+    return _metric(
+        "sagemcp_graphql_response_bytes",
+        "Histogram",
+        "Size of GraphQL response bodies in bytes",
+        labelnames=["host"],
+        buckets=(512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608),
+    )
+
+
+def graphql_queries_total():
+    return _metric(
+        "sagemcp_graphql_queries_total",
+        "Counter",
+        "GraphQL queries sent, by how they went on the wire (single, merged, persisted)",
+        labelnames=["host", "mode"],
+    )
+
+
+def provider_metadata_lookups_total():
+    return _metric(
+        "sagemcp_provider_metadata_lookups_total",
+        "Counter",
+        "Provider metadata lookups (e.g. Atlassian cloud id) served from cache or fetched",
+        labelnames=["kind", "result"],
+    )
+
+
+def oauth_refresh_total():
+    return _metric(
+        "sagemcp_oauth_refresh_total",
+        "Counter",
+        "OAuth token refresh attempts (success, error, revoked, unconfigured)",
+        labelnames=["provider", "result"],
+    )
+
+
+def db_pool_checkout_duration():
+    return _metric(
+        "sagemcp_db_pool_checkout_seconds",
+        "Histogram",
+        "Time spent waiting for a database connection from the pool",
+        labelnames=["pool"],
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+    )
+
+
+def db_pool_connections():
+    return _metric(
+        "sagemcp_db_pool_connections",
+        "Gauge",
+        "Database pool connections by state (checked_out, idle, capacity)",
+        labelnames=["pool", "state"],
+    )
+
+
+def db_pool_timeouts_total():
+    return _metric(
+        "sagemcp_db_pool_timeouts_total",
+        "Counter",
+        "Database connection checkouts that timed out waiting for the pool",
+        labelnames=["pool"],
+    )
+
+
 def memory_usage_bytes():
     return _metric(
         "sagemcp_memory_usage_bytes",
@@ -142,8 +402,14 @@ def record_pool_miss():
         m.inc()
 
 
-def record_tool_call(connector_type: str, tool_name: str, status: str, duration: float):
-    _increment_tool_calls_today()
+def record_tool_call(
+    connector_type: str,
+    tool_name: str,
+    status: str,
+    duration: float,
+    tenant_id: Optional[uuid.UUID] = None,
+):
+    get_usage_aggregator().record(tenant_id, connector_type, tool_name, status, duration)
     tc = tool_calls_total()
     if tc:
         tc.labels(connector_type=connector_type, status=status).inc()
@@ -152,112 +418,9 @@ def record_tool_call(connector_type: str, tool_name: str, status: str, duration:
         tcd.labels(connector_type=connector_type, tool_name=tool_name, status=status).observe(duration)
 
 
-def _increment_tool_calls_today() -> None:
-    """Increment in-memory daily tool call counter (UTC day)."""
-    global _tool_calls_day, _tool_calls_today_count, _tool_calls_flushed_count
-    today = datetime.now(timezone.utc).date()
-    if _tool_calls_day != today:
-        _tool_calls_day = today
-        _tool_calls_today_count = 0
-        _tool_calls_flushed_count = 0
-    _tool_calls_today_count += 1
-
-
 def get_tool_calls_today() -> int:
-    """Return in-memory daily tool call count (UTC day)."""
-    global _tool_calls_day, _tool_calls_today_count
-    today = datetime.now(timezone.utc).date()
-    if _tool_calls_day != today:
-        _tool_calls_day = today
-        _tool_calls_today_count = 0
-    return _tool_calls_today_count
-
-
-async def bootstrap_tool_calls_today_from_db() -> int:
-    """Load today's persisted counter and seed in-memory metrics state."""
-    from sqlalchemy import select
-
-    from ..database.connection import get_db_context
-    from ..models.tool_usage_daily import ToolUsageDaily
-
-    global _tool_calls_day, _tool_calls_today_count, _tool_calls_flushed_count
-
-    today = datetime.now(timezone.utc).date()
-    try:
-        async with get_db_context() as session:
-            persisted_count = (
-                await session.execute(
-                    select(ToolUsageDaily.tool_calls_count).where(ToolUsageDaily.day == today)
-                )
-            ).scalar() or 0
-    except Exception as e:
-        logger.warning("Failed to bootstrap daily tool usage counter: %s", e)
-        persisted_count = 0
-
-    _tool_calls_day = today
-    _tool_calls_today_count = persisted_count
-    _tool_calls_flushed_count = persisted_count
-    return persisted_count
-
-
-async def flush_tool_calls_today_to_db() -> int:
-    """Flush unpersisted in-memory tool-call increments to database."""
-    from sqlalchemy import update
-    from sqlalchemy.exc import IntegrityError
-
-    from ..database.connection import get_db_context
-    from ..models.tool_usage_daily import ToolUsageDaily
-
-    global _tool_calls_day, _tool_calls_today_count, _tool_calls_flushed_count
-
-    today = datetime.now(timezone.utc).date()
-    if _tool_calls_day != today:
-        _tool_calls_day = today
-        _tool_calls_today_count = 0
-        _tool_calls_flushed_count = 0
-        return 0
-
-    delta = _tool_calls_today_count - _tool_calls_flushed_count
-    if delta <= 0:
-        return 0
-
-    try:
-        async with get_db_context() as session:
-            update_result = await session.execute(
-                update(ToolUsageDaily)
-                .where(ToolUsageDaily.day == today)
-                .values(tool_calls_count=ToolUsageDaily.tool_calls_count + delta)
-            )
-            if (update_result.rowcount or 0) == 0:
-                session.add(ToolUsageDaily(day=today, tool_calls_count=delta))
-
-            try:
-                await session.commit()
-            except IntegrityError:
-                await session.rollback()
-                await session.execute(
-                    update(ToolUsageDaily)
-                    .where(ToolUsageDaily.day == today)
-                    .values(tool_calls_count=ToolUsageDaily.tool_calls_count + delta)
-                )
-                await session.commit()
-    except Exception as e:
-        logger.warning("Failed to flush daily tool usage counter: %s", e)
-        return 0
-
-    _tool_calls_flushed_count += delta
-    return delta
-
-
-async def run_tool_usage_flush_loop(
-    stop_event: asyncio.Event, interval_seconds: float = 60.0
-) -> None:
-    """Background loop to periodically persist the in-memory tool-call counter."""
-    while not stop_event.is_set():
-        try:
-            await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
-        except asyncio.TimeoutError:
-            await flush_tool_calls_today_to_db()
+    """Return the daily tool call count (UTC day) seen by this process."""
+    return get_usage_aggregator().calls_today()
 
 
 def set_active_sessions(count: int):
@@ -278,6 +441,184 @@ def set_external_processes(count: int):
         m.set(count)
 
 
+def adjust_external_requests_in_flight(runtime_type: str, delta: int):
+    m = external_requests_in_flight()
+    if m:
+        m.labels(runtime_type=runtime_type).inc(delta)
+
+
+def adjust_external_requests_queued(runtime_type: str, delta: int):
+    m = external_requests_queued()
+    if m:
+        m.labels(runtime_type=runtime_type).inc(delta)
+
+
+def record_external_request_queue_wait(runtime_type: str, seconds: float):
+    m = external_request_queue_wait()
+    if m:
+        m.labels(runtime_type=runtime_type).observe(seconds)
+
+
+def record_external_request_cancelled(runtime_type: str, method: str, reason: str):
+    m = external_requests_cancelled_total()
+    if m:
+        m.labels(runtime_type=runtime_type, method=method, reason=reason).inc()
+
+
+def set_external_process_usage(
+    connector_id: str, runtime_type: str, rss_bytes: int, cpu_millicores: Optional[float]
+):
+    m = external_process_rss_bytes()
+    if m:
+        m.labels(connector_id=connector_id, runtime_type=runtime_type).set(rss_bytes)
+    m = external_process_cpu_millicores()
+    if m and cpu_millicores is not None:
+        m.labels(connector_id=connector_id, runtime_type=runtime_type).set(cpu_millicores)
+
+
+def clear_external_process_usage(connector_id: str, runtime_type: str):
+    for m in (external_process_rss_bytes(), external_process_cpu_millicores()):
+        if m:
+            try:
+                m.remove(connector_id, runtime_type)
+            except KeyError:
+                pass
+
+
+def upstream_host_label(host: str) -> str:
+    """Metric label for an upstream host: itself if under a known provider domain, else ``other``.
+
+    Values without a dot are provider names (e.g. ``github``) and pass through.
+    """
+    name = host.lower()
+    head, _, port = name.rpartition(":")
+    if head and port.isdigit():
+        name = head
+    elif "." not in name and ":" not in name:
+        return host
+    for domain in _KNOWN_UPSTREAM_DOMAINS:
+        if name == domain or name.endswith("." + domain):
+            return name
+    return OTHER_HOST
+
+
+def adjust_http_pool_in_flight(host: str, delta: int):
+    m = http_pool_in_flight()
+    if m:
+        m.labels(host=upstream_host_label(host)).inc(delta)
+
+
+def set_http_pool_max_connections(host: str, limit: int):
+    m = http_pool_max_connections()
+    if m:
+        m.labels(host=upstream_host_label(host)).set(limit)
+
+
+def record_http_pool_saturated(host: str):
+    m = http_pool_saturated_total()
+    if m:
+        m.labels(host=upstream_host_label(host)).inc()
+
+
+def record_upstream_throttle(provider: str, reason: str, wait: float):
+    m = upstream_throttled_total()
+    if m:
+        m.labels(provider=upstream_host_label(provider), reason=reason).inc()
+    m = upstream_throttle_wait()
+    if m and reason == "paced":
+        m.labels(provider=upstream_host_label(provider)).observe(wait)
+
+
+def adjust_upstream_quota_paced(provider: str, delta: int):
+    m = upstream_quota_paced()
+    if m:
+        m.labels(provider=upstream_host_label(provider)).inc(delta)
+
+
+def adjust_circuit_breakers_open(host: str, delta: int):
+    m = circuit_breakers_open()
+    if m:
+        m.labels(host=upstream_host_label(host)).inc(delta)
+
+
+def record_circuit_breaker_transition(host: str, state: str):
+    m = circuit_breaker_transitions_total()
+    if m:
+        m.labels(host=upstream_host_label(host), state=state).inc()
+
+
+def record_circuit_breaker_rejected(host: str):
+    m = circuit_breaker_rejected_total()
+    if m:
+        m.labels(host=upstream_host_label(host)).inc()
+
+
+def record_upstream_coalesced(host: str):
+    m = upstream_coalesced_total()
+    if m:
+        m.labels(host=upstream_host_label(host)).inc()
+
+
+def record_upstream_cache(host: str, result: str):
+    m = upstream_cache_total()
+    if m:
+        m.labels(host=upstream_host_label(host), result=result).inc()
+
+
+def set_upstream_cache_bytes(total: int):
+    m = upstream_cache_bytes()
+    if m:
+        m.set(total)
+
+
+def record_pagination_page(source: str, seconds: float):
+    m = pagination_page_duration()
+    if m:
+        m.labels(source=source).observe(seconds)
+
+
+def record_graphql_response(host: str, size: int):
+    m = graphql_response_bytes()
+    if m:
+        m.labels(host=upstream_host_label(host)).observe(size)
+
+
+def record_graphql_queries(host: str, mode: str, count: int = 1):
+    m = graphql_queries_total()
+    if m:
+        m.labels(host=upstream_host_label(host), mode=mode).inc(count)
+
+
+def record_provider_metadata_lookup(kind: str, result: str):
+    m = provider_metadata_lookups_total()
+    if m:
+        m.labels(kind=kind, result=result).inc()
+
+
+def record_oauth_refresh(provider: str, result: str):
+    m = oauth_refresh_total()
+    if m:
+        m.labels(provider=provider, result=result).inc()
+
+
+def record_db_pool_checkout(pool: str, seconds: float, timed_out: bool = False):
+    m = db_pool_checkout_duration()
+    if m:
+        m.labels(pool=pool).observe(seconds)
+    if timed_out:
+        t = db_pool_timeouts_total()
+        if t:
+            t.labels(pool=pool).inc()
+
+
+def set_db_pool_connections(pool: str, checked_out: int, idle: int, capacity: int):
+    m = db_pool_connections()
+    if m:
+        m.labels(pool=pool, state="checked_out").set(checked_out)
+        m.labels(pool=pool, state="idle").set(idle)
+        m.labels(pool=pool, state="capacity").set(capacity)
+
+
 def generate_metrics_text() -> Optional[str]:
     """Generate Prometheus metrics text output."""
     prom = _get_prom()
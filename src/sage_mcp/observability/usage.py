@@ -0,0 +1,351 @@
+"""Write-behind tool usage aggregation.
+
+Tool calls are counted in memory per (UTC day, tenant, connector type,
+tool). A background loop writes them to the ``tool_usage`` table every
+USAGE_FLUSH_INTERVAL_SECONDS as one multi-row upsert that adds to the
+stored counts. The upsert is additive, so replicas flush concurrently
+without reading the rows first.
+
+Tool names come from clients, so callers record only names that resolved
+to a tool the connector advertises and pass ``UNKNOWN_TOOL`` otherwise;
+names are also clamped to the column widths. Each tenant may hold at most
+USAGE_MAX_PENDING_KEYS_PER_TENANT keys; past that its calls to tools
+without a pending key are counted under a per-connector ``_other`` tool,
+so tenant and connector totals stay exact and one tenant cannot crowd out
+the others. Reaching that budget, or USAGE_MAX_PENDING_KEYS keys overall,
+wakes the loop to flush early.
+
+A flush that fails for a transient reason puts its batch back for the next
+one; shutdown drains whatever is left. Rows the database rejects as data
+errors are isolated by splitting the batch and dropped with an error log,
+so one bad row cannot fail every later flush.
+
+Dashboards read the aggregates through ``query_usage``; Prometheus has no
+tenant label and cannot serve per-tenant usage.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stands in for the tool name once a tenant's pending key budget is used up.
+OTHER_TOOL = "_other"
+# Recorded for calls naming a tool the connector does not have.
+UNKNOWN_TOOL = "_unknown"
+
+# Widths of tool_usage.connector_type and tool_usage.tool_name.
+_MAX_CONNECTOR_TYPE_LENGTH = 50
+_MAX_TOOL_NAME_LENGTH = 200
+
+# Rows per INSERT; 8 parameters each stays under PostgreSQL's 32767 limit.
+_UPSERT_CHUNK_ROWS = 1000
+
+UsageKey = Tuple[date, uuid.UUID, str, str]
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class UsageAggregator:
+    """In-memory usage counts waiting to be written to the database."""
+
+    def __init__(self, max_pending_keys: int = 50_000, max_keys_per_tenant: int = 2_000):
+        self.max_pending_keys = max(1, max_pending_keys)
+        self.max_keys_per_tenant = max(1, max_keys_per_tenant)
+        # key -> [calls, errors, duration_ms]
+        self._pending: Dict[UsageKey, List[int]] = {}
+        # tenant -> number of its keys in _pending
+        self._tenant_keys: Dict[uuid.UUID, int] = {}
+        self._day: Optional[date] = None
+        self._calls_today = 0
+        self._flush_lock = asyncio.Lock()
+        self.flush_requested = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(
+        self,
+        tenant_id: Optional[uuid.UUID],
+        connector_type: str,
+        tool_name: str,
+        status: str,
+        duration: float,
+    ):
+        """Count one tool call."""
+        day = _utc_today()
+        if day != self._day:
+            self._day = day
+            self._calls_today = 0
+        self._calls_today += 1
+        if tenant_id is None:
+            return
+
+        connector_type = connector_type[:_MAX_CONNECTOR_TYPE_LENGTH]
+        key = (day, tenant_id, connector_type, tool_name[:_MAX_TOOL_NAME_LENGTH])
+        counts = self._pending.get(key)
+        if counts is None:
+            tenant_keys = self._tenant_keys.get(tenant_id, 0)
+            if tenant_keys >= self.max_keys_per_tenant:
+                self.flush_requested.set()
+                key = (day, tenant_id, connector_type, OTHER_TOOL)
+                counts = self._pending.get(key)
+            if counts is None:
+                counts = self._pending[key] = [0, 0, 0]
+                self._tenant_keys[tenant_id] = tenant_keys + 1
+                if len(self._pending) >= self.max_pending_keys:
+                    self.flush_requested.set()
+        counts[0] += 1
+        if status != "success":
+            counts[1] += 1
+        counts[2] += int(duration * 1000)
+
+    def calls_today(self) -> int:
+        """Tool calls today (UTC): the persisted total at startup plus calls since."""
+        if self._day != _utc_today():
+            return 0
+        return self._calls_today
+
+    def seed_today(self, persisted_calls: int):
+        self._day = _utc_today()
+        self._calls_today = persisted_calls
+
+    def _merge(self, batch: Dict[UsageKey, List[int]]):
+        for key, (calls, errors, duration_ms) in batch.items():
+            counts = self._pending.get(key)
+            if counts is None:
+                counts = self._pending[key] = [0, 0, 0]
+                self._tenant_keys[key[1]] = self._tenant_keys.get(key[1], 0) + 1
+            counts[0] += calls
+            counts[1] += errors
+            counts[2] += duration_ms
+
+    async def flush(self) -> int:
+        """Upsert all pending counts; returns the number of rows written.
+
+        On failure the counts not yet written are kept for the next flush and
+        the error is raised. Rows rejected as data errors are dropped.
+        """
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            self._tenant_keys = {}
+            self.flush_requested.clear()
+            if not batch:
+                return 0
+            unwritten = dict(batch)
+            try:
+                return await self._write(batch, unwritten)
+            except BaseException:
+                self._merge(unwritten)
+                raise
+
+    async def _write(self, batch: Dict[UsageKey, List[int]], unwritten: Dict[UsageKey, List[int]]) -> int:
+        """Upsert *batch*, halving it to isolate rows the database rejects.
+
+        Keys are removed from *unwritten* once written or dropped.
+        """
+        from sqlalchemy.exc import DataError, IntegrityError
+
+        try:
+            await _upsert(batch)
+        except (DataError, IntegrityError) as e:
+            if len(batch) == 1:
+                (key, counts), = batch.items()
+                logger.error(
+                    "Dropping usage row for tenant %s, %s/%s (%d calls) rejected by the database: %s",
+                    key[1], key[2], key[3], counts[0], e,
+                )
+                del unwritten[key]
+                return 0
+            items = list(batch.items())
+            half = len(items) // 2
+            return (
+                await self._write(dict(items[:half]), unwritten)
+                + await self._write(dict(items[half:]), unwritten)
+            )
+        for key in batch:
+            del unwritten[key]
+        return len(batch)
+
+    async def drain(self, attempts: int = 3) -> int:
+        """Flush until nothing is pending, retrying failures; used at shutdown."""
+        written = 0
+        for attempt in range(attempts):
+            if not self._pending:
+                break
+            try:
+                written += await self.flush()
+            except Exception as e:
+                logger.warning("Usage flush failed during shutdown (attempt %d): %s", attempt + 1, e)
+                await asyncio.sleep(0.5 * 2 ** attempt)
+        if self._pending:
+            lost = sum(counts[0] for counts in self._pending.values())
+            logger.error("Dropping %d unflushed usage rows (%d tool calls)", len(self._pending), lost)
+        return written
+
+
+async def _upsert(batch: Dict[UsageKey, List[int]]):
+    from sqlalchemy import func
+    from sqlalchemy.dialects import postgresql, sqlite
+
+    from ..database.connection import BACKGROUND, get_db_context
+    from ..models.tool_usage import ToolUsage
+
+    # Sorted so concurrent flushes from several replicas lock rows in the same order.
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "day": day,
+            "tenant_id": tenant_id,
+            "connector_type": connector_type,
+            "tool_name": tool_name,
+            "call_count": calls,
+            "error_count": errors,
+            "duration_ms": duration_ms,
+        }
+        for (day, tenant_id, connector_type, tool_name), (calls, errors, duration_ms)
+        in sorted(batch.items(), key=lambda item: (item[0][0], str(item[0][1]), item[0][2], item[0][3]))
+    ]
+
+    async with get_db_context(BACKGROUND) as session:
+        dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+        for start in range(0, len(rows), _UPSERT_CHUNK_ROWS):
+            stmt = dialect.insert(ToolUsage).values(rows[start:start + _UPSERT_CHUNK_ROWS])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["day", "tenant_id", "connector_type", "tool_name"],
+                set_={
+                    "call_count": ToolUsage.call_count + stmt.excluded.call_count,
+                    "error_count": ToolUsage.error_count + stmt.excluded.error_count,
+                    "duration_ms": ToolUsage.duration_ms + stmt.excluded.duration_ms,
+                    "updated_at": func.now(),
+                },
+            )
+            await session.execute(stmt)
+        await session.commit()
+
+
+# --------------------------------------------------------------------------- #
+# Queries
+# --------------------------------------------------------------------------- #
+
+USAGE_GROUPS = ("day", "tenant", "connector", "tool")
+
+
+async def query_usage(
+    session: Any,
+    start: date,
+    end: date,
+    tenant_id: Optional[uuid.UUID] = None,
+    group_by: Sequence[str] = ("day",),
+) -> List[Dict[str, Any]]:
+    """Summed usage between *start* and *end* (inclusive), grouped by *group_by*.
+
+    ``group_by`` takes any of ``USAGE_GROUPS``; ``tool`` implies ``connector``.
+    """
+    from sqlalchemy import func, select
+
+    from ..models.tool_usage import ToolUsage
+
+    unknown = set(group_by) - set(USAGE_GROUPS)
+    if unknown:
+        raise ValueError(f"Unknown usage grouping: {', '.join(sorted(unknown))}")
+    columns = []
+    if "day" in group_by:
+        columns.append(ToolUsage.day)
+    if "tenant" in group_by:
+        columns.append(ToolUsage.tenant_id)
+    if "connector" in group_by or "tool" in group_by:
+        columns.append(ToolUsage.connector_type)
+    if "tool" in group_by:
+        columns.append(ToolUsage.tool_name)
+
+    query = select(
+        *columns,
+        func.sum(ToolUsage.call_count).label("calls"),
+        func.sum(ToolUsage.error_count).label("errors"),
+        func.sum(ToolUsage.duration_ms).label("duration_ms"),
+    ).where(ToolUsage.day >= start, ToolUsage.day <= end)
+    if columns:
+        query = query.group_by(*columns).order_by(*columns)
+    if tenant_id is not None:
+        query = query.where(ToolUsage.tenant_id == tenant_id)
+
+    rows = []
+    for row in (await session.execute(query)).mappings():
+        entry = dict(row)
+        entry["calls"] = int(entry["calls"] or 0)
+        entry["errors"] = int(entry["errors"] or 0)
+        duration_ms = int(entry.pop("duration_ms") or 0)
+        entry["avg_duration_ms"] = round(duration_ms / entry["calls"], 1) if entry["calls"] else 0.0
+        rows.append(entry)
+    return rows
+
+
+# --------------------------------------------------------------------------- #
+# Process-wide aggregator
+# --------------------------------------------------------------------------- #
+
+_aggregator: Optional[UsageAggregator] = None
+
+
+def get_usage_aggregator() -> UsageAggregator:
+    """Get the process-wide usage aggregator."""
+    global _aggregator
+    if _aggregator is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        _aggregator = UsageAggregator(
+            max_pending_keys=settings.usage_max_pending_keys,
+            max_keys_per_tenant=settings.usage_max_pending_keys_per_tenant,
+        )
+    return _aggregator
+
+
+async def bootstrap_usage_from_db() -> int:
+    """Seed today's tool call count from the persisted aggregates."""
+    from sqlalchemy import func, select
+
+    from ..database.connection import BACKGROUND, get_db_context
+    from ..models.tool_usage import ToolUsage
+
+    try:
+        async with get_db_context(BACKGROUND) as session:
+            persisted = (
+                await session.execute(
+                    select(func.sum(ToolUsage.call_count)).where(ToolUsage.day == _utc_today())
+                )
+            ).scalar() or 0
+    except Exception as e:
+        logger.warning("Failed to load today's tool usage: %s", e)
+        persisted = 0
+
+    get_usage_aggregator().seed_today(int(persisted))
+    return int(persisted)
+
+
+async def run_usage_flush_loop(stop_event: asyncio.Event, interval_seconds: float = 60.0) -> None:
+    """Background loop that flushes usage periodically, or early when the buffer fills.
+
+    Pending counts left when *stop_event* is set are written by ``drain``.
+    """
+    aggregator = get_usage_aggregator()
+    while not stop_event.is_set():
+        stopped = asyncio.ensure_future(stop_event.wait())
+        woken = asyncio.ensure_future(aggregator.flush_requested.wait())
+        try:
+            await asyncio.wait({stopped, woken}, timeout=interval_seconds, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopped.cancel()
+            woken.cancel()
+        if stop_event.is_set():
+            break
+        try:
+            await aggregator.flush()
+        except Exception as e:
+            logger.warning("Failed to flush tool usage: %s", e)
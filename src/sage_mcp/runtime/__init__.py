@@ -1,10 +1,12 @@
 """Runtime system for external MCP servers."""
 
 from .generic_connector import GenericMCPConnector
+from .http_connector import StreamableHTTPMCPConnector
 from .process_manager import MCPProcessManager, process_manager
 
 __all__ = [
     "GenericMCPConnector",
     "MCPProcessManager",
     "process_manager",
+    "StreamableHTTPMCPConnector",
 ]
@@ -5,13 +5,20 @@ import json
 import logging
 import os
 import shutil
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from mcp import types
 
 from ..connectors.base import BaseConnector
 from ..models.connector import Connector
 from ..models.oauth_credential import OAuthCredential
+from ..observability.metrics import (
+    adjust_external_requests_in_flight,
+    adjust_external_requests_queued,
+    record_external_request_cancelled,
+    record_external_request_queue_wait,
+)
+from .resources import ProcessResourceGuard, ResourceLimits, ResourceUsage
 
 logger = logging.getLogger(__name__)
 
@@ -28,15 +35,34 @@ class GenericMCPConnector(BaseConnector):
     - JSON-RPC 2.0 communication over stdio
     - OAuth token injection via environment variables
     - Automatic process initialization
+    - Per-method request timeouts with `notifications/cancelled` on abandon
+    - Bounded in-flight requests per process (excess callers queue)
+    - Cached tools/list and resources/list, invalidated by list_changed
+    - CPU/memory limits (cgroup v2 or setrlimit) and usage sampling
     - Error handling and process cleanup
     """
 
+    DEFAULT_REQUEST_TIMEOUT = 30.0
+    DEFAULT_MAX_IN_FLIGHT = 32
+    PROTOCOL_VERSION = "2024-11-05"
+
+    # Notification method -> cached list method it invalidates
+    LIST_CHANGED_NOTIFICATIONS = {
+        "notifications/tools/list_changed": "tools/list",
+        "notifications/resources/list_changed": "resources/list",
+    }
+
     def __init__(
         self,
         runtime_type: str,
         command: List[str],
         env: Optional[Dict[str, str]] = None,
         working_dir: Optional[str] = None,
+        request_timeout: Optional[float] = None,
+        request_timeouts: Optional[Dict[str, float]] = None,
+        max_in_flight: Optional[int] = None,
+        resource_limits: Optional[ResourceLimits] = None,
+        cgroup_root: Optional[str] = None,
     ):
         """Initialize the generic MCP connector.
 
@@ -45,6 +71,11 @@ class GenericMCPConnector(BaseConnector):
             command: Command to execute (e.g., ["npx", "@modelcontextprotocol/server-github"])
             env: Environment variables to pass to the process
             working_dir: Working directory for the process
+            request_timeout: Default request timeout in seconds
+            request_timeouts: Per-method timeout overrides (e.g., {"tools/call": 120})
+            max_in_flight: Maximum concurrent requests sent to the process
+            resource_limits: CPU/memory limits applied to the spawned process
+            cgroup_root: Delegated cgroup v2 directory used to enforce limits
         """
         super().__init__()
         self.runtime_type = runtime_type
@@ -62,6 +93,29 @@ class GenericMCPConnector(BaseConnector):
         self._stdout_buffer = b""
         self._stdout_buffer_max = 1024 * 1024  # 1MB safety cap
         self._stdio_framing = "json_line"
+        self.request_timeout = request_timeout or self.DEFAULT_REQUEST_TIMEOUT
+        self.request_timeouts = dict(request_timeouts or {})
+        self.max_in_flight = max(1, max_in_flight or self.DEFAULT_MAX_IN_FLIGHT)
+        self._in_flight_slots = asyncio.Semaphore(self.max_in_flight)
+        self.in_flight_count = 0
+        self.queued_count = 0
+        self.cancelled_count = 0
+        self._list_cache: Dict[str, Dict] = {}
+        self._list_cache_generation = 0
+        # Called with list_changed notifications after the cache is invalidated.
+        self.on_notification: Optional[Callable[[Dict], None]] = None
+        self.resource_guard = ProcessResourceGuard(
+            resource_limits or ResourceLimits(), cgroup_root
+        )
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the external server is currently reachable."""
+        return self.process is not None and self.process.returncode is None
+
+    def get_request_timeout(self, method: str) -> float:
+        """Resolve the timeout for a JSON-RPC method."""
+        return self.request_timeouts.get(method, self.request_timeout)
 
     @staticmethod
     def _classify_stderr_level(line: str) -> int:
@@ -199,6 +253,11 @@ class GenericMCPConnector(BaseConnector):
                 env_key = f"CONFIG_{key.upper()}"
                 process_env[env_key] = str(value)
 
+        # A fresh process may expose different tools/resources.
+        self.invalidate_list_cache()
+
+        self.resource_guard.prepare(name=f"sagemcp-{connector_id}")
+
         # Start process
         try:
             self.process = await asyncio.create_subprocess_exec(
@@ -208,6 +267,7 @@ class GenericMCPConnector(BaseConnector):
                 stderr=asyncio.subprocess.PIPE,
                 env=process_env,
                 cwd=cwd,
+                preexec_fn=self.resource_guard.preexec_fn,
             )
         except Exception as e:
             raise Exception(
@@ -251,7 +311,7 @@ class GenericMCPConnector(BaseConnector):
         """Send MCP initialize request."""
         timeout = 90.0 if exec_name == "npx" else 30.0
         init_params = {
-            "protocolVersion": "2024-11-05",
+            "protocolVersion": self.PROTOCOL_VERSION,
             "capabilities": {"roots": {"listChanged": True}, "sampling": {}},
             "clientInfo": {"name": "SageMCP", "version": "1.0.0"},
         }
@@ -275,12 +335,20 @@ class GenericMCPConnector(BaseConnector):
         # Send initialized notification
         await self._send_notification("notifications/initialized")
 
-    async def _send_request(self, method: str, params: Dict, timeout: float = 30.0) -> Dict:
+    async def _send_request(
+        self, method: str, params: Dict, timeout: Optional[float] = None
+    ) -> Dict:
         """Send JSON-RPC request and wait for response.
 
+        Waits for a free in-flight slot first; the timeout covers both the
+        queue wait and the response. If the caller times out or is cancelled
+        after the request was written, `notifications/cancelled` is sent so
+        the external server can stop working on it.
+
         Args:
             method: JSON-RPC method name
             params: Parameters for the method
+            timeout: Timeout in seconds (defaults to the per-method timeout)
 
         Returns:
             Result from the response
@@ -288,6 +356,39 @@ class GenericMCPConnector(BaseConnector):
         Raises:
             Exception: If request fails or times out
         """
+        if timeout is None:
+            timeout = self.get_request_timeout(method)
+
+        loop = asyncio.get_running_loop()
+        queued_at = loop.time()
+        self.queued_count += 1
+        adjust_external_requests_queued(self.runtime_type, 1)
+        try:
+            await asyncio.wait_for(self._in_flight_slots.acquire(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise Exception(
+                f"MCP request queue timeout: {method} "
+                f"({self.max_in_flight} requests already in flight)"
+            )
+        finally:
+            self.queued_count -= 1
+            adjust_external_requests_queued(self.runtime_type, -1)
+
+        waited = loop.time() - queued_at
+        record_external_request_queue_wait(self.runtime_type, waited)
+        self.in_flight_count += 1
+        adjust_external_requests_in_flight(self.runtime_type, 1)
+        try:
+            return await self._dispatch_request(
+                method, params, max(timeout - waited, 0.0)
+            )
+        finally:
+            self.in_flight_count -= 1
+            adjust_external_requests_in_flight(self.runtime_type, -1)
+            self._in_flight_slots.release()
+
+    async def _dispatch_request(self, method: str, params: Dict, timeout: float) -> Dict:
+        """Write a request to the process and wait for its response."""
         self.request_id += 1
         request_id = str(self.request_id)
 
@@ -298,22 +399,61 @@ class GenericMCPConnector(BaseConnector):
         self._pending_requests[request_id] = future
 
         # Send request
-        await self._write_message(message)
+        try:
+            await self._write_message(message)
+        except BaseException:
+            self._pending_requests.pop(request_id, None)
+            raise
 
         # Wait for response (with timeout)
         try:
             response = await asyncio.wait_for(future, timeout=timeout)
-            if "error" in response:
-                error = response["error"]
-                error_msg = error.get("message", "Unknown error")
-                raise Exception(f"MCP error: {error_msg}")
-            return response.get("result", {})
         except asyncio.TimeoutError:
             self._pending_requests.pop(request_id, None)
+            self._cancel_remote_request(request_id, method, "timeout")
             stderr_tail = "\n".join(self._stderr_buffer[-20:])
             if stderr_tail:
                 raise Exception(f"MCP request timeout: {method}\nstderr:\n{stderr_tail}")
             raise Exception(f"MCP request timeout: {method}")
+        except asyncio.CancelledError:
+            # Caller went away (client disconnect, outer wait_for, shutdown).
+            self._pending_requests.pop(request_id, None)
+            self._cancel_remote_request(request_id, method, "cancelled")
+            raise
+
+        if "error" in response:
+            error = response["error"]
+            error_msg = error.get("message", "Unknown error")
+            raise Exception(f"MCP error: {error_msg}")
+        return response.get("result", {})
+
+    def _cancel_remote_request(self, request_id: str, method: str, reason: str):
+        """Tell the external server to stop working on an abandoned request.
+
+        Written synchronously (no drain) so it also works from a cancelled
+        task. The MCP spec forbids cancelling `initialize`.
+        """
+        self.cancelled_count += 1
+        record_external_request_cancelled(self.runtime_type, method, reason)
+
+        if method == "initialize":
+            return
+
+        message = {
+            "jsonrpc": "2.0",
+            "method": "notifications/cancelled",
+            "params": {"requestId": request_id, "reason": f"Request {reason}: {method}"},
+        }
+        self._send_cancel_notification(request_id, message)
+
+    def _send_cancel_notification(self, request_id: str, message: Dict):
+        """Write a cancellation to stdin without waiting for drain."""
+        if not self.process or not self.process.stdin or self.process.returncode is not None:
+            return
+        try:
+            self.process.stdin.write(self._encode_message(message))
+        except Exception as e:
+            logger.debug("Failed to send cancellation for request %s: %s", request_id, e)
 
     async def _send_notification(self, method: str, params: Optional[Dict] = None):
         """Send JSON-RPC notification (no response expected).
@@ -325,6 +465,14 @@ class GenericMCPConnector(BaseConnector):
         message = {"jsonrpc": "2.0", "method": method, "params": params or {}}
         await self._write_message(message)
 
+    def _encode_message(self, message: Dict) -> bytes:
+        """Serialize a JSON-RPC message using the negotiated stdio framing."""
+        if self._stdio_framing == "json_line":
+            return (json.dumps(message) + "\n").encode("utf-8")
+        payload = json.dumps(message).encode("utf-8")
+        header = f"Content-Length: {len(payload)}\r\n\r\n".encode("ascii")
+        return header + payload
+
     async def _write_message(self, message: Dict):
         """Write JSON-RPC message to process stdin.
 
@@ -337,12 +485,7 @@ class GenericMCPConnector(BaseConnector):
         if not self.process or not self.process.stdin:
             raise Exception("Process not started")
 
-        if self._stdio_framing == "json_line":
-            data = (json.dumps(message) + "\n").encode("utf-8")
-        else:
-            payload = json.dumps(message).encode("utf-8")
-            header = f"Content-Length: {len(payload)}\r\n\r\n".encode("ascii")
-            data = header + payload
+        data = self._encode_message(message)
         try:
             self.process.stdin.write(data)
             await self.process.stdin.drain()
@@ -356,7 +499,41 @@ class GenericMCPConnector(BaseConnector):
             future = self._pending_requests.pop(message["id"])
             if not future.done():
                 future.set_result(message)
-        # Handle notifications; keep silent by default.
+            return
+
+        # Notifications: only list_changed is acted upon; others stay silent.
+        if "id" in message:
+            return
+        cached_method = self.LIST_CHANGED_NOTIFICATIONS.get(message.get("method"))
+        if not cached_method:
+            return
+        self.invalidate_list_cache(cached_method)
+        if self.on_notification:
+            try:
+                self.on_notification(message)
+            except Exception as e:
+                logger.error("Error forwarding MCP notification %s: %s", message.get("method"), e)
+
+    async def _cached_list_request(self, method: str) -> Dict:
+        """Send a list request, reusing the cached result until invalidated."""
+        cached = self._list_cache.get(method)
+        if cached is not None:
+            return cached
+
+        generation = self._list_cache_generation
+        result = await self._send_request(method, {})
+        # Don't cache a result that raced with a list_changed notification.
+        if generation == self._list_cache_generation:
+            self._list_cache[method] = result
+        return result
+
+    def invalidate_list_cache(self, method: Optional[str] = None):
+        """Drop cached list results (all of them when method is None)."""
+        self._list_cache_generation += 1
+        if method is None:
+            self._list_cache.clear()
+        else:
+            self._list_cache.pop(method, None)
 
     def _try_parse_stdout_frames(self):
         """Parse as many framed/line JSON messages as possible from buffer."""
@@ -489,8 +666,8 @@ class GenericMCPConnector(BaseConnector):
                 tenant_config=connector.configuration,
             )
 
-        # Request tools from external server
-        response = await self._send_request("tools/list", {})
+        # Request tools from external server (cached until tools/list_changed)
+        response = await self._cached_list_request("tools/list")
 
         # Convert to MCP types
         tools = []
@@ -565,7 +742,7 @@ class GenericMCPConnector(BaseConnector):
                 tenant_config=connector.configuration,
             )
 
-        response = await self._send_request("resources/list", {})
+        response = await self._cached_list_request("resources/list")
 
         resources = []
         for res_data in response.get("resources", []):
@@ -635,10 +812,18 @@ class GenericMCPConnector(BaseConnector):
 
             self.process = None
             self._initialized = False
+            self.resource_guard.cleanup()
+            self.invalidate_list_cache()
             self._pending_requests.clear()
             self._stderr_buffer.clear()
             self._stdout_buffer = b""
 
+    def sample_resource_usage(self, remember: bool = True) -> Optional[ResourceUsage]:
+        """Sample RSS/CPU of the running process tree, or None if not running."""
+        if not self.process or self.process.returncode is not None:
+            return None
+        return self.resource_guard.sample(self.process.pid, remember)
+
     def __del__(self):
         """Cleanup on garbage collection."""
         if self.process and self.process.returncode is None:
@@ -0,0 +1,339 @@
+"""Connector for external MCP servers reachable over Streamable HTTP."""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+import httpx
+
+from ..connectors.http_client import get_http_client
+from .generic_connector import GenericMCPConnector
+from .resources import ResourceUsage
+
+logger = logging.getLogger(__name__)
+
+
+class StreamableHTTPMCPConnector(GenericMCPConnector):
+    """Bridges an external MCP server over the Streamable HTTP transport.
+
+    Lets SageMCP use servers that are not child processes of the API pod
+    (sidecars, containers started by the orchestrators, remote services).
+    Requests share the global httpx client, so keep-alive connections and
+    pool limits are shared with native connectors.
+
+    Key features:
+    - JSON-RPC POSTs answered with application/json or text/event-stream
+    - Mcp-Session-Id tracking and DELETE on stop
+    - Same per-method timeouts, in-flight cap and cancellation as stdio
+    - Optional GET event stream for list_changed notifications
+    """
+
+    PROTOCOL_VERSION = "2025-03-26"
+    CONNECT_TIMEOUT = 10.0
+    LISTEN_RETRY_DELAY = 5.0
+
+    def __init__(
+        self,
+        runtime_type: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        request_timeout: Optional[float] = None,
+        request_timeouts: Optional[Dict[str, float]] = None,
+        max_in_flight: Optional[int] = None,
+        listen_for_notifications: bool = False,
+    ):
+        """Initialize the HTTP MCP connector.
+
+        Args:
+            runtime_type: Type of runtime (external_http)
+            url: MCP endpoint URL of the external server
+            headers: Extra headers sent with every request
+            request_timeout: Default request timeout in seconds
+            request_timeouts: Per-method timeout overrides (e.g., {"tools/call": 120})
+            max_in_flight: Maximum concurrent requests sent to the server
+            listen_for_notifications: Hold a GET event stream open for
+                server notifications (uses one pooled connection)
+        """
+        super().__init__(
+            runtime_type=runtime_type,
+            command=[],
+            request_timeout=request_timeout,
+            request_timeouts=request_timeouts,
+            max_in_flight=max_in_flight,
+        )
+        self.url = url
+        self.headers = dict(headers or {})
+        self.listen_for_notifications = listen_for_notifications
+        self.session_id: Optional[str] = None
+        self.negotiated_protocol_version: Optional[str] = None
+        self._connected = False
+        self._request_headers: Dict[str, str] = {}
+        self._post_tasks: Dict[str, asyncio.Task] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._listen_task: Optional[asyncio.Task] = None
+
+    @property
+    def display_name(self) -> str:
+        """Display name for this connector."""
+        return f"External MCP Server ({self.runtime_type})"
+
+    @property
+    def description(self) -> str:
+        """Connector description."""
+        return (
+            "Connects to an external MCP server over Streamable HTTP and proxies "
+            "tools/resources into SageMCP."
+        )
+
+    @property
+    def is_running(self) -> bool:
+        """Whether an MCP session with the server is established."""
+        return self._connected
+
+    async def start_process(
+        self,
+        tenant_id: str,
+        connector_id: str,
+        oauth_token: Optional[str] = None,
+        tenant_config: Optional[Dict] = None,
+    ):
+        """Open an MCP session with the external server.
+
+        Args:
+            tenant_id: ID of the tenant
+            connector_id: ID of the connector
+            oauth_token: OAuth access token sent as a bearer token
+            tenant_config: Unused; HTTP servers own their configuration
+        """
+        if self._connected:
+            return
+        if not self.url:
+            raise Exception("runtime_command must be the MCP endpoint URL for external_http connectors")
+
+        self._request_headers = {
+            **self.headers,
+            "X-SageMCP-Tenant-Id": tenant_id,
+            "X-SageMCP-Connector-Id": connector_id,
+        }
+        if oauth_token:
+            self._request_headers["Authorization"] = f"Bearer {oauth_token}"
+
+        # A fresh session may expose different tools/resources.
+        self.invalidate_list_cache()
+        self._connected = True
+        try:
+            await self._initialize_mcp()
+        except Exception as e:
+            await self.stop_process()
+            raise Exception(f"Failed to initialize MCP session: {str(e)}")
+
+        if self.listen_for_notifications:
+            self._listen_task = asyncio.create_task(self._listen())
+
+    async def _initialize_mcp(self, exec_name: Optional[str] = None):
+        """Send MCP initialize request and record the negotiated session."""
+        init_params = {
+            "protocolVersion": self.PROTOCOL_VERSION,
+            "capabilities": {"roots": {"listChanged": True}, "sampling": {}},
+            "clientInfo": {"name": "SageMCP", "version": "1.0.0"},
+        }
+        result = await self._send_request("initialize", init_params)
+        self.negotiated_protocol_version = result.get("protocolVersion")
+        self._initialized = True
+
+        await self._send_notification("notifications/initialized")
+
+    def _headers(self, accept: str) -> Dict[str, str]:
+        headers = {**self._request_headers, "Accept": accept}
+        if self.session_id:
+            headers["Mcp-Session-Id"] = self.session_id
+        if self.negotiated_protocol_version:
+            headers["MCP-Protocol-Version"] = self.negotiated_protocol_version
+        return headers
+
+    async def _write_message(self, message: Dict):
+        """POST a JSON-RPC message to the server.
+
+        Requests are posted in a background task that feeds the response
+        (JSON or event stream) into `_process_incoming_message`, so the
+        caller's timeout in `_dispatch_request` covers the whole exchange.
+        Notifications are posted inline.
+        """
+        if not self._connected:
+            raise Exception("MCP session not started")
+
+        if "id" not in message:
+            await self._post(message, timeout=self.request_timeout)
+            return
+
+        request_id = message["id"]
+        task = asyncio.create_task(self._post_request(request_id, message))
+        self._post_tasks[request_id] = task
+
+    async def _post_request(self, request_id: str, message: Dict):
+        """Post a request and fail its pending future if no response arrives."""
+        try:
+            await self._post(message, timeout=None)
+            error: Exception = Exception(
+                f"MCP server returned no response for {message.get('method')}"
+            )
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            error = e
+        finally:
+            self._post_tasks.pop(request_id, None)
+
+        future = self._pending_requests.pop(request_id, None)
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+    async def _post(self, message: Dict, timeout: Optional[float]):
+        """POST one message and dispatch every message in the response."""
+        client = get_http_client()
+        async with client.stream(
+            "POST",
+            self.url,
+            json=message,
+            headers=self._headers("application/json, text/event-stream"),
+            timeout=httpx.Timeout(timeout, connect=self.CONNECT_TIMEOUT),
+        ) as response:
+            if response.status_code == 404 and self.session_id:
+                # Server dropped the session; health checks will reconnect.
+                self._connected = False
+                raise Exception("MCP session expired")
+            if response.status_code >= 400:
+                body = (await response.aread()).decode("utf-8", errors="replace")
+                raise Exception(f"MCP HTTP error {response.status_code}: {body[:200]}")
+
+            if message.get("method") == "initialize":
+                self.session_id = response.headers.get("mcp-session-id")
+
+            content_type = response.headers.get("content-type", "")
+            if content_type.startswith("text/event-stream"):
+                async for data in self._iter_sse_data(response):
+                    self._dispatch_payload(data)
+            elif content_type.startswith("application/json"):
+                self._dispatch_payload((await response.aread()).decode("utf-8"))
+
+    @staticmethod
+    async def _iter_sse_data(response: httpx.Response) -> AsyncIterator[str]:
+        """Yield the data field of each server-sent event."""
+        data_lines = []
+        async for line in response.aiter_lines():
+            if not line:
+                if data_lines:
+                    yield "\n".join(data_lines)
+                    data_lines = []
+                continue
+            if line.startswith(":"):
+                continue
+            field, _, value = line.partition(":")
+            if field == "data":
+                data_lines.append(value[1:] if value.startswith(" ") else value)
+        if data_lines:
+            yield "\n".join(data_lines)
+
+    def _dispatch_payload(self, data: str):
+        """Parse a JSON-RPC message or batch and process each message."""
+        try:
+            payload: Any = json.loads(data)
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON from MCP server %s: %s", self.url, data[:200])
+            return
+        for message in payload if isinstance(payload, list) else [payload]:
+            if isinstance(message, dict):
+                self._process_incoming_message(message)
+
+    def _cancel_remote_request(self, request_id: str, method: str, reason: str):
+        """Abort the request's HTTP exchange and notify the server.
+
+        Closing the response stream alone does not cancel work on the server,
+        so `notifications/cancelled` is posted as well (never for initialize).
+        """
+        task = self._post_tasks.pop(request_id, None)
+        if task is not None:
+            task.cancel()
+        super()._cancel_remote_request(request_id, method, reason)
+
+    def _send_cancel_notification(self, request_id: str, message: Dict):
+        if not self._connected:
+            return
+        task = asyncio.create_task(self._post_quietly(message))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _post_quietly(self, message: Dict):
+        try:
+            await self._post(message, timeout=self.request_timeout)
+        except Exception as e:
+            logger.debug("Failed to post %s to %s: %s", message.get("method"), self.url, e)
+
+    async def _listen(self):
+        """Hold the GET event stream open for server notifications."""
+        client = get_http_client()
+        while self._connected:
+            try:
+                async with client.stream(
+                    "GET",
+                    self.url,
+                    headers=self._headers("text/event-stream"),
+                    timeout=httpx.Timeout(None, connect=self.CONNECT_TIMEOUT),
+                ) as response:
+                    if response.status_code == 405:
+                        logger.debug("MCP server %s offers no notification stream", self.url)
+                        return
+                    if response.status_code >= 400:
+                        raise Exception(f"HTTP {response.status_code}")
+                    async for data in self._iter_sse_data(response):
+                        self._dispatch_payload(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug("MCP notification stream from %s dropped: %s", self.url, e)
+            # Notifications may have been missed while disconnected.
+            self.invalidate_list_cache()
+            await asyncio.sleep(self.LISTEN_RETRY_DELAY)
+
+    async def _cached_list_request(self, method: str) -> Dict:
+        """Cache list results only while list_changed notifications can arrive."""
+        if not self.listen_for_notifications:
+            return await self._send_request(method, {})
+        return await super()._cached_list_request(method)
+
+    def sample_resource_usage(self, remember: bool = True) -> Optional[ResourceUsage]:
+        """Remote servers have no local process to sample."""
+        return None
+
+    async def stop_process(self):
+        """Close the MCP session with the external server."""
+        was_connected = self._connected
+        self._connected = False
+
+        tasks = [*self._post_tasks.values(), *self._background_tasks]
+        if self._listen_task:
+            tasks.append(self._listen_task)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._post_tasks.clear()
+        self._background_tasks.clear()
+        self._listen_task = None
+
+        if was_connected and self.session_id:
+            try:
+                await get_http_client().delete(
+                    self.url,
+                    headers=self._headers("application/json"),
+                    timeout=httpx.Timeout(5.0, connect=self.CONNECT_TIMEOUT),
+                )
+            except Exception as e:
+                logger.debug("Failed to close MCP session at %s: %s", self.url, e)
+
+        self.session_id = None
+        self.negotiated_protocol_version = None
+        self._initialized = False
+        self.invalidate_list_cache()
+        self._pending_requests.clear()
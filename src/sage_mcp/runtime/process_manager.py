@@ -5,16 +5,25 @@ import json
 import logging
 import os
 from datetime import datetime
-from typing import Any, Dict, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import case, literal, null, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .generic_connector import GenericMCPConnector
-from ..database.connection import get_db_context
-from ..models.connector import Connector
+from .http_connector import StreamableHTTPMCPConnector
+from .resources import ResourceLimits
+from ..config import get_settings
+from ..database.connection import BACKGROUND, get_db_context
+from ..models.connector import Connector, ConnectorRuntimeType
 from ..models.mcp_process import MCPProcess, ProcessStatus
 from ..models.oauth_credential import OAuthCredential
+from ..observability.metrics import (
+    clear_external_process_usage,
+    set_external_process_usage,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +32,13 @@ class MCPProcessManager:
     """Singleton manager for all external MCP processes.
 
     Responsibilities:
-    - Start and stop external MCP server processes
+    - Start and stop external MCP server processes (stdio) and sessions
+      with remote servers (Streamable HTTP)
     - Track process states in database
     - Perform periodic health checks
     - Auto-restart failed processes
+    - Enforce CPU/memory limits and sample per-process usage
+    - Fan out list_changed notifications to subscribed MCP sessions
     - Cleanup on shutdown
     """
 
@@ -36,9 +48,15 @@ class MCPProcessManager:
         self.health_check_interval = 30  # seconds
         self.protocol_probe_interval = 300  # seconds
         self.health_failure_threshold = 3
+        self.health_check_concurrency = 50  # probes/restarts in flight per pass
+        self.heartbeat_batch_size = 1000  # connector ids per bulk UPDATE
+        self.max_restarts = 3
         self._health_state: Dict[str, Dict[str, Any]] = {}
         self._health_check_task: Optional[asyncio.Task] = None
         self._shutdown = False
+        # Subscriber queues survive process restarts; keyed like self.processes.
+        self._notification_subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self.notification_queue_size = 100
 
     def _get_key(self, tenant_id: str, connector_id: str) -> str:
         """Generate unique key for process.
@@ -52,6 +70,39 @@ class MCPProcessManager:
         """
         return f"{tenant_id}:{connector_id}"
 
+    def subscribe(self, tenant_id: str, connector_id: str) -> asyncio.Queue:
+        """Subscribe to notifications forwarded from a connector's process.
+
+        Args:
+            tenant_id: Tenant ID
+            connector_id: Connector ID
+
+        Returns:
+            Bounded queue receiving JSON-RPC notification dicts
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.notification_queue_size)
+        key = self._get_key(tenant_id, connector_id)
+        self._notification_subscribers.setdefault(key, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, tenant_id: str, connector_id: str, queue: asyncio.Queue):
+        """Remove a subscriber queue created by subscribe()."""
+        key = self._get_key(tenant_id, connector_id)
+        subscribers = self._notification_subscribers.get(key)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._notification_subscribers[key]
+
+    def _publish_notification(self, key: str, message: Dict[str, Any]):
+        """Deliver a process notification to every subscriber of key."""
+        for queue in list(self._notification_subscribers.get(key, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.debug("Dropping %s for slow subscriber on %s", message.get("method"), key)
+
     @staticmethod
     def _coerce_uuid(value):
         """Best-effort UUID coercion for DB filters/assignments."""
@@ -98,32 +149,12 @@ class MCPProcessManager:
                 # Unhealthy, restart
                 await self.terminate(str(connector.tenant_id), str(connector.id))
 
-        # Parse runtime command
-        try:
-            command = json.loads(connector.runtime_command) if connector.runtime_command else []
-        except json.JSONDecodeError:
-            raise Exception(f"Invalid runtime_command JSON: {connector.runtime_command}")
-
-        if not isinstance(command, list) or not command:
-            raise Exception("runtime_command is required for external MCP connectors")
-        if not isinstance(command[0], str) or not command[0].strip():
-            raise Exception("runtime_command must start with a non-empty executable name")
-        detected_runtime_type = self._infer_runtime_type(
-            command[0], connector.runtime_type.value
-        )
-
-        # Normalize package_path: treat empty strings as unset.
-        working_dir = connector.package_path.strip() if connector.package_path else None
-        if working_dir == "":
-            working_dir = None
-
-        # Create new process
-        process = GenericMCPConnector(
-            runtime_type=connector.runtime_type.value,
-            command=command,
-            env=connector.runtime_env or {},
-            working_dir=working_dir,
-        )
+        if connector.runtime_type == ConnectorRuntimeType.EXTERNAL_HTTP:
+            process = self._create_http_connector(connector)
+            detected_runtime_type = connector.runtime_type.value
+        else:
+            process, detected_runtime_type = await self._create_stdio_connector(connector)
+        process.on_notification = partial(self._publish_notification, key)
 
         # Start the process
         try:
@@ -162,6 +193,101 @@ class MCPProcessManager:
 
         return process
 
+    async def _create_stdio_connector(
+        self, connector: Connector
+    ) -> Tuple[GenericMCPConnector, str]:
+        """Build a stdio bridge from the connector's runtime_command.
+
+        Returns:
+            Tuple of (connector instance, detected runtime type)
+        """
+        # Parse runtime command
+        try:
+            command = json.loads(connector.runtime_command) if connector.runtime_command else []
+        except json.JSONDecodeError:
+            raise Exception(f"Invalid runtime_command JSON: {connector.runtime_command}")
+
+        if not isinstance(command, list) or not command:
+            raise Exception("runtime_command is required for external MCP connectors")
+        if not isinstance(command[0], str) or not command[0].strip():
+            raise Exception("runtime_command must start with a non-empty executable name")
+        detected_runtime_type = self._infer_runtime_type(
+            command[0], connector.runtime_type.value
+        )
+
+        # Normalize package_path: treat empty strings as unset.
+        working_dir = connector.package_path.strip() if connector.package_path else None
+        if working_dir == "":
+            working_dir = None
+
+        settings = get_settings()
+        resource_limits = await self._load_resource_limits(connector)
+        process = GenericMCPConnector(
+            runtime_type=connector.runtime_type.value,
+            command=command,
+            env=connector.runtime_env or {},
+            working_dir=working_dir,
+            request_timeout=settings.mcp_server_timeout,
+            request_timeouts=settings.get_external_mcp_request_timeouts(),
+            max_in_flight=settings.external_mcp_max_in_flight,
+            resource_limits=resource_limits,
+            cgroup_root=settings.external_mcp_cgroup_root,
+        )
+        return process, detected_runtime_type
+
+    @staticmethod
+    def _parse_http_url(runtime_command: Optional[str]) -> str:
+        """Extract the endpoint URL from an external_http runtime_command.
+
+        Accepts a bare URL, a JSON string or a one-element JSON array.
+        """
+        value: Any = (runtime_command or "").strip()
+        if value.startswith(("[", '"')):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                raise Exception(f"Invalid runtime_command JSON: {runtime_command}")
+            if isinstance(value, list):
+                value = value[0] if len(value) == 1 else None
+        if not isinstance(value, str) or not value.startswith(("http://", "https://")):
+            raise Exception("runtime_command must be an http(s) MCP endpoint URL")
+        return value
+
+    def _create_http_connector(self, connector: Connector) -> StreamableHTTPMCPConnector:
+        """Build a Streamable HTTP bridge; runtime_env entries become headers."""
+        settings = get_settings()
+        return StreamableHTTPMCPConnector(
+            runtime_type=connector.runtime_type.value,
+            url=self._parse_http_url(connector.runtime_command),
+            headers={str(k): str(v) for k, v in (connector.runtime_env or {}).items()},
+            request_timeout=settings.mcp_server_timeout,
+            request_timeouts=settings.get_external_mcp_request_timeouts(),
+            max_in_flight=settings.external_mcp_max_in_flight,
+            listen_for_notifications=settings.external_mcp_http_notifications,
+        )
+
+    async def _load_resource_limits(self, connector: Connector) -> ResourceLimits:
+        """Resolve limits from the process record, falling back to settings."""
+        settings = get_settings()
+        cpu_millicores = None
+        memory_mb = None
+        try:
+            async with get_db_context() as session:
+                result = await session.execute(
+                    select(
+                        MCPProcess.cpu_limit_millicores, MCPProcess.memory_limit_mb
+                    ).where(MCPProcess.connector_id == self._coerce_uuid(connector.id))
+                )
+                row = result.first()
+                if row is not None:
+                    cpu_millicores, memory_mb = row
+        except Exception as e:
+            logger.warning("Failed to load resource limits for %s: %s", connector.id, e)
+        return ResourceLimits(
+            cpu_millicores=cpu_millicores or settings.external_mcp_cpu_limit_millicores,
+            memory_mb=memory_mb or settings.external_mcp_memory_limit_mb,
+        )
+
     async def terminate(self, tenant_id: str, connector_id: str):
         """Terminate external MCP server process.
 
@@ -170,17 +296,26 @@ class MCPProcessManager:
             connector_id: Connector ID
         """
         key = self._get_key(tenant_id, connector_id)
-        if key in self.processes:
-            process = self.processes[key]
-            await process.stop_process()
-            del self.processes[key]
-            self._health_state.pop(key, None)
-
+        if await self._stop_tracked(key):
             # Update database
             await self._update_process_status(
                 tenant_id, connector_id, ProcessStatus.STOPPED
             )
 
+    async def _stop_tracked(self, key: str) -> bool:
+        """Stop and forget a tracked process without touching the database.
+
+        Returns:
+            True if a process was tracked under key
+        """
+        process = self.processes.pop(key, None)
+        self._health_state.pop(key, None)
+        if process is None:
+            return False
+        await process.stop_process()
+        clear_external_process_usage(key.split(":")[1], process.runtime_type)
+        return True
+
     async def terminate_all(self):
         """Terminate all external MCP server processes."""
         self._shutdown = True
@@ -216,7 +351,7 @@ class MCPProcessManager:
         Returns:
             True if healthy, False otherwise
         """
-        if not process.process or process.process.returncode is not None:
+        if not process.is_running:
             return False
 
         loop = asyncio.get_running_loop()
@@ -252,105 +387,211 @@ class MCPProcessManager:
         while not self._shutdown:
             try:
                 await asyncio.sleep(self.health_check_interval)
-
-                for key, process in list(self.processes.items()):
-                    if not await self._is_healthy(key, process):
-                        tenant_id, connector_id = key.split(":")
-
-                        # Get restart count from database
-                        async with get_db_context() as session:
-                            result = await session.execute(
-                                select(MCPProcess).where(
-                                    MCPProcess.tenant_id == tenant_id,
-                                    MCPProcess.connector_id == connector_id,
-                                )
-                            )
-                            mcp_process = result.scalar_one_or_none()
-                            restart_count = (
-                                mcp_process.restart_count if mcp_process else 0
-                            )
-
-                        # Check restart limit (max 3 restarts)
-                        if restart_count >= 3:
-                            # Too many restarts, mark as error
-                            await self._update_process_status(
-                                tenant_id,
-                                connector_id,
-                                ProcessStatus.ERROR,
-                                error_message="Max restart limit reached (3)",
-                            )
-                            # Remove from active processes
-                            await self.terminate(tenant_id, connector_id)
-                            continue
-
-                        # Attempt restart
-                        try:
-                            # Get connector and OAuth credentials
-                            async with get_db_context() as session:
-                                result = await session.execute(
-                                    select(Connector).where(Connector.id == connector_id)
-                                )
-                                connector = result.scalar_one_or_none()
-
-                                if not connector:
-                                    await self.terminate(tenant_id, connector_id)
-                                    continue
-
-                                # Get OAuth credential
-                                result = await session.execute(
-                                    select(OAuthCredential).where(
-                                        OAuthCredential.tenant_id == tenant_id,
-                                        OAuthCredential.provider
-                                        == connector.connector_type.value,
-                                        OAuthCredential.is_active.is_(True),
-                                    )
-                                )
-                                oauth_cred = result.scalar_one_or_none()
-
-                            # Terminate old process
-                            await self.terminate(tenant_id, connector_id)
-
-                            # Update status to restarting
-                            await self._update_process_status(
-                                tenant_id,
-                                connector_id,
-                                ProcessStatus.RESTARTING,
-                                restart_count=restart_count + 1,
-                            )
-
-                            # Start new process
-                            await self.get_or_create(connector, oauth_cred)
-
-                        except Exception as e:
-                            # Restart failed
-                            await self._update_process_status(
-                                tenant_id,
-                                connector_id,
-                                ProcessStatus.ERROR,
-                                error_message=f"Restart failed: {str(e)}",
-                                restart_count=restart_count + 1,
-                            )
-                            await self.terminate(tenant_id, connector_id)
-
-                    else:
-                        # Update last health check time
-                        tenant_id, connector_id = key.split(":")
-                        async with get_db_context() as session:
-                            await session.execute(
-                                update(MCPProcess)
-                                .where(
-                                    MCPProcess.tenant_id == tenant_id,
-                                    MCPProcess.connector_id == connector_id,
-                                )
-                                .values(last_health_check=datetime.utcnow())
-                            )
-                            await session.commit()
-
+                await self._run_health_checks()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error("Error in health check loop: %s", e)
 
+    async def _run_health_checks(self):
+        """Run one health check pass over all tracked processes.
+
+        Probes run concurrently (bounded by health_check_concurrency). Healthy
+        processes get their heartbeat written in bulk; unhealthy ones are
+        restarted with their bookkeeping sharing one session.
+        """
+        items = list(self.processes.items())
+        if not items:
+            return
+
+        semaphore = asyncio.Semaphore(self.health_check_concurrency)
+
+        async def probe(key: str, process: GenericMCPConnector) -> Tuple[str, GenericMCPConnector, bool]:
+            async with semaphore:
+                try:
+                    return key, process, await self._is_healthy(key, process)
+                except Exception as e:
+                    logger.warning("Health check for %s failed: %s", key, e)
+                    return key, process, False
+
+        results = await asyncio.gather(*(probe(key, process) for key, process in items))
+
+        healthy: List[str] = []
+        unhealthy: List[str] = []
+        for key, process, is_healthy in results:
+            # Skip processes replaced or terminated while the probe ran.
+            if self.processes.get(key) is not process:
+                continue
+            (healthy if is_healthy else unhealthy).append(key)
+
+        if healthy:
+            await asyncio.to_thread(
+                self._sample_resource_usage,
+                [(key, self.processes[key]) for key in healthy],
+            )
+            await self._record_heartbeats(healthy)
+        if unhealthy:
+            await self._restart_unhealthy(unhealthy, semaphore)
+
+    def _sample_resource_usage(self, items: List[Tuple[str, GenericMCPConnector]]):
+        """Sample RSS/CPU for each process and export them as gauges.
+
+        Runs in a worker thread: it only reads /proc and cgroup files.
+        """
+        for key, process in items:
+            try:
+                usage = process.sample_resource_usage()
+            except Exception as e:
+                logger.debug("Resource sampling failed for %s: %s", key, e)
+                continue
+            if usage is not None:
+                set_external_process_usage(
+                    key.split(":")[1],
+                    process.runtime_type,
+                    usage.rss_bytes,
+                    usage.cpu_millicores,
+                )
+
+    async def _record_heartbeats(self, keys: List[str]):
+        """Write last_health_check for healthy processes as bulk UPDATEs."""
+        connector_ids = [self._coerce_uuid(key.split(":")[1]) for key in keys]
+        now = datetime.utcnow()
+        async with get_db_context(BACKGROUND) as session:
+            for start in range(0, len(connector_ids), self.heartbeat_batch_size):
+                await session.execute(
+                    update(MCPProcess)
+                    .where(
+                        MCPProcess.connector_id.in_(
+                            connector_ids[start:start + self.heartbeat_batch_size]
+                        )
+                    )
+                    .values(last_health_check=now)
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+
+    async def _restart_unhealthy(self, keys: List[str], semaphore: asyncio.Semaphore):
+        """Restart unhealthy processes, respecting the restart limit.
+
+        The old processes are stopped concurrently before a connection is
+        taken. Restart counts, connectors and OAuth credentials are then
+        loaded in bulk and every status change is written by one UPDATE,
+        committed before any new process is spawned.
+        """
+
+        async def stop(key: str):
+            async with semaphore:
+                try:
+                    await self._stop_tracked(key)
+                except Exception as e:
+                    logger.warning("Stopping %s failed: %s", key, e)
+
+        await asyncio.gather(*(stop(key) for key in keys))
+
+        connector_uuids = [self._coerce_uuid(key.split(":")[1]) for key in keys]
+        exhausted: List[Any] = []
+        orphaned: List[Any] = []
+        restarts: List[Tuple[Connector, Optional[OAuthCredential], int]] = []
+
+        async with get_db_context(BACKGROUND) as session:
+            result = await session.execute(
+                select(MCPProcess.connector_id, MCPProcess.restart_count).where(
+                    MCPProcess.connector_id.in_(connector_uuids)
+                )
+            )
+            restart_counts = {str(cid): count or 0 for cid, count in result.all()}
+
+            result = await session.execute(
+                select(Connector).where(Connector.id.in_(connector_uuids))
+            )
+            connectors = {str(c.id): c for c in result.scalars().all()}
+
+            credentials: Dict[Tuple[str, str], OAuthCredential] = {}
+            tenant_uuids = {c.tenant_id for c in connectors.values()}
+            if tenant_uuids:
+                result = await session.execute(
+                    select(OAuthCredential).where(
+                        OAuthCredential.tenant_id.in_(tenant_uuids),
+                        OAuthCredential.is_active.is_(True),
+                    )
+                )
+                for cred in result.scalars().all():
+                    credentials.setdefault((str(cred.tenant_id), cred.provider), cred)
+
+            for key, connector_uuid in zip(keys, connector_uuids):
+                connector_id = key.split(":")[1]
+                restart_count = restart_counts.get(connector_id, 0)
+                connector = connectors.get(connector_id)
+
+                if restart_count >= self.max_restarts:
+                    # Too many restarts, mark as error
+                    exhausted.append(connector_uuid)
+                elif connector is None:
+                    orphaned.append(connector_uuid)
+                else:
+                    oauth_cred = credentials.get(
+                        (str(connector.tenant_id), connector.connector_type.value)
+                    )
+                    restarts.append((connector, oauth_cred, restart_count + 1))
+
+            status_type = MCPProcess.status.type
+            settled = exhausted + orphaned
+            await session.execute(
+                update(MCPProcess)
+                .where(MCPProcess.connector_id.in_(connector_uuids))
+                .values(
+                    status=case(
+                        (
+                            MCPProcess.connector_id.in_(exhausted),
+                            literal(ProcessStatus.ERROR, status_type),
+                        ),
+                        (
+                            MCPProcess.connector_id.in_(orphaned),
+                            literal(ProcessStatus.STOPPED, status_type),
+                        ),
+                        else_=literal(ProcessStatus.RESTARTING, status_type),
+                    ),
+                    error_message=case(
+                        (
+                            MCPProcess.connector_id.in_(exhausted),
+                            literal(f"Max restart limit reached ({self.max_restarts})"),
+                        ),
+                        else_=null(),
+                    ),
+                    restart_count=case(
+                        (MCPProcess.connector_id.in_(settled), MCPProcess.restart_count),
+                        else_=MCPProcess.restart_count + 1,
+                    ),
+                    pid=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+        failures: List[Tuple[Connector, int, Exception]] = []
+
+        async def restart(connector: Connector, oauth_cred, restart_count: int):
+            async with semaphore:
+                try:
+                    await self.get_or_create(connector, oauth_cred)
+                except Exception as e:
+                    failures.append((connector, restart_count, e))
+
+        await asyncio.gather(*(restart(*args) for args in restarts))
+
+        if failures:
+            async with get_db_context() as session:
+                for connector, restart_count, error in failures:
+                    await self._update_process_status(
+                        str(connector.tenant_id),
+                        str(connector.id),
+                        ProcessStatus.ERROR,
+                        error_message=f"Restart failed: {str(error)}",
+                        restart_count=restart_count,
+                        session=session,
+                    )
+                await session.commit()
+
     async def _update_process_status(
         self,
         tenant_id: str,
@@ -360,6 +601,7 @@ class MCPProcessManager:
         error_message: Optional[str] = None,
         restart_count: Optional[int] = None,
         runtime_type: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
     ):
         """Update process status in database.
 
@@ -371,82 +613,95 @@ class MCPProcessManager:
             error_message: Error message (optional)
             restart_count: Restart count (optional)
             runtime_type: Runtime type label to persist (optional)
+            session: Session to reuse; the caller commits (optional)
         """
-        async with get_db_context() as session:
-            tenant_uuid = self._coerce_uuid(tenant_id)
-            connector_uuid = self._coerce_uuid(connector_id)
+        if session is None:
+            async with get_db_context() as own_session:
+                await self._update_process_status(
+                    tenant_id,
+                    connector_id,
+                    status,
+                    pid=pid,
+                    error_message=error_message,
+                    restart_count=restart_count,
+                    runtime_type=runtime_type,
+                    session=own_session,
+                )
+                await own_session.commit()
+            return
 
-            # Check if record exists
-            result = await session.execute(
-                select(MCPProcess).where(
+        tenant_uuid = self._coerce_uuid(tenant_id)
+        connector_uuid = self._coerce_uuid(connector_id)
+
+        # Check if record exists
+        result = await session.execute(
+            select(MCPProcess).where(
+                MCPProcess.tenant_id == tenant_uuid,
+                MCPProcess.connector_id == connector_uuid,
+            )
+        )
+        mcp_process = result.scalar_one_or_none()
+
+        if mcp_process:
+            # Update existing record
+            update_values = {"status": status}
+            if pid is not None:
+                update_values["pid"] = pid
+            elif status != ProcessStatus.RUNNING:
+                update_values["pid"] = None
+            if error_message is not None:
+                update_values["error_message"] = error_message
+            elif status in {
+                ProcessStatus.STARTING,
+                ProcessStatus.RUNNING,
+                ProcessStatus.RESTARTING,
+                ProcessStatus.STOPPED,
+            }:
+                # Clear stale error after successful recovery/start/stop.
+                update_values["error_message"] = None
+            if restart_count is not None:
+                update_values["restart_count"] = restart_count
+            if runtime_type is not None:
+                update_values["runtime_type"] = runtime_type
+            if status == ProcessStatus.RUNNING:
+                update_values["started_at"] = datetime.utcnow()
+                update_values["last_health_check"] = datetime.utcnow()
+
+            await session.execute(
+                update(MCPProcess)
+                .where(
                     MCPProcess.tenant_id == tenant_uuid,
                     MCPProcess.connector_id == connector_uuid,
                 )
+                .values(**update_values)
             )
-            mcp_process = result.scalar_one_or_none()
-
-            if mcp_process:
-                # Update existing record
-                update_values = {"status": status}
-                if pid is not None:
-                    update_values["pid"] = pid
-                elif status != ProcessStatus.RUNNING:
-                    update_values["pid"] = None
-                if error_message is not None:
-                    update_values["error_message"] = error_message
-                elif status in {
-                    ProcessStatus.STARTING,
-                    ProcessStatus.RUNNING,
-                    ProcessStatus.RESTARTING,
-                    ProcessStatus.STOPPED,
-                }:
-                    # Clear stale error after successful recovery/start/stop.
-                    update_values["error_message"] = None
-                if restart_count is not None:
-                    update_values["restart_count"] = restart_count
-                if runtime_type is not None:
-                    update_values["runtime_type"] = runtime_type
-                if status == ProcessStatus.RUNNING:
-                    update_values["started_at"] = datetime.utcnow()
-                    update_values["last_health_check"] = datetime.utcnow()
-
-                await session.execute(
-                    update(MCPProcess)
-                    .where(
-                        MCPProcess.tenant_id == tenant_uuid,
-                        MCPProcess.connector_id == connector_uuid,
-                    )
-                    .values(**update_values)
-                )
-            else:
-                # Create new record
-                result = await session.execute(
-                    select(Connector).where(Connector.id == connector_uuid)
-                )
-                connector = result.scalar_one_or_none()
-
-                persisted_runtime_type = runtime_type or (
-                    connector.runtime_type.value if connector else "external_custom"
-                )
+        else:
+            # Create new record
+            result = await session.execute(
+                select(Connector).where(Connector.id == connector_uuid)
+            )
+            connector = result.scalar_one_or_none()
 
-                new_process = MCPProcess(
-                    connector_id=connector_uuid,
-                    tenant_id=tenant_uuid,
-                    pid=pid,
-                    runtime_type=persisted_runtime_type,
-                    status=status,
-                    started_at=datetime.utcnow(),
-                    last_health_check=(
-                        datetime.utcnow()
-                        if status == ProcessStatus.RUNNING
-                        else None
-                    ),
-                    error_message=error_message,
-                    restart_count=restart_count or 0,
-                )
-                session.add(new_process)
+            persisted_runtime_type = runtime_type or (
+                connector.runtime_type.value if connector else "external_custom"
+            )
 
-            await session.commit()
+            new_process = MCPProcess(
+                connector_id=connector_uuid,
+                tenant_id=tenant_uuid,
+                pid=pid,
+                runtime_type=persisted_runtime_type,
+                status=status,
+                started_at=datetime.utcnow(),
+                last_health_check=(
+                    datetime.utcnow()
+                    if status == ProcessStatus.RUNNING
+                    else None
+                ),
+                error_message=error_message,
+                restart_count=restart_count or 0,
+            )
+            session.add(new_process)
 
 
 # Global singleton instance
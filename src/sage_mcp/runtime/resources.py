@@ -0,0 +1,264 @@
+"""Resource limits and usage accounting for external MCP processes.
+
+Limits are enforced with a per-process cgroup v2 child when a delegated
+cgroup root is configured, otherwise with setrlimit (memory) and a lower
+scheduling priority (CPU). Usage is sampled from the cgroup or from /proc.
+"""
+
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PROC_ROOT = "/proc"
+CPU_PERIOD_USEC = 100_000
+# Niceness applied to CPU-limited children when no cgroup is available,
+# so API workers on the same node keep scheduling priority.
+FALLBACK_NICE_INCREMENT = 10
+
+
+@dataclass
+class ResourceLimits:
+    """CPU and memory limits for one external process."""
+
+    cpu_millicores: Optional[int] = None
+    memory_mb: Optional[int] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.cpu_millicores and not self.memory_mb
+
+
+@dataclass
+class ResourceUsage:
+    """Point-in-time resource usage of an external process tree."""
+
+    rss_bytes: int
+    cpu_seconds: float
+    cpu_millicores: Optional[float]  # average since the previous sample
+    sampled_at: float
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_text(path: str, value: str):
+    with open(path, "w") as f:
+        f.write(value)
+
+
+def _sanitize_cgroup_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name) or "process"
+
+
+def _descendant_pids(pid: int) -> List[int]:
+    """Return pid and its descendants via /proc/<pid>/task/<tid>/children."""
+    pids = [pid]
+    index = 0
+    while index < len(pids):
+        current = pids[index]
+        index += 1
+        task_dir = os.path.join(PROC_ROOT, str(current), "task")
+        try:
+            tids = os.listdir(task_dir)
+        except OSError:
+            continue
+        for tid in tids:
+            children = _read_text(os.path.join(task_dir, tid, "children"))
+            if children:
+                pids.extend(int(child) for child in children.split() if child.isdigit())
+    return pids
+
+
+def _read_proc_usage(pid: int) -> Optional[Tuple[int, float]]:
+    """Sum RSS bytes and CPU seconds over a process tree from /proc."""
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    rss_bytes = 0
+    cpu_ticks = 0
+    found = False
+    for member in _descendant_pids(pid):
+        stat = _read_text(os.path.join(PROC_ROOT, str(member), "stat"))
+        statm = _read_text(os.path.join(PROC_ROOT, str(member), "statm"))
+        if not stat or not statm:
+            continue
+        # comm (field 2) may contain spaces; fields after it start at state.
+        fields = stat[stat.rfind(")") + 2:].split()
+        try:
+            cpu_ticks += int(fields[11]) + int(fields[12])  # utime + stime
+            rss_bytes += int(statm.split()[1]) * page_size
+        except (IndexError, ValueError):
+            continue
+        found = True
+    if not found:
+        return None
+    return rss_bytes, cpu_ticks / clock_ticks
+
+
+class ProcessResourceGuard:
+    """Applies limits to, and samples usage of, one external process.
+
+    Usage:
+        guard = ProcessResourceGuard(limits, cgroup_root, name)
+        guard.prepare()                       # before spawning
+        spawn(..., preexec_fn=guard.preexec_fn)
+        usage = guard.sample(pid)             # periodically
+        guard.cleanup()                       # after the process exited
+    """
+
+    def __init__(
+        self,
+        limits: ResourceLimits,
+        cgroup_root: Optional[str] = None,
+        name: str = "process",
+    ):
+        self.limits = limits
+        self.cgroup_root = cgroup_root
+        self.name = _sanitize_cgroup_name(name)
+        self.cgroup_path: Optional[str] = None
+        self.enforcement: Optional[str] = None  # "cgroup", "rlimit" or None
+        self.last_usage: Optional[ResourceUsage] = None
+
+    def prepare(self, name: Optional[str] = None):
+        """Create the cgroup for the process, or select the rlimit fallback."""
+        if name:
+            self.name = _sanitize_cgroup_name(name)
+        self.enforcement = None
+        if self.limits.is_empty:
+            return
+        if self.cgroup_root:
+            try:
+                self.cgroup_path = self._create_cgroup()
+                self.enforcement = "cgroup"
+                return
+            except OSError as e:
+                logger.warning(
+                    "cgroup limits unavailable under %s, falling back to setrlimit: %s",
+                    self.cgroup_root,
+                    e,
+                )
+                self.cgroup_path = None
+        if resource is not None:
+            self.enforcement = "rlimit"
+
+    def _create_cgroup(self) -> str:
+        if not os.path.isdir(self.cgroup_root):
+            raise FileNotFoundError(f"cgroup root does not exist: {self.cgroup_root}")
+        # Best effort: the controllers may already be enabled by the delegator.
+        try:
+            _write_text(
+                os.path.join(self.cgroup_root, "cgroup.subtree_control"), "+cpu +memory"
+            )
+        except OSError:
+            pass
+        path = os.path.join(self.cgroup_root, self.name)
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            pass
+        if self.limits.cpu_millicores:
+            quota = self.limits.cpu_millicores * CPU_PERIOD_USEC // 1000
+            _write_text(os.path.join(path, "cpu.max"), f"{quota} {CPU_PERIOD_USEC}")
+        if self.limits.memory_mb:
+            _write_text(
+                os.path.join(path, "memory.max"), str(self.limits.memory_mb * 1024 * 1024)
+            )
+        return path
+
+    @property
+    def preexec_fn(self) -> Optional[Callable[[], None]]:
+        """Callable run in the child before exec, or None if nothing to apply."""
+        if self.enforcement == "cgroup":
+            procs_path = os.path.join(self.cgroup_path, "cgroup.procs")
+
+            def join_cgroup():
+                # "0" moves the writing process itself.
+                _write_text(procs_path, "0")
+
+            return join_cgroup
+
+        if self.enforcement == "rlimit":
+            memory_bytes = (
+                self.limits.memory_mb * 1024 * 1024 if self.limits.memory_mb else None
+            )
+            lower_priority = bool(self.limits.cpu_millicores)
+
+            def apply_rlimits():
+                if memory_bytes:
+                    # RLIMIT_DATA rather than RLIMIT_AS: runtimes such as V8
+                    # reserve large PROT_NONE regions that RLIMIT_AS would count.
+                    resource.setrlimit(resource.RLIMIT_DATA, (memory_bytes, memory_bytes))
+                if lower_priority:
+                    os.nice(FALLBACK_NICE_INCREMENT)
+
+            return apply_rlimits
+
+        return None
+
+    def _read_cgroup_usage(self) -> Optional[Tuple[int, float]]:
+        memory = _read_text(os.path.join(self.cgroup_path, "memory.current"))
+        cpu_stat = _read_text(os.path.join(self.cgroup_path, "cpu.stat"))
+        if memory is None or cpu_stat is None:
+            return None
+        usage_usec = 0
+        for line in cpu_stat.splitlines():
+            key, _, value = line.partition(" ")
+            if key == "usage_usec":
+                usage_usec = int(value)
+                break
+        return int(memory), usage_usec / 1_000_000
+
+    def sample(self, pid: Optional[int], remember: bool = True) -> Optional[ResourceUsage]:
+        """Sample usage for the process tree rooted at pid.
+
+        The sample becomes ``last_usage``, the baseline for the next CPU
+        rate, unless remember is False.
+        """
+        raw = None
+        if self.cgroup_path:
+            raw = self._read_cgroup_usage()
+        if raw is None and pid:
+            raw = _read_proc_usage(pid)
+        if raw is None:
+            return None
+
+        rss_bytes, cpu_seconds = raw
+        now = time.monotonic()
+        cpu_millicores = None
+        previous = self.last_usage
+        if previous is not None and now > previous.sampled_at:
+            cpu_delta = max(0.0, cpu_seconds - previous.cpu_seconds)
+            cpu_millicores = cpu_delta / (now - previous.sampled_at) * 1000
+        usage = ResourceUsage(
+            rss_bytes=rss_bytes,
+            cpu_seconds=cpu_seconds,
+            cpu_millicores=cpu_millicores,
+            sampled_at=now,
+        )
+        if remember:
+            self.last_usage = usage
+        return usage
+
+    def cleanup(self):
+        """Remove the per-process cgroup once the process has exited."""
+        if self.cgroup_path:
+            try:
+                os.rmdir(self.cgroup_path)
+            except OSError as e:
+                logger.debug("Failed to remove cgroup %s: %s", self.cgroup_path, e)
+            self.cgroup_path = None
+        self.last_usage = None
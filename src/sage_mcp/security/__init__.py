@@ -1,6 +1,15 @@
 """Security module for SageMCP — encryption, authentication, and authorization."""
 
-from .encryption import encrypt_value, decrypt_value, is_encrypted, get_fernet
+from .encryption import (
+    encrypt_value,
+    decrypt_value,
+    is_encrypted,
+    get_fernet,
+    load_keys,
+    rotate_key,
+    rotate_value,
+    clear_plaintext_cache,
+)
 from .types import EncryptedText
 from .encrypted_json import EncryptedJSON
 
@@ -9,6 +18,10 @@ __all__ = [
     "decrypt_value",
     "is_encrypted",
     "get_fernet",
+    "load_keys",
+    "rotate_key",
+    "rotate_value",
+    "clear_plaintext_cache",
     "EncryptedText",
     "EncryptedJSON",
 ]
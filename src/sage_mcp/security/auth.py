@@ -2,27 +2,44 @@
 
 Feature-flagged via ``SAGEMCP_ENABLE_AUTH``. When disabled, all checks pass through.
 
-Hot-path optimisation: SHA256-keyed LRU cache avoids repeated bcrypt verifies (~100ms each).
+Hot path: every key row stores an HMAC-SHA256 verifier of the raw key, keyed
+from SECRET_KEY. The verifier is deterministic, so it doubles as the indexed
+lookup id: authenticating a key is one indexed SELECT plus a local SHA256-keyed
+LRU cache, shared across workers through the database. bcrypt (~100ms) only
+runs for keys created before verifiers existed, in a small dedicated thread
+pool so it never blocks the event loop, and the verifier is filled in after
+the first successful check.
+
+Legacy keys can only be told apart by bcrypt, so an unknown key is checked
+against every one of them. The database connection is released meanwhile,
+at most AUTH_BCRYPT_WORKERS checks run at once, and unknown keys are
+remembered for a short while so retries skip the database and bcrypt.
 """
 
+import asyncio
 import hashlib
+import hmac
 import logging
 import secrets
 import threading
 import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List, Optional
 
 from fastapi import Depends, HTTPException, Request, WebSocket
 from starlette.websockets import WebSocketDisconnect
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import get_settings
 from ..database.connection import get_db_context, get_db_session
 from ..models.api_key import APIKey, APIKeyScope
+from .encryption import active_secrets
+from .tenant_directory import remember_tenant, resolve_tenant
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +88,12 @@ _CACHE_TTL = 300  # 5 minutes
 _cache: OrderedDict[str, tuple[AuthContext, float]] = OrderedDict()
 _cache_lock = threading.Lock()
 
+# Negative cache: SHA-256 of keys that matched nothing -> time of the miss.
+_MISS_CACHE_MAX = 10_000
+_MISS_CACHE_TTL = 30
+
+_misses: OrderedDict[str, float] = OrderedDict()
+
 
 def _cache_key(raw_key: str) -> str:
     return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
@@ -99,6 +122,27 @@ def _cache_put(raw_key: str, ctx: AuthContext) -> None:
             _cache.popitem(last=False)
 
 
+def _miss_cached(raw_key: str) -> bool:
+    with _cache_lock:
+        ck = _cache_key(raw_key)
+        ts = _misses.get(ck)
+        if ts is None:
+            return False
+        if time.monotonic() - ts > _MISS_CACHE_TTL:
+            _misses.pop(ck, None)
+            return False
+        return True
+
+
+def _remember_miss(raw_key: str) -> None:
+    with _cache_lock:
+        ck = _cache_key(raw_key)
+        _misses[ck] = time.monotonic()
+        _misses.move_to_end(ck)
+        while len(_misses) > _MISS_CACHE_MAX:
+            _misses.popitem(last=False)
+
+
 def invalidate_cache_for_key(raw_key: str) -> None:
     """Remove a specific key from the auth cache."""
     with _cache_lock:
@@ -109,6 +153,7 @@ def clear_auth_cache() -> None:
     """Clear the entire auth cache (used on key revocation)."""
     with _cache_lock:
         _cache.clear()
+        _misses.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -134,6 +179,36 @@ def verify_api_key(raw_key: str, hashed: str) -> bool:
     return _bcrypt.checkpw(raw_key.encode("utf-8"), hashed.encode("utf-8"))
 
 
+_VERIFIER_CONTEXT = b"sagemcp-api-key-verifier-v1"
+
+
+@lru_cache(maxsize=8)
+def _verifier_key(secret: str) -> bytes:
+    return hashlib.sha256(_VERIFIER_CONTEXT + secret.encode("utf-8")).digest()
+
+
+def compute_key_verifier(raw_key: str, secret: Optional[str] = None) -> str:
+    """HMAC-SHA256 of *raw_key*, keyed from *secret* (default: the current SECRET_KEY)."""
+    if secret is None:
+        secret = active_secrets()[0]
+    return hmac.new(_verifier_key(secret), raw_key.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+# bcrypt releases the GIL; a few threads keep a burst of legacy-key checks
+# from occupying the default executor.
+_bcrypt_executor: Optional[ThreadPoolExecutor] = None
+
+
+async def _verify_in_thread(raw_key: str, hashed: str) -> bool:
+    global _bcrypt_executor
+    if _bcrypt_executor is None:
+        _bcrypt_executor = ThreadPoolExecutor(
+            max_workers=max(1, get_settings().auth_bcrypt_workers), thread_name_prefix="bcrypt"
+        )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_executor, verify_api_key, raw_key, hashed)
+
+
 # ---------------------------------------------------------------------------
 # FastAPI dependencies
 # ---------------------------------------------------------------------------
@@ -145,38 +220,75 @@ async def _authenticate_raw_key(
     """Authenticate a raw API key string against the database.
 
     Returns an ``AuthContext`` on success. Returns ``None`` if the key is invalid.
-    Uses the SHA-256 LRU cache to avoid repeated bcrypt verifies.
+    Uses the SHA-256 LRU cache, then a single lookup by HMAC verifier.
     """
     # Check cache first
     cached = _cache_get(raw_key)
     if cached is not None:
         return cached
+    if _miss_cached(raw_key):
+        return None
 
-    # DB lookup by prefix
-    prefix = raw_key[:8]  # "smcp_XX_"
+    # Verifiers under the current and any retired SECRET_KEY, newest first
+    verifiers = [compute_key_verifier(raw_key, secret) for secret in active_secrets()]
     result = await session.execute(
-        select(APIKey).where(
-            APIKey.key_prefix == prefix,
+        select(APIKey)
+        .where(
             APIKey.is_active.is_(True),
+            or_(
+                APIKey.key_verifier.in_(verifiers),
+                # Keys without a verifier yet: narrow by prefix, then bcrypt
+                and_(APIKey.key_verifier.is_(None), APIKey.key_prefix == raw_key[:8]),
+            ),
         )
+        # Newest legacy keys first: the likeliest to still be in use
+        .order_by(APIKey.created_at.desc())
     )
-    candidates = result.scalars().all()
 
-    for api_key in candidates:
-        # Check expiration
-        if api_key.expires_at and api_key.expires_at < datetime.now(timezone.utc):
+    now = datetime.now(timezone.utc)
+    match = None
+    legacy = []
+    for api_key in result.scalars().all():
+        # Check expiration (SQLite returns naive datetimes)
+        expires_at = api_key.expires_at
+        if expires_at and (expires_at if expires_at.tzinfo else expires_at.replace(tzinfo=timezone.utc)) < now:
             continue
-        if verify_api_key(raw_key, api_key.key_hash):
-            ctx = AuthContext(
-                key_id=str(api_key.id),
-                name=api_key.name,
-                scope=api_key.scope,
-                tenant_id=str(api_key.tenant_id) if api_key.tenant_id else None,
-            )
-            _cache_put(raw_key, ctx)
-            return ctx
+        if api_key.key_verifier is None:
+            legacy.append(api_key)
+        elif match is None:
+            match = api_key
+
+    if match is None and legacy:
+        # End the read transaction so the connection is back in the pool during bcrypt.
+        await session.commit()
+        for api_key in legacy:
+            if await _verify_in_thread(raw_key, api_key.key_hash):
+                match = api_key
+                break
+    if match is None:
+        _remember_miss(raw_key)
+        return None
+
+    ctx = AuthContext(
+        key_id=str(match.id),
+        name=match.name,
+        scope=match.scope,
+        tenant_id=str(match.tenant_id) if match.tenant_id else None,
+    )
+    if match.key_verifier != verifiers[0]:
+        await _store_verifier(session, match, verifiers[0])
+    _cache_put(raw_key, ctx)
+    return ctx
 
-    return None
+
+async def _store_verifier(session: AsyncSession, api_key: APIKey, verifier: str) -> None:
+    """Record the current verifier so other workers skip bcrypt for this key."""
+    api_key.key_verifier = verifier
+    try:
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        logger.warning("Could not store API key verifier", exc_info=True)
 
 
 async def get_auth_context(
@@ -225,6 +337,9 @@ def require_tenant_access(slug_param: str = "tenant_slug"):
 
     - ``platform_admin`` keys have access to all tenants.
     - ``tenant_admin`` and ``tenant_user`` keys must match the tenant.
+
+    When the slug is resolved here, the tenant is left on ``request.state``
+    (``tenant`` and ``tenant_id``).
     """
 
     async def _check(
@@ -244,20 +359,18 @@ def require_tenant_access(slug_param: str = "tenant_slug"):
         if not tenant_slug:
             return  # No tenant in path, scope check suffices
 
-        # Resolve tenant ID from slug
-        from ..models.tenant import Tenant
-
-        result = await session.execute(
-            select(Tenant.id).where(Tenant.slug == tenant_slug)
-        )
-        tenant_id = result.scalar_one_or_none()
-        if tenant_id is None:
+        # Resolve tenant ID from slug (cached; see tenant_directory)
+        tenant = await resolve_tenant(session, tenant_slug)
+        if tenant is None:
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Check tenant-scoped key matches
-        if auth.tenant_id and auth.tenant_id != str(tenant_id):
+        if auth.tenant_id and auth.tenant_id != str(tenant.id):
             raise HTTPException(status_code=403, detail="Access denied to this tenant")
 
+        # Let handlers (get_tenant_info, MCP server init) skip resolving it again
+        remember_tenant(request, tenant)
+
     return _check
 
 
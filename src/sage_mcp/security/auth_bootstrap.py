@@ -7,7 +7,7 @@ from sqlalchemy import select, func
 from ..config import get_settings
 from ..database.connection import get_db_context
 from ..models.api_key import APIKey, APIKeyScope
-from .auth import generate_api_key, hash_api_key
+from .auth import compute_key_verifier, generate_api_key, hash_api_key
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +44,7 @@ async def bootstrap_admin_key() -> None:
             name="Bootstrap Admin Key",
             key_prefix=raw_key[:8],
             key_hash=key_hash,
+            key_verifier=compute_key_verifier(raw_key),
             scope=APIKeyScope.PLATFORM_ADMIN,
             tenant_id=None,
             is_active=True,
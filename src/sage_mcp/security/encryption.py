@@ -1,17 +1,31 @@
 """Fernet encryption utilities for field-level encryption at rest.
 
-Key is derived from SECRET_KEY via PBKDF2 (480K iterations) and cached per-process.
+Keys are derived from SECRET_KEY via PBKDF2 (480K iterations); each derived
+key is cached per-process, so the derivation runs once per secret.
 All encrypted values are Fernet tokens (base64, prefixed with ``gAAAAB``).
+
+Values are encrypted with SECRET_KEY and decrypted with SECRET_KEY or any
+key in SECRET_KEY_PREVIOUS (a MultiFernet key ring, newest first).
+``load_keys`` and ``rotate_key`` swap the ring in a running process, and
+``rotate_value`` re-encrypts a token under the current key.
+
+Decrypted values are kept in a bounded LRU keyed by the SHA-256 digest of
+the ciphertext (ENCRYPTION_CACHE_SIZE entries), so loading the same row
+again skips HMAC verification and AES. The cache holds its plaintexts in
+bytearrays that are overwritten with zeros on eviction and whenever the
+key ring changes. Strings already returned to callers are immutable and
+are not wiped.
 """
 
 import base64
 import hashlib
 import logging
-import os
+import threading
+from collections import OrderedDict
 from functools import lru_cache
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 
-from cryptography.fernet import Fernet, InvalidToken
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
 
@@ -26,6 +40,7 @@ _KDF_ITERATIONS = 480_000
 FERNET_PREFIX = "gAAAAA"
 
 
+@lru_cache(maxsize=8)
 def _derive_key(secret: str) -> bytes:
     """Derive a 32-byte Fernet key from *secret* using PBKDF2."""
     kdf = PBKDF2HMAC(
@@ -37,17 +52,132 @@ def _derive_key(secret: str) -> bytes:
     return base64.urlsafe_b64encode(kdf.derive(secret.encode("utf-8")))
 
 
-# NOTE: lru_cache(maxsize=1) means key rotation requires a process restart
-# to pick up a new SECRET_KEY value.
-@lru_cache(maxsize=1)
-def get_fernet() -> Fernet:
-    """Return a process-cached Fernet instance keyed from SECRET_KEY."""
-    from ..config import get_settings
+# --------------------------------------------------------------------------- #
+# Key ring
+# --------------------------------------------------------------------------- #
+
+_fernet: Optional[MultiFernet] = None
+_secrets: Tuple[str, ...] = ()
+_keys_lock = threading.Lock()
+
+
+def _previous_secrets(value: Optional[str]) -> List[str]:
+    return [secret.strip() for secret in (value or "").split(",") if secret.strip()]
+
+
+def load_keys(secret_key: str, previous: Sequence[str] = ()) -> MultiFernet:
+    """Install a key ring that encrypts with *secret_key* and also decrypts with *previous*."""
+    global _fernet, _secrets
+    secrets = tuple(dict.fromkeys([secret_key, *previous]))
+    ring = MultiFernet([Fernet(_derive_key(secret)) for secret in secrets])
+    with _keys_lock:
+        _fernet, _secrets = ring, secrets
+    clear_plaintext_cache()
+    return ring
+
+
+def rotate_key(new_secret: str) -> MultiFernet:
+    """Encrypt with *new_secret* from now on, keeping the current keys for decryption."""
+    get_fernet()
+    return load_keys(new_secret, _secrets)
+
+
+def active_secrets() -> Tuple[str, ...]:
+    """Secrets of the current key ring, newest first."""
+    get_fernet()
+    return _secrets
+
+
+def get_fernet() -> MultiFernet:
+    """Return the process key ring, built from SECRET_KEY and SECRET_KEY_PREVIOUS on first use."""
+    ring = _fernet
+    if ring is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        ring = load_keys(settings.secret_key, _previous_secrets(settings.secret_key_previous))
+    return ring
+
+
+# --------------------------------------------------------------------------- #
+# Plaintext cache
+# --------------------------------------------------------------------------- #
+
+def _wipe(buffer: bytearray):
+    buffer[:] = bytes(len(buffer))
+
 
-    settings = get_settings()
-    key = _derive_key(settings.secret_key)
-    return Fernet(key)
+class PlaintextCache:
+    """Bounded LRU of decrypted values keyed by ciphertext digest."""
 
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[bytes, bytearray]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Plain counters: a Prometheus update would cost more than a hit.
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(token: bytes) -> bytes:
+        return hashlib.sha256(token).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self._lock:
+            buffer = self._entries.get(key)
+            if buffer is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return buffer.decode("utf-8")
+
+    def put(self, key: bytes, plaintext: bytes):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                _wipe(previous)
+            self._entries[key] = bytearray(plaintext)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                _wipe(evicted)
+
+    def clear(self):
+        """Zero and drop every cached plaintext."""
+        with self._lock:
+            for buffer in self._entries.values():
+                _wipe(buffer)
+            self._entries.clear()
+
+
+_plaintext_cache: Optional[PlaintextCache] = None
+
+
+def get_plaintext_cache() -> Optional[PlaintextCache]:
+    """Get the process-wide plaintext cache, or None when disabled in Settings."""
+    global _plaintext_cache
+    if _plaintext_cache is None:
+        from ..config import get_settings
+
+        size = get_settings().encryption_cache_size
+        if size <= 0:
+            return None
+        _plaintext_cache = PlaintextCache(size)
+    return _plaintext_cache
+
+
+def clear_plaintext_cache():
+    """Zero and drop all cached plaintexts (done automatically when keys change)."""
+    if _plaintext_cache is not None:
+        _plaintext_cache.clear()
+
+
+# --------------------------------------------------------------------------- #
+# Encrypt / decrypt
+# --------------------------------------------------------------------------- #
 
 def encrypt_value(plaintext: str) -> str:
     """Encrypt *plaintext* and return the Fernet token as a UTF-8 string."""
@@ -59,13 +189,31 @@ def decrypt_value(ciphertext: str) -> str:
     """Decrypt *ciphertext*. If it's not a valid Fernet token, return as-is (legacy plaintext fallback)."""
     if not ciphertext:
         return ciphertext
+    token = ciphertext.encode("utf-8")
+    cache = get_plaintext_cache()
+    if cache is not None:
+        key = cache.key(token)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     f = get_fernet()
     try:
-        return f.decrypt(ciphertext.encode("utf-8")).decode("utf-8")
+        plaintext = f.decrypt(token)
     except InvalidToken:
         # Legacy plaintext — return raw value so existing data keeps working.
         logger.debug("decrypt_value: value is not a valid Fernet token, returning as plaintext")
         return ciphertext
+    if cache is not None:
+        cache.put(key, plaintext)
+    return plaintext.decode("utf-8")
+
+
+def rotate_value(value: str) -> str:
+    """Re-encrypt a stored value under the current key; legacy plaintext is encrypted."""
+    if not is_encrypted(value):
+        return encrypt_value(value)
+    return get_fernet().rotate(value.encode("utf-8")).decode("utf-8")
 
 
 def is_encrypted(value: Optional[str]) -> bool:
@@ -0,0 +1,297 @@
+"""Refresh OAuth access tokens before they expire.
+
+Google, Atlassian, Microsoft, Zoom and others issue short-lived access
+tokens together with a refresh token. A background loop loads active
+credentials that expire within OAUTH_REFRESH_LEAD_SECONDS, a batch at a
+time, and exchanges their refresh tokens at the provider's `token_url`
+(see OAUTH_PROVIDERS). The new tokens are written back to the same row,
+and its EncryptedText columns re-encrypt them on flush.
+
+On the request path, `ensure_fresh_credential` schedules a refresh for a
+credential that is close to expiry and returns without waiting. It only
+waits when the token has already lapsed. Refreshes are single-flight per
+credential, so the loop and any number of requests share one exchange.
+
+Across replicas the credential row is locked (``FOR UPDATE SKIP LOCKED``)
+for the duration of the exchange, so two replicas never spend the same
+rotating refresh token; a replica that finds the row locked leaves it to
+the holder. The lock is taken on the background pool, never the primary
+one, because it is held across the call to the provider.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+
+from ..connectors.coalesce import SingleFlight
+from ..observability.metrics import record_oauth_refresh
+
+logger = logging.getLogger(__name__)
+
+# Providers whose token endpoint expects the client credentials as HTTP Basic auth.
+_BASIC_AUTH_PROVIDERS = {"zoom", "notion", "bitbucket"}
+
+# Longest pause before retrying a credential whose refresh keeps failing.
+_MAX_BACKOFF_SECONDS = 3600.0
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes even for timezone-aware columns.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class OAuthTokenRefresher:
+    """Exchanges refresh tokens for credentials that are about to expire."""
+
+    def __init__(self, lead_seconds: float = 300.0, batch_size: int = 50, concurrency: int = 5):
+        self.lead_seconds = lead_seconds
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._flights = SingleFlight()
+        self._failures: Dict[Any, int] = {}
+        self._retry_at: Dict[Any, float] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    def is_due(self, cred: Any, now: Optional[datetime] = None) -> bool:
+        """True when the credential can be refreshed and expires within the lead time."""
+        if not cred.refresh_token or not cred.expires_at:
+            return False
+        now = now or datetime.now(timezone.utc)
+        return _as_utc(cred.expires_at) <= now + timedelta(seconds=self.lead_seconds)
+
+    def _backing_off(self, credential_id: Any) -> bool:
+        return self._retry_at.get(credential_id, 0.0) > time.monotonic()
+
+    async def refresh_due(self) -> int:
+        """Refresh one batch of credentials that are due; returns how many succeeded."""
+        from sqlalchemy import select
+
+        from ..database.connection import BACKGROUND, get_db_context
+        from ..models.oauth_credential import OAuthCredential
+
+        horizon = datetime.now(timezone.utc) + timedelta(seconds=self.lead_seconds)
+        async with get_db_context(BACKGROUND) as session:
+            result = await session.execute(
+                select(OAuthCredential.id)
+                .where(
+                    OAuthCredential.is_active.is_(True),
+                    OAuthCredential.refresh_token.is_not(None),
+                    OAuthCredential.expires_at.is_not(None),
+                    OAuthCredential.expires_at <= horizon,
+                )
+                .order_by(OAuthCredential.expires_at)
+            )
+            due = [cid for cid in result.scalars() if not self._backing_off(cid)][: self.batch_size]
+
+        refreshed = await asyncio.gather(*(self.refresh(cid) for cid in due))
+        return sum(1 for cred in refreshed if cred is not None)
+
+    async def refresh(self, credential_id: Any) -> Optional[Any]:
+        """Refresh one credential, joining a refresh already in flight for it.
+
+        Returns the updated credential, or None if it could not be refreshed.
+        """
+        return await self._flights.do(credential_id, lambda: self._refresh(credential_id))
+
+    def schedule(self, credential_id: Any):
+        """Start a refresh in the background unless one is already running."""
+        if self._backing_off(credential_id):
+            return
+        task = asyncio.ensure_future(self.refresh(credential_id))
+        self._background.add(task)
+        task.add_done_callback(self._forget)
+
+    def _forget(self, task: asyncio.Task):
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background OAuth refresh failed: %s", task.exception())
+
+    async def _refresh(self, credential_id: Any) -> Optional[Any]:
+        from sqlalchemy import select
+
+        from ..database.connection import BACKGROUND, get_db_context
+        from ..models.oauth_credential import OAuthCredential
+
+        async with self._semaphore:
+            async with get_db_context(BACKGROUND) as session:
+                result = await session.execute(
+                    select(OAuthCredential)
+                    .where(OAuthCredential.id == credential_id)
+                    .with_for_update(skip_locked=True)
+                )
+                cred = result.scalar_one_or_none()
+                if cred is None:
+                    # Missing, or locked by a refresh on another replica.
+                    return None
+                if not cred.is_active or not cred.refresh_token:
+                    return None
+                if not self.is_due(cred):
+                    # Refreshed meanwhile, e.g. by another replica.
+                    return cred
+                provider = cred.provider
+                try:
+                    token_url, client_id, client_secret = await _client_config(session, cred)
+                    if not token_url or not client_id or not client_secret:
+                        logger.warning("Cannot refresh %s token: OAuth client not configured", provider)
+                        self._fail(credential_id)
+                        record_oauth_refresh(provider, "unconfigured")
+                        return None
+
+                    refresh_token = cred.refresh_token
+                    status, token_info = await _exchange_refresh_token(
+                        provider, token_url, refresh_token, client_id, client_secret
+                    )
+                    if status == 400 and token_info.get("error") == "invalid_grant":
+                        await session.refresh(cred)
+                        if cred.refresh_token != refresh_token:
+                            # Rotated or reconnected meanwhile; the rejected token was already spent.
+                            logger.info("Refresh token for %s credential %s changed during refresh", provider, credential_id)
+                            return cred if cred.is_active and cred.refresh_token else None
+                        # The grant was revoked; the user has to reconnect.
+                        logger.warning("Refresh token for %s credential %s was rejected", provider, credential_id)
+                        cred.refresh_token = None
+                        cred.updated_at = datetime.now(timezone.utc)
+                        await session.commit()
+                        record_oauth_refresh(provider, "revoked")
+                        return None
+                    if status != 200 or not token_info.get("access_token"):
+                        logger.warning("Refreshing %s token failed: HTTP %s", provider, status)
+                        self._fail(credential_id)
+                        record_oauth_refresh(provider, "error")
+                        return None
+
+                    now = datetime.now(timezone.utc)
+                    cred.access_token = token_info["access_token"]
+                    if token_info.get("refresh_token"):
+                        # Atlassian and Microsoft rotate refresh tokens on every use.
+                        cred.refresh_token = token_info["refresh_token"]
+                    cred.expires_at = (
+                        now + timedelta(seconds=int(token_info["expires_in"]))
+                        if "expires_in" in token_info
+                        else None
+                    )
+                    if token_info.get("scope"):
+                        cred.scopes = token_info["scope"]
+                    cred.updated_at = now
+                    await session.commit()
+                except Exception:
+                    logger.exception("Refreshing %s credential %s failed", provider, credential_id)
+                    self._fail(credential_id)
+                    record_oauth_refresh(provider, "error")
+                    return None
+
+                self._failures.pop(credential_id, None)
+                self._retry_at.pop(credential_id, None)
+                record_oauth_refresh(provider, "success")
+                logger.info("Refreshed %s OAuth token (credential %s)", provider, credential_id)
+                return cred
+
+    def _fail(self, credential_id: Any):
+        failures = self._failures.get(credential_id, 0) + 1
+        self._failures[credential_id] = failures
+        self._retry_at[credential_id] = time.monotonic() + min(_MAX_BACKOFF_SECONDS, 30.0 * 2 ** failures)
+
+    async def shutdown(self):
+        """Cancel background refreshes started from the request path."""
+        for task in list(self._background):
+            task.cancel()
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+
+async def _client_config(session: Any, cred: Any) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Token URL and client credentials, preferring the tenant's own OAuth app."""
+    from sqlalchemy import select
+
+    from ..api.oauth import OAUTH_PROVIDERS
+    from ..models.oauth_config import OAuthConfig
+
+    provider_config = OAUTH_PROVIDERS.get(cred.provider)
+    if provider_config is None:
+        return None, None, None
+    result = await session.execute(
+        select(OAuthConfig).where(
+            OAuthConfig.tenant_id == cred.tenant_id,
+            OAuthConfig.provider == cred.provider,
+            OAuthConfig.is_active.is_(True),
+        )
+    )
+    tenant_config = result.scalar_one_or_none()
+    if tenant_config:
+        return provider_config["token_url"], tenant_config.client_id, tenant_config.client_secret
+    return provider_config["token_url"], provider_config["client_id"], provider_config["client_secret"]
+
+
+async def _exchange_refresh_token(
+    provider: str, token_url: str, refresh_token: str, client_id: str, client_secret: str
+) -> Tuple[int, Dict[str, Any]]:
+    from ..connectors.http_client import get_http_client
+
+    data = {"grant_type": "refresh_token", "refresh_token": refresh_token}
+    kwargs: Dict[str, Any] = {}
+    if provider in _BASIC_AUTH_PROVIDERS:
+        kwargs["auth"] = (client_id, client_secret)
+    else:
+        data["client_id"] = client_id
+        data["client_secret"] = client_secret
+
+    response = await get_http_client().post(
+        token_url, data=data, headers={"Accept": "application/json"}, **kwargs
+    )
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    return response.status_code, body if isinstance(body, dict) else {}
+
+
+_refresher: Optional[OAuthTokenRefresher] = None
+
+
+def get_token_refresher() -> Optional[OAuthTokenRefresher]:
+    """Get the process-wide token refresher, or None when disabled in Settings."""
+    global _refresher
+    if _refresher is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        if not settings.oauth_refresh_enabled:
+            return None
+        _refresher = OAuthTokenRefresher(
+            lead_seconds=settings.oauth_refresh_lead_seconds,
+            batch_size=settings.oauth_refresh_batch_size,
+        )
+    return _refresher
+
+
+async def ensure_fresh_credential(cred: Any) -> Any:
+    """Return a usable credential without blocking on refreshes that can wait.
+
+    A token close to expiry is refreshed in the background and the current
+    one is used. A token that has already lapsed is refreshed inline.
+    """
+    refresher = get_token_refresher()
+    if refresher is None or getattr(cred, "id", None) is None or not refresher.is_due(cred):
+        return cred
+    if _as_utc(cred.expires_at) > datetime.now(timezone.utc):
+        refresher.schedule(cred.id)
+        return cred
+    refreshed = await refresher.refresh(cred.id)
+    return refreshed if refreshed is not None else cred
+
+
+async def run_token_refresh_loop(stop_event: asyncio.Event, interval_seconds: float = 60.0) -> None:
+    """Background loop that refreshes credentials ahead of expiry."""
+    while not stop_event.is_set():
+        refresher = get_token_refresher()
+        if refresher is not None:
+            try:
+                await refresher.refresh_due()
+            except Exception:
+                logger.exception("OAuth token refresh pass failed")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,180 @@
+"""Cached tenant slug resolution.
+
+Almost every tenant-scoped route turns the ``{tenant_slug}`` path segment
+into a tenant id: ``require_tenant_access`` for the key check, then the
+handler again for its own queries. The directory caches what those lookups
+need (id, active flag, per-tenant rate limit) for TENANT_CACHE_TTL_SECONDS,
+bounded to TENANT_CACHE_MAX_ENTRIES slugs. Concurrent misses for one slug
+share a single query. Unknown slugs are not cached.
+
+Tenant update and delete routes invalidate their slug. Other replicas only
+see such changes once the entry expires, so keep the TTL short.
+
+Handlers take the resolved tenant with ``Depends(get_tenant_info)``; it
+reuses the entry already resolved for the request by
+``require_tenant_access``.
+"""
+
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..connectors.coalesce import SingleFlight
+from ..database.connection import get_db_session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TenantInfo:
+    """The parts of a tenant row that request routing needs."""
+    id: uuid.UUID
+    slug: str
+    is_active: bool
+    rate_limit_rpm: Optional[int] = None
+
+
+def _rate_limit_override(raw_settings: Optional[str]) -> Optional[int]:
+    # Tenant.settings is free-form JSON; only a positive integer is an override.
+    if not raw_settings:
+        return None
+    try:
+        rpm = json.loads(raw_settings).get("rate_limit_rpm")
+    except (ValueError, AttributeError):
+        return None
+    return rpm if isinstance(rpm, int) and not isinstance(rpm, bool) and rpm > 0 else None
+
+
+async def load_tenant_info(session: AsyncSession, tenant_slug: str) -> Optional[TenantInfo]:
+    """Query one tenant by slug, bypassing the cache."""
+    from ..models.tenant import Tenant
+
+    result = await session.execute(
+        select(Tenant.id, Tenant.is_active, Tenant.settings).where(Tenant.slug == tenant_slug)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return TenantInfo(
+        id=row.id,
+        slug=tenant_slug,
+        is_active=row.is_active,
+        rate_limit_rpm=_rate_limit_override(row.settings),
+    )
+
+
+class TenantDirectory:
+    """TTL- and size-bounded cache of slug -> TenantInfo."""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, TenantInfo]]" = OrderedDict()
+        self._flights = SingleFlight()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, tenant_slug: str) -> Optional[TenantInfo]:
+        """Cached entry for a slug, if present and fresh."""
+        entry = self._entries.get(tenant_slug)
+        if entry is None:
+            return None
+        stored_at, info = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            del self._entries[tenant_slug]
+            return None
+        self._entries.move_to_end(tenant_slug)
+        return info
+
+    def put(self, info: TenantInfo):
+        self._entries[info.slug] = (time.monotonic(), info)
+        self._entries.move_to_end(info.slug)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def resolve(self, session: AsyncSession, tenant_slug: str) -> Optional[TenantInfo]:
+        """Return the tenant for a slug, querying through *session* on a miss."""
+        info = self.get(tenant_slug)
+        if info is not None:
+            return info
+
+        async def fetch() -> Optional[TenantInfo]:
+            loaded = await load_tenant_info(session, tenant_slug)
+            if loaded is not None:
+                self.put(loaded)
+            return loaded
+
+        return await self._flights.do(tenant_slug, fetch)
+
+    def invalidate(self, tenant_slug: Optional[str] = None):
+        """Forget one slug, or every slug when called without arguments."""
+        if tenant_slug is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(tenant_slug, None)
+
+
+_directory: Optional[TenantDirectory] = None
+
+
+def get_tenant_directory() -> Optional[TenantDirectory]:
+    """Get the process-wide directory, or None when caching is disabled in Settings."""
+    global _directory
+    if _directory is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        if settings.tenant_cache_ttl_seconds <= 0:
+            return None
+        _directory = TenantDirectory(
+            ttl=settings.tenant_cache_ttl_seconds,
+            max_entries=settings.tenant_cache_max_entries,
+        )
+    return _directory
+
+
+async def resolve_tenant(session: AsyncSession, tenant_slug: str) -> Optional[TenantInfo]:
+    """Resolve through the shared directory, or query directly when it is disabled."""
+    directory = get_tenant_directory()
+    if directory is None:
+        return await load_tenant_info(session, tenant_slug)
+    return await directory.resolve(session, tenant_slug)
+
+
+def invalidate_tenant(tenant_slug: str):
+    """Drop a slug from this process's directory after the tenant changed."""
+    if _directory is not None:
+        _directory.invalidate(tenant_slug)
+
+
+def remember_tenant(request: Request, info: TenantInfo):
+    """Attach a resolved tenant to the request and apply its rate limit override."""
+    request.state.tenant = info
+    request.state.tenant_id = str(info.id)
+    rate_limiter = getattr(request.app.state, "rate_limiter", None)
+    if rate_limiter is not None:
+        rate_limiter.sync_tenant_limit(info.slug, info.rate_limit_rpm)
+
+
+async def get_tenant_info(
+    tenant_slug: str,
+    request: Request,
+    session: AsyncSession = Depends(get_db_session),
+) -> TenantInfo:
+    """FastAPI dependency: the tenant named by ``{tenant_slug}``, or 404."""
+    info = getattr(request.state, "tenant", None)
+    if info is None or info.slug != tenant_slug:
+        info = await resolve_tenant(session, tenant_slug)
+        if info is None:
+            raise HTTPException(status_code=404, detail="Tenant not found")
+        remember_tenant(request, info)
+    return info
@@ -56,6 +56,7 @@ def test_list_tenants_success(mock_client_class, client):
         {"slug": "tenant1", "name": "Tenant 1"},
         {"slug": "tenant2", "name": "Tenant 2"},
     ]
+    mock_response.headers = {}
     mock_response.raise_for_status = Mock()
 
     mock_client = Mock()
@@ -71,6 +72,33 @@ def test_list_tenants_success(mock_client_class, client):
     assert tenants[1]["slug"] == "tenant2"
 
 
+@patch("httpx.Client")
+def test_list_tenants_follows_cursor(mock_client_class, client):
+    """Test that listing follows X-Next-Cursor until the limit is reached."""
+    pages = [
+        ([{"slug": "a"}, {"slug": "b"}], {"X-Next-Cursor": "c1"}),
+        ([{"slug": "c"}], {"X-Next-Cursor": "c2"}),
+    ]
+    responses = []
+    for items, headers in pages:
+        response = Mock(status_code=200, headers=headers)
+        response.json.return_value = items
+        responses.append(response)
+
+    mock_client = Mock()
+    mock_client.__enter__ = Mock(return_value=mock_client)
+    mock_client.__exit__ = Mock(return_value=False)
+    mock_client.get.side_effect = responses
+    mock_client_class.return_value = mock_client
+
+    client.PAGE_SIZE = 2
+    tenants = client.list_tenants(limit=3)
+
+    assert [t["slug"] for t in tenants] == ["a", "b", "c"]
+    params = [call.kwargs["params"] for call in mock_client.get.call_args_list]
+    assert params == [{"limit": 2}, {"limit": 1, "cursor": "c1"}]
+
+
 @patch("httpx.Client")
 def test_create_tenant_success(mock_client_class, client):
     """Test successful tenant creation."""
@@ -90,3 +90,16 @@ def test_update_tenant_no_fields():
     result = runner.invoke(tenant_app, ["update", "test"])
 
     assert result.exit_code == 2
+
+
+def test_db_migrate_reports_applied_versions():
+    """Test `db migrate` runs pending migrations."""
+    from sage_mcp.cli.commands.db import app as db_app
+
+    with patch("sage_mcp.cli.commands.db._migrate", new=MagicMock()) as migrate, \
+            patch("sage_mcp.cli.commands.db.asyncio.run", return_value=[9, 10]) as run:
+        result = runner.invoke(db_app, ["migrate"])
+
+    assert result.exit_code == 0
+    run.assert_called_once_with(migrate.return_value)
+    assert "9, 10" in result.output
@@ -111,6 +111,19 @@ def cleanup_db():
         session.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_upstream_guards(monkeypatch):
+    """Give each test fresh upstream pacing, circuit breaker, cache and usage state."""
+    monkeypatch.setattr("sage_mcp.connectors.quota._limiter", None)
+    monkeypatch.setattr("sage_mcp.connectors.circuit_breaker._registry", None)
+    monkeypatch.setattr("sage_mcp.connectors.coalesce._single_flight", None)
+    monkeypatch.setattr("sage_mcp.connectors.response_cache._cache", None)
+    monkeypatch.setattr("sage_mcp.connectors.provider_metadata._resolver", None)
+    monkeypatch.setattr("sage_mcp.security.oauth_refresh._refresher", None)
+    monkeypatch.setattr("sage_mcp.security.tenant_directory._directory", None)
+    monkeypatch.setattr("sage_mcp.observability.usage._aggregator", None)
+
+
 @pytest.fixture
 def db_session():
     """Create a test database session."""
@@ -1,9 +1,10 @@
 """Unit tests for admin process status reconciliation."""
 
+import threading
 from datetime import datetime, timezone
 from types import SimpleNamespace
 from uuid import uuid4
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
@@ -11,6 +12,7 @@ from sage_mcp.api.admin import get_process_status, restart_process
 from sage_mcp.models.connector import ConnectorRuntimeType
 from sage_mcp.models.mcp_process import ProcessStatus
 from sage_mcp.runtime import process_manager
+from sage_mcp.runtime.resources import ResourceLimits, ResourceUsage
 
 
 class _Result:
@@ -48,6 +50,8 @@ async def test_get_process_status_reconciles_stale_running_record():
         last_health_check=started_at,
         error_message="old init error",
         restart_count=0,
+        cpu_limit_millicores=None,
+        memory_limit_mb=None,
     )
     session = SimpleNamespace(
         execute=AsyncMock(side_effect=[_Result(connector), _Result(process)]),
@@ -122,6 +126,8 @@ async def test_get_process_status_keeps_running_when_process_is_live():
         last_health_check=started_at,
         error_message=None,
         restart_count=1,
+        cpu_limit_millicores=None,
+        memory_limit_mb=None,
     )
     session = SimpleNamespace(
         execute=AsyncMock(side_effect=[_Result(connector), _Result(process)]),
@@ -132,7 +138,20 @@ async def test_get_process_status_keeps_running_when_process_is_live():
     original_processes = process_manager.processes
     process_manager.processes = {
         f"{tenant_id}:{connector_id}": SimpleNamespace(
-            process=SimpleNamespace(returncode=None)
+            process=SimpleNamespace(returncode=None),
+            is_running=True,
+            resource_guard=SimpleNamespace(
+                limits=ResourceLimits(cpu_millicores=500, memory_mb=256),
+                enforcement="rlimit",
+                # Left by the last health pass
+                last_usage=ResourceUsage(
+                    rss_bytes=64 * 1024 * 1024,
+                    cpu_seconds=3.0,
+                    cpu_millicores=120.0,
+                    sampled_at=0.0,
+                ),
+            ),
+            sample_resource_usage=Mock(side_effect=AssertionError("must not sample on the event loop")),
         )
     }
     try:
@@ -143,10 +162,56 @@ async def test_get_process_status_keeps_running_when_process_is_live():
     assert response is not None
     assert response.status == ProcessStatus.RUNNING.value
     assert response.pid == process_id
+    assert response.cpu_limit_millicores == 500
+    assert response.memory_limit_mb == 256
+    assert response.limit_enforcement == "rlimit"
+    assert response.rss_bytes == 64 * 1024 * 1024
+    assert response.cpu_millicores == 120.0
     session.commit.assert_not_awaited()
     session.refresh.assert_not_awaited()
 
 
+@pytest.mark.asyncio
+async def test_get_process_status_samples_off_loop_without_moving_the_baseline():
+    connector_id = uuid4()
+    tenant_id = uuid4()
+    started_at = datetime.now(timezone.utc)
+    connector = SimpleNamespace(
+        id=connector_id, tenant_id=tenant_id, runtime_type=ConnectorRuntimeType.EXTERNAL_PYTHON,
+    )
+    process = SimpleNamespace(
+        connector_id=connector_id, tenant_id=tenant_id, pid=4321, runtime_type="external_python",
+        status=ProcessStatus.RUNNING, started_at=started_at, last_health_check=None,
+        error_message=None, restart_count=0, cpu_limit_millicores=None, memory_limit_mb=None,
+    )
+    session = SimpleNamespace(
+        execute=AsyncMock(side_effect=[_Result(connector), _Result(process)]),
+        commit=AsyncMock(),
+        refresh=AsyncMock(),
+    )
+    guard = SimpleNamespace(limits=ResourceLimits(), enforcement=None, last_usage=None)
+    calls = []
+
+    def sample_resource_usage(remember=True):
+        calls.append((remember, threading.current_thread() is threading.main_thread()))
+        return ResourceUsage(rss_bytes=1024, cpu_seconds=1.0, cpu_millicores=None, sampled_at=0.0)
+
+    original_processes = process_manager.processes
+    process_manager.processes = {
+        f"{tenant_id}:{connector_id}": SimpleNamespace(
+            is_running=True, resource_guard=guard, sample_resource_usage=sample_resource_usage,
+        )
+    }
+    try:
+        response = await get_process_status(str(connector_id), session=session)
+    finally:
+        process_manager.processes = original_processes
+
+    assert response.rss_bytes == 1024
+    assert calls == [(False, False)]
+    assert guard.last_usage is None
+
+
 @pytest.mark.asyncio
 async def test_get_process_status_normalizes_stopped_metadata():
     connector_id = uuid4()
@@ -168,6 +233,8 @@ async def test_get_process_status_normalizes_stopped_metadata():
         last_health_check=started_at,
         error_message="stale",
         restart_count=1,
+        cpu_limit_millicores=None,
+        memory_limit_mb=None,
     )
     session = SimpleNamespace(
         execute=AsyncMock(side_effect=[_Result(connector), _Result(process)]),
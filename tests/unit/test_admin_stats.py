@@ -1,11 +1,14 @@
 """Unit tests for dashboard admin stats."""
 
+from datetime import date
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
 
-from sage_mcp.api.admin_stats import get_platform_stats
+from fastapi import HTTPException
+
+from sage_mcp.api.admin_stats import _usage_window, get_platform_stats
 from sage_mcp.api import mcp as mcp_api
 
 
@@ -51,6 +54,7 @@ async def test_get_platform_stats_uses_process_fallbacks(monkeypatch):
     assert stats["active_instances"] == 0
     assert stats["active_sessions"] == 0
     assert stats["tool_calls_today"] == 7
+    assert stats["circuit_breakers"]["tripped"] == []
 
 
 @pytest.mark.asyncio
@@ -97,3 +101,22 @@ def test_record_websocket_activity_counts_toward_recent_sessions(monkeypatch):
     mcp_api._record_websocket_activity(ws, "tenant-a", "connector-a")
 
     assert mcp_api.get_recent_active_session_count(app, ttl_seconds=60.0) == 1
+
+
+def test_usage_window_defaults_to_last_30_days():
+    start, end, groups = _usage_window(None, date(2026, 3, 31), "connector, tool")
+
+    assert start == date(2026, 3, 2)
+    assert end == date(2026, 3, 31)
+    assert groups == ["connector", "tool"]
+
+
+@pytest.mark.parametrize("start, end, group_by", [
+    (date(2026, 3, 2), date(2026, 3, 1), "day"),
+    (date(2024, 1, 1), date(2026, 1, 1), "day"),
+    (None, None, "region"),
+])
+def test_usage_window_rejects_bad_queries(start, end, group_by):
+    with pytest.raises(HTTPException) as exc:
+        _usage_window(start, end, group_by)
+    assert exc.value.status_code == 400
@@ -1,15 +1,25 @@
 """Tests for API key authentication (Phase 2)."""
 
 import os
+import threading
 import time
+from datetime import datetime, timezone
+from unittest.mock import patch
 
 import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
 os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
 os.environ.setdefault("ENVIRONMENT", "test")
 os.environ.setdefault("SECRET_KEY", "test-secret-key-for-testing-only")
 
-from sage_mcp.models.api_key import APIKeyScope
+from sage_mcp.models.api_key import APIKey, APIKeyScope
+from sage_mcp.models.base import Base
+from sage_mcp.security import auth as auth_module
+from sage_mcp.security import encryption
 from sage_mcp.security.auth import (
     SCOPE_HIERARCHY,
     SCOPE_PREFIX_MAP,
@@ -19,7 +29,9 @@ from sage_mcp.security.auth import (
     _cache_put,
     _cache_key,
     _CACHE_TTL,
+    _authenticate_raw_key,
     clear_auth_cache,
+    compute_key_verifier,
     generate_api_key,
     hash_api_key,
     invalidate_cache_for_key,
@@ -240,3 +252,168 @@ class TestRequireScope:
         )
         # Should not raise
         await check_fn(auth=ctx)
+
+
+@pytest_asyncio.fixture
+async def key_db():
+    """In-memory database with the api_keys table; yields (factory, executed statements)."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    clear_auth_cache()
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False), statements
+    clear_auth_cache()
+    await engine.dispose()
+
+
+async def _add_key(factory, raw_key, with_verifier=True, **fields) -> APIKey:
+    async with factory() as session:
+        api_key = APIKey(
+            name="key",
+            key_prefix=raw_key[:8],
+            key_hash=hash_api_key(raw_key),
+            key_verifier=compute_key_verifier(raw_key) if with_verifier else None,
+            scope=APIKeyScope.TENANT_USER,
+            is_active=True,
+            **fields,
+        )
+        session.add(api_key)
+        await session.commit()
+        return api_key
+
+
+def _no_bcrypt(*args):
+    raise AssertionError("bcrypt should not run")
+
+
+class TestAuthenticateRawKey:
+    """Verifier lookup with bcrypt fallback for older keys."""
+
+    @pytest.mark.asyncio
+    async def test_key_with_verifier_skips_bcrypt(self, key_db):
+        factory, statements = key_db
+        raw_key = generate_api_key(APIKeyScope.TENANT_USER)
+        stored = await _add_key(factory, raw_key)
+        statements.clear()
+
+        with patch.object(auth_module, "verify_api_key", side_effect=_no_bcrypt):
+            async with factory() as session:
+                ctx = await _authenticate_raw_key(raw_key, session)
+
+        assert ctx.key_id == str(stored.id)
+        assert len(statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_key_skips_bcrypt(self, key_db):
+        factory, _ = key_db
+        await _add_key(factory, generate_api_key(APIKeyScope.TENANT_USER))
+
+        with patch.object(auth_module, "verify_api_key", side_effect=_no_bcrypt):
+            async with factory() as session:
+                assert await _authenticate_raw_key(generate_api_key(APIKeyScope.TENANT_USER), session) is None
+
+    @pytest.mark.asyncio
+    async def test_legacy_key_verified_off_loop_then_backfilled(self, key_db):
+        factory, _ = key_db
+        raw_key = generate_api_key(APIKeyScope.TENANT_USER)
+        stored = await _add_key(factory, raw_key, with_verifier=False)
+
+        threads = []
+        real_verify = auth_module.verify_api_key
+
+        def recording_verify(*args):
+            threads.append(threading.current_thread())
+            return real_verify(*args)
+
+        with patch.object(auth_module, "verify_api_key", side_effect=recording_verify):
+            async with factory() as session:
+                ctx = await _authenticate_raw_key(raw_key, session)
+
+        assert ctx.key_id == str(stored.id)
+        assert threads and threads[0] is not threading.main_thread()
+
+        async with factory() as session:
+            refreshed = await session.get(APIKey, stored.id)
+            assert refreshed.key_verifier == compute_key_verifier(raw_key)
+
+        # Another worker (empty local cache) now authenticates without bcrypt
+        clear_auth_cache()
+        with patch.object(auth_module, "verify_api_key", side_effect=_no_bcrypt):
+            async with factory() as session:
+                assert (await _authenticate_raw_key(raw_key, session)).key_id == str(stored.id)
+
+    @pytest.mark.asyncio
+    async def test_verifier_under_retired_secret_is_accepted_and_restamped(self, key_db, monkeypatch):
+        monkeypatch.setattr(encryption, "_fernet", None)
+        monkeypatch.setattr(encryption, "_plaintext_cache", None)
+        factory, _ = key_db
+        raw_key = generate_api_key(APIKeyScope.TENANT_USER)
+        encryption.load_keys("old-secret-key-123")
+        stored = await _add_key(factory, raw_key)
+
+        encryption.rotate_key("new-secret-key-456")
+        with patch.object(auth_module, "verify_api_key", side_effect=_no_bcrypt):
+            async with factory() as session:
+                assert (await _authenticate_raw_key(raw_key, session)).key_id == str(stored.id)
+
+        async with factory() as session:
+            refreshed = await session.get(APIKey, stored.id)
+            assert refreshed.key_verifier == compute_key_verifier(raw_key, "new-secret-key-456")
+
+    @pytest.mark.asyncio
+    async def test_expired_key_rejected(self, key_db):
+        from datetime import datetime, timedelta, timezone
+
+        factory, _ = key_db
+        raw_key = generate_api_key(APIKeyScope.TENANT_USER)
+        await _add_key(factory, raw_key, expires_at=datetime.now(timezone.utc) - timedelta(minutes=1))
+
+        async with factory() as session:
+            assert await _authenticate_raw_key(raw_key, session) is None
+
+    @pytest.mark.asyncio
+    async def test_every_legacy_key_can_authenticate_and_misses_are_cached(self, key_db):
+        factory, statements = key_db
+        oldest = generate_api_key(APIKeyScope.TENANT_USER)
+        async with factory() as session:
+            for i in range(10):
+                raw = oldest if i == 0 else generate_api_key(APIKeyScope.TENANT_USER)
+                session.add(APIKey(
+                    name=f"legacy-{i}", key_prefix=raw[:8], key_hash=f"hash-of:{raw}",
+                    scope=APIKeyScope.TENANT_USER, is_active=True,
+                    created_at=datetime(2024, 1, 1 + i, tzinfo=timezone.utc),
+                ))
+            await session.commit()
+
+        checks = []
+
+        def fake_verify(raw_key, hashed):
+            checks.append((raw_key, session.in_transaction()))
+            return hashed == f"hash-of:{raw_key}"
+
+        with patch.object(auth_module, "verify_api_key", side_effect=fake_verify):
+            async with factory() as session:
+                # The oldest key is tried last but still authenticates.
+                assert await _authenticate_raw_key(oldest, session) is not None
+                assert len(checks) == 10
+                # bcrypt runs with the read transaction ended.
+                assert not any(in_transaction for _, in_transaction in checks)
+
+                checks.clear()
+                unknown = generate_api_key(APIKeyScope.TENANT_USER)
+                assert await _authenticate_raw_key(unknown, session) is None
+                assert len(checks) == 9
+
+                statements.clear()
+                assert await _authenticate_raw_key(unknown, session) is None
+                assert len(checks) == 9
+                assert statements == []
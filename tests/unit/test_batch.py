@@ -0,0 +1,165 @@
+"""Tests for Graph $batch / Google multipart batching of connector requests."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from sage_mcp.connectors.batch import (
+    GMAIL_BATCH_URL,
+    GRAPH_BATCH_URL,
+    MicroBatcher,
+    SubRequest,
+    _decode_google_batch,
+    _encode_google_batch,
+    google_batch,
+    graph_batch,
+    raise_for_sub_response,
+    request_batched,
+)
+from sage_mcp.connectors.exceptions import ConnectorNotFoundError
+
+
+def _graph_connector():
+    async def respond(method, url, oauth_cred, json=None, **kwargs):
+        responses = [
+            {"id": item["id"], "status": 200, "body": {"url": item["url"]}}
+            for item in json["requests"]
+        ]
+        return httpx.Response(200, json={"responses": list(reversed(responses))})
+
+    connector = MagicMock()
+    connector._make_authenticated_request = AsyncMock(side_effect=respond)
+    return connector
+
+
+@pytest.mark.asyncio
+async def test_graph_batch_chunks_by_20_and_keeps_order():
+    connector = _graph_connector()
+    requests = [
+        SubRequest("GET", f"https://graph.microsoft.com/v1.0/me/messages/{i}", params={"$select": "subject"})
+        for i in range(45)
+    ]
+
+    responses = await graph_batch(connector, MagicMock(), requests)
+
+    assert connector._make_authenticated_request.await_count == 3
+    assert [r.json()["url"] for r in responses] == [
+        f"/me/messages/{i}?%24select=subject" for i in range(45)
+    ]
+
+
+def _google_batch_response(parts):
+    boundary = "batch_resp"
+    body = "".join(
+        f"--{boundary}\r\n"
+        "Content-Type: application/http\r\n"
+        f"Content-ID: <response-item-{index}>\r\n\r\n"
+        f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n\r\n"
+        f"{json.dumps(payload)}\r\n"
+        for index, status, payload in parts
+    ) + f"--{boundary}--\r\n"
+    return httpx.Response(
+        200, headers={"Content-Type": f"multipart/mixed; boundary={boundary}"}, content=body.encode()
+    )
+
+
+def test_google_batch_encoding_and_decoding():
+    encoded = _encode_google_batch(
+        [SubRequest("GET", "https://gmail.googleapis.com/gmail/v1/users/me/messages/a", params={"format": "full"})],
+        "b1",
+    ).decode()
+    assert "Content-ID: <item-0>" in encoded
+    assert "GET /gmail/v1/users/me/messages/a?format=full HTTP/1.1" in encoded
+    assert encoded.endswith("--b1--\r\n")
+
+    decoded = _decode_google_batch(_google_batch_response([(1, 404, {"error": "gone"}), (0, 200, {"id": "a"})]))
+    assert decoded[0][0] == 200 and json.loads(decoded[0][2]) == {"id": "a"}
+    assert decoded[1][0] == 404
+
+
+@pytest.mark.asyncio
+async def test_google_batch_returns_per_item_responses():
+    connector = MagicMock()
+    connector._make_authenticated_request = AsyncMock(
+        return_value=_google_batch_response([(0, 200, {"id": "a"}), (1, 404, {"error": "gone"})])
+    )
+
+    responses = await google_batch(
+        connector, MagicMock(), GMAIL_BATCH_URL,
+        [SubRequest("GET", f"https://gmail.googleapis.com/gmail/v1/users/me/messages/{i}") for i in "ab"],
+    )
+
+    assert responses[0].json() == {"id": "a"}
+    with pytest.raises(ConnectorNotFoundError):
+        raise_for_sub_response(responses[1])
+    content_type = connector._make_authenticated_request.await_args.kwargs["headers"]["Content-Type"]
+    assert content_type.startswith("multipart/mixed; boundary=")
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_merges_requests_within_window():
+    sent = []
+
+    async def send_batch(requests):
+        sent.append(len(requests))
+        return [httpx.Response(200, json={"url": r.url}) for r in requests]
+
+    batcher = MicroBatcher(send_batch, limit=20, window=0.01)
+    futures = [batcher.submit(SubRequest("GET", f"https://x/{i}")) for i in range(3)]
+    responses = await asyncio.gather(*futures)
+
+    assert sent == [3]
+    assert [r.json()["url"] for r in responses] == ["https://x/0", "https://x/1", "https://x/2"]
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_holds_in_flight_batches_until_idle():
+    release = asyncio.Event()
+    idle = []
+
+    async def send_batch(requests):
+        await release.wait()
+        return list(requests)
+
+    batcher = MicroBatcher(send_batch, limit=2, window=10, on_idle=lambda: idle.append(True))
+    futures = [batcher.submit(i) for i in range(2)]
+    await asyncio.sleep(0)
+
+    assert len(batcher._in_flight) == 1
+    assert idle == []
+    release.set()
+    assert await asyncio.gather(*futures) == [0, 1]
+    await asyncio.sleep(0)
+    assert batcher._in_flight == set()
+    assert idle == [True]
+
+
+@pytest.mark.asyncio
+async def test_request_batched_falls_back_to_single_request_when_disabled():
+    connector = MagicMock()
+    connector._make_authenticated_request = AsyncMock(return_value=httpx.Response(200, json={}))
+    cred = MagicMock()
+    url = "https://graph.microsoft.com/v1.0/me/messages/1"
+
+    with patch("sage_mcp.connectors.batch._batch_window", return_value=0):
+        await request_batched(connector, cred, GRAPH_BATCH_URL, url)
+
+    connector._make_authenticated_request.assert_awaited_once_with("GET", url, cred, params=None)
+
+
+@pytest.mark.asyncio
+async def test_request_batched_merges_concurrent_gets():
+    connector = _graph_connector()
+    cred = MagicMock(access_token="tok")
+
+    with patch("sage_mcp.connectors.batch._batch_window", return_value=0.01):
+        responses = await asyncio.gather(*(
+            request_batched(connector, cred, GRAPH_BATCH_URL, f"https://graph.microsoft.com/v1.0/me/messages/{i}")
+            for i in range(5)
+        ))
+
+    assert connector._make_authenticated_request.await_count == 1
+    assert [r.json()["url"] for r in responses] == [f"/me/messages/{i}" for i in range(5)]
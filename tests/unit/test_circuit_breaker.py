@@ -0,0 +1,125 @@
+"""Tests for upstream circuit breakers."""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from sage_mcp.connectors.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    send_guarded,
+)
+from sage_mcp.connectors.exceptions import ConnectorAPIError
+
+
+def _breaker(**kwargs):
+    options = dict(failure_rate=0.5, min_requests=4, window_seconds=10, open_seconds=5)
+    options.update(kwargs)
+    return CircuitBreaker("api.atlassian.com", **options)
+
+
+class TestCircuitBreaker:
+    def test_opens_once_failure_rate_is_reached_with_enough_requests(self):
+        breaker = _breaker()
+        for failed in (True, False, True):
+            breaker.record(failed, now=0.0)
+        assert breaker.state == CLOSED  # only 3 requests so far
+
+        breaker.record(True, now=1.0)
+
+        assert breaker.state == OPEN
+        assert breaker.allow(now=2.0) is False
+        assert breaker.retry_in(now=2.0) == pytest.approx(4.0)
+
+    def test_old_outcomes_leave_the_window(self):
+        breaker = _breaker()
+        for _ in range(3):
+            breaker.record(True, now=0.0)
+        for _ in range(3):
+            breaker.record(False, now=20.0)
+        breaker.record(True, now=20.0)
+
+        assert breaker.state == CLOSED
+
+    def test_half_open_allows_a_single_probe(self):
+        breaker = _breaker()
+        for _ in range(4):
+            breaker.record(True, now=0.0)
+
+        assert breaker.allow(now=6.0) is True
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow(now=6.0) is False
+
+    def test_failed_probe_reopens_and_successful_probe_closes(self):
+        breaker = _breaker()
+        for _ in range(4):
+            breaker.record(True, now=0.0)
+
+        breaker.allow(now=6.0)
+        breaker.record(True, now=6.0)
+        assert breaker.state == OPEN
+        assert breaker.retry_in(now=6.0) == pytest.approx(5.0)
+
+        breaker.allow(now=12.0)
+        breaker.record(False, now=12.0)
+        assert breaker.state == CLOSED
+        assert breaker.snapshot(now=12.0)["requests"] == 0
+
+
+class TestRegistry:
+    def test_keys_per_host_unless_per_credential(self):
+        shared = CircuitBreakerRegistry()
+        assert shared.make_key("slack.com", "a") == shared.make_key("slack.com", "b")
+
+        per_credential = CircuitBreakerRegistry(per_credential=True)
+        key = per_credential.make_key("slack.com", "xoxb-secret")
+        assert key != per_credential.make_key("slack.com", "other")
+        assert "xoxb-secret" not in key[1]
+
+    def test_stats_list_only_tripped_breakers(self):
+        registry = CircuitBreakerRegistry(min_requests=1)
+        registry.get(registry.make_key("healthy.example"))
+        registry.get(registry.make_key("down.example")).record(True)
+
+        stats = registry.get_stats()
+
+        assert stats["tracked"] == 2
+        assert stats["open"] == 1
+        assert [entry["host"] for entry in stats["tripped"]] == ["down.example"]
+
+
+@pytest.mark.asyncio
+async def test_send_guarded_fails_fast_while_open():
+    registry = CircuitBreakerRegistry(min_requests=2)
+    send = AsyncMock(return_value=httpx.Response(502))
+
+    with patch("sage_mcp.connectors.circuit_breaker.get_circuit_breakers", return_value=registry):
+        await send_guarded("api.atlassian.com", "token", send)
+        await send_guarded("api.atlassian.com", "token", send)
+
+        with pytest.raises(ConnectorAPIError) as exc_info:
+            await send_guarded("api.atlassian.com", "token", send)
+
+    assert exc_info.value.status_code == 503
+    assert send.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_send_guarded_counts_connection_errors_but_not_4xx():
+    registry = CircuitBreakerRegistry(min_requests=2)
+
+    with patch("sage_mcp.connectors.circuit_breaker.get_circuit_breakers", return_value=registry):
+        for _ in range(3):
+            await send_guarded("api.github.com", "t", AsyncMock(return_value=httpx.Response(429)))
+        assert registry.get(registry.make_key("api.github.com")).state == CLOSED
+
+        for _ in range(3):
+            with pytest.raises(httpx.ConnectError):
+                await send_guarded(
+                    "api.github.com", "t", AsyncMock(side_effect=httpx.ConnectError("down"))
+                )
+        assert registry.get(registry.make_key("api.github.com")).state == OPEN
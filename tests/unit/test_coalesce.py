@@ -0,0 +1,83 @@
+"""Tests for single-flight coalescing of identical upstream GETs."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from sage_mcp.connectors.github import GitHubConnector
+from sage_mcp.connectors.coalesce import SingleFlight, coalesce_key
+
+
+class TestCoalesceKey:
+    def test_identical_gets_share_a_key_regardless_of_param_order(self):
+        a = coalesce_key("tok", "GET", "https://api.github.com/repos/o/r", {"params": {"a": 1, "b": 2}})
+        b = coalesce_key("tok", "get", "https://api.github.com/repos/o/r", {"params": {"b": 2, "a": 1}})
+        assert a == b
+
+    def test_credential_and_headers_are_part_of_the_key(self):
+        url = "https://api.github.com/repos/o/r/readme"
+        base = coalesce_key("tok", "GET", url, {})
+        assert base != coalesce_key("other", "GET", url, {})
+        assert base != coalesce_key("tok", "GET", url, {"headers": {"Accept": "application/vnd.github.raw"}})
+        # The bearer header is covered by the credential itself.
+        assert base == coalesce_key("tok", "GET", url, {"headers": {"Authorization": "Bearer tok"}})
+
+    def test_non_idempotent_requests_are_never_shared(self):
+        url = "https://api.github.com/repos/o/r/issues"
+        assert coalesce_key("tok", "POST", url, {"json": {"title": "x"}}) is None
+        assert coalesce_key("tok", "GET", url, {"json": {"q": 1}}) is None
+        assert coalesce_key("tok", "GET", url, {"timeout": 5}) is None
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_call_and_survives_caller_cancellation():
+    group = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "body"
+
+    first = asyncio.create_task(group.do("k", fetch))
+    second = asyncio.create_task(group.do("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "body"
+    assert calls == 1
+    assert group.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_authenticated_gets_are_coalesced_when_enabled():
+    gate = asyncio.Event()
+
+    async def request(method, url, **kwargs):
+        await gate.wait()
+        return httpx.Response(200, json={"ok": True}, request=httpx.Request(method, url))
+
+    client = MagicMock()
+    client.request = MagicMock(side_effect=request)
+    cred = MagicMock(access_token="tok", provider="github", is_active=True, is_expired=False)
+
+    with patch("sage_mcp.connectors.http_client.get_http_client", return_value=client), \
+            patch("sage_mcp.connectors.coalesce._single_flight", SingleFlight()):
+        connector = GitHubConnector()
+        calls = [
+            asyncio.create_task(
+                connector._make_authenticated_request("GET", "https://api.github.com/repos/o/r", cred)
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        responses = await asyncio.gather(*calls)
+
+    assert client.request.call_count == 1
+    assert all(r.json() == {"ok": True} for r in responses)
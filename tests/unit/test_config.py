@@ -123,6 +123,44 @@ class TestSettings:
         assert settings.gitlab_client_id == "gitlab-id"
         assert settings.google_client_id == "google-id"
 
+    def test_external_mcp_request_timeouts_parsing(self):
+        """Test per-method external MCP timeout parsing skips malformed entries."""
+        settings = Settings(
+            secret_key="test-secret-key-min16",
+            external_mcp_request_timeouts="tools/call=120, tools/list=10,bogus,x=abc",
+        )
+
+        assert settings.get_external_mcp_request_timeouts() == {
+            "tools/call": 120.0,
+            "tools/list": 10.0,
+        }
+
+    def test_http_pool_settings_parsing(self):
+        """Test per-host pool limits and HTTP/2 host list parsing."""
+        settings = Settings(
+            secret_key="test-secret-key-min16",
+            http_pool_host_limits="Slack.com=20, api.github.com=100,bad,x=y",
+            http2_hosts="googleapis.com, graph.microsoft.com,",
+        )
+
+        assert settings.get_http_pool_host_limits() == {
+            "slack.com": 20,
+            "api.github.com": 100,
+        }
+        assert settings.get_http2_hosts() == ["googleapis.com", "graph.microsoft.com"]
+
+    def test_upstream_response_cache_ttls_parsing(self):
+        """Test freshness lifetimes for cached upstream GETs."""
+        settings = Settings(
+            secret_key="test-secret-key-min16",
+            upstream_response_cache_ttls="api.github.com/user=30, API.github.com/user/orgs=300,bad,x=0,y=z",
+        )
+
+        assert settings.get_upstream_response_cache_ttls() == {
+            "api.github.com/user": 30.0,
+            "api.github.com/user/orgs": 300.0,
+        }
+
 
 class TestGetSettings:
     """Test get_settings function."""
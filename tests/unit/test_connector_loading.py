@@ -0,0 +1,97 @@
+"""Tests for loading connector implementations on first use."""
+
+import subprocess
+import sys
+
+import pytest
+
+from sage_mcp.connectors.registry import BUILTIN_CONNECTORS, ConnectorRegistry, connector_registry
+from sage_mcp.models.connector import ConnectorType
+
+CONNECTOR_MODULES = {f"sage_mcp.connectors.{module}" for module in BUILTIN_CONNECTORS.values()}
+
+
+def _importtime(statement: str):
+    """Run *statement* under ``python -X importtime``; return {module: cumulative µs}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def _slowest(modules, count=10):
+    return ", ".join(f"{name}={us}us" for name, us in sorted(modules.items(), key=lambda kv: -kv[1])[:count])
+
+
+@pytest.mark.parametrize("statement", [
+    "import sage_mcp.connectors",
+    "import sage_mcp.connectors.registry",
+    "import sage_mcp.main",
+])
+def test_startup_imports_no_connector_implementation(statement):
+    """Importing the app must not pull in connector modules (import-time regression guard)."""
+    modules = _importtime(statement)
+
+    eager = CONNECTOR_MODULES & modules.keys()
+    assert not eager, f"{statement} imported {sorted(eager)}; slowest imports: {_slowest(modules)}"
+
+
+def test_first_use_imports_only_the_requested_connector():
+    # importlib.import_module is not reported by -X importtime, so read sys.modules.
+    result = subprocess.run(
+        [sys.executable, "-c", (
+            "import sys\n"
+            "from sage_mcp.connectors.registry import connector_registry\n"
+            "from sage_mcp.models.connector import ConnectorType\n"
+            "assert connector_registry.get_connector(ConnectorType.SLACK).name == 'slack'\n"
+            "print('\\n'.join(sys.modules))"
+        )],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    assert CONNECTOR_MODULES & set(result.stdout.split()) == {"sage_mcp.connectors.slack"}
+
+
+def test_every_connector_type_is_declared():
+    native = set(ConnectorType) - {ConnectorType.CUSTOM, ConnectorType.GOOGLE_CALENDAR}
+    assert set(BUILTIN_CONNECTORS) == native
+
+
+def test_declared_types_are_listed_before_loading():
+    registry = ConnectorRegistry({ConnectorType.GITHUB: "github"})
+
+    assert registry.list_connector_types() == [ConnectorType.GITHUB]
+    assert registry.list_connectors() == []
+
+
+def test_get_connector_loads_declared_module():
+    connector_registry.declare(ConnectorType.GITHUB, "github")
+
+    connector = connector_registry.get_connector(ConnectorType.GITHUB)
+
+    assert connector is not None
+    assert connector.name == "github"
+    assert "sage_mcp.connectors.github" in sys.modules
+
+
+def test_unknown_type_returns_none_without_importing():
+    registry = ConnectorRegistry()
+    assert registry.get_connector(ConnectorType.GITHUB) is None
+
+
+def test_get_connector_by_name_loads_declared_modules():
+    assert connector_registry.get_connector_by_name("googledocs").display_name
@@ -1,5 +1,6 @@
 """Test connectors module."""
 
+import json
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -241,6 +242,39 @@ class TestGitHubConnector:
         assert "user:email" in result
         assert "read:org" in result
 
+    @pytest.mark.asyncio
+    @patch('sage_mcp.connectors.github.GitHubConnector._make_authenticated_request')
+    async def test_get_user_stats_pages_through_all_repositories(self, mock_request, sample_oauth_credential):
+        """User stats count every repository, not just the first 100."""
+        connector = GitHubConnector()
+        user = {
+            "login": "octo", "public_repos": 250, "followers": 1, "following": 2,
+            "created_at": "2020-01-01T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z",
+        }
+
+        async def respond(method, url, oauth_cred, params=None):
+            response = Mock()
+            response.headers = {}
+            if url.endswith("/repos"):
+                count = {1: 100, 2: 100, 3: 50}[params["page"]]
+                response.json.return_value = [
+                    {"name": f"r{params['page']}-{i}", "full_name": f"octo/r{i}",
+                     "html_url": "https://github.com/octo/r", "stargazers_count": 1,
+                     "forks_count": 0, "language": "Python"}
+                    for i in range(count)
+                ]
+            else:
+                response.json.return_value = user
+            return response
+
+        mock_request.side_effect = respond
+
+        result = json.loads(await connector._get_user_stats({"username": "octo"}, sample_oauth_credential))
+
+        assert result["statistics"]["total_stars_received"] == 250
+        assert result["languages"] == {"Python": 250}
+        assert mock_request.await_count == 4
+
     @pytest.mark.asyncio
     @patch('sage_mcp.connectors.github.GitHubConnector._make_authenticated_request')
     async def test_list_organizations(self, mock_request, sample_connector, sample_oauth_credential):
@@ -650,9 +684,11 @@ class TestJiraConnector:
 
         assert cloud_id == "test-cloud-id-123"
         assert mock_request.called
-        # Verify caching works
+        # Verify caching works, also across a token refresh
+        sample_oauth_credential.access_token = "refreshed_access_token"
         cloud_id2 = await connector._get_cloud_id(sample_oauth_credential)
         assert cloud_id2 == "test-cloud-id-123"
+        assert mock_request.call_count == 1
 
     @pytest.mark.asyncio
     @patch('sage_mcp.connectors.jira.JiraConnector._make_authenticated_request')
@@ -1865,7 +1901,7 @@ class TestGoogleSheetsConnector:
 
         tools = await connector.get_tools(sample_connector, sample_oauth_credential)
 
-        assert len(tools) == 14
+        assert len(tools) == 15
 
         # Check that all tools have the correct naming convention
         for tool in tools:
@@ -1879,6 +1915,7 @@ class TestGoogleSheetsConnector:
         assert "google_sheets_list_spreadsheets" in tool_names
         assert "google_sheets_get_spreadsheet" in tool_names
         assert "google_sheets_read_range" in tool_names
+        assert "google_sheets_read_ranges" in tool_names
         assert "google_sheets_write_range" in tool_names
         assert "google_sheets_append_rows" in tool_names
         assert "google_sheets_clear_range" in tool_names
@@ -2140,7 +2177,7 @@ class TestGmailConnector:
 
         tools = await connector.get_tools(sample_connector, sample_oauth_credential)
 
-        assert len(tools) == 15
+        assert len(tools) == 16
 
         # Check that all tools have the correct naming convention
         for tool in tools:
@@ -2153,6 +2190,7 @@ class TestGmailConnector:
         tool_names = [tool.name for tool in tools]
         assert "gmail_list_messages" in tool_names
         assert "gmail_get_message" in tool_names
+        assert "gmail_get_messages" in tool_names
         assert "gmail_search_messages" in tool_names
         assert "gmail_send_message" in tool_names
         assert "gmail_reply_to_message" in tool_names
@@ -2632,7 +2670,7 @@ class TestOutlookConnector:
 
         tools = await connector.get_tools(sample_connector, sample_oauth_credential)
 
-        assert len(tools) == 15
+        assert len(tools) == 16
 
     @pytest.mark.asyncio
     async def test_tool_names(self, sample_connector, sample_oauth_credential):
@@ -4783,7 +4821,7 @@ class TestLinearConnector:
 
         tools = await connector.get_tools(sample_connector, sample_oauth_credential)
 
-        assert len(tools) == 19
+        assert len(tools) == 20
 
     @pytest.mark.asyncio
     async def test_tool_names(self, sample_connector, sample_oauth_credential):
@@ -5313,7 +5351,7 @@ class TestLinearConnector:
     async def test_tool_count(self, sample_connector):
         connector = LinearConnector()
         tools = await connector.get_tools(sample_connector)
-        assert len(tools) == 19
+        assert len(tools) == 20
 
     @pytest.mark.asyncio
     async def test_tool_names(self, sample_connector):
@@ -5327,7 +5365,7 @@ class TestLinearConnector:
             "linear_get_project", "linear_create_project", "linear_list_cycles",
             "linear_get_cycle", "linear_list_labels", "linear_list_workflow_states",
             "linear_add_comment", "linear_list_comments", "linear_list_users",
-            "linear_get_user_by_email",
+            "linear_get_user_by_email", "linear_get_issues",
         }
         assert names == expected
 
@@ -5489,6 +5527,66 @@ class TestLinearConnector:
         result = await connector.execute_tool(sample_connector, "unknown_tool", {}, sample_oauth_credential)
         assert "Unknown tool" in result
 
+    @pytest.mark.asyncio
+    @patch.object(LinearConnector, '_get_client')
+    async def test_get_issues_reports_per_issue_errors(self, mock_get_client, sample_oauth_credential):
+        """Test fetching several Linear issues with one execute_many call."""
+        from sage_mcp.connectors.exceptions import ConnectorAPIError
+
+        connector = LinearConnector()
+
+        mock_client = AsyncMock()
+        mock_client.execute_many.return_value = [
+            {"issue": {"id": "issue-1", "identifier": "ENG-1", "title": "Fix login bug"}},
+            ConnectorAPIError("GraphQL error: Entity not found"),
+        ]
+        mock_get_client.return_value = mock_client
+
+        result = json.loads(
+            await connector._get_issues({"ids": ["issue-1", "missing"]}, sample_oauth_credential)
+        )
+
+        queries = mock_client.execute_many.call_args.args[0]
+        assert [variables for _, variables in queries] == [{"id": "issue-1"}, {"id": "missing"}]
+        assert [issue["identifier"] for issue in result["issues"]] == ["ENG-1"]
+        assert result["errors"][0]["id"] == "missing"
+
+    @pytest.mark.asyncio
+    @patch("sage_mcp.connectors.http_client.get_http_client")
+    async def test_get_issues_with_one_missing_id_still_returns_the_others(
+        self, mock_get_client, sample_oauth_credential
+    ):
+        """A missing issue nulls Linear's whole merged response; the rest are re-fetched alone."""
+        def respond(url, json, headers):
+            response = Mock(status_code=200, raise_for_status=Mock())
+            variables = json["variables"]
+            if len(variables) > 1:
+                # issue(id:) is non-null, so one failure nulls `data` for the whole document.
+                response.json.return_value = {
+                    "data": None,
+                    "errors": [{"message": "Entity not found", "path": ["q1_issue"]}],
+                }
+            elif variables["id"] == "missing":
+                response.json.return_value = {"data": None, "errors": [{"message": "Entity not found"}]}
+            else:
+                response.json.return_value = {
+                    "data": {"issue": {"id": variables["id"], "identifier": variables["id"].upper()}}
+                }
+            return response
+
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = respond
+        mock_get_client.return_value = mock_client
+
+        result = json.loads(await LinearConnector()._get_issues(
+            {"ids": ["eng-1", "missing", "eng-3"]}, sample_oauth_credential
+        ))
+
+        assert [issue["identifier"] for issue in result["issues"]] == ["ENG-1", "ENG-3"]
+        assert [error["id"] for error in result["errors"]] == ["missing"]
+        # One merged request, then the two queries it could not answer.
+        assert mock_client.post.await_count == 3
+
 
 class TestDiscordConnector:
     """Test DiscordConnector class.
@@ -0,0 +1,79 @@
+"""Tests for database engine routing and pool instrumentation."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from sage_mcp.config import Settings
+from sage_mcp.database.connection import (
+    BACKGROUND,
+    PRIMARY,
+    READ,
+    DatabaseManager,
+    InstrumentedQueuePool,
+)
+
+
+def _manager(**overrides) -> DatabaseManager:
+    values = {
+        "secret_key": "test-secret-key-min16",
+        "environment": "production",
+        "database_url": "postgresql://u:p@primary/db",
+        "db_pool_size": 7,
+        "db_max_overflow": 3,
+        "db_pool_recycle": 600,
+    }
+    values.update(overrides)
+    manager = DatabaseManager()
+    manager.settings = Settings(**values)
+    manager.initialize()
+    return manager
+
+
+def test_workloads_get_their_own_tuned_pools():
+    manager = _manager(
+        database_read_url="postgresql://u:p@replica/db",
+        db_background_pool_size=2,
+        db_background_max_overflow=1,
+    )
+
+    assert set(manager.engines) == {PRIMARY, READ, BACKGROUND}
+    primary = manager.engines[PRIMARY].pool
+    assert isinstance(primary, InstrumentedQueuePool)
+    assert (primary.size(), primary._max_overflow, primary._recycle) == (7, 3, 600)
+    assert primary._pre_ping is True
+    assert manager.engines[READ].url.host == "replica"
+    assert manager.engines[BACKGROUND].pool.size() == 2
+    assert manager.engines[BACKGROUND].pool.workload == BACKGROUND
+    assert manager.get_session_factory(READ).kw["bind"] is manager.engines[READ]
+
+
+def test_workloads_fall_back_to_the_primary_engine():
+    manager = _manager(db_background_pool_size=0)
+
+    assert set(manager.engines) == {PRIMARY}
+    assert manager.get_session_factory(READ) is manager.session_factory
+    assert manager.get_session_factory(BACKGROUND) is manager.session_factory
+
+
+@pytest.mark.asyncio
+async def test_checkouts_report_wait_time_and_occupancy(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+        pool_logging_name=BACKGROUND,
+    )
+    with patch("sage_mcp.database.connection.record_db_pool_checkout") as checkout, \
+            patch("sage_mcp.database.connection.set_db_pool_connections") as occupancy:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            occupancy.assert_called_with(BACKGROUND, 1, 0, 3)
+        await engine.dispose()
+
+    assert checkout.call_args.args[0] == BACKGROUND
+    assert checkout.call_args.args[1] >= 0
+    occupancy.assert_called_with(BACKGROUND, 0, 1, 3)
@@ -2,6 +2,7 @@
 
 import json
 import os
+import time
 
 import pytest
 
@@ -16,8 +17,14 @@ from sage_mcp.security.encryption import (
     is_encrypted,
     get_fernet,
     FERNET_PREFIX,
+    PlaintextCache,
     _derive_key,
+    get_plaintext_cache,
+    load_keys,
+    rotate_key,
+    rotate_value,
 )
+from sage_mcp.security import encryption
 from sage_mcp.security.types import EncryptedText
 from sage_mcp.security.encrypted_json import EncryptedJSON
 
@@ -209,3 +216,145 @@ class TestDecryptValueEdgeCases:
         with patch("sage_mcp.security.encryption.get_fernet", return_value=mock_fernet):
             with pytest.raises(TypeError, match="unexpected error"):
                 decrypt_value("some-ciphertext")
+
+
+@pytest.fixture
+def isolated_keys(monkeypatch):
+    """Let a test swap keys and caches without leaking them into other tests."""
+    monkeypatch.setattr(encryption, "_fernet", None)
+    monkeypatch.setattr(encryption, "_secrets", ())
+    monkeypatch.setattr(encryption, "_plaintext_cache", None)
+
+
+class TestKeyRotation:
+    """MultiFernet key ring swapped at runtime."""
+
+    def test_previous_keys_still_decrypt(self, isolated_keys):
+        load_keys("old-secret-key-123")
+        old_token = encrypt_value("payload")
+
+        rotate_key("new-secret-key-456")
+
+        assert decrypt_value(old_token) == "payload"
+        new_token = encrypt_value("payload")
+        assert load_keys("new-secret-key-456").decrypt(new_token.encode()) == b"payload"
+
+    def test_dropped_key_no_longer_decrypts(self, isolated_keys):
+        load_keys("old-secret-key-123")
+        old_token = encrypt_value("payload")
+        assert decrypt_value(old_token) == "payload"  # now cached
+
+        load_keys("new-secret-key-456")
+
+        # The cache was wiped with the key change, so the token is unreadable.
+        assert decrypt_value(old_token) == old_token
+
+    def test_previous_keys_from_settings(self, isolated_keys, monkeypatch):
+        load_keys("retired-secret-key")
+        old_token = encrypt_value("payload")
+        monkeypatch.setattr(encryption, "_fernet", None)
+
+        from sage_mcp.config import get_settings
+        monkeypatch.setattr(get_settings(), "secret_key_previous", "unused-key, retired-secret-key")
+
+        assert decrypt_value(old_token) == "payload"
+
+    def test_rotate_value_reencrypts_under_current_key(self, isolated_keys):
+        load_keys("old-secret-key-123")
+        old_token = encrypt_value("payload")
+        rotate_key("new-secret-key-456")
+
+        rotated = rotate_value(old_token)
+        assert load_keys("new-secret-key-456").decrypt(rotated.encode()) == b"payload"
+
+    def test_rotate_value_encrypts_legacy_plaintext(self, isolated_keys):
+        rotated = rotate_value("legacy")
+        assert is_encrypted(rotated)
+        assert decrypt_value(rotated) == "legacy"
+
+
+class TestPlaintextCache:
+    """Decrypted values cached by ciphertext digest."""
+
+    def test_repeat_decrypt_skips_fernet(self, isolated_keys):
+        from unittest.mock import patch
+
+        token = encrypt_value("payload")
+        assert decrypt_value(token) == "payload"
+        with patch.object(encryption, "get_fernet", side_effect=AssertionError("decrypted again")):
+            assert decrypt_value(token) == "payload"
+        assert get_plaintext_cache().hits == 1
+
+    def test_legacy_plaintext_is_not_cached(self, isolated_keys):
+        assert decrypt_value("legacy-value") == "legacy-value"
+        assert len(get_plaintext_cache()) == 0
+
+    def test_eviction_zeroes_plaintext(self):
+        cache = PlaintextCache(max_entries=1)
+        cache.put(b"a", b"first-secret")
+        buffer = cache._entries[b"a"]
+
+        cache.put(b"b", b"second-secret")
+
+        assert cache.get(b"a") is None
+        assert cache.get(b"b") == "second-secret"
+        assert bytes(buffer) == bytes(len(b"first-secret"))
+
+    def test_key_change_zeroes_plaintext(self, isolated_keys):
+        token = encrypt_value("payload")
+        decrypt_value(token)
+        cache = get_plaintext_cache()
+        buffer = next(iter(cache._entries.values()))
+
+        rotate_key("new-secret-key-456")
+
+        assert len(cache) == 0
+        assert bytes(buffer) == bytes(len(b"payload"))
+
+    def test_disabled_by_settings(self, isolated_keys, monkeypatch):
+        from sage_mcp.config import get_settings
+        monkeypatch.setattr(get_settings(), "encryption_cache_size", 0)
+
+        assert get_plaintext_cache() is None
+        token = encrypt_value("payload")
+        assert decrypt_value(token) == "payload"
+
+
+class TestDecodeBenchmark:
+    """Per-row decode cost of encrypted columns, with and without the cache."""
+
+    ROWS = 500
+
+    def _per_row(self, decode, values) -> float:
+        start = time.perf_counter()
+        for value in values:
+            decode(value, None)
+        return (time.perf_counter() - start) / len(values)
+
+    def test_cached_decode_is_cheaper(self, isolated_keys, monkeypatch, capsys):
+        from sage_mcp.config import get_settings
+
+        text_type, json_type = EncryptedText(), EncryptedJSON()
+        text_values = [encrypt_value(f"ghp_{i:036d}") for i in range(self.ROWS)]
+        json_values = [
+            encrypt_value(json.dumps({"api_key": f"sk-{i}", "env": {"REGION": "eu", "DEBUG": False}}))
+            for i in range(self.ROWS)
+        ]
+
+        monkeypatch.setattr(get_settings(), "encryption_cache_size", 0)
+        uncached_text = self._per_row(text_type.process_result_value, text_values)
+        uncached_json = self._per_row(json_type.process_result_value, json_values)
+
+        monkeypatch.setattr(get_settings(), "encryption_cache_size", 2 * self.ROWS)
+        self._per_row(text_type.process_result_value, text_values)  # warm
+        self._per_row(json_type.process_result_value, json_values)
+        cached_text = self._per_row(text_type.process_result_value, text_values)
+        cached_json = self._per_row(json_type.process_result_value, json_values)
+
+        with capsys.disabled():
+            print(
+                f"\nper-row decode: EncryptedText {uncached_text * 1e6:.1f}us -> {cached_text * 1e6:.1f}us, "
+                f"EncryptedJSON {uncached_json * 1e6:.1f}us -> {cached_json * 1e6:.1f}us"
+            )
+        assert cached_text < uncached_text
+        assert cached_json < uncached_json
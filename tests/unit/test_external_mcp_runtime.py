@@ -13,6 +13,7 @@ from pydantic import AnyUrl, TypeAdapter
 from sage_mcp.mcp.transport import MCPTransport
 from sage_mcp.runtime.generic_connector import GenericMCPConnector
 from sage_mcp.runtime.process_manager import MCPProcessManager
+from sage_mcp.runtime.resources import ProcessResourceGuard, ResourceLimits
 
 
 class _FakeTask:
@@ -220,7 +221,7 @@ async def test_process_manager_health_check_skips_probe_within_interval():
         "last_protocol_probe_at": now,
         "consecutive_failures": 0,
     }
-    fake_connector = SimpleNamespace(process=SimpleNamespace(returncode=None))
+    fake_connector = SimpleNamespace(process=SimpleNamespace(returncode=None), is_running=True)
 
     is_healthy = await manager._is_healthy(key, fake_connector)
 
@@ -236,7 +237,7 @@ async def test_process_manager_health_check_uses_failure_threshold():
     manager._protocol_probe = AsyncMock(side_effect=Exception("probe failed"))
 
     key = "tenant-1:connector-1"
-    fake_connector = SimpleNamespace(process=SimpleNamespace(returncode=None))
+    fake_connector = SimpleNamespace(process=SimpleNamespace(returncode=None), is_running=True)
 
     assert await manager._is_healthy(key, fake_connector) is True
     assert await manager._is_healthy(key, fake_connector) is True
@@ -406,3 +407,513 @@ async def test_generic_connector_initialize_falls_back_to_content_length_framing
     assert connector._stdio_framing == "content_length"
     assert connector._send_request.await_count == 2
     connector._send_notification.assert_awaited_once_with("notifications/initialized")
+
+
+def _connected_connector(**kwargs):
+    connector = GenericMCPConnector(
+        runtime_type="external_python", command=["python", "server.py"], **kwargs
+    )
+    fake_stdin = _FakeStdin()
+    connector.process = SimpleNamespace(stdin=fake_stdin, returncode=None)
+    return connector, fake_stdin
+
+
+def _written_messages(fake_stdin):
+    return [json.loads(line) for line in fake_stdin.buf.decode("utf-8").splitlines() if line]
+
+
+def test_generic_connector_resolves_per_method_timeouts():
+    connector = GenericMCPConnector(
+        runtime_type="external_python",
+        command=["python", "server.py"],
+        request_timeout=20,
+        request_timeouts={"tools/call": 120},
+    )
+
+    assert connector.get_request_timeout("tools/call") == 120
+    assert connector.get_request_timeout("tools/list") == 20
+
+
+@pytest.mark.asyncio
+async def test_generic_connector_timeout_sends_cancelled_notification():
+    connector, fake_stdin = _connected_connector()
+
+    with pytest.raises(Exception, match="MCP request timeout: tools/call"):
+        await connector._send_request("tools/call", {"name": "slow"}, timeout=0.01)
+
+    request, cancel = _written_messages(fake_stdin)
+    assert cancel["method"] == "notifications/cancelled"
+    assert cancel["params"]["requestId"] == request["id"]
+    assert connector._pending_requests == {}
+    assert connector.cancelled_count == 1
+    connector.process = None
+
+
+@pytest.mark.asyncio
+async def test_generic_connector_caller_cancellation_sends_cancelled_notification():
+    connector, fake_stdin = _connected_connector()
+
+    task = asyncio.create_task(connector._send_request("tools/call", {"name": "slow"}))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    request, cancel = _written_messages(fake_stdin)
+    assert cancel["method"] == "notifications/cancelled"
+    assert cancel["params"]["requestId"] == request["id"]
+    assert connector.in_flight_count == 0
+    connector.process = None
+
+
+@pytest.mark.asyncio
+async def test_generic_connector_never_cancels_initialize():
+    connector, fake_stdin = _connected_connector()
+
+    with pytest.raises(Exception, match="MCP request timeout: initialize"):
+        await connector._send_request("initialize", {}, timeout=0.01)
+
+    assert [m["method"] for m in _written_messages(fake_stdin)] == ["initialize"]
+    connector.process = None
+
+
+@pytest.mark.asyncio
+async def test_generic_connector_bounds_in_flight_requests():
+    connector, fake_stdin = _connected_connector(max_in_flight=1)
+
+    first = asyncio.create_task(connector._send_request("tools/list", {}))
+    second = asyncio.create_task(connector._send_request("tools/list", {}))
+    await asyncio.sleep(0.01)
+
+    assert connector.in_flight_count == 1
+    assert connector.queued_count == 1
+    assert len(_written_messages(fake_stdin)) == 1
+
+    connector._process_incoming_message({"jsonrpc": "2.0", "id": "1", "result": {"tools": []}})
+    assert await first == {"tools": []}
+    await asyncio.sleep(0.01)
+
+    assert connector.queued_count == 0
+    connector._process_incoming_message({"jsonrpc": "2.0", "id": "2", "result": {"tools": []}})
+    assert await second == {"tools": []}
+    assert connector.in_flight_count == 0
+    connector.process = None
+
+
+@pytest.mark.asyncio
+async def test_generic_connector_queue_timeout_does_not_write_request():
+    connector, fake_stdin = _connected_connector(max_in_flight=1)
+
+    blocker = asyncio.create_task(connector._send_request("tools/call", {}, timeout=5))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(Exception, match="queue timeout"):
+        await connector._send_request("tools/list", {}, timeout=0.01)
+
+    assert len(_written_messages(fake_stdin)) == 1
+    blocker.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await blocker
+    connector.process = None
+
+
+@pytest.mark.asyncio
+async def test_generic_connector_caches_tools_list_until_list_changed():
+    connector = GenericMCPConnector(runtime_type="external_python", command=["python", "server.py"])
+    connector._initialized = True
+    connector._send_request = AsyncMock(
+        side_effect=[
+            {"tools": [{"name": "a", "inputSchema": {"type": "object"}}]},
+            {"tools": [{"name": "b", "inputSchema": {"type": "object"}}]},
+        ]
+    )
+    forwarded = []
+    connector.on_notification = forwarded.append
+
+    first = await connector.get_tools(SimpleNamespace())
+    second = await connector.get_tools(SimpleNamespace())
+    assert [t.name for t in first] == [t.name for t in second] == ["a"]
+    assert connector._send_request.await_count == 1
+
+    notification = {"jsonrpc": "2.0", "method": "notifications/tools/list_changed"}
+    connector._process_incoming_message(notification)
+    third = await connector.get_tools(SimpleNamespace())
+
+    assert [t.name for t in third] == ["b"]
+    assert connector._send_request.await_count == 2
+    assert forwarded == [notification]
+
+
+@pytest.mark.asyncio
+async def test_generic_connector_does_not_cache_list_raced_by_list_changed():
+    connector = GenericMCPConnector(runtime_type="external_python", command=["python", "server.py"])
+
+    async def send_request(method, params):
+        connector._process_incoming_message(
+            {"jsonrpc": "2.0", "method": "notifications/resources/list_changed"}
+        )
+        return {"resources": []}
+
+    connector._send_request = send_request
+
+    await connector._cached_list_request("resources/list")
+
+    assert "resources/list" not in connector._list_cache
+
+
+@pytest.mark.asyncio
+async def test_generic_connector_stop_process_clears_list_cache():
+    connector = GenericMCPConnector(runtime_type="external_python", command=["python", "server.py"])
+    connector.process = _FakeProcess()
+    connector._list_cache["tools/list"] = {"tools": []}
+
+    await connector.stop_process()
+
+    assert connector._list_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_process_manager_forwards_notifications_to_subscribers():
+    manager = MCPProcessManager()
+    queue_a = manager.subscribe("tenant-1", "connector-1")
+    queue_b = manager.subscribe("tenant-1", "connector-1")
+    other = manager.subscribe("tenant-1", "connector-2")
+
+    message = {"jsonrpc": "2.0", "method": "notifications/tools/list_changed"}
+    manager._publish_notification("tenant-1:connector-1", message)
+
+    assert queue_a.get_nowait() == message
+    assert queue_b.get_nowait() == message
+    assert other.empty()
+
+    manager.unsubscribe("tenant-1", "connector-1", queue_a)
+    manager.unsubscribe("tenant-1", "connector-1", queue_b)
+    assert "tenant-1:connector-1" not in manager._notification_subscribers
+
+
+class _SessionCtx:
+    def __init__(self, results=()):
+        self.execute = AsyncMock(side_effect=list(results) or None)
+        self.commit = AsyncMock()
+        self.opened = 0
+        self.workloads = []
+
+    def __call__(self, workload="primary"):
+        self.opened += 1
+        self.workloads.append(workload)
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+def _tracked_process():
+    return SimpleNamespace(
+        process=SimpleNamespace(returncode=None),
+        is_running=True,
+        runtime_type="external_python",
+        stop_process=AsyncMock(),
+        sample_resource_usage=Mock(return_value=None),
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_manager_health_pass_probes_concurrently_and_bulk_writes_heartbeats():
+    manager = MCPProcessManager()
+    manager.processes = {f"tenant-1:connector-{i}": _tracked_process() for i in range(3)}
+    active = {"now": 0, "max": 0}
+
+    async def is_healthy(key, process):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return True
+
+    manager._is_healthy = is_healthy
+    ctx = _SessionCtx()
+
+    with patch("sage_mcp.runtime.process_manager.get_db_context", ctx):
+        await manager._run_health_checks()
+
+    assert active["max"] == 3
+    assert ctx.opened == 1
+    assert ctx.workloads == ["background"]
+    assert ctx.execute.await_count == 1
+    ctx.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_process_manager_health_pass_stops_before_the_session_and_bulk_writes_statuses():
+    from contextlib import asynccontextmanager
+
+    from sqlalchemy import event, select
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import StaticPool
+
+    from sage_mcp.models.base import Base
+    from sage_mcp.models.connector import Connector, ConnectorType
+    from sage_mcp.models.mcp_process import MCPProcess, ProcessStatus
+    from sage_mcp.models.tenant import Tenant
+
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        tenant = Tenant(slug="acme", name="Acme")
+        session.add(tenant)
+        await session.flush()
+        exhausted = Connector(tenant_id=tenant.id, connector_type=ConnectorType.CUSTOM, name="a")
+        flaky = Connector(tenant_id=tenant.id, connector_type=ConnectorType.CUSTOM, name="b")
+        session.add_all([exhausted, flaky])
+        await session.flush()
+        session.add_all([
+            MCPProcess(connector_id=exhausted.id, tenant_id=tenant.id, runtime_type="external_python",
+                       status=ProcessStatus.RUNNING, pid=11, restart_count=3),
+            MCPProcess(connector_id=flaky.id, tenant_id=tenant.id, runtime_type="external_python",
+                       status=ProcessStatus.RUNNING, pid=12, restart_count=1),
+        ])
+        await session.commit()
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    sessions_open = {"now": 0}
+
+    @asynccontextmanager
+    async def db_context(workload="primary"):
+        sessions_open["now"] += 1
+        try:
+            async with factory() as session:
+                yield session
+        finally:
+            sessions_open["now"] -= 1
+
+    manager = MCPProcessManager()
+    processes = {
+        f"{tenant.id}:{exhausted.id}": _tracked_process(),
+        f"{tenant.id}:{flaky.id}": _tracked_process(),
+    }
+    stopping = {"now": 0, "max": 0}
+    for process in processes.values():
+        async def stop_process():
+            assert sessions_open["now"] == 0
+            stopping["now"] += 1
+            stopping["max"] = max(stopping["max"], stopping["now"])
+            await asyncio.sleep(0.01)
+            stopping["now"] -= 1
+
+        process.stop_process = AsyncMock(side_effect=stop_process)
+    manager.processes = dict(processes)
+    manager._is_healthy = AsyncMock(return_value=False)
+    manager._update_process_status = AsyncMock()
+    manager.get_or_create = AsyncMock()
+
+    with patch("sage_mcp.runtime.process_manager.get_db_context", db_context):
+        await manager._run_health_checks()
+
+    assert stopping["max"] == 2
+    assert [s.split()[0] for s in statements if s.split()[0] in ("SELECT", "UPDATE")] == [
+        "SELECT", "SELECT", "SELECT", "UPDATE",
+    ]
+    manager._update_process_status.assert_not_awaited()
+    manager.get_or_create.assert_awaited_once()
+    assert manager.get_or_create.await_args.args[0].id == flaky.id
+
+    async with factory() as session:
+        rows = {
+            row.connector_id: row
+            for row in (await session.execute(select(MCPProcess))).scalars().all()
+        }
+    assert rows[exhausted.id].status == ProcessStatus.ERROR
+    assert rows[exhausted.id].error_message == "Max restart limit reached (3)"
+    assert rows[exhausted.id].restart_count == 3
+    assert rows[flaky.id].status == ProcessStatus.RESTARTING
+    assert rows[flaky.id].error_message is None
+    assert rows[flaky.id].restart_count == 2
+    assert rows[flaky.id].pid is None
+    await engine.dispose()
+
+
+def test_resource_guard_samples_process_tree_from_proc():
+    if not os.path.isdir("/proc/self/task"):
+        pytest.skip("requires /proc")
+    guard = ProcessResourceGuard(ResourceLimits())
+
+    first = guard.sample(os.getpid())
+    sum(range(200000))  # burn a little CPU between samples
+    second = guard.sample(os.getpid())
+
+    assert first.rss_bytes > 0
+    assert first.cpu_millicores is None
+    assert second.cpu_seconds >= first.cpu_seconds
+    assert second.cpu_millicores is not None
+    assert guard.sample(None) is None
+
+    peek = guard.sample(os.getpid(), remember=False)
+    assert peek.cpu_millicores is not None
+    assert guard.last_usage is second
+
+
+def test_resource_guard_configures_cgroup_and_joins_it_from_child(tmp_path):
+    root = tmp_path / "cgroup"
+    root.mkdir()
+    guard = ProcessResourceGuard(
+        ResourceLimits(cpu_millicores=500, memory_mb=256), cgroup_root=str(root)
+    )
+
+    guard.prepare(name="sagemcp-connector/1")
+    guard.preexec_fn()
+
+    cgroup = root / "sagemcp-connector_1"
+    assert guard.enforcement == "cgroup"
+    assert (cgroup / "cpu.max").read_text() == "50000 100000"
+    assert (cgroup / "memory.max").read_text() == str(256 * 1024 * 1024)
+    assert (cgroup / "cgroup.procs").read_text() == "0"
+
+    (cgroup / "memory.current").write_text("1048576")
+    (cgroup / "cpu.stat").write_text("usage_usec 2500000\nuser_usec 2000000\n")
+    usage = guard.sample(None)
+    assert usage.rss_bytes == 1048576
+    assert usage.cpu_seconds == 2.5
+
+
+@pytest.mark.asyncio
+async def test_resource_guard_falls_back_to_rlimit_in_child(tmp_path):
+    guard = ProcessResourceGuard(
+        ResourceLimits(memory_mb=512), cgroup_root=str(tmp_path / "missing")
+    )
+    guard.prepare(name="sagemcp-test")
+    if guard.enforcement != "rlimit":
+        pytest.skip("setrlimit unavailable")
+
+    proc = await asyncio.create_subprocess_exec(
+        "python",
+        "-c",
+        "import resource; print(resource.getrlimit(resource.RLIMIT_DATA)[0])",
+        stdout=asyncio.subprocess.PIPE,
+        preexec_fn=guard.preexec_fn,
+    )
+    stdout, _ = await proc.communicate()
+
+    assert int(stdout) == 512 * 1024 * 1024
+
+
+def test_resource_guard_without_limits_applies_nothing(tmp_path):
+    guard = ProcessResourceGuard(ResourceLimits(), cgroup_root=str(tmp_path))
+    guard.prepare(name="sagemcp-test")
+
+    assert guard.enforcement is None
+    assert guard.preexec_fn is None
+
+
+def _http_mcp_transport(handler_log, tools_delay=0.0):
+    """Mock Streamable HTTP MCP server: JSON for initialize, SSE for tools/list."""
+    import httpx
+
+    async def handler(request):
+        handler_log.append(request)
+        if request.method == "DELETE":
+            return httpx.Response(200)
+        message = json.loads(request.content)
+        if "id" not in message:
+            return httpx.Response(202)
+        if message["method"] == "initialize":
+            return httpx.Response(
+                200,
+                json={"jsonrpc": "2.0", "id": message["id"], "result": {"protocolVersion": "2025-03-26"}},
+                headers={"Mcp-Session-Id": "session-1"},
+            )
+        await asyncio.sleep(tools_delay)
+        events = (
+            'data: {"jsonrpc": "2.0", "method": "notifications/progress", "params": {}}\n\n'
+            "data: " + json.dumps({
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "result": {"tools": [{"name": "echo", "inputSchema": {"type": "object"}}]},
+            }) + "\n\n"
+        )
+        return httpx.Response(200, text=events, headers={"Content-Type": "text/event-stream"})
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_http_connector_tracks_session_and_parses_event_stream():
+    import httpx
+    from sage_mcp.runtime.http_connector import StreamableHTTPMCPConnector
+
+    log = []
+    client = httpx.AsyncClient(transport=_http_mcp_transport(log))
+    connector = StreamableHTTPMCPConnector(
+        runtime_type="external_http",
+        url="http://mcp.internal/mcp",
+        headers={"X-Api-Key": "k"},
+    )
+
+    with patch("sage_mcp.runtime.http_connector.get_http_client", return_value=client):
+        await connector.start_process("tenant-1", "connector-1", oauth_token="tok")
+        result = await connector._send_request("tools/list", {})
+        await connector.stop_process()
+
+    assert result["tools"][0]["name"] == "echo"
+    assert [r.method for r in log] == ["POST", "POST", "POST", "DELETE"]
+    assert "mcp-session-id" not in log[0].headers
+    for request in log[1:]:
+        assert request.headers["mcp-session-id"] == "session-1"
+        assert request.headers["mcp-protocol-version"] == "2025-03-26"
+    assert log[0].headers["authorization"] == "Bearer tok"
+    assert log[0].headers["x-api-key"] == "k"
+    assert "text/event-stream" in log[0].headers["accept"]
+    assert connector.is_running is False
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_http_connector_timeout_posts_cancel_notification():
+    import httpx
+    from sage_mcp.runtime.http_connector import StreamableHTTPMCPConnector
+
+    log = []
+    client = httpx.AsyncClient(transport=_http_mcp_transport(log, tools_delay=1.0))
+    connector = StreamableHTTPMCPConnector(
+        runtime_type="external_http", url="http://mcp.internal/mcp"
+    )
+
+    with patch("sage_mcp.runtime.http_connector.get_http_client", return_value=client):
+        await connector.start_process("tenant-1", "connector-1")
+        with pytest.raises(Exception, match="MCP request timeout: tools/list"):
+            await connector._send_request("tools/list", {}, timeout=0.05)
+        await asyncio.sleep(0.01)
+        await connector.stop_process()
+
+    cancels = [
+        json.loads(r.content) for r in log
+        if r.method == "POST" and json.loads(r.content).get("method") == "notifications/cancelled"
+    ]
+    assert cancels and cancels[0]["params"]["requestId"] == "2"
+    assert connector._post_tasks == {}
+    await client.aclose()
+
+
+def test_process_manager_parses_http_endpoint_urls():
+    parse = MCPProcessManager._parse_http_url
+
+    assert parse("https://mcp.internal/mcp") == "https://mcp.internal/mcp"
+    assert parse('"http://sidecar:8080/mcp"') == "http://sidecar:8080/mcp"
+    assert parse('["http://sidecar:8080/mcp"]') == "http://sidecar:8080/mcp"
+    with pytest.raises(Exception, match="endpoint URL"):
+        parse('["npx", "server"]')
+    with pytest.raises(Exception, match="endpoint URL"):
+        parse(None)
@@ -7,6 +7,8 @@ Verifies:
 - paginate_connection yields nodes across single and multiple pages.
 - collect_connection respects max_items.
 - The shared HTTP client and retry_with_backoff are used internally.
+- Independent queries are merged into one aliased document and split back.
+- Persisted-query hashes are sent first and fall back to the full text.
 
 Note: get_http_client and retry_with_backoff are lazily imported inside
 GraphQLClient.execute(), so we patch them at their source modules:
@@ -14,10 +16,17 @@ GraphQLClient.execute(), so we patch them at their source modules:
   - sage_mcp.connectors.retry.asyncio.sleep (to prevent actual delays)
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from sage_mcp.connectors.graphql import GraphQLClient
+from sage_mcp.connectors.graphql import (
+    GraphQLClient,
+    alias_query,
+    merge_queries,
+    split_merged_response,
+)
 from sage_mcp.connectors.exceptions import ConnectorAPIError
 
 
@@ -389,3 +398,171 @@ class TestGraphQLClientCollectConnection:
 
         assert len(items) == 2
         assert items == [{"id": "1"}, {"id": "2"}]
+
+
+# ---------------------------------------------------------------------------
+# Query merging
+# ---------------------------------------------------------------------------
+
+_ISSUE_QUERY = """
+query GetIssue($id: String!) {
+  issue(id: $id) { id title }
+}
+"""
+
+
+class TestQueryMerging:
+    """Tests for alias_query / merge_queries / split_merged_response."""
+
+    async def test_merge_aliases_fields_and_renames_variables(self):
+        query, variables = merge_queries([
+            (_ISSUE_QUERY, {"id": "a"}),
+            ('{ viewer { id } me: user(id: "$x") @include(if: true) { id } }', None),
+        ])
+
+        assert query.startswith("query Merged($q0_id: String!)")
+        assert "q0_issue: issue(id: $q0_id)" in query
+        assert "q1_viewer: viewer" in query
+        # Existing aliases are prefixed; string contents are left alone.
+        assert 'q1_me: user(id: "$x")' in query
+        assert variables == {"q0_id": "a"}
+
+    async def test_mutations_and_fragments_are_not_merged(self):
+        assert alias_query("mutation M { issueArchive(id: 1) { success } }", "q0_") is None
+        assert alias_query("query { ...F } fragment F on Query { viewer { id } }", "q0_") is None
+        assert merge_queries([(_ISSUE_QUERY, None), ("mutation { a }", None)]) is None
+
+    async def test_split_routes_data_and_errors_to_their_query(self):
+        body = {
+            "data": {"q0_issue": {"id": "a"}, "q1_issue": None},
+            "errors": [{"message": "Entity not found", "path": ["q1_issue"]}],
+        }
+
+        (data0, errors0), (data1, errors1) = split_merged_response(body, 2)
+
+        assert data0 == {"issue": {"id": "a"}} and errors0 == []
+        assert data1 == {"issue": None}
+        assert errors1 == [{"message": "Entity not found", "path": ["issue"]}]
+
+    async def test_split_marks_queries_a_null_document_hides_as_unknown(self):
+        body = {"data": None, "errors": [{"message": "Entity not found", "path": ["q1_issue"]}]}
+
+        results = split_merged_response(body, 3)
+
+        assert results[0] is None and results[2] is None
+        assert results[1][1] == [{"message": "Entity not found", "path": ["issue"]}]
+
+    async def test_split_keeps_complete_queries_despite_unattributed_errors(self):
+        body = {
+            "data": {"q0_issue": {"id": "a"}, "q1_issue": None},
+            "errors": [{"message": "Internal error"}],
+        }
+
+        (data0, errors0), unknown = split_merged_response(body, 2)
+
+        assert data0 == {"issue": {"id": "a"}} and errors0 == []
+        assert unknown is None
+
+
+class TestGraphQLClientExecuteMany:
+    """Tests for GraphQLClient.execute_many() and implicit merging."""
+
+    @patch("sage_mcp.connectors.http_client.get_http_client")
+    async def test_execute_many_sends_one_merged_request(self, mock_get_client):
+        mock_client = AsyncMock()
+        mock_client.post.return_value = _make_response({
+            "data": {"q0_issue": {"id": "a"}, "q1_issue": None},
+            "errors": [{"message": "Entity not found", "path": ["q1_issue", "id"]}],
+        })
+        mock_get_client.return_value = mock_client
+
+        client = GraphQLClient(endpoint="https://api.example.com/graphql", auth_value="Bearer t")
+        results = await client.execute_many(
+            [(_ISSUE_QUERY, {"id": "a"}), (_ISSUE_QUERY, {"id": "b"})],
+            return_exceptions=True,
+        )
+
+        mock_client.post.assert_awaited_once()
+        payload = mock_client.post.call_args.kwargs["json"]
+        assert payload["variables"] == {"q0_id": "a", "q1_id": "b"}
+        assert results[0] == {"issue": {"id": "a"}}
+        assert isinstance(results[1], ConnectorAPIError)
+
+        with pytest.raises(ConnectorAPIError):
+            await client.execute_many([(_ISSUE_QUERY, {"id": "a"}), (_ISSUE_QUERY, {"id": "b"})])
+
+    @patch("sage_mcp.connectors.http_client.get_http_client")
+    async def test_concurrent_executes_merge_within_window(self, mock_get_client):
+        mock_client = AsyncMock()
+        mock_client.post.return_value = _make_response({
+            "data": {"q0_issue": {"id": "a"}, "q1_issue": {"id": "b"}},
+        })
+        mock_get_client.return_value = mock_client
+
+        client = GraphQLClient(endpoint="https://api.example.com/graphql", auth_value="Bearer t")
+        with patch("sage_mcp.connectors.graphql._batch_settings", return_value=(0.005, 10)):
+            first, second = await asyncio.gather(
+                client.execute(_ISSUE_QUERY, {"id": "a"}),
+                client.execute(_ISSUE_QUERY, {"id": "b"}),
+            )
+
+        mock_client.post.assert_awaited_once()
+        assert first == {"issue": {"id": "a"}}
+        assert second == {"issue": {"id": "b"}}
+
+
+# ---------------------------------------------------------------------------
+# Persisted queries
+# ---------------------------------------------------------------------------
+
+class TestGraphQLClientPersistedQueries:
+    """Tests for automatic persisted queries."""
+
+    @patch("sage_mcp.connectors.http_client.get_http_client")
+    async def test_hash_only_then_full_text_on_not_found(self, mock_get_client):
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = [
+            _make_response({"errors": [{"message": "PersistedQueryNotFound"}]}),
+            _make_response({"data": {"viewer": {"id": "1"}}}),
+            _make_response({"data": {"viewer": {"id": "1"}}}),
+        ]
+        mock_get_client.return_value = mock_client
+
+        client = GraphQLClient(
+            endpoint="https://apq.example.com/graphql",
+            auth_value="Bearer t",
+            persisted_queries=True,
+        )
+        assert await client.execute("{ viewer { id } }") == {"viewer": {"id": "1"}}
+        assert await client.execute("{ viewer { id } }") == {"viewer": {"id": "1"}}
+
+        payloads = [c.kwargs["json"] for c in mock_client.post.call_args_list]
+        assert "query" not in payloads[0]
+        assert len(payloads[0]["extensions"]["persistedQuery"]["sha256Hash"]) == 64
+        # The fallback registers the hash together with the full text.
+        assert payloads[1]["query"] == "{ viewer { id } }"
+        assert payloads[1]["extensions"] == payloads[0]["extensions"]
+        assert "query" not in payloads[2]
+
+    @patch("sage_mcp.connectors.http_client.get_http_client")
+    async def test_unsupported_server_stops_sending_hashes(self, mock_get_client):
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = [
+            _make_response({"errors": [{"message": "x", "extensions": {"code": "PERSISTED_QUERY_NOT_SUPPORTED"}}]}),
+            _make_response({"data": {"viewer": {"id": "1"}}}),
+            _make_response({"data": {"viewer": {"id": "1"}}}),
+        ]
+        mock_get_client.return_value = mock_client
+
+        client = GraphQLClient(
+            endpoint="https://no-apq.example.com/graphql",
+            auth_value="Bearer t",
+            persisted_queries=True,
+        )
+        with patch("sage_mcp.connectors.graphql._apq_unsupported", set()):
+            await client.execute("{ viewer { id } }")
+            await client.execute("{ viewer { id } }")
+
+        payloads = [c.kwargs["json"] for c in mock_client.post.call_args_list]
+        assert [("query" in p) for p in payloads] == [False, True, True]
+        assert "extensions" not in payloads[2]
@@ -0,0 +1,99 @@
+"""Tests for the shared connector HTTP client's per-host connection pools."""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from sage_mcp.connectors.http_client import PerHostTransport
+
+
+class _RecordingTransport(PerHostTransport):
+    """PerHostTransport whose pools answer locally instead of opening sockets."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.created = {}
+
+    def _create_pool(self, host, limit):
+        self.created[host] = {"limit": limit, "http2": self._uses_http2(host)}
+        return httpx.MockTransport(lambda request: httpx.Response(200, text=host))
+
+
+@pytest.mark.asyncio
+async def test_requests_are_routed_to_one_pool_per_host():
+    transport = _RecordingTransport(max_connections=10)
+    async with httpx.AsyncClient(transport=transport) as client:
+        await client.get("https://api.github.com/user")
+        await client.get("https://api.github.com/repos")
+        response = await client.get("https://slack.com/api/auth.test")
+
+    assert response.text == "slack.com"
+    assert set(transport.created) == {"api.github.com", "slack.com"}
+
+
+def test_host_limits_match_subdomains_and_prefer_longest_pattern():
+    transport = PerHostTransport(
+        max_connections=50,
+        host_limits={"github.com": 10, "api.github.com": 100},
+    )
+
+    assert transport._max_connections_for("api.github.com") == 100
+    assert transport._max_connections_for("uploads.github.com") == 10
+    assert transport._max_connections_for("notgithub.com") == 50
+
+
+@pytest.mark.asyncio
+async def test_http2_is_enabled_only_for_listed_hosts():
+    transport = _RecordingTransport(http2_hosts=["googleapis.com"])
+    transport._http2_available = True
+    async with httpx.AsyncClient(transport=transport) as client:
+        await client.get("https://sheets.googleapis.com/v4/spreadsheets/x")
+        await client.get("https://api.notion.com/v1/users")
+
+    assert transport.created["sheets.googleapis.com"]["http2"] is True
+    assert transport.created["api.notion.com"]["http2"] is False
+
+
+@pytest.mark.asyncio
+async def test_in_flight_is_held_until_response_is_closed_and_saturation_counted():
+    transport = _RecordingTransport(max_connections=1)
+    with patch("sage_mcp.connectors.http_client.record_http_pool_saturated") as saturated:
+        async with httpx.AsyncClient(transport=transport) as client:
+            first = await client.send(client.build_request("GET", "https://slack.com/a"), stream=True)
+            assert transport.get_pool_stats()["slack.com"] == {"in_flight": 1, "max_connections": 1}
+            saturated.assert_not_called()
+
+            second = await client.send(client.build_request("GET", "https://slack.com/b"), stream=True)
+            assert transport.get_pool_stats()["slack.com"]["in_flight"] == 2
+            saturated.assert_called_once_with("slack.com")
+
+            await first.aclose()
+            await second.aclose()
+            assert transport.get_pool_stats()["slack.com"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_idle_pool_is_closed_past_max_hosts():
+    transport = _RecordingTransport(max_hosts=2)
+    async with httpx.AsyncClient(transport=transport) as client:
+        busy = await client.send(client.build_request("GET", "https://a.example/x"), stream=True)
+        await client.get("https://b.example/x")
+        transport._pools["b.example"].aclose = close_b = AsyncMock()
+
+        await client.get("https://c.example/x")
+        # a.example is older but still has a response open, so b.example goes.
+        assert list(transport._pools) == ["a.example", "c.example"]
+        close_b.assert_awaited_once()
+        assert "b.example" not in transport.get_pool_stats()
+        await busy.aclose()
+
+
+def test_hosts_outside_known_providers_share_one_metric_label():
+    from sage_mcp.observability.metrics import upstream_host_label
+
+    assert upstream_host_label("api.github.com") == "api.github.com"
+    assert upstream_host_label("sheets.googleapis.com:443") == "sheets.googleapis.com"
+    assert upstream_host_label("jira.acme.internal") == "other"
+    assert upstream_host_label("tenant-1234.example.com:8443") == "other"
+    assert upstream_host_label("github") == "github"
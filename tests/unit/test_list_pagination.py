@@ -0,0 +1,184 @@
+"""Tests for keyset pagination of the list endpoints."""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from sage_mcp.api.admin import list_connectors, list_tenants
+from sage_mcp.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from sage_mcp.api.registry import list_registry_servers
+from sage_mcp.database.migrations import upgrade_add_list_indexes
+from sage_mcp.models.base import Base
+from sage_mcp.models.connector import Connector, ConnectorType
+from sage_mcp.models.mcp_server_registry import MCPServerRegistry, RuntimeType, SourceType
+from sage_mcp.models.tenant import Tenant
+from sage_mcp.security.tenant_directory import TenantInfo
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session(engine):
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        yield session
+
+
+async def _registry(session, popularity):
+    for i, (stars, downloads) in enumerate(popularity):
+        session.add(MCPServerRegistry(
+            name=f"server-{i}",
+            description="search me" if i % 2 else None,
+            source_type=SourceType.NPM,
+            source_url=f"https://example.com/{i}",
+            runtime_type=RuntimeType.NODEJS,
+            star_count=stars,
+            download_count=downloads,
+        ))
+    await session.commit()
+
+
+async def _servers(session, limit, cursor=None, search=None, offset=0):
+    response = Response()
+    servers = await list_registry_servers(
+        response, search=search, runtime_type=None, source_type=None, requires_oauth=None,
+        verified_only=False, limit=limit, cursor=cursor, offset=offset, db=session,
+    )
+    return [s.name for s in servers], response.headers.get(NEXT_CURSOR_HEADER)
+
+
+async def _all_pages(fetch):
+    names, cursor = await fetch(None)
+    while cursor:
+        page, cursor = await fetch(cursor)
+        names += page
+    return names
+
+
+class TestCursor:
+    """Test cursor encoding."""
+
+    def test_round_trip(self):
+        key = uuid.uuid4()
+        columns = (MCPServerRegistry.star_count, MCPServerRegistry.id)
+        assert decode_cursor(encode_cursor([5, key]), columns) == [5, key]
+
+    @pytest.mark.parametrize("cursor", ["not base64!", encode_cursor([5]), encode_cursor([True, "x"]),
+                                        encode_cursor([5, "not-a-uuid"])])
+    def test_malformed_cursor_is_400(self, cursor):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(cursor, (MCPServerRegistry.star_count, MCPServerRegistry.id))
+        assert exc.value.status_code == 400
+
+
+class TestRegistryPagination:
+    """Test paging through the registry in popularity order."""
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_every_server_once_in_popularity_order(self, session):
+        await _registry(session, [(5, 1), (9, 0), (5, 1), (5, 3), (0, 0), (9, 0), (1, 1)])
+
+        everything, cursor = await _servers(session, limit=100)
+        paged = await _all_pages(lambda cursor: _servers(session, limit=2, cursor=cursor))
+
+        assert cursor is None
+        assert paged == everything
+        assert len(set(paged)) == 7
+        assert everything[:2] in (["server-1", "server-5"], ["server-5", "server-1"])
+        assert everything[2] == "server-3"
+        assert everything[-1] == "server-4"
+
+    @pytest.mark.asyncio
+    async def test_search_with_cursor(self, session):
+        await _registry(session, [(i, 0) for i in range(6)])
+
+        paged = await _all_pages(lambda cursor: _servers(session, limit=2, cursor=cursor, search="search"))
+
+        assert paged == ["server-5", "server-3", "server-1"]
+
+    @pytest.mark.asyncio
+    async def test_offset_still_works_without_cursor(self, session):
+        await _registry(session, [(i, 0) for i in range(4)])
+
+        names, _ = await _servers(session, limit=2, offset=1)
+
+        assert names == ["server-2", "server-1"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_400(self, session):
+        with pytest.raises(HTTPException) as exc:
+            await _servers(session, limit=2, cursor="garbage")
+        assert exc.value.status_code == 400
+
+
+class TestAdminPagination:
+    """Test paging through tenants and connectors."""
+
+    @pytest.mark.asyncio
+    async def test_tenants_by_slug(self, session):
+        session.add_all([Tenant(slug=slug, name=slug) for slug in ("c", "a", "d", "b", "e")])
+        await session.commit()
+
+        async def fetch(cursor):
+            response = Response()
+            tenants = await list_tenants(response, limit=2, cursor=cursor, session=session)
+            return [t.slug for t in tenants], response.headers.get(NEXT_CURSOR_HEADER)
+
+        assert await _all_pages(fetch) == ["a", "b", "c", "d", "e"]
+
+        response = Response()
+        unpaged = await list_tenants(response, limit=None, cursor=None, session=session)
+        assert [t.slug for t in unpaged] == ["a", "b", "c", "d", "e"]
+        assert NEXT_CURSOR_HEADER not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_connectors_by_name_with_duplicate_names(self, session):
+        tenant = Tenant(slug="acme", name="Acme")
+        session.add(tenant)
+        await session.flush()
+        for name in ("beta", "alpha", "beta", "beta", "gamma"):
+            session.add(Connector(tenant_id=tenant.id, connector_type=ConnectorType.GITHUB, name=name))
+        await session.commit()
+        info = TenantInfo(id=tenant.id, slug="acme", is_active=True)
+
+        async def fetch(cursor):
+            response = Response()
+            connectors = await list_connectors(
+                "acme", response, limit=2, cursor=cursor, tenant=info, session=session
+            )
+            return [c.id for c in connectors], response.headers.get(NEXT_CURSOR_HEADER)
+
+        everything = await list_connectors(
+            "acme", Response(), limit=None, cursor=None, tenant=info, session=session
+        )
+        assert [c.name for c in everything] == ["alpha", "beta", "beta", "beta", "gamma"]
+        assert await _all_pages(fetch) == [c.id for c in everything]
+
+
+@pytest.mark.asyncio
+async def test_index_migration_is_idempotent(engine):
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_mcp_server_registry_popularity"))
+
+    await upgrade_add_list_indexes(engine)
+    await upgrade_add_list_indexes(engine)
+
+    async with engine.connect() as conn:
+        names = set((await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))).scalars())
+    assert {"ix_mcp_server_registry_popularity", "ix_connectors_tenant_name"} <= names
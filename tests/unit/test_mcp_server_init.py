@@ -0,0 +1,135 @@
+"""Tests for MCPServer.initialize loading everything in one query."""
+
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from sage_mcp.mcp.server import MCPServer
+from sage_mcp.models.base import Base
+from sage_mcp.models.connector import Connector, ConnectorType
+from sage_mcp.models.connector_tool_state import ConnectorToolState
+from sage_mcp.models.tenant import Tenant
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    """In-memory database wired into the server; yields (factory, executed statements)."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    @asynccontextmanager
+    async def db_context(workload="primary"):
+        async with factory() as session:
+            yield session
+
+    monkeypatch.setattr("sage_mcp.mcp.server.get_db_context", db_context)
+    yield factory, statements
+    await engine.dispose()
+
+
+async def _seed(factory, tool_states=None, tenant_active=True, connector_enabled=True):
+    async with factory() as session:
+        tenant = Tenant(slug=f"t-{uuid.uuid4().hex[:8]}", name="Tenant", is_active=tenant_active)
+        session.add(tenant)
+        await session.flush()
+        connector = Connector(
+            tenant_id=tenant.id,
+            connector_type=ConnectorType.GITHUB,
+            name="GitHub",
+            is_enabled=connector_enabled,
+        )
+        session.add(connector)
+        await session.flush()
+        for name, enabled in (tool_states or {}).items():
+            session.add(ConnectorToolState(connector_id=connector.id, tool_name=name, is_enabled=enabled))
+        await session.commit()
+        return tenant, connector
+
+
+@pytest.mark.asyncio
+async def test_initialize_loads_tenant_connector_and_tool_states_in_one_query(db):
+    factory, statements = db
+    tenant, connector = await _seed(factory, {"github_list_repos": True, "github_delete_repo": False})
+    statements.clear()
+
+    server = MCPServer(tenant.slug, str(connector.id))
+    assert await server.initialize() is True
+
+    assert len(statements) == 1
+    assert server.tenant.id == tenant.id
+    assert server.tenant_id == str(tenant.id)
+    assert server.connectors == [server.connector]
+    assert server.connector.id == connector.id
+    assert server._tool_states_cache == {"github_list_repos": True, "github_delete_repo": False}
+
+
+@pytest.mark.asyncio
+async def test_initialize_without_tool_states_caches_empty_dict(db):
+    factory, statements = db
+    tenant, connector = await _seed(factory)
+    statements.clear()
+
+    server = MCPServer(tenant.slug, str(connector.id))
+    assert await server.initialize() is True
+    assert len(statements) == 1
+    assert server._tool_states_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_initialize_uses_tenant_id_resolved_upstream(db):
+    factory, statements = db
+    tenant, connector = await _seed(factory, {"github_list_repos": True})
+    statements.clear()
+
+    server = MCPServer("ignored-slug", str(connector.id), tenant_id=str(tenant.id))
+    assert await server.initialize() is True
+    assert len(statements) == 1
+    assert server.tenant.slug == tenant.slug
+
+
+@pytest.mark.asyncio
+async def test_initialize_rejects_connector_of_another_tenant(db):
+    factory, _ = db
+    tenant, _ = await _seed(factory)
+    _, foreign_connector = await _seed(factory)
+
+    server = MCPServer(tenant.slug, str(foreign_connector.id))
+    assert await server.initialize() is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tenant_active, connector_enabled", [(False, True), (True, False)])
+async def test_initialize_rejects_inactive_tenant_or_disabled_connector(db, tenant_active, connector_enabled):
+    factory, _ = db
+    tenant, connector = await _seed(factory, tenant_active=tenant_active, connector_enabled=connector_enabled)
+
+    server = MCPServer(tenant.slug, str(connector.id))
+    assert await server.initialize() is False
+
+
+@pytest.mark.asyncio
+async def test_initialize_with_invalid_connector_id_skips_the_database(db):
+    factory, statements = db
+    tenant, _ = await _seed(factory)
+    statements.clear()
+
+    server = MCPServer(tenant.slug, "not-a-uuid")
+    assert await server.initialize() is False
+    assert statements == []
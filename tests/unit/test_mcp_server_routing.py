@@ -1,11 +1,14 @@
 """Unit tests for MCPServer tool/resource routing behavior."""
 
+import uuid
 from types import SimpleNamespace
 
+import pytest
 from pydantic import AnyUrl, TypeAdapter
 
 from sage_mcp.mcp.server import MCPServer
 from sage_mcp.models.connector import ConnectorRuntimeType
+from sage_mcp.observability.usage import UNKNOWN_TOOL
 
 
 def _connector(connector_type: str, runtime_type: ConnectorRuntimeType, is_enabled: bool = True):
@@ -81,3 +84,31 @@ def test_resolve_resource_target_accepts_anyurl_for_external_connector():
 
     assert resolved_conn is conn
     assert resource_arg == "hass://entities"
+
+
+@pytest.mark.asyncio
+async def test_usage_tool_name_buckets_tools_the_connector_does_not_have(monkeypatch):
+    from sage_mcp.connectors.registry import connector_registry
+    from sage_mcp.models.connector import ConnectorType
+
+    server = MCPServer("tenant-a", "connector-a")
+    conn = _connector("github", ConnectorRuntimeType.NATIVE)
+    conn.connector_type = ConnectorType.GITHUB
+    conn.id = uuid.uuid4()
+    server.connectors = [conn]
+
+    async def no_fetch(*args, **kwargs):
+        raise AssertionError("tool list fetched on the call path")
+
+    monkeypatch.setattr(server, "_get_connector_tools", no_fetch)
+    monkeypatch.setattr(server, "_get_oauth_credential", no_fetch)
+    monkeypatch.setattr(connector_registry, "get_connector_for_config", no_fetch)
+
+    assert await server._usage_tool_name(conn, "github_list_repositories", "list_repositories") == "list_repositories"
+    assert await server._usage_tool_name(conn, "github_" + "x" * 5000, "x" * 5000) == UNKNOWN_TOOL
+
+    external = _connector("custom", ConnectorRuntimeType.EXTERNAL_NODEJS)
+    external.id = uuid.uuid4()
+    assert await server._usage_tool_name(external, "list_workflows", "list_workflows") == UNKNOWN_TOOL
+    server._tool_names[external.id] = frozenset({"list_workflows"})
+    assert await server._usage_tool_name(external, "list_workflows", "list_workflows") == "list_workflows"
@@ -1,111 +1,291 @@
-"""Unit tests for in-memory tool-usage counters and DB flush behavior."""
+"""Unit tests for write-behind tool usage aggregation."""
 
-from types import SimpleNamespace
-from unittest.mock import AsyncMock, Mock
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
 
 import pytest
-
-from sage_mcp.observability import metrics
-
-
-class _FakeResult:
-    def __init__(self, value):
-        self._value = value
-
-    def scalar(self):
-        return self._value
-
-
-class _ExecResult:
-    def __init__(self, rowcount: int):
-        self.rowcount = rowcount
-
-
-class _Ctx:
-    def __init__(self, *, scalar_value=None, exec_side_effect=None, commit_side_effect=None):
-        self.execute = AsyncMock(side_effect=exec_side_effect or [])
-        self.commit = AsyncMock(side_effect=commit_side_effect or [None])
-        self.rollback = AsyncMock()
-        self.add = Mock()
-        self._scalar_value = scalar_value
-
-    async def __aenter__(self):
-        if self._scalar_value is not None:
-            self.execute = AsyncMock(return_value=_FakeResult(self._scalar_value))
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-
-def _reset_metric_globals():
-    metrics._tool_calls_day = None
-    metrics._tool_calls_today_count = 0
-    metrics._tool_calls_flushed_count = 0
-
-
-@pytest.mark.asyncio
-async def test_bootstrap_tool_calls_today_from_db(monkeypatch):
-    _reset_metric_globals()
-    monkeypatch.setattr(
-        "sage_mcp.database.connection.get_db_context",
-        lambda: _Ctx(scalar_value=11),
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.exc import DataError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from sage_mcp.models.base import Base
+from sage_mcp.models.tool_usage import ToolUsage
+from sage_mcp.observability import metrics, usage
+from sage_mcp.observability.usage import OTHER_TOOL, UsageAggregator, query_usage
+
+TENANT_A = uuid.uuid4()
+TENANT_B = uuid.uuid4()
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    """In-memory database behind get_db_context; yields (factory, executed statements)."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
     )
-
-    loaded = await metrics.bootstrap_tool_calls_today_from_db()
-
-    assert loaded == 11
-    assert metrics.get_tool_calls_today() == 11
-    assert metrics._tool_calls_flushed_count == 11
-
-
-@pytest.mark.asyncio
-async def test_flush_tool_calls_today_to_db_persists_delta(monkeypatch):
-    _reset_metric_globals()
-    metrics._tool_calls_day = metrics.datetime.now(metrics.timezone.utc).date()
-    metrics._tool_calls_today_count = 10
-    metrics._tool_calls_flushed_count = 7
-
-    ctx = _Ctx(exec_side_effect=[_ExecResult(rowcount=1)], commit_side_effect=[None])
-    monkeypatch.setattr("sage_mcp.database.connection.get_db_context", lambda: ctx)
-
-    flushed = await metrics.flush_tool_calls_today_to_db()
-
-    assert flushed == 3
-    assert metrics._tool_calls_flushed_count == 10
-    assert ctx.execute.await_count == 1
-    assert ctx.commit.await_count == 1
-
-
-@pytest.mark.asyncio
-async def test_flush_tool_calls_today_retries_on_integrity_error(monkeypatch):
-    _reset_metric_globals()
-    metrics._tool_calls_day = metrics.datetime.now(metrics.timezone.utc).date()
-    metrics._tool_calls_today_count = 5
-    metrics._tool_calls_flushed_count = 0
-
-    ctx = _Ctx(
-        exec_side_effect=[_ExecResult(rowcount=0), _ExecResult(rowcount=1)],
-        commit_side_effect=[None, Exception("boom")],
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
     )
 
-    class _IntegrityError(Exception):
-        pass
-
-    ctx.commit = AsyncMock(side_effect=[_IntegrityError("race"), None])
-    monkeypatch.setattr("sage_mcp.database.connection.get_db_context", lambda: ctx)
-    monkeypatch.setattr("sage_mcp.observability.metrics.IntegrityError", _IntegrityError, raising=False)
-
-    # Monkeypatch module import target used inside function.
-    import sqlalchemy.exc  # type: ignore
-
-    monkeypatch.setattr(sqlalchemy.exc, "IntegrityError", _IntegrityError)
-
-    flushed = await metrics.flush_tool_calls_today_to_db()
-
-    assert flushed == 5
-    assert ctx.add.call_count == 1
-    assert ctx.rollback.await_count == 1
-    assert ctx.execute.await_count == 2
-    assert ctx.commit.await_count == 2
-    assert metrics._tool_calls_flushed_count == 5
+    @asynccontextmanager
+    async def db_context(workload="primary"):
+        async with factory() as session:
+            yield session
+
+    monkeypatch.setattr("sage_mcp.database.connection.get_db_context", db_context)
+    yield factory, statements
+    await engine.dispose()
+
+
+async def _rows(factory):
+    async with factory() as session:
+        result = await session.execute(
+            select(ToolUsage.tenant_id, ToolUsage.tool_name, ToolUsage.call_count,
+                   ToolUsage.error_count, ToolUsage.duration_ms)
+        )
+        return {(row.tenant_id, row.tool_name): tuple(row[2:]) for row in result}
+
+
+class TestUsageAggregator:
+    """Test recording and flushing."""
+
+    def test_record_aggregates_by_key(self):
+        aggregator = UsageAggregator()
+        aggregator.record(TENANT_A, "github", "list_repos", "success", 0.1)
+        aggregator.record(TENANT_A, "github", "list_repos", "error", 0.2)
+        aggregator.record(TENANT_B, "github", "list_repos", "success", 0.1)
+
+        assert len(aggregator) == 2
+        assert aggregator.calls_today() == 3
+
+    def test_calls_without_tenant_only_count_towards_today(self):
+        aggregator = UsageAggregator()
+        aggregator.record(None, "github", "list_repos", "success", 0.1)
+
+        assert len(aggregator) == 0
+        assert aggregator.calls_today() == 1
+
+    def test_full_tenant_budget_folds_new_tools_and_requests_flush(self):
+        aggregator = UsageAggregator(max_keys_per_tenant=2)
+        aggregator.record(TENANT_A, "github", "a", "success", 0.0)
+        aggregator.record(TENANT_A, "github", "b", "success", 0.0)
+        aggregator.record(TENANT_A, "github", "c", "success", 0.0)
+        aggregator.record(TENANT_A, "github", "d", "success", 0.0)
+        aggregator.record(TENANT_A, "github", "a", "success", 0.0)
+
+        assert aggregator.flush_requested.is_set()
+        keys = {key[3]: counts[0] for key, counts in aggregator._pending.items()}
+        assert keys == {"a": 2, "b": 1, OTHER_TOOL: 2}
+
+    def test_tenant_budgets_are_independent(self):
+        aggregator = UsageAggregator(max_keys_per_tenant=2)
+        for tool in ("a", "b", "c", "d"):
+            aggregator.record(TENANT_A, "github", tool, "success", 0.0)
+        aggregator.record(TENANT_B, "github", "a", "success", 0.0)
+        aggregator.record(TENANT_B, "github", "b", "success", 0.0)
+
+        tenant_b_tools = {key[3] for key in aggregator._pending if key[1] == TENANT_B}
+        assert tenant_b_tools == {"a", "b"}
+
+    def test_global_limit_only_requests_an_early_flush(self):
+        aggregator = UsageAggregator(max_pending_keys=2)
+        for tool in ("a", "b", "c"):
+            aggregator.record(TENANT_A, "github", tool, "success", 0.0)
+
+        assert aggregator.flush_requested.is_set()
+        assert {key[3] for key in aggregator._pending} == {"a", "b", "c"}
+
+    def test_names_are_clamped_to_the_column_widths(self):
+        aggregator = UsageAggregator()
+        aggregator.record(TENANT_A, "c" * 80, "t" * 5000, "success", 0.0)
+
+        (key,) = aggregator._pending
+        assert len(key[2]) == ToolUsage.__table__.c.connector_type.type.length
+        assert len(key[3]) == ToolUsage.__table__.c.tool_name.type.length
+
+    @pytest.mark.asyncio
+    async def test_rejected_row_is_dropped_and_the_rest_written(self, db, monkeypatch):
+        """PostgreSQL rejects over-long VARCHARs (SQLite does not); one bad row must not block the batch."""
+        factory, _ = db
+        real_upsert = usage._upsert
+        attempts = []
+
+        async def postgres_upsert(batch):
+            attempts.append(len(batch))
+            for key in batch:
+                if key[3] == "poison":
+                    raise DataError("INSERT", {}, Exception("value too long for type character varying(200)"))
+            await real_upsert(batch)
+
+        monkeypatch.setattr(usage, "_upsert", postgres_upsert)
+        aggregator = UsageAggregator()
+        for tool in ("a", "b", "poison", "c", "d"):
+            aggregator.record(TENANT_A, "github", tool, "success", 0.0)
+
+        assert await aggregator.flush() == 4
+        assert len(aggregator) == 0
+        assert set(tool for _, tool in await _rows(factory)) == {"a", "b", "c", "d"}
+
+        attempts.clear()
+        aggregator.record(TENANT_A, "github", "a", "success", 0.0)
+        assert await aggregator.flush() == 1
+        assert attempts == [1]
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_after_partial_write_keeps_only_unwritten_rows(self, db, monkeypatch):
+        factory, _ = db
+        real_upsert = usage._upsert
+
+        async def upsert(batch):
+            if any(key[3] == "poison" for key in batch):
+                raise DataError("INSERT", {}, Exception("value too long"))
+            if any(key[3] == "d" for key in batch):
+                raise RuntimeError("connection reset")
+            await real_upsert(batch)
+
+        monkeypatch.setattr(usage, "_upsert", upsert)
+        aggregator = UsageAggregator()
+        for tool in ("a", "b", "poison", "d"):
+            aggregator.record(TENANT_A, "github", tool, "success", 0.0)
+
+        with pytest.raises(RuntimeError):
+            await aggregator.flush()
+
+        assert {key[3] for key in aggregator._pending} == {"d"}
+        assert set(tool for _, tool in await _rows(factory)) == {"a", "b"}
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_one_upsert_and_adds_to_existing_rows(self, db):
+        factory, statements = db
+        aggregator = UsageAggregator()
+        for _ in range(3):
+            aggregator.record(TENANT_A, "github", "list_repos", "success", 0.25)
+        aggregator.record(TENANT_A, "github", "get_repo", "error", 0.5)
+        aggregator.record(TENANT_B, "slack", "post", "success", 0.1)
+
+        statements.clear()
+        assert await aggregator.flush() == 3
+        inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+        assert len(inserts) == 1
+        assert len(aggregator) == 0
+
+        aggregator.record(TENANT_A, "github", "list_repos", "error", 0.25)
+        await aggregator.flush()
+
+        rows = await _rows(factory)
+        assert rows[(TENANT_A, "list_repos")] == (4, 1, 1000)
+        assert rows[(TENANT_A, "get_repo")] == (1, 1, 500)
+        assert rows[(TENANT_B, "post")] == (1, 0, 100)
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_counts(self, monkeypatch):
+        aggregator = UsageAggregator()
+        aggregator.record(TENANT_A, "github", "list_repos", "success", 0.1)
+
+        async def failing_upsert(batch):
+            aggregator.record(TENANT_A, "github", "list_repos", "success", 0.1)
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(usage, "_upsert", failing_upsert)
+        with pytest.raises(RuntimeError):
+            await aggregator.flush()
+
+        assert [counts[0] for counts in aggregator._pending.values()] == [2]
+
+    @pytest.mark.asyncio
+    async def test_drain_retries_until_written(self, db, monkeypatch):
+        factory, _ = db
+        aggregator = UsageAggregator()
+        aggregator.record(TENANT_A, "github", "list_repos", "success", 0.1)
+
+        real_upsert = usage._upsert
+        attempts = []
+
+        async def flaky_upsert(batch):
+            attempts.append(len(batch))
+            if len(attempts) == 1:
+                raise RuntimeError("connection reset")
+            await real_upsert(batch)
+
+        async def no_sleep(seconds):
+            pass
+
+        monkeypatch.setattr(usage, "_upsert", flaky_upsert)
+        monkeypatch.setattr(usage.asyncio, "sleep", no_sleep)
+
+        assert await aggregator.drain() == 1
+        assert attempts == [1, 1]
+        assert (await _rows(factory))[(TENANT_A, "list_repos")][0] == 1
+
+
+class TestBootstrapAndMetrics:
+    """Test the daily total used by the admin dashboard."""
+
+    @pytest.mark.asyncio
+    async def test_bootstrap_seeds_today_from_persisted_rows(self, db):
+        factory, _ = db
+        aggregator = usage.get_usage_aggregator()
+        for _ in range(11):
+            aggregator.record(TENANT_A, "github", "list_repos", "success", 0.0)
+        await aggregator.flush()
+        aggregator.seed_today(0)
+
+        assert await usage.bootstrap_usage_from_db() == 11
+        assert metrics.get_tool_calls_today() == 11
+
+    def test_record_tool_call_feeds_the_aggregator(self):
+        metrics.record_tool_call("github", "list_repos", "success", 0.1, tenant_id=TENANT_A)
+
+        assert metrics.get_tool_calls_today() == 1
+        assert len(usage.get_usage_aggregator()) == 1
+
+
+class TestQueryUsage:
+    """Test reading the aggregates."""
+
+    @pytest.mark.asyncio
+    async def test_grouping_and_tenant_filter(self, db):
+        factory, _ = db
+        today = date.today()
+        async with factory() as session:
+            session.add_all([
+                ToolUsage(day=today, tenant_id=TENANT_A, connector_type="github", tool_name="list_repos",
+                          call_count=4, error_count=1, duration_ms=400),
+                ToolUsage(day=today, tenant_id=TENANT_A, connector_type="slack", tool_name="post",
+                          call_count=1, error_count=0, duration_ms=50),
+                ToolUsage(day=today - timedelta(days=1), tenant_id=TENANT_B, connector_type="github",
+                          tool_name="list_repos", call_count=2, error_count=0, duration_ms=100),
+                ToolUsage(day=today - timedelta(days=40), tenant_id=TENANT_A, connector_type="github",
+                          tool_name="list_repos", call_count=9, error_count=0, duration_ms=0),
+            ])
+            await session.commit()
+
+            start = today - timedelta(days=29)
+            by_connector = await query_usage(session, start, today, group_by=["connector"])
+            by_tool = await query_usage(session, start, today, tenant_id=TENANT_A, group_by=["tool"])
+            total = await query_usage(session, start, today, group_by=[])
+
+        assert by_connector == [
+            {"connector_type": "github", "calls": 6, "errors": 1, "avg_duration_ms": 83.3},
+            {"connector_type": "slack", "calls": 1, "errors": 0, "avg_duration_ms": 50.0},
+        ]
+        assert [(r["tool_name"], r["calls"]) for r in by_tool] == [("list_repos", 4), ("post", 1)]
+        assert total == [{"calls": 7, "errors": 1, "avg_duration_ms": 78.6}]
+
+    @pytest.mark.asyncio
+    async def test_unknown_grouping_is_rejected(self, db):
+        factory, _ = db
+        async with factory() as session:
+            with pytest.raises(ValueError):
+                await query_usage(session, date.today(), date.today(), group_by=["region"])
@@ -0,0 +1,109 @@
+"""Tests for the versioned migration runner."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from sage_mcp.database.migrations import (
+    MIGRATIONS,
+    applied_versions,
+    pending_migrations,
+    run_migrations,
+    schema_migrations,
+)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    """Empty in-memory database; yields (engine, executed statements)."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    yield engine, statements
+    await engine.dispose()
+
+
+def _recording_steps(calls, fail_at=None):
+    def step(version):
+        async def migration(engine):
+            if version == fail_at:
+                raise RuntimeError(f"step {version} failed")
+            calls.append(version)
+        migration.__name__ = f"step_{version}"
+        return migration
+    return [(version, step(version)) for version in (1, 2, 3)]
+
+
+def test_versions_are_unique_and_ascending():
+    versions = [version for version, _ in MIGRATIONS]
+    assert versions == sorted(set(versions))
+
+
+def test_pending_migrations():
+    steps = _recording_steps([])
+    assert pending_migrations(None, steps) == steps
+    assert pending_migrations(set(), steps) == steps
+    assert [v for v, _ in pending_migrations({1, 3}, steps)] == [2]
+    assert pending_migrations({1, 2, 3, 4}, steps) == []
+
+
+@pytest.mark.asyncio
+async def test_fresh_database_applies_everything_in_order(engine):
+    engine, _ = engine
+    calls = []
+
+    assert await applied_versions(engine) is None
+    assert await run_migrations(engine, _recording_steps(calls)) == [1, 2, 3]
+
+    assert calls == [1, 2, 3]
+    assert await applied_versions(engine) == {1, 2, 3}
+    async with engine.connect() as conn:
+        names = (await conn.execute(select(schema_migrations.c.name))).scalars().all()
+    assert sorted(names) == ["step_1", "step_2", "step_3"]
+
+
+@pytest.mark.asyncio
+async def test_current_schema_costs_one_query(engine):
+    engine, statements = engine
+    calls = []
+    await run_migrations(engine, _recording_steps(calls))
+    calls.clear()
+    statements.clear()
+
+    assert await run_migrations(engine, _recording_steps(calls)) == []
+    assert calls == []
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_only_new_versions_run(engine):
+    engine, _ = engine
+    calls = []
+    await run_migrations(engine, _recording_steps(calls)[:2])
+    calls.clear()
+
+    assert await run_migrations(engine, _recording_steps(calls)) == [3]
+    assert calls == [3]
+
+
+@pytest.mark.asyncio
+async def test_failed_step_is_not_recorded_and_resumes(engine):
+    engine, _ = engine
+    calls = []
+
+    with pytest.raises(RuntimeError):
+        await run_migrations(engine, _recording_steps(calls, fail_at=2))
+    assert calls == [1]
+    assert await applied_versions(engine) == {1}
+
+    assert await run_migrations(engine, _recording_steps(calls)) == [2, 3]
+    assert calls == [1, 2, 3]
@@ -0,0 +1,195 @@
+"""Tests for proactive OAuth token refresh."""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from sage_mcp.api.oauth import OAUTH_PROVIDERS
+from sage_mcp.models.base import Base
+from sage_mcp.models.oauth_credential import OAuthCredential
+from sage_mcp.models.tenant import Tenant
+from sage_mcp.security import oauth_refresh
+from sage_mcp.security.oauth_refresh import OAuthTokenRefresher, ensure_fresh_credential
+
+TOKEN_URL = OAUTH_PROVIDERS["jira"]["token_url"]
+
+
+@pytest_asyncio.fixture
+async def sessions(monkeypatch):
+    """In-memory database wired into get_db_context."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    factory.workloads = []
+
+    @asynccontextmanager
+    async def db_context(workload="primary"):
+        factory.workloads.append(workload)
+        async with factory() as session:
+            yield session
+
+    monkeypatch.setattr("sage_mcp.database.connection.get_db_context", db_context)
+    monkeypatch.setitem(OAUTH_PROVIDERS["jira"], "client_id", "client-id")
+    monkeypatch.setitem(OAUTH_PROVIDERS["jira"], "client_secret", "client-secret")
+    yield factory
+    await engine.dispose()
+
+
+async def _add_credential(factory, expires_in: float, refresh_token="refresh-1") -> OAuthCredential:
+    async with factory() as session:
+        tenant = Tenant(slug=f"t-{uuid.uuid4().hex[:8]}", name="Tenant")
+        session.add(tenant)
+        await session.flush()
+        cred = OAuthCredential(
+            tenant_id=tenant.id,
+            provider="jira",
+            provider_user_id="acc-1",
+            access_token="access-1",
+            refresh_token=refresh_token,
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+            is_active=True,
+        )
+        session.add(cred)
+        await session.commit()
+        return cred
+
+
+def _token_client(*responses):
+    client = MagicMock()
+    client.post = AsyncMock(side_effect=[
+        httpx.Response(status, json=body, request=httpx.Request("POST", TOKEN_URL))
+        for status, body in responses
+    ])
+    return client
+
+
+@pytest.mark.asyncio
+async def test_refresh_due_rotates_tokens_of_expiring_credentials(sessions):
+    expiring = await _add_credential(sessions, expires_in=60)
+    await _add_credential(sessions, expires_in=7200)
+    client = _token_client(
+        (200, {"access_token": "access-2", "refresh_token": "refresh-2", "expires_in": 3600}),
+    )
+
+    with patch("sage_mcp.connectors.http_client.get_http_client", return_value=client):
+        assert await OAuthTokenRefresher(lead_seconds=300).refresh_due() == 1
+
+    call = client.post.await_args
+    assert call.args[0] == TOKEN_URL
+    assert call.kwargs["data"]["grant_type"] == "refresh_token"
+    assert call.kwargs["data"]["refresh_token"] == "refresh-1"
+    async with sessions() as session:
+        stored = await session.get(OAuthCredential, expiring.id)
+        assert stored.access_token == "access-2"
+        assert stored.refresh_token == "refresh-2"
+        assert oauth_refresh._as_utc(stored.expires_at) > datetime.now(timezone.utc) + timedelta(minutes=50)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_exchange(sessions):
+    cred = await _add_credential(sessions, expires_in=-10)
+    client = _token_client((200, {"access_token": "access-2", "expires_in": 3600}))
+    refresher = OAuthTokenRefresher()
+
+    with patch("sage_mcp.connectors.http_client.get_http_client", return_value=client):
+        results = await asyncio.gather(*(refresher.refresh(cred.id) for _ in range(3)))
+
+    assert client.post.await_count == 1
+    assert {r.access_token for r in results} == {"access-2"}
+
+
+@pytest.mark.asyncio
+async def test_revoked_grant_clears_refresh_token(sessions):
+    cred = await _add_credential(sessions, expires_in=60)
+    client = _token_client((400, {"error": "invalid_grant"}))
+
+    with patch("sage_mcp.connectors.http_client.get_http_client", return_value=client):
+        assert await OAuthTokenRefresher().refresh(cred.id) is None
+
+    async with sessions() as session:
+        stored = await session.get(OAuthCredential, cred.id)
+        assert stored.refresh_token is None
+        assert stored.access_token == "access-1"
+
+
+@pytest.mark.asyncio
+async def test_rejected_grant_keeps_a_token_rotated_during_the_exchange(sessions):
+    cred = await _add_credential(sessions, expires_in=60)
+
+    async def post(*args, **kwargs):
+        # Another replica spent refresh-1 first and stored its successor.
+        async with sessions() as other:
+            await other.execute(
+                update(OAuthCredential).where(OAuthCredential.id == cred.id).values(refresh_token="refresh-2")
+            )
+            await other.commit()
+        return httpx.Response(400, json={"error": "invalid_grant"}, request=httpx.Request("POST", TOKEN_URL))
+
+    client = MagicMock(post=AsyncMock(side_effect=post))
+    with patch("sage_mcp.connectors.http_client.get_http_client", return_value=client):
+        result = await OAuthTokenRefresher().refresh(cred.id)
+
+    assert result is not None and result.refresh_token == "refresh-2"
+    async with sessions() as session:
+        assert (await session.get(OAuthCredential, cred.id)).refresh_token == "refresh-2"
+
+
+@pytest.mark.asyncio
+async def test_refresh_locks_the_row_on_the_background_pool(sessions):
+    cred = await _add_credential(sessions, expires_in=60)
+    client = _token_client((200, {"access_token": "access-2", "expires_in": 3600}))
+    statements = []
+
+    def capture(state):
+        statements.append(str(state.statement.compile(dialect=postgresql.dialect())))
+
+    event.listen(Session, "do_orm_execute", capture)
+    try:
+        with patch("sage_mcp.connectors.http_client.get_http_client", return_value=client):
+            await OAuthTokenRefresher().refresh(cred.id)
+    finally:
+        event.remove(Session, "do_orm_execute", capture)
+
+    assert "primary" not in sessions.workloads
+    assert "FOR UPDATE SKIP LOCKED" in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_request_path_only_waits_for_lapsed_tokens(sessions, monkeypatch):
+    refresher = OAuthTokenRefresher(lead_seconds=300)
+    monkeypatch.setattr("sage_mcp.security.oauth_refresh._refresher", refresher)
+    gate = asyncio.Event()
+
+    async def post(*args, **kwargs):
+        await gate.wait()
+        return httpx.Response(200, json={"access_token": "access-2", "expires_in": 3600},
+                              request=httpx.Request("POST", TOKEN_URL))
+
+    client = MagicMock(post=AsyncMock(side_effect=post))
+    with patch("sage_mcp.connectors.http_client.get_http_client", return_value=client):
+        expiring = await _add_credential(sessions, expires_in=60)
+        # Not yet expired: returned at once, refreshed in the background.
+        assert (await ensure_fresh_credential(expiring)).access_token == "access-1"
+        gate.set()
+        await asyncio.gather(*refresher._background)
+        assert client.post.await_count == 1
+
+        lapsed = await _add_credential(sessions, expires_in=-5)
+        assert (await ensure_fresh_credential(lapsed)).access_token == "access-2"
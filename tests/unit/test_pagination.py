@@ -9,6 +9,8 @@ Verifies:
 - _parse_link_next correctly extracts the "next" URL from Link headers.
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
@@ -361,3 +363,87 @@ class TestParseLinkNext:
         """Handles rel='next' with single quotes."""
         header = "<https://example.com/p2>; rel='next'"
         assert _parse_link_next(header) == "https://example.com/p2"
+
+
+# ---------------------------------------------------------------------------
+# Prefetching
+# ---------------------------------------------------------------------------
+
+class TestPrefetch:
+    """Tests for concurrent page prefetch and early termination."""
+
+    async def test_offset_fetches_known_pages_concurrently_in_order(self):
+        in_flight = 0
+        peak = 0
+
+        async def fetch_page(params):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            page = params["page"]
+            # Later pages answer first; items must still come out in order.
+            await asyncio.sleep(0.01 * (6 - page))
+            in_flight -= 1
+            return make_response([{"page": page, "i": i} for i in range(2)])
+
+        items = [
+            item async for item in paginate_offset(
+                fetch_page, per_page=2, total_pages=5, prefetch=3
+            )
+        ]
+
+        assert [item["page"] for item in items] == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+        assert peak == 3
+
+    async def test_offset_reads_total_pages_header(self):
+        responses = {
+            1: make_response([{"id": 1}, {"id": 2}]),
+            2: make_response([{"id": 3}]),
+        }
+        responses[1].headers = {"X-Total-Pages": "2"}
+        fetch_page = AsyncMock(side_effect=lambda params: responses[params["page"]])
+
+        items = await collect_all_pages(paginate_offset(fetch_page, per_page=2))
+
+        assert [item["id"] for item in items] == [1, 2, 3]
+        assert fetch_page.await_count == 2
+
+    async def test_max_items_cancels_in_flight_pages(self):
+        started = []
+        cancelled = []
+
+        async def fetch_page(params):
+            started.append(params["page"])
+            if params["page"] > 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(params["page"])
+                    raise
+            return make_response([{"id": i} for i in range(10)])
+
+        items = await collect_all_pages(
+            paginate_offset(fetch_page, per_page=10, total_pages=4, prefetch=3),
+            max_items=5,
+        )
+        await asyncio.sleep(0)
+
+        assert len(items) == 5
+        assert sorted(cancelled) == sorted(p for p in started if p > 1)
+
+    async def test_cursor_overlaps_next_fetch_and_honours_max_items(self):
+        fetch_page = AsyncMock(side_effect=[
+            make_response({"items": [{"id": 1}, {"id": 2}], "next_cursor": "c2"}),
+            make_response({"items": [{"id": 3}, {"id": 4}], "next_cursor": "c3"}),
+            make_response({"items": [{"id": 5}], "next_cursor": None}),
+        ])
+
+        paginator = paginate_cursor(fetch_page, max_items=3)
+        first = await paginator.__anext__()
+        # Page 2 was requested before page 1's first item was consumed.
+        await asyncio.sleep(0)
+        assert fetch_page.await_count == 2
+
+        rest = [item async for item in paginator]
+        assert [first["id"]] + [item["id"] for item in rest] == [1, 2, 3]
+        assert fetch_page.await_count == 2
@@ -0,0 +1,104 @@
+"""Tests for the shared provider metadata resolver."""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from sage_mcp.connectors.confluence import ConfluenceConnector
+from sage_mcp.connectors.provider_metadata import ProviderMetadataResolver, get_atlassian_cloud_id
+
+
+def _cred(account="acc-1", token="tok", tenant=None, provider="jira"):
+    return MagicMock(
+        tenant_id=tenant or uuid.UUID(int=1),
+        provider=provider,
+        provider_user_id=account,
+        access_token=token,
+    )
+
+
+@pytest.mark.asyncio
+async def test_cached_per_account_not_per_token():
+    resolver = ProviderMetadataResolver()
+    fetch = AsyncMock(return_value="cloud-1")
+
+    assert await resolver.resolve("site", _cred(token="old"), fetch) == "cloud-1"
+    assert await resolver.resolve("site", _cred(token="refreshed"), fetch) == "cloud-1"
+    assert fetch.await_count == 1
+
+    await resolver.resolve("site", _cred(account="acc-2"), fetch)
+    await resolver.resolve("site", _cred(tenant=uuid.UUID(int=2)), fetch)
+    assert fetch.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_size_is_bounded():
+    resolver = ProviderMetadataResolver(ttl=60, max_entries=2)
+    fetch = AsyncMock(side_effect=lambda: "value")
+
+    with patch("sage_mcp.connectors.provider_metadata.time.monotonic", return_value=0.0):
+        for account in ("a", "b", "c"):
+            await resolver.resolve("site", _cred(account=account), fetch)
+    assert len(resolver) == 2
+
+    with patch("sage_mcp.connectors.provider_metadata.time.monotonic", return_value=61.0):
+        await resolver.resolve("site", _cred(account="c"), fetch)
+    assert fetch.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch_and_failures_are_not_cached():
+    resolver = ProviderMetadataResolver()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        if calls == 1:
+            raise ValueError("boom")
+        return "cloud-1"
+
+    waiters = [asyncio.create_task(resolver.resolve("site", _cred(), fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert calls == 1
+    assert all(isinstance(r, ValueError) for r in results)
+
+    assert await resolver.resolve("site", _cred(), fetch) == "cloud-1"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_by_account():
+    resolver = ProviderMetadataResolver()
+    fetch = AsyncMock(return_value="cloud-1")
+    await resolver.resolve("site", _cred(account="a"), fetch)
+    await resolver.resolve("site", _cred(account="b"), fetch)
+
+    resolver.invalidate("site", _cred(account="a"))
+
+    assert len(resolver) == 1
+    await resolver.resolve("site", _cred(account="b"), fetch)
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_atlassian_cloud_id_uses_first_site():
+    connector = ConfluenceConnector()
+    response = MagicMock()
+    response.json.return_value = [{"id": "site-1", "name": "One"}, {"id": "site-2"}]
+
+    with patch.object(connector, "_make_authenticated_request", AsyncMock(return_value=response)) as request:
+        assert await connector._get_cloud_id(_cred(provider="confluence")) == "site-1"
+        assert await get_atlassian_cloud_id(connector, _cred(provider="confluence"), "Confluence") == "site-1"
+    assert request.await_count == 1
+
+    response.json.return_value = []
+    with patch.object(connector, "_make_authenticated_request", AsyncMock(return_value=response)):
+        with pytest.raises(ValueError, match="No accessible Confluence resources"):
+            await connector._get_cloud_id(_cred(account="other", provider="confluence"))
@@ -0,0 +1,192 @@
+"""Tests for client-side pacing from upstream quota headers."""
+
+import time
+
+import httpx
+import pytest
+
+from sage_mcp.connectors.exceptions import ConnectorRateLimitError
+from sage_mcp.connectors.quota import (
+    AdaptiveTokenBucket,
+    QuotaSnapshot,
+    UpstreamRateLimiter,
+    parse_quota_headers,
+)
+
+
+def _response(status_code=200, headers=None):
+    return httpx.Response(status_code, headers=headers or {})
+
+
+class TestParseQuotaHeaders:
+    def test_github_epoch_seconds_reset(self):
+        now = 1_700_000_000.0
+        snapshot = parse_quota_headers(
+            _response(headers={
+                "X-RateLimit-Remaining": "120",
+                "X-RateLimit-Limit": "5000",
+                "X-RateLimit-Reset": str(int(now + 600)),
+            }),
+            now=now,
+        )
+        assert snapshot.remaining == 120
+        assert snapshot.limit == 5000
+        assert snapshot.reset_in == 600
+
+    def test_linear_epoch_millis_reset(self):
+        now = 1_700_000_000.0
+        snapshot = parse_quota_headers(
+            _response(headers={
+                "X-RateLimit-Requests-Remaining": "40",
+                "X-RateLimit-Requests-Reset": str(int((now + 30) * 1000)),
+            }),
+            now=now,
+        )
+        assert snapshot.remaining == 40
+        assert snapshot.reset_in == pytest.approx(30)
+
+    def test_atlassian_iso_reset(self):
+        now = 1_700_000_000.0
+        snapshot = parse_quota_headers(
+            _response(headers={
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": "2023-11-14T22:14:20Z",
+            }),
+            now=now,
+        )
+        assert snapshot.remaining == 0
+        assert snapshot.reset_in == pytest.approx(1_700_000_060 - now)
+
+    def test_gitlab_delta_reset(self):
+        snapshot = parse_quota_headers(
+            _response(headers={"RateLimit-Remaining": "5", "RateLimit-Reset": "12"})
+        )
+        assert snapshot.remaining == 5
+        assert snapshot.reset_in == 12
+
+    def test_retry_after_only_on_throttling_status(self):
+        assert parse_quota_headers(_response(429, {"Retry-After": "7"})).retry_after == 7
+        assert parse_quota_headers(_response(200, {"Retry-After": "7"})).retry_after is None
+
+
+class TestAdaptiveTokenBucket:
+    def test_unlimited_until_quota_is_learned(self):
+        bucket = AdaptiveTokenBucket(burst=2)
+        assert all(bucket.reserve(now=0.0) == 0 for _ in range(50))
+
+    def test_paces_remaining_over_the_window_in_arrival_order(self):
+        bucket = AdaptiveTokenBucket(burst=2)
+        # 10 of 1000 left for the next 10 seconds -> 1 request/second.
+        bucket.learn(QuotaSnapshot(remaining=10, limit=1000, reset_in=10), now=0.0)
+
+        waits = [bucket.reserve(now=0.0) for _ in range(5)]
+
+        assert waits == [0.0, 0.0, 1.0, 2.0, 3.0]
+
+    def test_exhausted_window_blocks_until_reset(self):
+        bucket = AdaptiveTokenBucket(burst=5)
+        bucket.learn(QuotaSnapshot(remaining=0, reset_in=20), now=0.0)
+
+        assert bucket.reserve(now=0.0) == pytest.approx(20.0)
+        # After the window resets with nothing newer learned, pacing stops.
+        assert bucket.reserve(now=21.0) == 0.0
+
+    def test_retry_after_blocks_then_releases_burst_per_interval(self):
+        bucket = AdaptiveTokenBucket(burst=2)
+        bucket.learn(QuotaSnapshot(retry_after=4), now=0.0)
+
+        waits = [bucket.reserve(now=0.0) for _ in range(3)]
+
+        assert waits == [4.0, 6.0, 8.0]
+
+    def test_cancelled_reservation_returns_the_slot(self):
+        bucket = AdaptiveTokenBucket(burst=1)
+        bucket.learn(QuotaSnapshot(remaining=1, limit=100, reset_in=10), now=0.0)
+        bucket.reserve(now=0.0)
+        second = bucket.reserve(now=0.0)
+        bucket.cancel_reservation()
+
+        assert second > 0
+        assert bucket.reserve(now=0.0) == second
+
+    def test_plenty_of_quota_left_is_not_paced(self):
+        bucket = AdaptiveTokenBucket(burst=10)
+        # GitHub just after the first call of the hour.
+        bucket.learn(QuotaSnapshot(remaining=4999, limit=5000, reset_in=3500), now=0.0)
+
+        assert all(bucket.reserve(now=0.0) == 0 for _ in range(200))
+
+    def test_pacing_starts_below_the_low_water_mark_and_stops_above_it(self):
+        bucket = AdaptiveTokenBucket(burst=10)
+        bucket.learn(QuotaSnapshot(remaining=499, limit=5000, reset_in=100), now=0.0)
+        waits = [bucket.reserve(now=0.0) for _ in range(12)]
+        assert waits[-1] > 0
+
+        # The window reset: back to a full quota, so pacing stops at once.
+        bucket.learn(QuotaSnapshot(remaining=5000, limit=5000, reset_in=3600), now=1.0)
+        assert bucket.reserve(now=1.0) == 0.0
+
+    def test_without_a_limit_only_near_exhaustion_is_paced(self):
+        bucket = AdaptiveTokenBucket(burst=5)
+        bucket.learn(QuotaSnapshot(remaining=40, reset_in=60), now=0.0)
+        assert all(bucket.reserve(now=0.0) == 0 for _ in range(20))
+
+        bucket.learn(QuotaSnapshot(remaining=4, reset_in=60), now=0.0)
+        waits = [bucket.reserve(now=0.0) for _ in range(5)]
+        assert waits[-1] > 0
+
+
+class TestUpstreamRateLimiter:
+    def test_keys_hash_the_credential(self):
+        key = UpstreamRateLimiter.make_key("github", "gho_secret")
+        assert key[0] == "github"
+        assert "gho_secret" not in key[1]
+        assert key == UpstreamRateLimiter.make_key("github", "gho_secret")
+        assert key != UpstreamRateLimiter.make_key("github", "gho_other")
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_slot_is_beyond_max_wait(self):
+        limiter = UpstreamRateLimiter(max_wait=5)
+        key = limiter.make_key("slack", "xoxb")
+        limiter.observe(key, _response(429, {"Retry-After": "60"}))
+
+        with pytest.raises(ConnectorRateLimitError) as exc_info:
+            await limiter.acquire(key)
+        assert exc_info.value.retry_after == pytest.approx(60, abs=1)
+
+    @pytest.mark.asyncio
+    async def test_buckets_are_independent_per_credential(self):
+        limiter = UpstreamRateLimiter(max_wait=5)
+        throttled = limiter.make_key("slack", "token-a")
+        limiter.observe(throttled, _response(429, {"Retry-After": "60"}))
+
+        start = time.monotonic()
+        await limiter.acquire(limiter.make_key("slack", "token-b"))
+        assert time.monotonic() - start < 0.5
+
+    def test_ignores_non_http_responses(self):
+        limiter = UpstreamRateLimiter()
+        limiter.observe(limiter.make_key("github", "t"), object())
+        assert limiter._buckets == {}
+
+    @pytest.mark.asyncio
+    async def test_paced_credentials_are_counted_per_provider(self, monkeypatch):
+        counts = {}
+
+        def adjust(provider, delta):
+            counts[provider] = counts.get(provider, 0) + delta
+
+        monkeypatch.setattr("sage_mcp.connectors.quota.adjust_upstream_quota_paced", adjust)
+        limiter = UpstreamRateLimiter(max_wait=5, max_buckets=3)
+        low = {"X-RateLimit-Remaining": "1", "X-RateLimit-Limit": "5000", "X-RateLimit-Reset": "60"}
+        high = {"X-RateLimit-Remaining": "4000", "X-RateLimit-Limit": "5000", "X-RateLimit-Reset": "60"}
+
+        limiter.observe(limiter.make_key("github", "a"), _response(headers=low))
+        limiter.observe(limiter.make_key("github", "b"), _response(headers=low))
+        limiter.observe(limiter.make_key("github", "c"), _response(headers=high))
+        limiter.observe(limiter.make_key("slack", "d"), _response(429, {"Retry-After": "0"}))
+        assert counts == {"github": 1}  # "a" was evicted; "d" was blocked for no time
+
+        limiter.observe(limiter.make_key("github", "b"), _response(headers=high))
+        limiter.observe(limiter.make_key("slack", "d"), _response(429, {"Retry-After": "60"}))
+        assert counts == {"github": 0, "slack": 1}
@@ -0,0 +1,149 @@
+"""Tests for the conditional-request (ETag) cache for connector GETs."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from sage_mcp.connectors.response_cache import ConditionalResponseCache, send_conditional
+
+URL = "https://api.github.com/repos/octo/repo"
+
+
+def _cached_send(cache):
+    return patch("sage_mcp.connectors.response_cache.get_response_cache", return_value=cache)
+
+
+class _Upstream:
+    """Fake upstream that answers 304 when the client's ETag matches."""
+
+    def __init__(self, etag='"v1"', body=b'{"name": "repo"}'):
+        self.etag = etag
+        self.body = body
+        self.requests = []
+
+    def sender(self, kwargs):
+        async def send():
+            headers = kwargs.get("headers") or {}
+            self.requests.append(dict(headers))
+            request = httpx.Request("GET", URL, headers=headers)
+            if headers.get("If-None-Match") == self.etag:
+                return httpx.Response(304, headers={"ETag": self.etag}, request=request)
+            return httpx.Response(
+                200,
+                headers={"ETag": self.etag, "Content-Type": "application/json"},
+                content=self.body,
+                request=request,
+            )
+        return send
+
+
+@pytest.mark.asyncio
+async def test_revalidates_with_if_none_match_and_serves_cached_body_on_304():
+    cache = ConditionalResponseCache()
+    upstream = _Upstream()
+
+    with _cached_send(cache):
+        for _ in range(2):
+            kwargs = {"headers": {"Authorization": "Bearer tok"}}
+            response = await send_conditional("tok", "GET", URL, kwargs, upstream.sender(kwargs))
+            assert response.status_code == 200
+            assert response.json() == {"name": "repo"}
+
+    assert "If-None-Match" not in upstream.requests[0]
+    assert upstream.requests[1]["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_changed_resource_replaces_the_cached_body():
+    cache = ConditionalResponseCache()
+    upstream = _Upstream()
+
+    with _cached_send(cache):
+        kwargs = {}
+        await send_conditional("tok", "GET", URL, kwargs, upstream.sender(kwargs))
+        upstream.etag, upstream.body = '"v2"', b'{"name": "renamed"}'
+        kwargs = {}
+        response = await send_conditional("tok", "GET", URL, kwargs, upstream.sender(kwargs))
+
+    assert response.json() == {"name": "renamed"}
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_paths_are_served_without_an_upstream_call():
+    cache = ConditionalResponseCache(ttls={"api.github.com/repos/*": 60})
+    upstream = _Upstream()
+
+    with _cached_send(cache):
+        for _ in range(3):
+            kwargs = {}
+            response = await send_conditional("tok", "GET", URL, kwargs, upstream.sender(kwargs))
+
+    assert response.json() == {"name": "repo"}
+    assert len(upstream.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_are_scoped_to_the_credential():
+    cache = ConditionalResponseCache()
+    upstream = _Upstream()
+
+    with _cached_send(cache):
+        kwargs = {}
+        await send_conditional("alice", "GET", URL, kwargs, upstream.sender(kwargs))
+        kwargs = {}
+        await send_conditional("bob", "GET", URL, kwargs, upstream.sender(kwargs))
+
+    assert all("If-None-Match" not in headers for headers in upstream.requests)
+
+
+def test_evicts_least_recently_used_entries_by_bytes():
+    cache = ConditionalResponseCache(max_bytes=100)
+    cache.max_entry_bytes = 100
+
+    def response(size):
+        return httpx.Response(200, headers={"ETag": '"x"'}, content=b"a" * size)
+
+    cache.put("a", response(40))
+    cache.put("b", response(40))
+    cache.get("a")
+    cache.put("c", response(40))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.total_bytes == 80
+
+
+def test_no_store_responses_are_not_cached():
+    cache = ConditionalResponseCache()
+    cache.put("k", httpx.Response(200, headers={"ETag": '"x"', "Cache-Control": "no-store"}))
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_connector_request_serves_cached_body_on_real_304():
+    from sage_mcp.connectors.github import GitHubConnector
+    from sage_mcp.models.oauth_credential import OAuthCredential
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, headers={"ETag": '"v1"'}, json={"name": "repo"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    cred = OAuthCredential(provider="github", access_token="tok", is_active=True)
+    connector = GitHubConnector()
+
+    with _cached_send(ConditionalResponseCache()), \
+            patch("sage_mcp.connectors.http_client.get_http_client", return_value=client):
+        for _ in range(2):
+            response = await connector._make_authenticated_request("GET", URL, cred)
+            assert response.status_code == 200
+            assert response.json() == {"name": "repo"}
+
+    assert seen == [None, '"v1"']
+    await client.aclose()
@@ -265,11 +265,26 @@ class TestParseRetryAfter:
         assert _parse_retry_after(response) is None
 
     def test_invalid_value(self):
-        """Non-numeric Retry-After returns None (HTTP-date not supported)."""
+        """Unparseable Retry-After returns None."""
         response = MagicMock(spec=httpx.Response)
-        response.headers = {"Retry-After": "Wed, 21 Oct 2025 07:28:00 GMT"}
+        response.headers = {"Retry-After": "soon"}
         assert _parse_retry_after(response) is None
 
+    def test_http_date_in_the_past(self):
+        """An HTTP-date that has already passed means no wait."""
+        response = MagicMock(spec=httpx.Response)
+        response.headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        assert _parse_retry_after(response) == 0.0
+
+    def test_http_date_in_the_future(self):
+        """An HTTP-date is converted into seconds from now."""
+        from email.utils import formatdate
+        import time
+
+        response = MagicMock(spec=httpx.Response)
+        response.headers = {"Retry-After": formatdate(time.time() + 120, usegmt=True)}
+        assert 110 <= _parse_retry_after(response) <= 120
+
     def test_lowercase_header(self):
         """Retry-after (lowercase) is also accepted."""
         response = MagicMock(spec=httpx.Response)
@@ -67,6 +67,18 @@ class TestServerPool:
             assert pool.hits == 1
             assert pool.misses == 1
 
+    @pytest.mark.asyncio
+    async def test_cache_miss_passes_resolved_tenant_id(self, pool):
+        """Test that a tenant id resolved during auth reaches the new server."""
+        with patch("sage_mcp.mcp.pool.MCPServer") as MockServer:
+            mock_instance = MagicMock()
+            mock_instance.initialize = AsyncMock(return_value=True)
+            MockServer.return_value = mock_instance
+
+            await pool.get_or_create("tenant-a", "conn-1", tenant_id="tenant-uuid")
+
+            MockServer.assert_called_once_with("tenant-a", "conn-1", None, tenant_id="tenant-uuid")
+
     @pytest.mark.asyncio
     async def test_cache_hit_updates_user_token(self, pool):
         """Test that cache hit updates user_token per-request."""
@@ -0,0 +1,203 @@
+"""Tests for cached tenant slug resolution."""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from sage_mcp.middleware.rate_limit import RateLimiter
+from sage_mcp.models.base import Base
+from sage_mcp.models.tenant import Tenant
+from sage_mcp.security.tenant_directory import (
+    TenantDirectory,
+    TenantInfo,
+    get_tenant_info,
+    load_tenant_info,
+)
+
+
+@pytest_asyncio.fixture
+async def db():
+    """In-memory database; yields (factory, executed statements)."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    yield factory, statements
+    await engine.dispose()
+
+
+async def _seed(factory, slug="acme", settings=None):
+    async with factory() as session:
+        tenant = Tenant(slug=slug, name="Acme", settings=json.dumps(settings) if settings else None)
+        session.add(tenant)
+        await session.commit()
+        return tenant
+
+
+def _request(rate_limiter=None):
+    return SimpleNamespace(
+        state=SimpleNamespace(),
+        app=SimpleNamespace(state=SimpleNamespace(rate_limiter=rate_limiter)),
+    )
+
+
+class TestTenantDirectory:
+    """Test TenantDirectory caching."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_the_database(self, db):
+        factory, statements = db
+        tenant = await _seed(factory)
+        directory = TenantDirectory(ttl=60)
+        statements.clear()
+
+        async with factory() as session:
+            first = await directory.resolve(session, "acme")
+            second = await directory.resolve(session, "acme")
+
+        assert first == second == TenantInfo(id=tenant.id, slug="acme", is_active=True)
+        assert len(statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_slug_is_not_cached(self, db):
+        factory, statements = db
+        directory = TenantDirectory(ttl=60)
+
+        async with factory() as session:
+            assert await directory.resolve(session, "missing") is None
+            assert await directory.resolve(session, "missing") is None
+
+        assert len(directory) == 0
+        assert len(statements) == 2
+
+    def test_expired_entry_is_dropped(self):
+        directory = TenantDirectory(ttl=5)
+        info = TenantInfo(id="t-1", slug="acme", is_active=True)
+        directory.put(info)
+        assert directory.get("acme") == info
+
+        directory._entries["acme"] = (time.monotonic() - 10, info)
+        assert directory.get("acme") is None
+        assert len(directory) == 0
+
+    def test_size_bound_evicts_least_recently_used(self):
+        directory = TenantDirectory(ttl=60, max_entries=2)
+        for slug in ("a", "b"):
+            directory.put(TenantInfo(id=slug, slug=slug, is_active=True))
+        directory.get("a")
+        directory.put(TenantInfo(id="c", slug="c", is_active=True))
+
+        assert directory.get("b") is None
+        assert directory.get("a") is not None
+        assert directory.get("c") is not None
+
+    def test_invalidate(self):
+        directory = TenantDirectory(ttl=60)
+        for slug in ("a", "b", "c"):
+            directory.put(TenantInfo(id=slug, slug=slug, is_active=True))
+
+        directory.invalidate("a")
+        assert directory.get("a") is None
+        assert len(directory) == 2
+
+        directory.invalidate()
+        assert len(directory) == 0
+
+
+class TestLoadTenantInfo:
+    """Test reading the per-tenant rate limit override from settings JSON."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("settings, expected", [
+        ({"rate_limit_rpm": 250}, 250),
+        ({"rate_limit_rpm": 0}, None),
+        ({"rate_limit_rpm": "250"}, None),
+        ({"other": True}, None),
+        (None, None),
+    ])
+    async def test_rate_limit_override(self, db, settings, expected):
+        factory, _ = db
+        await _seed(factory, settings=settings)
+
+        async with factory() as session:
+            info = await load_tenant_info(session, "acme")
+
+        assert info.rate_limit_rpm == expected
+
+
+class TestGetTenantInfo:
+    """Test the FastAPI dependency."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_tenant_is_404(self, db):
+        factory, _ = db
+
+        async with factory() as session:
+            with pytest.raises(HTTPException) as exc:
+                await get_tenant_info("missing", _request(), session)
+
+        assert exc.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_reuses_tenant_resolved_earlier_in_the_request(self, db):
+        factory, statements = db
+        request = _request()
+        request.state.tenant = TenantInfo(id="t-1", slug="acme", is_active=True)
+
+        async with factory() as session:
+            info = await get_tenant_info("acme", request, session)
+
+        assert info is request.state.tenant
+        assert statements == []
+
+    @pytest.mark.asyncio
+    async def test_applies_rate_limit_override(self, db):
+        factory, _ = db
+        tenant = await _seed(factory, settings={"rate_limit_rpm": 7})
+        limiter = RateLimiter(default_rpm=100)
+        request = _request(limiter)
+
+        async with factory() as session:
+            info = await get_tenant_info("acme", request, session)
+
+        assert request.state.tenant_id == str(tenant.id)
+        assert info.rate_limit_rpm == 7
+        assert limiter._get_bucket("acme").capacity == 7.0
+
+
+class TestSyncTenantLimit:
+    """Test RateLimiter.sync_tenant_limit."""
+
+    def test_clearing_override_restores_default(self):
+        limiter = RateLimiter(default_rpm=100)
+        limiter.sync_tenant_limit("acme", 5)
+        assert limiter._get_bucket("acme").capacity == 5.0
+
+        limiter.sync_tenant_limit("acme", None)
+        assert limiter._get_bucket("acme").capacity == 100.0
+
+    def test_unchanged_override_keeps_bucket(self):
+        limiter = RateLimiter(default_rpm=100)
+        limiter.sync_tenant_limit("acme", 5)
+        bucket = limiter._get_bucket("acme")
+        bucket.try_consume()
+
+        limiter.sync_tenant_limit("acme", 5)
+        assert limiter._get_bucket("acme") is bucket
@@ -0,0 +1,203 @@
+"""Tests for set-based connector tool state writes."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from sage_mcp.api.admin import (
+    BulkToolUpdateRequest,
+    BulkToolUpdatesRequest,
+    bulk_update_tools,
+    disable_all_tools,
+    sync_connector_tools,
+)
+from sage_mcp.database.tool_states import (
+    delete_tool_states_except,
+    insert_missing_tool_states,
+    set_all_tool_states,
+    upsert_tool_states,
+)
+from sage_mcp.models.base import Base
+from sage_mcp.models.connector import Connector, ConnectorType
+from sage_mcp.models.connector_tool_state import ConnectorToolState
+from sage_mcp.models.tenant import Tenant
+from sage_mcp.security.tenant_directory import TenantInfo
+
+
+@pytest_asyncio.fixture
+async def db():
+    """In-memory database with one connector; yields (session, connector, tenant, executed statements)."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        tenant = Tenant(slug="acme", name="Acme")
+        session.add(tenant)
+        await session.flush()
+        connector = Connector(tenant_id=tenant.id, connector_type=ConnectorType.GITHUB, name="GitHub")
+        session.add(connector)
+        await session.commit()
+
+        statements = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        yield session, connector, tenant, statements
+    await engine.dispose()
+
+
+def _writes(statements):
+    return [s for s in statements if s.lstrip().split()[0].upper() in ("INSERT", "UPDATE", "DELETE")]
+
+
+async def _states(session, connector):
+    result = await session.execute(
+        select(ConnectorToolState.tool_name, ConnectorToolState.is_enabled)
+        .where(ConnectorToolState.connector_id == connector.id)
+    )
+    return dict(result.all())
+
+
+def _request():
+    pool = MagicMock()
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(server_pool=pool))), pool
+
+
+class TestToolStateStatements:
+    """Test the statement helpers."""
+
+    @pytest.mark.asyncio
+    async def test_insert_missing_is_one_statement_and_keeps_existing_rows(self, db):
+        session, connector, _, statements = db
+        await upsert_tool_states(session, connector.id, {"a": False})
+        statements.clear()
+
+        added = await insert_missing_tool_states(session, connector.id, [f"tool_{i}" for i in range(40)] + ["a"])
+
+        assert len(_writes(statements)) == 1
+        assert len(added) == 40
+        states = await _states(session, connector)
+        assert len(states) == 41
+        assert states["a"] is False
+
+    @pytest.mark.asyncio
+    async def test_upsert_creates_and_updates_in_one_statement(self, db):
+        session, connector, _, statements = db
+        await insert_missing_tool_states(session, connector.id, ["a", "b"])
+        statements.clear()
+
+        written = await upsert_tool_states(session, connector.id, {"a": False, "c": False})
+
+        assert len(_writes(statements)) == 1
+        assert sorted(written) == ["a", "c"]
+        assert await _states(session, connector) == {"a": False, "b": True, "c": False}
+
+    @pytest.mark.asyncio
+    async def test_set_all_and_delete_except(self, db):
+        session, connector, _, _ = db
+        await insert_missing_tool_states(session, connector.id, ["a", "b", "c"])
+
+        assert await set_all_tool_states(session, connector.id, is_enabled=False) == 3
+        assert sorted(await delete_tool_states_except(session, connector.id, ["a"])) == ["b", "c"]
+        assert await _states(session, connector) == {"a": False}
+
+    @pytest.mark.asyncio
+    async def test_empty_input_issues_no_statement(self, db):
+        session, connector, _, statements = db
+        statements.clear()
+
+        assert await upsert_tool_states(session, connector.id, {}) == []
+        assert await insert_missing_tool_states(session, connector.id, []) == []
+        assert statements == []
+
+
+class TestToolStateEndpoints:
+    """Test the admin handlers built on the helpers."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_writes_once_and_invalidates_once(self, db):
+        session, connector, tenant, statements = db
+        await insert_missing_tool_states(session, connector.id, ["a", "b"])
+        await session.commit()
+        http_request, pool = _request()
+        statements.clear()
+
+        result = await bulk_update_tools(
+            "acme",
+            connector.id,
+            BulkToolUpdatesRequest(updates=[
+                BulkToolUpdateRequest(tool_name="a", is_enabled=False),
+                BulkToolUpdateRequest(tool_name="new", is_enabled=True),
+                BulkToolUpdateRequest(tool_name="a", is_enabled=True),
+            ]),
+            http_request,
+            tenant=TenantInfo(id=tenant.id, slug="acme", is_active=True),
+            session=session,
+        )
+
+        assert result["updated_count"] == 2
+        assert len(_writes(statements)) == 1
+        pool.invalidate.assert_called_once_with("acme", connector.id)
+        assert await _states(session, connector) == {"a": True, "b": True, "new": True}
+
+    @pytest.mark.asyncio
+    async def test_disable_all_reports_count(self, db):
+        session, connector, tenant, _ = db
+        await insert_missing_tool_states(session, connector.id, ["a", "b"])
+        await session.commit()
+        http_request, pool = _request()
+
+        result = await disable_all_tools(
+            "acme", connector.id, http_request,
+            tenant=TenantInfo(id=tenant.id, slug="acme", is_active=True),
+            session=session,
+        )
+
+        assert result["updated_count"] == 2
+        pool.invalidate.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_sync_adds_new_and_removes_orphaned_tools(self, db, monkeypatch):
+        session, connector, tenant, statements = db
+        await insert_missing_tool_states(session, connector.id, ["kept", "orphan"])
+        await session.commit()
+
+        plugin = MagicMock()
+
+        async def get_tools(connector, oauth_cred=None):
+            return [SimpleNamespace(name="kept"), SimpleNamespace(name="added")]
+
+        async def get_connector_for_config(connector, oauth_cred=None):
+            return plugin
+
+        plugin.get_tools = get_tools
+        monkeypatch.setattr(
+            "sage_mcp.api.admin.connector_registry.get_connector_for_config", get_connector_for_config
+        )
+        http_request, pool = _request()
+        statements.clear()
+
+        result = await sync_connector_tools(
+            "acme", connector.id, http_request,
+            tenant=TenantInfo(id=tenant.id, slug="acme", is_active=True),
+            session=session,
+        )
+
+        assert result["added"] == ["added"]
+        assert result["removed"] == ["orphan"]
+        assert result["unchanged"] == 1
+        assert len(_writes(statements)) == 2
+        pool.invalidate.assert_called_once()
+        assert await _states(session, connector) == {"kept": True, "added": True}